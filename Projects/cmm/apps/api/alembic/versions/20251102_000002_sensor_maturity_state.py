@@ -0,0 +1,44 @@
+"""Per-sensor running maturity accumulators."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20251102_000002"
+down_revision = "20251101_000001"
+branch_labels = None
+depends_on = None
+
+timestamp_kwargs = {
+    "nullable": False,
+    "server_default": sa.text("CURRENT_TIMESTAMP"),
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        "sensor_maturity_states",
+        sa.Column("id", sa.String(length=36), primary_key=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), **timestamp_kwargs),
+        sa.Column("updated_at", sa.DateTime(timezone=True), **timestamp_kwargs),
+        sa.Column("sensor_id", sa.String(length=36), sa.ForeignKey("sensors.id"), nullable=False),
+        sa.Column("t0_c", sa.Float(), nullable=False),
+        sa.Column("ea", sa.Float(), nullable=False),
+        sa.Column("tr_c", sa.Float(), nullable=False),
+        sa.Column("origin_ts", sa.DateTime(timezone=True)),
+        sa.Column("last_ts", sa.DateTime(timezone=True)),
+        sa.Column("last_celsius", sa.Float()),
+        sa.Column("ttf_c_h", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("eq_age_h", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("sample_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.UniqueConstraint(
+            "sensor_id", "t0_c", "ea", "tr_c", name="uq_sensor_maturity_states_params"
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("sensor_maturity_states")
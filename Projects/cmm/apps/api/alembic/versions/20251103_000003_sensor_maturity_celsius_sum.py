@@ -0,0 +1,31 @@
+"""Track the running temperature sum on sensor maturity accumulators."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20251103_000003"
+down_revision = "20251102_000002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "sensor_maturity_states",
+        sa.Column("celsius_sum", sa.Float(), nullable=False, server_default="0"),
+    )
+    # Accumulators always cover a sensor's full history, so the backfill is a plain sum.
+    op.execute(
+        "UPDATE sensor_maturity_states SET celsius_sum = ("
+        " SELECT COALESCE(SUM(celsius), 0) FROM readings_ts"
+        " WHERE readings_ts.sensor_id = sensor_maturity_states.sensor_id"
+        ")"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("sensor_maturity_states", "celsius_sum")
@@ -0,0 +1,124 @@
+"""Per-sensor temperature rollups (1m/15m/1h/1d) over readings_ts."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import context, op
+
+# revision identifiers, used by Alembic.
+revision = "20251104_000004"
+down_revision = "20251103_000003"
+branch_labels = None
+depends_on = None
+
+# (view name, bucket width, refresh start offset, refresh schedule)
+ROLLUPS = (
+    ("readings_1m", "1 minute", "2 hours", "1 minute"),
+    ("readings_15m", "15 minutes", "1 day", "15 minutes"),
+    ("readings_1h", "1 hour", "3 days", "1 hour"),
+    ("readings_1d", "1 day", "30 days", "1 day"),
+)
+
+
+def _has_hypertable(bind: sa.engine.Connection) -> bool:
+    installed = bind.execute(
+        sa.text("SELECT 1 FROM pg_extension WHERE extname = 'timescaledb'")
+    ).first()
+    if installed is None:
+        return False
+    return (
+        bind.execute(
+            sa.text(
+                "SELECT 1 FROM timescaledb_information.hypertables"
+                " WHERE hypertable_name = 'readings_ts'"
+            )
+        ).first()
+        is not None
+    )
+
+
+def _has_toolkit(bind: sa.engine.Connection) -> bool:
+    try:
+        with bind.begin_nested():
+            op.execute("CREATE EXTENSION IF NOT EXISTS timescaledb_toolkit")
+        return True
+    except Exception as exc:  # pragma: no cover - warning only
+        context.get_context().log.warn(f"timescaledb_toolkit unavailable, twa_c uses avg: {exc}")
+        return False
+
+
+def _continuous_aggregate(name: str, width: str, twa: str) -> str:
+    return (
+        f"CREATE MATERIALIZED VIEW {name}"
+        " WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS"
+        f" SELECT time_bucket(INTERVAL '{width}', ts) AS bucket, sensor_id,"
+        " count(*) AS sample_count,"
+        " min(celsius)::double precision AS min_c,"
+        " max(celsius)::double precision AS max_c,"
+        " avg(celsius)::double precision AS avg_c,"
+        f" {twa} AS twa_c,"
+        " min(ts) AS first_ts, max(ts) AS last_ts"
+        " FROM readings_ts GROUP BY bucket, sensor_id"
+        " WITH NO DATA"
+    )
+
+
+def _fallback_view(name: str, width: str) -> str:
+    # Without Timescale the time weight of each sample runs until the next sample or the end of
+    # its bucket, whichever comes first.
+    return (
+        f"CREATE MATERIALIZED VIEW {name} AS"
+        " WITH bucketed AS ("
+        "  SELECT sensor_id, ts, celsius::double precision AS celsius,"
+        f"  date_bin(INTERVAL '{width}', ts, TIMESTAMPTZ '2000-01-03 00:00:00+00') AS bucket"
+        "  FROM readings_ts"
+        " ), weighted AS ("
+        "  SELECT bucketed.*, EXTRACT(epoch FROM LEAST("
+        "   lead(ts) OVER (PARTITION BY sensor_id ORDER BY ts),"
+        f"   bucket + INTERVAL '{width}') - ts) AS weight"
+        "  FROM bucketed"
+        " )"
+        " SELECT bucket, sensor_id, count(*) AS sample_count,"
+        " min(celsius) AS min_c, max(celsius) AS max_c, avg(celsius) AS avg_c,"
+        " COALESCE(sum(celsius * weight) / NULLIF(sum(weight), 0), avg(celsius)) AS twa_c,"
+        " min(ts) AS first_ts, max(ts) AS last_ts"
+        " FROM weighted GROUP BY bucket, sensor_id"
+        " WITH NO DATA"
+    )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    timescale = _has_hypertable(bind)
+    toolkit = timescale and _has_toolkit(bind)
+    twa = (
+        "average(time_weight('LOCF', ts, celsius::double precision))"
+        if toolkit
+        else "avg(celsius)::double precision"
+    )
+    for name, width, start_offset, schedule in ROLLUPS:
+        if timescale:
+            op.execute(_continuous_aggregate(name, width, twa))
+            op.execute(
+                f"SELECT add_continuous_aggregate_policy('{name}',"
+                f" start_offset => INTERVAL '{start_offset}',"
+                f" end_offset => INTERVAL '{width}',"
+                f" schedule_interval => INTERVAL '{schedule}')"
+            )
+            op.execute(f"CREATE INDEX ix_{name}_sensor_bucket ON {name} (sensor_id, bucket)")
+        else:
+            op.execute(_fallback_view(name, width))
+            # Unique so REFRESH MATERIALIZED VIEW CONCURRENTLY can be used.
+            op.execute(f"CREATE UNIQUE INDEX ux_{name}_sensor_bucket ON {name} (sensor_id, bucket)")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    for name, *_ in reversed(ROLLUPS):
+        op.execute(f"DROP MATERIALIZED VIEW IF EXISTS {name} CASCADE")
@@ -0,0 +1,81 @@
+"""Native compression for readings_ts and an archive tier for closed pours."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20251105_000005"
+down_revision = "20251104_000004"
+branch_labels = None
+depends_on = None
+
+COMPRESS_AFTER = "7 days"
+ARCHIVE_CHUNK_INTERVAL = "30 days"
+
+
+def _is_hypertable(bind: sa.engine.Connection, table: str) -> bool:
+    installed = bind.execute(
+        sa.text("SELECT 1 FROM pg_extension WHERE extname = 'timescaledb'")
+    ).first()
+    if installed is None:
+        return False
+    return (
+        bind.execute(
+            sa.text(
+                "SELECT 1 FROM timescaledb_information.hypertables WHERE hypertable_name = :name"
+            ),
+            {"name": table},
+        ).first()
+        is not None
+    )
+
+
+def _enable_compression(table: str, compress_after: str) -> None:
+    op.execute(
+        f"ALTER TABLE {table} SET (timescaledb.compress,"
+        " timescaledb.compress_segmentby = 'sensor_id',"
+        " timescaledb.compress_orderby = 'ts')"
+    )
+    op.execute(
+        f"SELECT add_compression_policy('{table}', INTERVAL '{compress_after}',"
+        " if_not_exists => TRUE)"
+    )
+
+
+def upgrade() -> None:
+    op.create_table(
+        "readings_archive",
+        sa.Column("sensor_id", sa.String(length=36), sa.ForeignKey("sensors.id"), primary_key=True),
+        sa.Column("ts", sa.DateTime(timezone=True), primary_key=True),
+        sa.Column("celsius", sa.Numeric(6, 3), nullable=False),
+        sa.Column("tenant_id", sa.String(length=36), sa.ForeignKey("tenants.id"), nullable=False),
+    )
+    op.create_index("ix_readings_archive_sensor_ts", "readings_archive", ["sensor_id", "ts"])
+
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql" or not _is_hypertable(bind, "readings_ts"):
+        return
+
+    _enable_compression("readings_ts", COMPRESS_AFTER)
+    op.execute(
+        "SELECT create_hypertable('readings_archive', 'ts',"
+        f" chunk_time_interval => INTERVAL '{ARCHIVE_CHUNK_INTERVAL}', if_not_exists => TRUE)"
+    )
+    # Archived readings are never written again, so they are compressed as soon as possible.
+    _enable_compression("readings_archive", "1 day")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql" and _is_hypertable(bind, "readings_ts"):
+        op.execute("SELECT remove_compression_policy('readings_ts', if_exists => TRUE)")
+        op.execute(
+            "SELECT decompress_chunk(c, if_compressed => TRUE)"
+            " FROM show_chunks('readings_ts') c"
+        )
+        op.execute("ALTER TABLE readings_ts SET (timescaledb.compress = false)")
+    op.drop_index("ix_readings_archive_sensor_ts", table_name="readings_archive")
+    op.drop_table("readings_archive")
@@ -0,0 +1,45 @@
+"""Latest reading per sensor for live panels."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20251106_000006"
+down_revision = "20251105_000005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "sensor_latest",
+        sa.Column("sensor_id", sa.String(length=36), sa.ForeignKey("sensors.id"), primary_key=True),
+        sa.Column("tenant_id", sa.String(length=36), sa.ForeignKey("tenants.id"), nullable=False),
+        sa.Column("ts", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("celsius", sa.Numeric(6, 3), nullable=False),
+    )
+    op.create_index("ix_sensor_latest_tenant_id", "sensor_latest", ["tenant_id"])
+    op.create_index("ix_sensors_project_id", "sensors", ["project_id"])
+
+    # Archived readings only belong to closed pours, but a sensor's newest reading may be among
+    # them, so both tiers are searched.
+    op.execute(
+        "INSERT INTO sensor_latest (sensor_id, tenant_id, ts, celsius)"
+        " SELECT r.sensor_id, r.tenant_id, r.ts, r.celsius"
+        " FROM (SELECT sensor_id, tenant_id, ts, celsius FROM readings_ts"
+        "       UNION ALL SELECT sensor_id, tenant_id, ts, celsius FROM readings_archive) r"
+        " JOIN (SELECT sensor_id, max(ts) AS ts FROM ("
+        "       SELECT sensor_id, ts FROM readings_ts"
+        "       UNION ALL SELECT sensor_id, ts FROM readings_archive) a"
+        "       GROUP BY sensor_id) latest"
+        " ON latest.sensor_id = r.sensor_id AND latest.ts = r.ts"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_sensors_project_id", table_name="sensors")
+    op.drop_index("ix_sensor_latest_tenant_id", table_name="sensor_latest")
+    op.drop_table("sensor_latest")
@@ -0,0 +1,39 @@
+"""Cumulative maturity checkpoints for as-of queries."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20251107_000007"
+down_revision = "20251106_000006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "sensor_maturity_checkpoints",
+        sa.Column(
+            "state_id",
+            sa.String(length=36),
+            sa.ForeignKey("sensor_maturity_states.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("ts", sa.DateTime(timezone=True), primary_key=True),
+        sa.Column("last_ts", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_celsius", sa.Float(), nullable=False),
+        sa.Column("ttf_c_h", sa.Float(), nullable=False),
+        sa.Column("eq_age_h", sa.Float(), nullable=False),
+        sa.Column("celsius_sum", sa.Float(), nullable=False),
+        sa.Column("sample_count", sa.Integer(), nullable=False),
+    )
+    # Accumulators are rebuilt from the readings, checkpoints included, the next time their
+    # sensor reports; until then maturity windows are integrated from the readings.
+    op.execute("DELETE FROM sensor_maturity_states")
+
+
+def downgrade() -> None:
+    op.drop_table("sensor_maturity_checkpoints")
@@ -0,0 +1,23 @@
+"""Explicit close timestamp on pours for readings tiering."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20251108_000008"
+down_revision = "20251107_000007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("pours", sa.Column("closed_at", sa.DateTime(timezone=True), nullable=True))
+    # Best available estimate for pours closed before the column existed.
+    op.execute("UPDATE pours SET closed_at = updated_at WHERE status IN ('closed', 'completed')")
+
+
+def downgrade() -> None:
+    op.drop_column("pours", "closed_at")
@@ -1,5 +1,4 @@
 from functools import lru_cache
-from typing import Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -10,8 +9,37 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_nested_delimiter="__", extra="ignore")
 
     database_url: str = "postgresql+psycopg2://cmm:cmm@db:5432/cmm"
-    alembic_database_url: Optional[str] = None
+    async_database_url: str | None = None
+    alembic_database_url: str | None = None
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout_s: float = 30.0
+    db_pool_recycle_s: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_timeout_ms: int = 30000
+    redis_url: str | None = None
+    maturity_cache_ttl_s: int = 300
+    maturity_cache_l1_entries: int = 1024
+    maturity_cache_l1_ttl_s: float = 30.0
+    sensor_cache_max_entries: int = 100000
+    sensor_cache_ttl_s: float = 300.0
     environment: str = "development"
+    ingest_chunk_size: int = 5000
+    ingest_copy_threshold: int = 10000
+    ingest_stream_max_line_bytes: int = 65536
+    ingest_stream_max_rejects: int = 1000
+    ingest_binary_max_bytes: int = 64 * 1024 * 1024
+    live_buffer_events: int = 256
+    live_replay_max_readings: int = 10000
+    live_heartbeat_s: float = 15.0
+    maturity_checkpoint_interval_s: int = 3600
+    forecast_lookback_h: float = 24.0
+    forecast_smoothing_h: float = 6.0
+    calibration_pool_workers: int = 4
+    calibration_pool_min_mixes: int = 5000
+    calibration_min_r_squared: float = 0.8
+    compress_after_days: int = 7
+    archive_closed_pours_after_days: int = 30
 
 
 @lru_cache
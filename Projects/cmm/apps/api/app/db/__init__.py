@@ -1,4 +1,17 @@
-from .session import SessionLocal, get_db, engine
-
-__all__ = ["SessionLocal", "get_db", "engine"]
+from .session import (
+    AsyncSessionLocal,
+    SessionLocal,
+    async_engine,
+    engine,
+    get_async_db,
+    get_db,
+)
 
+__all__ = [
+    "AsyncSessionLocal",
+    "SessionLocal",
+    "async_engine",
+    "engine",
+    "get_async_db",
+    "get_db",
+]
@@ -0,0 +1,53 @@
+"""
+Database work written once for sync and async sessions.
+
+A plan is a generator that yields statements, optionally as ``(statement, parameters)``, and
+receives each one's :class:`~sqlalchemy.engine.Result`; its return value is the plan's result.
+:func:`run_plan` drives it on a sync :class:`~sqlalchemy.orm.Session`. :func:`run_plan_async`
+awaits every statement on an :class:`~sqlalchemy.ext.asyncio.AsyncSession` and runs the code
+between them, where plans do their numpy work, in a worker thread, so neither the queries nor
+the integration block the event loop. Plans must not trigger lazy loads.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Generator
+from typing import Any, TypeVar
+
+from sqlalchemy.engine import Result
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Executable
+
+T = TypeVar("T")
+
+Statement = Executable | tuple[Executable, Any]
+Plan = Generator[Statement, Result, T]
+
+
+def _arguments(statement: Statement) -> tuple[Executable, Any]:
+    return statement if isinstance(statement, tuple) else (statement, None)
+
+
+def _advance(plan: Plan[T], result: Result | None) -> tuple[bool, Any]:
+    # StopIteration cannot cross a future, so the thread reports completion as a flag.
+    try:
+        return False, plan.send(result)
+    except StopIteration as stop:
+        return True, stop.value
+
+
+def run_plan(session: Session, plan: Plan[T]) -> T:
+    done, value = _advance(plan, None)
+    while not done:
+        done, value = _advance(plan, session.execute(*_arguments(value)))
+    return value
+
+
+async def run_plan_async(session: AsyncSession, plan: Plan[T]) -> T:
+    done, value = await asyncio.to_thread(_advance, plan, None)
+    while not done:
+        result = await session.execute(*_arguments(value))
+        done, value = await asyncio.to_thread(_advance, plan, result)
+    return value
@@ -0,0 +1,241 @@
+"""
+Batched least-squares fitting of strength-maturity curves.
+
+Cylinder breaks pair a maturity (TTF in °C·h or equivalent age in hours) with a measured
+compressive strength. The curves of :func:`app.domain.maturity_models.predict_strength` are fitted
+to them many datasets at a time: datasets are padded into ``(datasets, points)`` arrays with a
+mask, so every step below is a numpy expression over the whole batch.
+
+* ``log``, ``S = a·ln(M) + b``, is linear in its parameters and solved in closed form.
+* ``asymptotic``, ``S = f_u·(1 - exp(-k·M))``, is fitted with Levenberg-Marquardt. The 2x2
+  normal equations of every dataset are solved explicitly, so one iteration advances all
+  datasets that have not converged yet.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import NamedTuple
+
+import numpy as np
+
+ArrayPair = tuple[np.ndarray, np.ndarray]
+
+
+class CurveFit(NamedTuple):
+    """Fitted curve of one dataset; parameters are ``nan`` when it could not be fitted."""
+
+    curve_type: str
+    params: dict[str, float]
+    r_squared: float
+    residual_sigma: float | None
+    points: int
+    iterations: int
+    converged: bool
+
+
+def _pad(datasets: Sequence[ArrayPair]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    width = max((len(np.atleast_1d(maturity)) for maturity, _ in datasets), default=0)
+    maturity = np.ones((len(datasets), width))
+    strength = np.zeros((len(datasets), width))
+    mask = np.zeros((len(datasets), width), dtype=bool)
+    for row, (m, s) in enumerate(datasets):
+        m = np.asarray(m, dtype=np.float64).ravel()
+        s = np.asarray(s, dtype=np.float64).ravel()
+        if m.shape != s.shape:
+            raise ValueError("Maturity and strength must have the same length.")
+        maturity[row, : m.size] = m
+        strength[row, : s.size] = s
+        mask[row, : m.size] = True
+    return maturity, strength, mask
+
+
+def _sum(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    return np.where(mask, values, 0.0).sum(axis=1)
+
+
+def fit_log_batch(
+    maturity: np.ndarray, strength: np.ndarray, mask: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Closed-form least squares of ``S = a·ln(M) + b`` for every row.
+
+    Parameters
+    ----------
+    maturity, strength : numpy.ndarray
+        ``(datasets, points)`` arrays; maturities must be positive where ``mask`` is set.
+    mask : numpy.ndarray
+        Boolean array marking the real points of each row.
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        ``(a, b, sse)`` per row; ``nan`` for rows with fewer than two distinct maturities.
+    """
+    count = mask.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x = np.log(np.where(mask, maturity, 1.0))
+        x_mean = _sum(x, mask) / count
+        s_mean = _sum(strength, mask) / count
+        dx = x - x_mean[:, None]
+        sxx = _sum(dx * dx, mask)
+        highest = np.where(mask, x, -np.inf).max(axis=1, initial=-np.inf)
+        lowest = np.where(mask, x, np.inf).min(axis=1, initial=np.inf)
+        a = np.where(highest > lowest, _sum(dx * (strength - s_mean[:, None]), mask) / sxx, np.nan)
+        b = s_mean - a * x_mean
+        residual = strength - (a[:, None] * x + b[:, None])
+    return a, b, _sum(residual * residual, mask)
+
+
+def _asymptotic_sse(
+    f_u: np.ndarray, k: np.ndarray, maturity: np.ndarray, strength: np.ndarray, mask: np.ndarray
+) -> np.ndarray:
+    with np.errstate(over="ignore", invalid="ignore"):
+        residual = strength + f_u[:, None] * np.expm1(-k[:, None] * maturity)
+    return _sum(residual * residual, mask)
+
+
+def fit_asymptotic_batch(
+    maturity: np.ndarray,
+    strength: np.ndarray,
+    mask: np.ndarray,
+    max_iter: int = 200,
+    tol: float = 1e-12,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Levenberg-Marquardt least squares of ``S = f_u·(1 - exp(-k·M))`` for every row.
+
+    ``k`` starts from the median of the per-point inversions against ``f_u = 1.1·max(S)``, and
+    ``f_u`` from the exact least-squares value for that ``k``. Steps are damped with
+    Marquardt's diagonal scaling, which copes with ``f_u`` and ``k`` differing by orders of
+    magnitude, and are only taken when they lower a row's error with both parameters
+    positive.
+
+    Parameters
+    ----------
+    maturity, strength, mask : numpy.ndarray
+        As for :func:`fit_log_batch`.
+    max_iter : int, optional
+        Iteration cap.
+    tol : float, optional
+        Rows stop once an accepted step lowers their error by less than this fraction.
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        ``(f_u, k, sse, iterations, converged)`` per row.
+    """
+    rows = maturity.shape[0]
+    peak = np.where(mask, strength, -np.inf).max(axis=1, initial=-np.inf)
+    guess = 1.1 * peak
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inverted = -np.log1p(-strength / guess[:, None]) / maturity
+        inverted = np.where(mask & (strength > 0) & np.isfinite(inverted), inverted, np.nan)
+        valid = ~np.isnan(inverted).all(axis=1)
+        k = np.full(rows, np.nan)
+        k[valid] = np.nanmedian(inverted[valid], axis=1)
+        k = np.where(valid & (k > 0), k, 1.0 / (_sum(maturity, mask) / mask.sum(axis=1)))
+        shape = np.where(mask, -np.expm1(-k[:, None] * maturity), 0.0)
+        f_u = _sum(shape * strength, mask) / _sum(shape * shape, mask)
+
+    sse = _asymptotic_sse(f_u, k, maturity, strength, mask)
+    damping = np.full(rows, 1e-3)
+    iterations = np.zeros(rows, dtype=np.int64)
+    converged = np.zeros(rows, dtype=bool)
+    active = np.isfinite(f_u) & np.isfinite(k) & (f_u > 0)
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        iterations += active
+        with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+            decay = np.exp(-k[:, None] * maturity)
+            residual = np.where(mask, strength - f_u[:, None] * (1.0 - decay), 0.0)
+            d_fu = np.where(mask, 1.0 - decay, 0.0)
+            d_k = np.where(mask, f_u[:, None] * maturity * decay, 0.0)
+            a11 = (d_fu * d_fu).sum(axis=1)
+            a12 = (d_fu * d_k).sum(axis=1)
+            a22 = (d_k * d_k).sum(axis=1)
+            g1 = (d_fu * residual).sum(axis=1)
+            g2 = (d_k * residual).sum(axis=1)
+            m11 = a11 * (1.0 + damping)
+            m22 = a22 * (1.0 + damping)
+            det = m11 * m22 - a12 * a12
+            step_fu = (m22 * g1 - a12 * g2) / det
+            step_k = (m11 * g2 - a12 * g1) / det
+        trial_fu = f_u + step_fu
+        trial_k = k + step_k
+        trial_sse = _asymptotic_sse(trial_fu, trial_k, maturity, strength, mask)
+        accepted = (
+            active
+            & (det > 0)
+            & (trial_fu > 0)
+            & (trial_k > 0)
+            & np.isfinite(trial_sse)
+            & (trial_sse < sse)
+        )
+        settled = accepted & (sse - trial_sse <= tol * sse)
+        f_u = np.where(accepted, trial_fu, f_u)
+        k = np.where(accepted, trial_k, k)
+        sse = np.where(accepted, trial_sse, sse)
+        damping = np.where(accepted, damping / 10.0, damping * 10.0)
+        # No step lowers the error even at vanishing step length: a minimum.
+        stuck = active & ~accepted & (damping > 1e12)
+        converged |= settled | stuck
+        active &= ~(settled | stuck)
+    return f_u, k, sse, iterations, converged
+
+
+def fit_strength_curves(datasets: Sequence[ArrayPair], curve_type: str) -> list[CurveFit]:
+    """
+    Fit one strength-maturity curve per dataset, all datasets in one batch.
+
+    Parameters
+    ----------
+    datasets : sequence of (maturity, strength)
+        Break data of each dataset: maturities (positive) and strengths in MPa.
+    curve_type : str
+        Either ``\"log\"`` or ``\"asymptotic\"``.
+
+    Returns
+    -------
+    list of CurveFit
+        One fit per dataset, in order. ``residual_sigma`` is the residual standard error
+        ``sqrt(SSE / (n - 2))`` and ``None`` for two points or fewer.
+    """
+    if curve_type not in ("log", "asymptotic"):
+        raise ValueError(f"Unsupported curve_type '{curve_type}'.")
+    if not datasets:
+        return []
+    maturity, strength, mask = _pad(datasets)
+    if np.any(mask & ~(maturity > 0)):
+        raise ValueError("Break maturities must be positive.")
+    count = mask.sum(axis=1)
+
+    if curve_type == "log":
+        a, b, sse = fit_log_batch(maturity, strength, mask)
+        params = {"a": a, "b": b}
+        iterations = np.zeros(len(datasets), dtype=np.int64)
+        converged = np.isfinite(a)
+    else:
+        f_u, k, sse, iterations, converged = fit_asymptotic_batch(maturity, strength, mask)
+        params = {"f_u": f_u, "k": k}
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        s_mean = _sum(strength, mask) / count
+        sst = _sum((strength - s_mean[:, None]) ** 2, mask)
+        r_squared = np.where(sst > 0, 1.0 - sse / sst, np.nan)
+        sigma = np.sqrt(sse / (count - 2))
+
+    columns = {name: values.tolist() for name, values in params.items()}
+    return [
+        CurveFit(
+            curve_type=curve_type,
+            params={name: values[row] for name, values in columns.items()},
+            r_squared=float(r_squared[row]),
+            residual_sigma=float(sigma[row]) if count[row] > 2 else None,
+            points=int(count[row]),
+            iterations=int(iterations[row]),
+            converged=bool(converged[row]),
+        )
+        for row in range(len(datasets))
+    ]
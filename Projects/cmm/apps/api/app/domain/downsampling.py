@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import numpy as np
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Select ``threshold`` points of a series with Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept. The points in between are split into
+    ``threshold - 2`` equal-count buckets, and each bucket keeps the point forming the largest
+    triangle with the previously kept point and the average of the next bucket. Peaks and dips
+    that a plain stride or average would flatten therefore survive.
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        Strictly increasing abscissae, e.g. epoch seconds.
+    y : numpy.ndarray
+        Values at ``x``.
+    threshold : int
+        Number of points to keep, at least 3.
+
+    Returns
+    -------
+    numpy.ndarray
+        Increasing indices into ``x`` and ``y``; all of them if the series has no more than
+        ``threshold`` points.
+    """
+    count = len(x)
+    if threshold < 3:
+        raise ValueError("LTTB needs a threshold of at least 3 points.")
+    if count <= threshold:
+        return np.arange(count)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # bounds[i]:bounds[i + 1] is bucket i; the last bucket is followed by the final point.
+    bounds = (np.arange(threshold - 1) * ((count - 2) / (threshold - 2))).astype(np.int64) + 1
+    bounds[-1] = count - 1
+    sizes = np.diff(np.append(bounds, count))
+    next_x = np.add.reduceat(x, bounds) / sizes
+    next_y = np.add.reduceat(y, bounds) / sizes
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, count - 1
+    anchor = 0
+    for bucket in range(threshold - 2):
+        start, stop = bounds[bucket], bounds[bucket + 1]
+        ax, ay = x[anchor], y[anchor]
+        # Twice the triangle area; the constant factor does not change the argmax.
+        area = np.abs(
+            (ax - next_x[bucket + 1]) * (y[start:stop] - ay)
+            - (ax - x[start:stop]) * (next_y[bucket + 1] - ay)
+        )
+        anchor = start + int(area.argmax())
+        selected[bucket + 1] = anchor
+    return selected
@@ -1,29 +1,379 @@
 from __future__ import annotations
 
 import math
-from datetime import datetime
-from typing import Iterable, Optional, Sequence, Tuple
+from collections.abc import Iterable, Sequence
+from datetime import UTC, datetime
+from itertools import islice
 
+import numpy as np
 
-Sample = Tuple[datetime, float]
+from app.domain.temperature_series import TemperatureSeries
 
+Sample = tuple[datetime, float]
 
-def _sorted_samples(samples: Sequence[Sample]) -> list[Sample]:
-    sorted_samples = sorted(samples, key=lambda item: item[0])
-    return sorted_samples
+SAMPLE_DTYPE = np.dtype([("ts", "f8"), ("temp_c", "f8")])
+"""Structured dtype for temperature histories: epoch seconds and degrees Celsius."""
 
+_KELVIN_OFFSET = 273.15
 
-def _hour_delta(start: datetime, end: datetime) -> float:
-    return (end - start).total_seconds() / 3600.0
 
+def _epoch_seconds(ts: datetime) -> float:
+    # Naive timestamps are treated as UTC so interval lengths match plain datetime arithmetic.
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=UTC)
+    return ts.timestamp()
 
-def ttf_maturity(samples_c: Sequence[Sample], T0_c: float) -> float:
+
+def samples_to_arrays(samples_c: Sequence[Sample]) -> tuple[np.ndarray, np.ndarray]:
     """
-    Compute Nurse-Saul (TTF) maturity in °C·h.
+    Convert ``(timestamp, temp_c)`` tuples into epoch-second and temperature arrays.
 
     Parameters
     ----------
     samples_c : sequence of (timestamp, temp_c)
+        Temperature history in degrees Celsius.
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        ``(epoch_s, temps_c)`` as float64 arrays in input order.
+    """
+    count = len(samples_c)
+    epoch_s = np.fromiter(
+        (_epoch_seconds(ts) for ts, _ in samples_c), dtype=np.float64, count=count
+    )
+    temps_c = np.fromiter((temp for _, temp in samples_c), dtype=np.float64, count=count)
+    return epoch_s, temps_c
+
+
+def _as_columns(
+    epoch_s: np.ndarray | TemperatureSeries,
+    temps_c: np.ndarray | None,
+) -> tuple[np.ndarray, np.ndarray]:
+    if isinstance(epoch_s, TemperatureSeries):
+        return epoch_s.epoch_s, epoch_s.temps_c.astype(np.float64, copy=False)
+    if temps_c is None:
+        structured = np.asarray(epoch_s)
+        if structured.dtype.names is None:
+            raise ValueError("temps_c is required unless a structured SAMPLE_DTYPE array is given.")
+        epoch_s, temps_c = structured["ts"], structured["temp_c"]
+    ts = np.asarray(epoch_s, dtype=np.float64)
+    temps = np.asarray(temps_c, dtype=np.float64)
+    if ts.shape != temps.shape or ts.ndim != 1:
+        raise ValueError("epoch_s and temps_c must be one-dimensional arrays of equal length.")
+    return ts, temps
+
+
+def _known_sorted(epoch_s: np.ndarray | TemperatureSeries) -> bool:
+    return isinstance(epoch_s, TemperatureSeries) and epoch_s.is_sorted
+
+
+def _interval_hours(
+    ts: np.ndarray,
+    temps: np.ndarray,
+    assume_sorted: bool = False,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return positive interval lengths (h) and the temperature at the start of each interval."""
+    if not assume_sorted and ts.size > 1 and np.any(ts[1:] < ts[:-1]):
+        order = np.argsort(ts, kind="stable")
+        ts = ts[order]
+        temps = temps[order]
+    delta_hours = np.diff(ts) / 3600.0
+    valid = delta_hours > 0
+    return delta_hours[valid], temps[:-1][valid]
+
+
+def _arrhenius_factor(temps_c: np.ndarray, Ea: float, Tr_c: float, R: float) -> np.ndarray:
+    Tr_k = Tr_c + _KELVIN_OFFSET
+    return np.exp(-Ea / R * ((1.0 / (temps_c + _KELVIN_OFFSET)) - (1.0 / Tr_k)))
+
+
+def maturity_integrals(
+    epoch_s: np.ndarray | TemperatureSeries,
+    temps_c: np.ndarray | None,
+    T0_c: float,
+    Ea: float,
+    Tr_c: float,
+    R: float = 8.314,
+    assume_sorted: bool = False,
+) -> tuple[float, float]:
+    """
+    Compute TTF maturity and equivalent age in a single vectorized pass.
+
+    Parameters
+    ----------
+    epoch_s : numpy.ndarray or TemperatureSeries
+        Sample timestamps in epoch seconds, a structured ``SAMPLE_DTYPE`` array or a series.
+    temps_c : numpy.ndarray or None
+        Temperatures in degrees Celsius; ``None`` when ``epoch_s`` is structured or a series.
+    T0_c : float
+        Datum temperature in degrees Celsius.
+    Ea : float
+        Activation energy (J/mol).
+    Tr_c : float
+        Reference temperature in degrees Celsius.
+    R : float, optional
+        Gas constant (J/mol·K), by default 8.314.
+    assume_sorted : bool, optional
+        Skip the ordering check when the caller guarantees ascending timestamps. A sorted
+        series skips it too.
+
+    Returns
+    -------
+    tuple
+        ``(ttf_c_h, eq_age_h)``.
+    """
+    assume_sorted = assume_sorted or _known_sorted(epoch_s)
+    ts, temps = _as_columns(epoch_s, temps_c)
+    if ts.size < 2:
+        return 0.0, 0.0
+    delta_hours, start_temps = _interval_hours(ts, temps, assume_sorted)
+    ttf = float(np.dot(start_temps - T0_c, delta_hours))
+    eq_age = float(np.dot(_arrhenius_factor(start_temps, Ea, Tr_c, R), delta_hours))
+    return ttf, eq_age
+
+
+def cumulative_maturity(
+    epoch_s: np.ndarray | TemperatureSeries,
+    temps_c: np.ndarray | None,
+    T0_c: float,
+    Ea: float,
+    Tr_c: float,
+    R: float = 8.314,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Running TTF maturity and equivalent age at every sample of an ascending history.
+
+    Element ``i`` equals what :func:`maturity_integrals` returns for the first ``i + 1``
+    samples, so the first element is always zero.
+
+    Parameters
+    ----------
+    epoch_s : numpy.ndarray or TemperatureSeries
+        Sample timestamps in epoch seconds in ascending order, or a sorted series.
+    temps_c : numpy.ndarray or None
+        Temperatures in degrees Celsius; ``None`` when ``epoch_s`` is a series.
+    T0_c, Ea, Tr_c, R : float
+        Model parameters as for :func:`maturity_integrals`.
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        ``(ttf_c_h, eq_age_h)``, each with one value per sample.
+    """
+    ts, temps = _as_columns(epoch_s, temps_c)
+    ttf = np.zeros(ts.size)
+    eq_age = np.zeros(ts.size)
+    if ts.size < 2:
+        return ttf, eq_age
+    # Zero-length intervals contribute nothing, as they are dropped by _interval_hours.
+    delta_hours = np.maximum(np.diff(ts) / 3600.0, 0.0)
+    start_temps = temps[:-1]
+    np.cumsum((start_temps - T0_c) * delta_hours, out=ttf[1:])
+    np.cumsum(_arrhenius_factor(start_temps, Ea, Tr_c, R) * delta_hours, out=eq_age[1:])
+    return ttf, eq_age
+
+
+def maturity_integrals_stream(
+    samples_c: Iterable[Sample],
+    T0_c: float,
+    Ea: float,
+    Tr_c: float,
+    R: float = 8.314,
+    chunk_size: int = 8192,
+) -> tuple[float, float, int]:
+    """
+    Integrate a time-ordered sample stream chunk by chunk with bounded memory.
+
+    Parameters
+    ----------
+    samples_c : iterable of (timestamp, temp_c)
+        Temperature history in ascending time order, e.g. rows streamed from the database.
+    T0_c, Ea, Tr_c, R : float
+        Model parameters as for :func:`maturity_integrals`.
+    chunk_size : int, optional
+        Number of samples converted to arrays at a time, by default 8192.
+
+    Returns
+    -------
+    tuple
+        ``(ttf_c_h, eq_age_h, sample_count)``.
+
+    Raises
+    ------
+    ValueError
+        If the stream is not ordered by time.
+    """
+    iterator = iter(samples_c)
+    ttf = eq_age = 0.0
+    count = 0
+    carry: Sample | None = None
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            break
+        count += len(chunk)
+        # The previous chunk's last sample opens the first interval of this one.
+        window = [carry, *chunk] if carry is not None else chunk
+        epoch_s, temps_c = samples_to_arrays(window)
+        if np.any(epoch_s[1:] < epoch_s[:-1]):
+            raise ValueError("Streamed samples must be ordered by time.")
+        chunk_ttf, chunk_eq = maturity_integrals(
+            epoch_s, temps_c, T0_c, Ea, Tr_c, R, assume_sorted=True
+        )
+        ttf += chunk_ttf
+        eq_age += chunk_eq
+        carry = chunk[-1]
+    return ttf, eq_age, count
+
+
+def maturity_integrals_with_bounds(
+    epoch_s: np.ndarray,
+    temps_c: np.ndarray,
+    low_c: np.ndarray,
+    high_c: np.ndarray,
+    T0_c: float,
+    Ea: float,
+    Tr_c: float,
+    R: float = 8.314,
+) -> tuple[float, float, float, float]:
+    """
+    Integrate aggregated samples and bound the error of doing so.
+
+    Each sample stands for an interval whose temperature stayed within ``[low_c, high_c]``, as
+    for a rollup bucket represented by its time-weighted average. Raw readings pass
+    ``low_c == high_c == temps_c`` and contribute no error.
+
+    Parameters
+    ----------
+    epoch_s, temps_c : numpy.ndarray
+        Representative timestamps (epoch seconds) and temperatures in ascending time order.
+    low_c, high_c : numpy.ndarray
+        Minimum and maximum temperature observed within each sample's interval.
+    T0_c, Ea, Tr_c, R : float
+        Model parameters as for :func:`maturity_integrals`.
+
+    Returns
+    -------
+    tuple
+        ``(ttf_c_h, eq_age_h, ttf_error_c_h, eq_age_error_h)`` where the errors are upper bounds
+        on the absolute deviation from integrating the underlying readings.
+    """
+    ts = np.asarray(epoch_s, dtype=np.float64)
+    if ts.size < 2:
+        return 0.0, 0.0, 0.0, 0.0
+    delta_hours = np.diff(ts) / 3600.0
+    valid = delta_hours > 0
+    delta_hours = delta_hours[valid]
+    temps = np.asarray(temps_c, dtype=np.float64)[:-1][valid]
+    low = np.asarray(low_c, dtype=np.float64)[:-1][valid]
+    high = np.asarray(high_c, dtype=np.float64)[:-1][valid]
+
+    ttf = float(np.dot(temps - T0_c, delta_hours))
+    eq_age = float(np.dot(_arrhenius_factor(temps, Ea, Tr_c, R), delta_hours))
+    ttf_error = float(np.dot(high - low, delta_hours))
+    # The Arrhenius factor increases with temperature, so the spread of the interval bounds it.
+    spread = _arrhenius_factor(high, Ea, Tr_c, R) - _arrhenius_factor(low, Ea, Tr_c, R)
+    eq_age_error = float(np.dot(spread, delta_hours))
+    return ttf, eq_age, ttf_error, eq_age_error
+
+
+def segmented_maturity_integrals(
+    segments: np.ndarray,
+    epoch_s: np.ndarray,
+    temps_c: np.ndarray,
+    T0_c: float | np.ndarray,
+    Ea: float | np.ndarray,
+    Tr_c: float | np.ndarray,
+    segment_count: int,
+    R: float = 8.314,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Integrate many independent histories, each with its own parameters, in one pass.
+
+    Parameters
+    ----------
+    segments : numpy.ndarray
+        Integer segment index of every sample. Samples of a segment must be contiguous and in
+        ascending time order; no interval is formed across a segment boundary.
+    epoch_s, temps_c : numpy.ndarray
+        Sample timestamps (epoch seconds) and temperatures in degrees Celsius.
+    T0_c, Ea, Tr_c : float or numpy.ndarray
+        Model parameters, either scalars or one value per segment.
+    segment_count : int
+        Number of segments; segments without samples report zeros.
+    R : float, optional
+        Gas constant (J/mol·K), by default 8.314.
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        ``(ttf_c_h, eq_age_h, sample_count)``, each of length ``segment_count``.
+    """
+    segments = np.asarray(segments, dtype=np.intp)
+    ts = np.asarray(epoch_s, dtype=np.float64)
+    temps = np.asarray(temps_c, dtype=np.float64)
+    counts = np.bincount(segments, minlength=segment_count)
+    if ts.size < 2:
+        zeros = np.zeros(segment_count)
+        return zeros, zeros.copy(), counts
+
+    delta_hours = np.diff(ts) / 3600.0
+    valid = (segments[1:] == segments[:-1]) & (delta_hours > 0)
+    owner = segments[:-1][valid]
+    delta_hours = delta_hours[valid]
+    start_temps = temps[:-1][valid]
+
+    def per_sample(value: float | np.ndarray) -> np.ndarray:
+        return np.broadcast_to(np.asarray(value, dtype=np.float64), (segment_count,))[owner]
+
+    ttf = np.bincount(
+        owner, weights=(start_temps - per_sample(T0_c)) * delta_hours, minlength=segment_count
+    )
+    factor = _arrhenius_factor(start_temps, per_sample(Ea), per_sample(Tr_c), R)
+    eq_age = np.bincount(owner, weights=factor * delta_hours, minlength=segment_count)
+    return ttf, eq_age, counts
+
+
+def ttf_maturity_array(
+    epoch_s: np.ndarray | TemperatureSeries,
+    temps_c: np.ndarray | None,
+    T0_c: float,
+) -> float:
+    """
+    Array form of :func:`ttf_maturity` over epoch-second and temperature columns.
+    """
+    ts, temps = _as_columns(epoch_s, temps_c)
+    if ts.size < 2:
+        return 0.0
+    delta_hours, start_temps = _interval_hours(ts, temps, _known_sorted(epoch_s))
+    return float(np.dot(start_temps - T0_c, delta_hours))
+
+
+def equivalent_age_array(
+    epoch_s: np.ndarray | TemperatureSeries,
+    temps_c: np.ndarray | None,
+    Ea: float,
+    Tr_c: float,
+    R: float = 8.314,
+) -> float:
+    """
+    Array form of :func:`equivalent_age` over epoch-second and temperature columns.
+    """
+    ts, temps = _as_columns(epoch_s, temps_c)
+    if ts.size < 2:
+        return 0.0
+    delta_hours, start_temps = _interval_hours(ts, temps, _known_sorted(epoch_s))
+    return float(np.dot(_arrhenius_factor(start_temps, Ea, Tr_c, R), delta_hours))
+
+
+def ttf_maturity(samples_c: Sequence[Sample] | TemperatureSeries, T0_c: float) -> float:
+    """
+    Compute Nurse-Saul (TTF) maturity in °C·h.
+
+    Parameters
+    ----------
+    samples_c : sequence of (timestamp, temp_c) or TemperatureSeries
         Temperature history in degrees Celsius ordered by time.
     T0_c : float
         Datum temperature in degrees Celsius.
@@ -33,21 +383,16 @@ def ttf_maturity(samples_c: Sequence[Sample], T0_c: float) -> float:
     float
         Accumulated TTF maturity in °C·h.
     """
-    ordered = _sorted_samples(samples_c)
-    if len(ordered) < 2:
+    if len(samples_c) < 2:
         return 0.0
-
-    maturity = 0.0
-    for (t_i, temp_c), (t_j, _) in zip(ordered, ordered[1:]):
-        delta_hours = _hour_delta(t_i, t_j)
-        if delta_hours <= 0:
-            continue
-        maturity += (temp_c - T0_c) * delta_hours
-    return maturity
+    if isinstance(samples_c, TemperatureSeries):
+        return ttf_maturity_array(samples_c, None, T0_c)
+    epoch_s, temps_c = samples_to_arrays(samples_c)
+    return ttf_maturity_array(epoch_s, temps_c, T0_c)
 
 
 def equivalent_age(
-    samples_c: Sequence[Sample],
+    samples_c: Sequence[Sample] | TemperatureSeries,
     Ea: float,
     Tr_c: float,
     R: float = 8.314,
@@ -57,7 +402,7 @@ def equivalent_age(
 
     Parameters
     ----------
-    samples_c : sequence of (timestamp, temp_c)
+    samples_c : sequence of (timestamp, temp_c) or TemperatureSeries
         Temperature history in degrees Celsius ordered by time.
     Ea : float
         Activation energy (J/mol).
@@ -71,27 +416,19 @@ def equivalent_age(
     float
         Equivalent age in hours.
     """
-    ordered = _sorted_samples(samples_c)
-    if len(ordered) < 2:
+    if len(samples_c) < 2:
         return 0.0
-
-    Tr_k = Tr_c + 273.15
-    eq_age = 0.0
-    for (t_i, temp_c), (t_j, _) in zip(ordered, ordered[1:]):
-        delta_hours = _hour_delta(t_i, t_j)
-        if delta_hours <= 0:
-            continue
-        T_k = temp_c + 273.15
-        exponent = -Ea / R * ((1.0 / T_k) - (1.0 / Tr_k))
-        eq_age += delta_hours * math.exp(exponent)
-    return eq_age
+    if isinstance(samples_c, TemperatureSeries):
+        return equivalent_age_array(samples_c, None, Ea, Tr_c, R)
+    epoch_s, temps_c = samples_to_arrays(samples_c)
+    return equivalent_age_array(epoch_s, temps_c, Ea, Tr_c, R)
 
 
 def predict_strength(
     maturity_value: float,
     curve_type: str,
     curve_params: dict[str, float | None],
-) -> Tuple[float, Optional[Tuple[float, float]]]:
+) -> tuple[float, tuple[float, float] | None]:
     """
     Compute predicted compressive strength with optional 95% confidence interval.
 
@@ -127,9 +464,55 @@ def predict_strength(
     else:
         raise ValueError(f"Unsupported curve_type '{curve_type}'.")
 
-    ci: Optional[Tuple[float, float]] = None
+    ci: tuple[float, float] | None = None
     if sigma is not None:
         delta = 1.96 * sigma
         ci = (mean - delta, mean + delta)
     return mean, ci
 
+
+def predict_strength_array(
+    maturity_values: np.ndarray,
+    curve_type: str,
+    curve_params: dict[str, float | None],
+) -> tuple[np.ndarray, tuple[np.ndarray, np.ndarray] | None]:
+    """
+    Vectorized :func:`predict_strength` over many maturity values.
+
+    Parameters
+    ----------
+    maturity_values : numpy.ndarray
+        Maturity metrics (TTF or equivalent age).
+    curve_type : str
+        Either ``\"log\"`` or ``\"asymptotic\"``.
+    curve_params : dict
+        Parameters for the selected curve.
+
+    Returns
+    -------
+    tuple
+        (mean_strength, (lower, upper) | None), each an array shaped like ``maturity_values``.
+    """
+    maturity = np.asarray(maturity_values, dtype=np.float64)
+    sigma = curve_params.get("sigma")
+    if curve_type == "log":
+        a = curve_params.get("a")
+        b = curve_params.get("b")
+        if a is None or b is None:
+            raise ValueError("Log model requires 'a' and 'b' parameters.")
+        min_maturity = max(curve_params.get("min_maturity", 1.0), 1e-9)
+        mean = a * np.log(np.maximum(maturity, min_maturity)) + b
+    elif curve_type == "asymptotic":
+        f_u = curve_params.get("f_u")
+        k = curve_params.get("k")
+        if f_u is None or k is None:
+            raise ValueError("Asymptotic model requires 'f_u' and 'k' parameters.")
+        mean = f_u * -np.expm1(-k * maturity)
+    else:
+        raise ValueError(f"Unsupported curve_type '{curve_type}'.")
+
+    ci: tuple[np.ndarray, np.ndarray] | None = None
+    if sigma is not None:
+        delta = 1.96 * sigma
+        ci = (mean - delta, mean + delta)
+    return mean, ci
@@ -0,0 +1,217 @@
+"""
+Compact columnar binary format for reading batches.
+
+All integers are little-endian. A batch is a fixed header, a sensor dictionary and three
+columns of ``reading_count`` values each::
+
+    magic          4 bytes   b"CMRB"
+    version        u8        1
+    flags          u8        0, reserved
+    sensor_count   u16
+    reading_count  u32
+    base_ms        i64       epoch milliseconds the first delta is relative to
+    sensors        sensor_count x (u8 length, UTF-8 sensor id)
+    sensor_index   u16[reading_count]   position in the sensor dictionary
+    ts_delta_ms    i32[reading_count]   milliseconds since the previous reading (or base_ms)
+    centi_c        i16[reading_count]   temperature in hundredths of a degree Celsius
+
+Compared to the JSON batch a reading costs 8 bytes instead of a repeated UUID, an ISO
+timestamp and a float literal, and decoding is a handful of ``numpy.frombuffer`` calls.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import itertools
+import struct
+from collections.abc import Sequence
+from typing import NamedTuple
+
+import numpy as np
+
+MAGIC = b"CMRB"
+VERSION = 1
+MEDIA_TYPE = "application/vnd.cmm.readings"
+
+HEADER = struct.Struct("<4sBBHIq")
+MIN_CELSIUS, MAX_CELSIUS = -200.0, 300.0
+# Epoch milliseconds of 0001-01-01 and 9999-12-31T23:59:59.999, the range of ``datetime``.
+MIN_EPOCH_MS, MAX_EPOCH_MS = -62_135_596_800_000, 253_402_300_799_999
+
+_INDEX_DTYPE = np.dtype("<u2")
+_DELTA_DTYPE = np.dtype("<i4")
+_CENTI_DTYPE = np.dtype("<i2")
+_BYTES_PER_READING = _INDEX_DTYPE.itemsize + _DELTA_DTYPE.itemsize + _CENTI_DTYPE.itemsize
+
+
+class ReadingCodecError(ValueError):
+    """Raised when a binary batch is malformed or holds out-of-range values."""
+
+
+class ReadingColumns(NamedTuple):
+    """Decoded batch: the sensor dictionary and one array per reading field."""
+
+    sensor_ids: list[str]
+    sensor_index: np.ndarray
+    epoch_ms: np.ndarray
+    celsius: np.ndarray
+
+
+def encode_readings(
+    sensor_ids: Sequence[str], epoch_ms: Sequence[int], celsius: Sequence[float]
+) -> bytes:
+    """
+    Encode parallel reading columns as a binary batch.
+
+    Parameters
+    ----------
+    sensor_ids : sequence of str
+        Sensor of each reading; repeated ids share one dictionary entry.
+    epoch_ms : sequence of int
+        Reading timestamps as epoch milliseconds, in any order.
+    celsius : sequence of float
+        Temperatures, rounded to hundredths of a degree.
+
+    Raises
+    ------
+    ReadingCodecError
+        If the columns differ in length, a sensor id is too long, there are more than 65536
+        sensors, consecutive timestamps are more than about 24 days apart or a temperature is
+        out of range.
+    """
+    count = len(sensor_ids)
+    if not count == len(epoch_ms) == len(celsius):
+        raise ReadingCodecError("Columns must have the same length.")
+    dictionary: dict[str, int] = {}
+    index = np.fromiter(
+        (dictionary.setdefault(sensor_id, len(dictionary)) for sensor_id in sensor_ids),
+        dtype=np.int64,
+        count=count,
+    )
+    if len(dictionary) > np.iinfo(_INDEX_DTYPE).max + 1:
+        raise ReadingCodecError("A batch holds at most 65536 sensors.")
+
+    stamps = np.asarray(epoch_ms, dtype=np.int64)
+    base_ms = int(stamps[0]) if count else 0
+    deltas = np.diff(stamps, prepend=base_ms)
+    limits = np.iinfo(_DELTA_DTYPE)
+    if count and (deltas.min() < limits.min or deltas.max() > limits.max):
+        raise ReadingCodecError("Consecutive timestamps are too far apart for a delta.")
+    temps = np.asarray(celsius, dtype=np.float64)
+    if count and (np.isnan(temps).any() or temps.min() < MIN_CELSIUS or temps.max() > MAX_CELSIUS):
+        raise ReadingCodecError("Temperature out of range.")
+
+    parts = [HEADER.pack(MAGIC, VERSION, 0, len(dictionary), count, base_ms)]
+    for sensor_id in dictionary:
+        encoded = sensor_id.encode()
+        if len(encoded) > 255:
+            raise ReadingCodecError(f"Sensor id {sensor_id!r} is longer than 255 bytes.")
+        parts.append(bytes((len(encoded),)) + encoded)
+    parts.append(index.astype(_INDEX_DTYPE).tobytes())
+    parts.append(deltas.astype(_DELTA_DTYPE).tobytes())
+    parts.append(np.rint(temps * 100.0).astype(_CENTI_DTYPE).tobytes())
+    return b"".join(parts)
+
+
+def decode_readings(payload: bytes) -> ReadingColumns:
+    """
+    Decode a binary batch into columns without building per-reading objects.
+
+    Raises
+    ------
+    ReadingCodecError
+        If the header, dictionary or column lengths are inconsistent, a reading points past
+        the dictionary, or a timestamp or temperature is out of range.
+    """
+    view = memoryview(payload)
+    if len(view) < HEADER.size:
+        raise ReadingCodecError("Payload is shorter than the header.")
+    magic, version, _flags, sensor_count, count, base_ms = HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise ReadingCodecError("Not a binary reading batch.")
+    if version != VERSION:
+        raise ReadingCodecError(f"Unsupported batch version {version}.")
+    # Checked before the deltas are summed onto it, so that sum cannot overflow int64.
+    if not MIN_EPOCH_MS <= base_ms <= MAX_EPOCH_MS:
+        raise ReadingCodecError("Timestamp out of range.")
+
+    offset = HEADER.size
+    sensor_ids: list[str] = []
+    for _ in range(sensor_count):
+        if offset >= len(view):
+            raise ReadingCodecError("Sensor dictionary is truncated.")
+        length = view[offset]
+        end = offset + 1 + length
+        if end > len(view):
+            raise ReadingCodecError("Sensor dictionary is truncated.")
+        try:
+            sensor_ids.append(str(view[offset + 1 : end], "utf-8"))
+        except UnicodeDecodeError as exc:
+            raise ReadingCodecError("Sensor id is not valid UTF-8.") from exc
+        offset = end
+
+    if len(view) - offset != count * _BYTES_PER_READING:
+        raise ReadingCodecError(
+            f"Expected {count * _BYTES_PER_READING} bytes of columns, got {len(view) - offset}."
+        )
+    index = np.frombuffer(payload, dtype=_INDEX_DTYPE, count=count, offset=offset)
+    offset += index.nbytes
+    deltas = np.frombuffer(payload, dtype=_DELTA_DTYPE, count=count, offset=offset)
+    offset += deltas.nbytes
+    centi = np.frombuffer(payload, dtype=_CENTI_DTYPE, count=count, offset=offset)
+
+    if count and int(index.max()) >= sensor_count:
+        raise ReadingCodecError("Reading refers to a sensor outside the dictionary.")
+    celsius = centi / 100.0
+    if count and (celsius.min() < MIN_CELSIUS or celsius.max() > MAX_CELSIUS):
+        raise ReadingCodecError("Temperature out of range.")
+    epoch_ms = np.cumsum(deltas, dtype=np.int64) + base_ms
+    if count and (epoch_ms.min() < MIN_EPOCH_MS or epoch_ms.max() > MAX_EPOCH_MS):
+        raise ReadingCodecError("Timestamp out of range.")
+    return ReadingColumns(sensor_ids, index, epoch_ms, celsius)
+
+
+def _utc_datetimes(epoch_ms: np.ndarray) -> list[dt.datetime]:
+    # Built from calendar fields computed as arrays; about three times faster than
+    # converting datetime64 values to objects and attaching the zone one by one.
+    stamps = epoch_ms.astype("datetime64[ms]")
+    years = stamps.astype("datetime64[Y]")
+    months = stamps.astype("datetime64[M]")
+    days = stamps.astype("datetime64[D]")
+    hours, rest = np.divmod((stamps - days).astype(np.int64), 3_600_000)
+    minutes, rest = np.divmod(rest, 60_000)
+    seconds, millis = np.divmod(rest, 1000)
+    return list(
+        map(
+            dt.datetime,
+            (years.astype(np.int64) + 1970).tolist(),
+            ((months - years).astype(np.int64) + 1).tolist(),
+            ((days - months).astype(np.int64) + 1).tolist(),
+            hours.tolist(),
+            minutes.tolist(),
+            seconds.tolist(),
+            (millis * 1000).tolist(),
+            itertools.repeat(dt.UTC),
+        )
+    )
+
+
+def column_readings(columns: ReadingColumns) -> list[tuple[str, dt.datetime, float]]:
+    """
+    Expand decoded columns into ``(sensor_id, ts, celsius)`` tuples, ``ts`` timezone-aware UTC.
+
+    Gateways sample their sensors together, so a batch holds far fewer distinct instants than
+    readings; each instant is converted to a ``datetime`` once.
+    """
+    instants, positions = np.unique(columns.epoch_ms, return_inverse=True)
+    timestamps = _utc_datetimes(instants)
+    sensor_ids = columns.sensor_ids
+    return [
+        (sensor_ids[index], timestamps[position], celsius)
+        for index, position, celsius in zip(
+            columns.sensor_index.tolist(),
+            positions.tolist(),
+            columns.celsius.tolist(),
+            strict=True,
+        )
+    ]
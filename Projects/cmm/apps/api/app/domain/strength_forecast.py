@@ -0,0 +1,108 @@
+"""
+Vectorized time-to-strength projection.
+
+The strength curves of :func:`app.domain.maturity_models.predict_strength` are inverted to the
+maturity a target strength needs, and the maturity still missing is divided by the rate at
+which a projected curing temperature accrues it. Every function works on arrays, one element
+per sensor, so a whole fleet is projected in a handful of numpy passes.
+"""
+
+from __future__ import annotations
+
+from typing import Literal
+
+import numpy as np
+
+from app.domain.maturity_models import _arrhenius_factor
+
+ArrayLike = float | np.ndarray
+MaturityBasis = Literal["ttf", "eq_age"]
+
+
+def maturity_for_strength(
+    target_strength: ArrayLike,
+    curve_type: str,
+    curve_params: dict[str, ArrayLike | None],
+) -> np.ndarray:
+    """
+    Invert a strength curve: the maturity at which it predicts ``target_strength``.
+
+    Parameters
+    ----------
+    target_strength : float or numpy.ndarray
+        Target compressive strength(s) in MPa.
+    curve_type : str
+        Either ``\"log\"`` or ``\"asymptotic\"``.
+    curve_params : dict
+        Parameters as for ``predict_strength``; values may be arrays that broadcast against
+        ``target_strength``.
+
+    Returns
+    -------
+    numpy.ndarray
+        Required maturity, ``inf`` where the curve never reaches the target (an asymptotic
+        curve whose ``f_u`` is at or below it, or a log curve that does not increase). Targets
+        the log curve meets below ``min_maturity`` need ``min_maturity``.
+    """
+    target = np.asarray(target_strength, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        if curve_type == "log":
+            a = curve_params.get("a")
+            b = curve_params.get("b")
+            if a is None or b is None:
+                raise ValueError("Log model requires 'a' and 'b' parameters.")
+            a = np.asarray(a, dtype=np.float64)
+            min_maturity = np.maximum(
+                np.asarray(curve_params.get("min_maturity", 1.0), dtype=np.float64), 1e-9
+            )
+            required = np.where(a > 0, np.maximum(np.exp((target - b) / a), min_maturity), np.inf)
+        elif curve_type == "asymptotic":
+            f_u = curve_params.get("f_u")
+            k = curve_params.get("k")
+            if f_u is None or k is None:
+                raise ValueError("Asymptotic model requires 'f_u' and 'k' parameters.")
+            f_u = np.asarray(f_u, dtype=np.float64)
+            k = np.asarray(k, dtype=np.float64)
+            reachable = (target < f_u) & (k > 0)
+            required = np.where(reachable, -np.log1p(-np.maximum(target, 0.0) / f_u) / k, np.inf)
+        else:
+            raise ValueError(f"Unsupported curve_type '{curve_type}'.")
+    return required
+
+
+def maturity_rate(
+    temps_c: ArrayLike,
+    basis: MaturityBasis,
+    T0_c: float,
+    Ea: float,
+    Tr_c: float,
+    R: float = 8.314,
+) -> np.ndarray:
+    """
+    Maturity accrued per hour at constant temperature(s).
+
+    ``\"ttf\"`` gives °C·h per hour (``T - T0_c``, negative below the datum), ``\"eq_age\"``
+    hours of equivalent age per hour (the Arrhenius factor).
+    """
+    temps = np.asarray(temps_c, dtype=np.float64)
+    if basis == "ttf":
+        return temps - T0_c
+    if basis == "eq_age":
+        return _arrhenius_factor(temps, Ea, Tr_c, R)
+    raise ValueError(f"Unsupported maturity basis '{basis}'.")
+
+
+def hours_to_maturity(current: ArrayLike, required: ArrayLike, rate_per_h: ArrayLike) -> np.ndarray:
+    """
+    Hours until ``current`` maturity reaches ``required`` at ``rate_per_h``.
+
+    Zero where it already has, ``inf`` where it never will (a non-positive rate or an
+    unreachable requirement).
+    """
+    current = np.asarray(current, dtype=np.float64)
+    required = np.asarray(required, dtype=np.float64)
+    rate = np.asarray(rate_per_h, dtype=np.float64)
+    missing = required - current
+    with np.errstate(divide="ignore", invalid="ignore"):
+        hours = np.where(rate > 0, missing / rate, np.inf)
+    return np.where(missing <= 0, 0.0, np.where(np.isposinf(missing), np.inf, hours))
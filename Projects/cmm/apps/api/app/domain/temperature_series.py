@@ -0,0 +1,174 @@
+"""
+Compact array-backed temperature history.
+
+A :class:`TemperatureSeries` holds a history as two contiguous columns: int64 epoch
+microseconds and float64 (or float32) degrees Celsius. That is 12-16 bytes per sample, against
+well over 100 for a list of ``(datetime, float)`` tuples, and the columns feed the vectorized
+maturity kernels without a conversion pass.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator
+from datetime import UTC, datetime, timedelta
+from typing import overload
+
+import numpy as np
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def epoch_us(ts: datetime) -> int:
+    """Exact epoch microseconds of ``ts``; naive timestamps are treated as UTC."""
+    if ts.tzinfo is None:
+        return (ts - _NAIVE_EPOCH) // _MICROSECOND
+    return (ts - _EPOCH) // _MICROSECOND
+
+
+def _is_sorted(epoch_us: np.ndarray) -> bool:
+    return bool(np.all(epoch_us[1:] >= epoch_us[:-1]))
+
+
+class TemperatureSeries:
+    """
+    Temperature history stored as epoch-microsecond and temperature arrays.
+
+    Indexing with an integer returns a ``(datetime, temp_c)`` sample with a UTC timestamp, so
+    a series stands in for a sequence of samples. Slicing and :meth:`window` return series that
+    share the parent's buffers instead of copying them.
+
+    Parameters
+    ----------
+    epoch_us : numpy.ndarray
+        Sample timestamps as integer epoch microseconds.
+    temps_c : numpy.ndarray
+        Temperatures in degrees Celsius; float32 is kept, anything else becomes float64.
+    is_sorted : bool, optional
+        Whether timestamps ascend; checked when omitted.
+    """
+
+    __slots__ = ("epoch_us", "temps_c", "is_sorted", "_epoch_s")
+
+    def __init__(
+        self,
+        epoch_us: np.ndarray,
+        temps_c: np.ndarray,
+        is_sorted: bool | None = None,
+    ) -> None:
+        ts = np.asarray(epoch_us, dtype=np.int64)
+        temps = np.asarray(temps_c)
+        if temps.dtype != np.float32:
+            temps = temps.astype(np.float64, copy=False)
+        if ts.shape != temps.shape or ts.ndim != 1:
+            raise ValueError("epoch_us and temps_c must be one-dimensional arrays of equal length.")
+        self.epoch_us = ts
+        self.temps_c = temps
+        self.is_sorted = _is_sorted(ts) if is_sorted is None else is_sorted
+        self._epoch_s: np.ndarray | None = None
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[tuple[datetime, float]],
+        dtype: type | np.dtype = np.float64,
+    ) -> TemperatureSeries:
+        """
+        Build a series from ``(timestamp, temp_c)`` rows in a single pass.
+
+        Rows are consumed as they arrive, e.g. straight from a database cursor, and packed into
+        typed buffers, so no intermediate list of tuples is materialised.
+
+        Parameters
+        ----------
+        rows : iterable of (timestamp, temp_c)
+            Samples in any order; naive timestamps are treated as UTC.
+        dtype : numpy dtype, optional
+            Temperature dtype, ``numpy.float64`` by default or ``numpy.float32``.
+
+        Returns
+        -------
+        TemperatureSeries
+        """
+        stamps = array("q")
+        temps = array("d")
+        for ts, temp in rows:
+            stamps.append(epoch_us(ts))
+            temps.append(temp)
+        return cls(
+            np.frombuffer(stamps, dtype=np.int64),
+            np.frombuffer(temps, dtype=np.float64).astype(dtype, copy=False),
+        )
+
+    @property
+    def epoch_s(self) -> np.ndarray:
+        """
+        Timestamps as float64 epoch seconds, the unit the maturity kernels integrate in.
+
+        Converted on first access and kept, so the series must not be modified in place.
+        """
+        if self._epoch_s is None:
+            self._epoch_s = self.epoch_us / 1e6
+        return self._epoch_s
+
+    @property
+    def nbytes(self) -> int:
+        cached = self._epoch_s.nbytes if self._epoch_s is not None else 0
+        return self.epoch_us.nbytes + self.temps_c.nbytes + cached
+
+    def sorted(self) -> TemperatureSeries:
+        """Return the series in ascending time order; ``self`` when it already is."""
+        if self.is_sorted:
+            return self
+        order = np.argsort(self.epoch_us, kind="stable")
+        return TemperatureSeries(self.epoch_us[order], self.temps_c[order], is_sorted=True)
+
+    def window(
+        self, start: datetime | None = None, end: datetime | None = None
+    ) -> TemperatureSeries:
+        """
+        Return the samples with ``start <= ts < end`` as a view of this series.
+
+        Raises
+        ------
+        ValueError
+            If the series is not sorted; call :meth:`sorted` first.
+        """
+        if not self.is_sorted:
+            raise ValueError("Only a sorted series can be windowed; call sorted() first.")
+        first = 0 if start is None else int(np.searchsorted(self.epoch_us, epoch_us(start)))
+        stop = (
+            len(self)
+            if end is None
+            else int(np.searchsorted(self.epoch_us, epoch_us(end), side="left"))
+        )
+        return self[first : max(first, stop)]
+
+    def __len__(self) -> int:
+        return self.epoch_us.size
+
+    @overload
+    def __getitem__(self, key: int) -> tuple[datetime, float]: ...
+
+    @overload
+    def __getitem__(self, key: slice) -> TemperatureSeries: ...
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            step = key.step if key.step is not None else 1
+            return TemperatureSeries(
+                self.epoch_us[key], self.temps_c[key], self.is_sorted if step > 0 else None
+            )
+        return _EPOCH + timedelta(microseconds=int(self.epoch_us[key])), float(self.temps_c[key])
+
+    def __iter__(self) -> Iterator[tuple[datetime, float]]:
+        for stamp, temp in zip(self.epoch_us.tolist(), self.temps_c.tolist(), strict=True):
+            yield _EPOCH + timedelta(microseconds=stamp), temp
+
+    def __repr__(self) -> str:
+        return (
+            f"TemperatureSeries(samples={len(self)}, dtype={self.temps_c.dtype}, "
+            f"sorted={self.is_sorted})"
+        )
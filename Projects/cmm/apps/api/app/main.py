@@ -1,9 +1,19 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.schemas.maturity import (
+    BatchMaturityRequest,
+    BatchMaturityResponse,
+    MaturityCurveRequest,
+    MaturityCurveResponse,
+    MaturityRequest,
+    MaturityResponse,
+)
+from app.services.maturity_cache import maturity_cache
+from app.services.maturity_service import DEFAULT_EA, DEFAULT_T0_C, DEFAULT_TR_C, MaturityService
+
 from .routers import health, v1
-from app.schemas.maturity import MaturityRequest, MaturityResponse
-from app.services.maturity_service import MaturityService
 
 app = FastAPI(title="CMM API", version="0.1.0")
 
@@ -21,9 +31,56 @@ app.include_router(v1.router, prefix="/v1")
 maturity_service = MaturityService()
 
 
+# Sync on purpose: FastAPI runs it in the threadpool, so the batch's numpy work never blocks
+# the event loop.
+@app.post("/v1/pours/maturity:batch", response_model=BatchMaturityResponse)
+def compute_maturity_batch(payload: BatchMaturityRequest) -> BatchMaturityResponse:
+    return maturity_service.compute_batch(payload.pours, payload.defaults)
+
+
 @app.post(
     "/v1/pours/{pour_id}/maturity_advanced",
     response_model=MaturityResponse,
 )
-def compute_maturity(pour_id: str, payload: MaturityRequest) -> MaturityResponse:
-    return maturity_service.compute(pour_id, payload)
+async def compute_maturity(pour_id: str, payload: MaturityRequest) -> MaturityResponse:
+    async def compute() -> MaturityResponse:
+        return await run_in_threadpool(maturity_service.compute, pour_id, payload)
+
+    params = {
+        "view": "advanced",
+        "request": payload.model_dump(),
+        "defaults": (DEFAULT_T0_C, DEFAULT_EA, DEFAULT_TR_C),
+    }
+    try:
+        return await maturity_cache.get_or_compute(pour_id, params, MaturityResponse, compute)
+    except LookupError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)
+        ) from exc
+
+
+@app.post(
+    "/v1/pours/{pour_id}/maturity_curve",
+    response_model=MaturityCurveResponse,
+)
+async def compute_maturity_curve(
+    pour_id: str, payload: MaturityCurveRequest
+) -> MaturityCurveResponse:
+    async def compute() -> MaturityCurveResponse:
+        return await run_in_threadpool(maturity_service.maturity_curve, pour_id, payload)
+
+    params = {
+        "view": "curve",
+        "request": payload.model_dump(),
+        "defaults": (DEFAULT_T0_C, DEFAULT_EA, DEFAULT_TR_C),
+    }
+    try:
+        return await maturity_cache.get_or_compute(pour_id, params, MaturityCurveResponse, compute)
+    except LookupError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)
+        ) from exc
@@ -16,11 +16,15 @@ from .domain import (
     Report,
     Role,
     Sensor,
+    SensorMaturityState,
     Tenant,
     User,
     UserRole,
     Webhook,
+    readings_archive,
     readings_ts,
+    sensor_latest,
+    sensor_maturity_checkpoints,
 )
 
 __all__ = [
@@ -40,10 +44,14 @@ __all__ = [
     "Report",
     "Role",
     "Sensor",
+    "SensorMaturityState",
     "Tenant",
     "User",
     "UserRole",
     "Webhook",
+    "readings_archive",
     "readings_ts",
+    "sensor_latest",
+    "sensor_maturity_checkpoints",
     "Base",
 ]
@@ -1,24 +1,24 @@
 from __future__ import annotations
 
 import datetime as dt
-
 from enum import Enum
 
 from sqlalchemy import (
+    JSON,
     Boolean,
-    Date,
+    Column,
     DateTime,
+    Float,
     ForeignKey,
     Index,
     Integer,
-    JSON,
     Numeric,
     String,
     Table,
     Text,
     UniqueConstraint,
 )
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
 from .base import Base, TimestampMixin, UUIDPrimaryKeyMixin, default_json
 
@@ -145,7 +145,9 @@ class Sensor(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     __tablename__ = "sensors"
 
     tenant_id: Mapped[str] = mapped_column(ForeignKey("tenants.id"), nullable=False)
-    project_id: Mapped[str] = mapped_column(ForeignKey("projects.id"), nullable=False)
+    project_id: Mapped[str] = mapped_column(
+        ForeignKey("projects.id"), nullable=False, index=True
+    )
     device_id: Mapped[str] = mapped_column(ForeignKey("devices.id"), nullable=False)
     channel: Mapped[str | None] = mapped_column(String(32))
     sensor_type: Mapped[str] = mapped_column(String(64), default="temperature")
@@ -155,6 +157,27 @@ class Sensor(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     device: Mapped["Device"] = relationship(back_populates="sensors")
 
 
+class SensorMaturityState(UUIDPrimaryKeyMixin, TimestampMixin, Base):
+    __tablename__ = "sensor_maturity_states"
+    __table_args__ = (
+        UniqueConstraint(
+            "sensor_id", "t0_c", "ea", "tr_c", name="uq_sensor_maturity_states_params"
+        ),
+    )
+
+    sensor_id: Mapped[str] = mapped_column(ForeignKey("sensors.id"), nullable=False)
+    t0_c: Mapped[float] = mapped_column(Float, nullable=False)
+    ea: Mapped[float] = mapped_column(Float, nullable=False)
+    tr_c: Mapped[float] = mapped_column(Float, nullable=False)
+    origin_ts: Mapped[dt.datetime | None] = mapped_column(DateTime(timezone=True))
+    last_ts: Mapped[dt.datetime | None] = mapped_column(DateTime(timezone=True))
+    last_celsius: Mapped[float | None] = mapped_column(Float)
+    celsius_sum: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
+    ttf_c_h: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
+    eq_age_h: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
+    sample_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+
 class Mix(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     __tablename__ = "mixes"
 
@@ -195,6 +218,9 @@ class Certificate(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     revoked: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
 
 
+CLOSED_POUR_STATUSES = ("closed", "completed")
+
+
 class Pour(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     __tablename__ = "pours"
 
@@ -205,6 +231,17 @@ class Pour(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     started_at: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     status: Mapped[str] = mapped_column(String(32), default="in_progress", nullable=False)
     target_strength: Mapped[float | None] = mapped_column(Numeric(8, 2))
+    # Set when the pour enters a closed status and cleared if it is reopened; readings tiering
+    # keys on it because ``updated_at`` moves with any later edit.
+    closed_at: Mapped[dt.datetime | None] = mapped_column(DateTime(timezone=True))
+
+    @validates("status")
+    def _track_closed_at(self, key: str, status: str) -> str:
+        if status not in CLOSED_POUR_STATUSES:
+            self.closed_at = None
+        elif self.closed_at is None or self.status not in CLOSED_POUR_STATUSES:
+            self.closed_at = dt.datetime.now(dt.UTC)
+        return status
 
 
 class Alert(UUIDPrimaryKeyMixin, TimestampMixin, Base):
@@ -274,3 +311,45 @@ readings_ts = Table(
     Index("ix_readings_ts_sensor_ts", "sensor_id", "ts"),
     Index("ix_readings_ts_ts", "ts"),
 )
+
+readings_archive = Table(
+    "readings_archive",
+    Base.metadata,
+    Column("sensor_id", String(36), ForeignKey("sensors.id"), primary_key=True, nullable=False),
+    Column("ts", DateTime(timezone=True), primary_key=True, nullable=False),
+    Column("celsius", Numeric(6, 3), nullable=False),
+    Column("tenant_id", String(36), ForeignKey("tenants.id"), nullable=False),
+    Index("ix_readings_archive_sensor_ts", "sensor_id", "ts"),
+)
+
+# Last reading per sensor, maintained by the ingest upserts and only ever moved forward.
+sensor_latest = Table(
+    "sensor_latest",
+    Base.metadata,
+    Column("sensor_id", String(36), ForeignKey("sensors.id"), primary_key=True, nullable=False),
+    Column("tenant_id", String(36), ForeignKey("tenants.id"), nullable=False),
+    Column("ts", DateTime(timezone=True), nullable=False),
+    Column("celsius", Numeric(6, 3), nullable=False),
+    Index("ix_sensor_latest_tenant_id", "tenant_id"),
+)
+
+# Cumulative totals of a maturity accumulator over the readings before ``ts``, written as the
+# accumulator crosses each checkpoint interval and rewritten when late readings land before it.
+sensor_maturity_checkpoints = Table(
+    "sensor_maturity_checkpoints",
+    Base.metadata,
+    Column(
+        "state_id",
+        String(36),
+        ForeignKey("sensor_maturity_states.id", ondelete="CASCADE"),
+        primary_key=True,
+        nullable=False,
+    ),
+    Column("ts", DateTime(timezone=True), primary_key=True, nullable=False),
+    Column("last_ts", DateTime(timezone=True), nullable=False),
+    Column("last_celsius", Float, nullable=False),
+    Column("ttf_c_h", Float, nullable=False),
+    Column("eq_age_h", Float, nullable=False),
+    Column("celsius_sum", Float, nullable=False),
+    Column("sample_count", Integer, nullable=False),
+)
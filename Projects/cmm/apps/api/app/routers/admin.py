@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import datetime as dt
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import get_db
+from app.services.live_hub import live_hub
+from app.services.maturity_cache import maturity_cache
+from app.services.rollups import available_rollups, refresh_rollups
+from app.services.sensor_cache import sensor_metadata_cache
+from app.services.storage import (
+    archive_closed_pours,
+    compress_chunks,
+    set_compression_policy,
+    storage_status,
+)
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/rollups")
+def list_rollups(db: Session = Depends(get_db)) -> dict:
+    return {
+        "rollups": [
+            {"name": rollup.name, "bucket_seconds": int(rollup.width.total_seconds())}
+            for rollup in available_rollups(db)
+        ]
+    }
+
+
+@router.post("/rollups/refresh")
+def refresh_all_rollups(db: Session = Depends(get_db)) -> dict:
+    return {"refreshed": refresh_rollups(db)}
+
+
+@router.get("/storage")
+def get_storage_status(db: Session = Depends(get_db)) -> dict:
+    return storage_status(db)
+
+
+@router.put("/storage/compression")
+def update_compression_policy(
+    after_days: int | None = Query(default=None, ge=1),
+    db: Session = Depends(get_db),
+) -> dict:
+    days = after_days or settings.compress_after_days
+    applied = set_compression_policy(db, dt.timedelta(days=days))
+    db.commit()
+    return {"applied": applied, "compress_after_days": days}
+
+
+@router.post("/storage/compress")
+def compress_old_chunks(
+    older_than_days: int | None = Query(default=None, ge=0),
+    db: Session = Depends(get_db),
+) -> dict:
+    days = older_than_days if older_than_days is not None else settings.compress_after_days
+    compressed = compress_chunks(db, dt.timedelta(days=days))
+    db.commit()
+    return {"compressed_chunks": compressed}
+
+
+@router.post("/storage/archive")
+def archive_pours(
+    closed_for_days: int | None = Query(default=None, ge=0),
+    db: Session = Depends(get_db),
+) -> dict:
+    days = (
+        closed_for_days
+        if closed_for_days is not None
+        else settings.archive_closed_pours_after_days
+    )
+    moved = archive_closed_pours(db, dt.timedelta(days=days))
+    db.commit()
+    return {"archived_readings": sum(moved.values()), "pours": moved}
+
+
+@router.get("/cache")
+def get_cache_stats() -> dict:
+    return {
+        "maturity": maturity_cache.snapshot(),
+        "sensor_metadata": sensor_metadata_cache.snapshot(),
+    }
+
+
+@router.get("/live")
+def get_live_stats() -> dict:
+    return live_hub.snapshot()
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db import get_db
+from app.models.domain import Calibration, CalibrationRun
+from app.schemas import (
+    CalibrationCreate,
+    CalibrationRefitError,
+    CalibrationRefitRequest,
+    CalibrationRefitResponse,
+    CalibrationResponse,
+    CalibrationRunResponse,
+)
+from app.services.calibration import calibrate_mix, refit_tenant
+
+router = APIRouter(prefix="/calibrations", tags=["calibrations"])
+
+
+def _response(calibration: Calibration, run: CalibrationRun | None) -> CalibrationResponse:
+    parameters = calibration.parameters or {}
+    return CalibrationResponse(
+        id=calibration.id,
+        tenant_id=calibration.tenant_id,
+        mix_id=calibration.mix_id,
+        method=calibration.method,
+        curve_type=parameters.get("curve_type"),
+        curve_params=parameters.get("curve_params"),
+        r_squared=float(calibration.r_squared) if calibration.r_squared is not None else None,
+        residual_sigma=parameters.get("residual_sigma"),
+        points=parameters.get("points", 0),
+        promoted=parameters.get("promoted", True),
+        promotion_issue=parameters.get("promotion_issue"),
+        run=CalibrationRunResponse.model_validate(run) if run is not None else None,
+    )
+
+
+@router.post("", response_model=CalibrationResponse, status_code=status.HTTP_201_CREATED)
+def create_calibration(
+    payload: CalibrationCreate, db: Session = Depends(get_db)
+) -> CalibrationResponse:
+    try:
+        calibration, run = calibrate_mix(db, payload)
+    except LookupError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)
+        ) from exc
+    db.commit()
+    return _response(calibration, run)
+
+
+@router.post("/refit", response_model=CalibrationRefitResponse)
+def refit_calibrations(
+    payload: CalibrationRefitRequest, db: Session = Depends(get_db)
+) -> CalibrationRefitResponse:
+    result = refit_tenant(db, payload.tenant_id, payload.curve_type, payload.workers)
+    db.commit()
+    return CalibrationRefitResponse(
+        tenant_id=payload.tenant_id,
+        mode=result.mode,
+        workers=result.workers,
+        wall_ms=result.wall_ms,
+        calibrations=[_response(calibration, run) for calibration, run in result.runs],
+        errors=[
+            CalibrationRefitError(
+                mix_id=calibration.mix_id, calibration_id=calibration.id, detail=detail
+            )
+            for calibration, detail in result.errors
+        ],
+    )
+
+
+@router.get("/{calibration_id}", response_model=CalibrationResponse)
+def get_calibration(calibration_id: str, db: Session = Depends(get_db)) -> CalibrationResponse:
+    calibration = db.get(Calibration, calibration_id)
+    if calibration is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Calibration not found")
+    run = db.scalars(
+        select(CalibrationRun)
+        .where(CalibrationRun.calibration_id == calibration_id)
+        .order_by(CalibrationRun.started_at.desc())
+        .limit(1)
+    ).first()
+    return _response(calibration, run)
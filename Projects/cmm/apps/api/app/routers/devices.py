@@ -2,17 +2,25 @@ from __future__ import annotations
 
 import datetime as dt
 
+from anyio import from_thread
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.db import get_db
-from app.models.domain import Device, Project, User
+from app.models.domain import Device, Project, Sensor, User
 from app.schemas import DeviceClaimRequest, DeviceConfigUpdate, DeviceResponse
+from app.services.sensor_cache import sensor_metadata_cache
 
 router = APIRouter(prefix="/devices", tags=["devices"])
 
 
+def _invalidate_sensors(db: Session, device: Device) -> None:
+    sensor_ids = db.scalars(select(Sensor.id).where(Sensor.device_id == device.id)).all()
+    sensor_metadata_cache.invalidate_sensors(sensor_ids)
+    from_thread.run(sensor_metadata_cache.publish)
+
+
 @router.post("/{device_id}/claim", response_model=DeviceResponse)
 def claim_device(device_id: str, payload: DeviceClaimRequest, db: Session = Depends(get_db)) -> Device:
     device = db.get(Device, device_id)
@@ -32,11 +40,12 @@ def claim_device(device_id: str, payload: DeviceClaimRequest, db: Session = Depe
     device.project_id = payload.project_id
     device.location_id = payload.location_id
     device.claimed_by = payload.user_id
-    device.claimed_at = dt.datetime.utcnow().replace(tzinfo=dt.timezone.utc)
+    device.claimed_at = dt.datetime.utcnow().replace(tzinfo=dt.UTC)
     device.status = "active"
 
     db.add(device)
     db.commit()
+    _invalidate_sensors(db, device)
     db.refresh(device)
     return device
 
@@ -72,6 +81,7 @@ def update_device_config(
 
     db.add(device)
     db.commit()
+    _invalidate_sensors(db, device)
     db.refresh(device)
     return device
 
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import datetime as dt
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db import get_async_db
+from app.models.domain import Pour, Project, Sensor
+from app.services.live_hub import (
+    LiveCursor,
+    LiveEvent,
+    live_hub,
+    pour_topic,
+    project_topic,
+    replay_readings,
+    stream_events,
+)
+from app.services.maturity_service import pour_sensors_query
+from app.services.maturity_state import as_utc
+
+router = APIRouter(prefix="/live", tags=["live"])
+
+
+@router.get("/readings", response_class=StreamingResponse)
+async def stream_live_readings(
+    project_id: str | None = Query(default=None),
+    pour_id: str | None = Query(default=None),
+    since: dt.datetime | None = Query(default=None),
+    last_event_id: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+) -> StreamingResponse:
+    if (project_id is None) == (pour_id is None):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Exactly one of project_id or pour_id is required",
+        )
+    after = LiveCursor(as_utc(since)) if since is not None else None
+    if last_event_id:
+        # A reconnecting EventSource sends the id of the last event it received.
+        try:
+            after = LiveCursor.parse(last_event_id)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Last-Event-ID"
+            ) from exc
+
+    if pour_id is not None:
+        pour = await db.get(Pour, pour_id)
+        if pour is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Pour not found")
+        topic = pour_topic(pour_id)
+        sensor_ids = list((await db.scalars(pour_sensors_query(pour))).all())
+    else:
+        if await db.get(Project, project_id) is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+        topic = project_topic(project_id)
+        sensor_ids = list(
+            (await db.scalars(select(Sensor.id).where(Sensor.project_id == project_id))).all()
+        )
+
+    # Subscribe before replaying so nothing written in between is missed; readings are keyed
+    # by (sensor_id, ts), so clients drop the few that may arrive both ways.
+    subscription = live_hub.subscribe(topic)
+    replay = None
+    truncated = False
+    try:
+        if after is not None:
+            limit = settings.live_replay_max_readings
+            readings = await replay_readings(db, sensor_ids, after, limit)
+            replay = LiveEvent(topic, tuple(readings))
+            truncated = len(readings) >= limit
+    except BaseException:
+        live_hub.unsubscribe(subscription)
+        raise
+    # The stream can stay open for hours; it must not hold a pooled connection.
+    await db.close()
+
+    # A truncated replay ends the stream; EventSource reconnects with the last id and continues.
+    return StreamingResponse(
+        stream_events(
+            live_hub,
+            subscription,
+            replay,
+            cursor=after,
+            heartbeat_s=settings.live_heartbeat_s,
+            end_after_replay=truncated,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
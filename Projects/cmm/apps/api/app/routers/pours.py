@@ -1,12 +1,33 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import func, select
+import datetime as dt
+
+from anyio import from_thread
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db import get_db
-from app.models.domain import Pour, Project, Sensor, readings_ts
-from app.schemas import MaturityResponse, PourCreate, PourResponse
+from app.db import get_async_db, get_db
+from app.db.plan import Plan, run_plan_async
+from app.models.domain import Pour, Project
+from app.schemas import (
+    ForecastBoardResponse,
+    MaturityAsOfResponse,
+    MaturityEnvelope,
+    MaturityResponse,
+    PourCreate,
+    PourForecast,
+    PourResponse,
+    SensorMaturity,
+)
+from app.schemas.pours import ForecastMethod, MaturityBasis
+from app.services.maturity_cache import maturity_cache
+from app.services.maturity_service import pour_sensors_query
+from app.services.maturity_state import as_utc, default_params, sensor_maturity_window_plan
+from app.services.rollups import rollup_sensor_maturity_plan
+from app.services.sensor_cache import sensor_metadata_cache
+from app.services.storage import is_closed
+from app.services.strength_forecast import active_pours, forecast_pours
 
 router = APIRouter(prefix="/pours", tags=["pours"])
 
@@ -27,42 +48,182 @@ def create_pour(payload: PourCreate, db: Session = Depends(get_db)) -> Pour:
     )
     db.add(pour)
     db.commit()
+    sensor_metadata_cache.invalidate_projects([pour.project_id])
+    from_thread.run(sensor_metadata_cache.publish)
     db.refresh(pour)
     return pour
 
 
-@router.get("/{pour_id}/maturity", response_model=MaturityResponse)
-def get_pour_maturity(pour_id: str, db: Session = Depends(get_db)) -> MaturityResponse:
-    pour = db.get(Pour, pour_id)
-    if pour is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Pour not found")
+# Forecasts fit curves in numpy; sync routes keep that work in the threadpool, off the event loop.
+@router.get("/forecast", response_model=ForecastBoardResponse)
+def get_forecast_board(
+    tenant_id: str | None = Query(default=None),
+    project_id: str | None = Query(default=None),
+    method: ForecastMethod = Query(default="smoothed"),
+    basis: MaturityBasis | None = Query(default=None),
+    curing_c: float | None = Query(
+        default=None, description="Assumed curing temperature for method=constant"
+    ),
+    lookback_h: float | None = Query(default=None, gt=0, le=24 * 14),
+    time_constant_h: float | None = Query(default=None, gt=0),
+    db: Session = Depends(get_db),
+) -> ForecastBoardResponse:
+    now = dt.datetime.now(dt.UTC)
+    pours = active_pours(db, tenant_id=tenant_id, project_id=project_id)
+    return ForecastBoardResponse(
+        generated_at=now,
+        pours=forecast_pours(db, pours, now, method, basis, curing_c, lookback_h, time_constant_h),
+    )
 
-    sensor_ids = db.scalars(select(Sensor.id).where(Sensor.project_id == pour.project_id)).all()
-    if not sensor_ids:
-        return MaturityResponse(
-            pour_id=pour_id,
-            sensor_count=0,
-            readings_count=0,
-            average_celsius=None,
-            maturity_index=None,
-        )
 
-    stmt = (
-        select(
-            func.count().label("readings_count"),
-            func.avg(readings_ts.c.celsius).label("avg_celsius"),
+def _envelope(values: list[float]) -> MaturityEnvelope | None:
+    if not values:
+        return None
+    return MaturityEnvelope(min=min(values), mean=sum(values) / len(values), max=max(values))
+
+
+def _pour_maturity_plan(
+    dialect_name: str, pour: Pour, tolerance: float | None, as_of: dt.datetime | None = None
+) -> Plan[MaturityResponse]:
+    window_start = pour.started_at
+    window_end = as_of or dt.datetime.now(dt.UTC)
+    sensor_ids = list((yield pour_sensors_query(pour)).scalars())
+    # Rollups only cover readings_ts, so closed pours that may be archived are read exactly.
+    closed = is_closed(pour)
+    sensors: list[SensorMaturity] = []
+    if sensor_ids:
+        approximated: dict[str, SensorMaturity] = {}
+        if tolerance is not None and not closed:
+            approximated = yield from rollup_sensor_maturity_plan(
+                dialect_name, sensor_ids, window_start, window_end, tolerance
+            )
+        exact_ids = [sensor_id for sensor_id in sensor_ids if sensor_id not in approximated]
+        window = yield from sensor_maturity_window_plan(
+            dialect_name, exact_ids, window_start, window_end, include_archive=closed
         )
-        .where(readings_ts.c.sensor_id.in_(sensor_ids))
+        exact = {sensor.sensor_id: sensor for sensor in window}
+        sensors = [approximated.get(sensor_id) or exact[sensor_id] for sensor_id in sensor_ids]
+
+    reporting = [sensor for sensor in sensors if sensor.readings_count]
+    readings_count = sum(sensor.readings_count for sensor in reporting)
+    average_celsius = (
+        sum(sensor.average_celsius * sensor.readings_count for sensor in reporting) / readings_count
+        if readings_count
+        else None
     )
-    result = db.execute(stmt).one()
-    average_celsius = float(result.avg_celsius) if result.avg_celsius is not None else None
-    maturity_index = float(result.avg_celsius) * 1.25 if result.avg_celsius is not None else None
 
     return MaturityResponse(
-        pour_id=pour_id,
+        pour_id=pour.id,
+        window_start=window_start,
+        window_end=window_end,
         sensor_count=len(sensor_ids),
-        readings_count=result.readings_count or 0,
+        readings_count=readings_count,
         average_celsius=average_celsius,
-        maturity_index=maturity_index,
+        ttf_c_h=_envelope([sensor.ttf_c_h for sensor in reporting]),
+        eq_age_h=_envelope([sensor.eq_age_h for sensor in reporting]),
+        sensors=sensors,
     )
 
+
+def _check_as_of(pour: Pour, as_of: dt.datetime) -> dt.datetime:
+    as_of = as_utc(as_of)
+    if as_of < as_utc(pour.started_at):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="as_of precedes the start of the pour",
+        )
+    return as_of
+
+
+@router.get("/{pour_id}/maturity", response_model=MaturityResponse)
+async def get_pour_maturity(
+    pour_id: str,
+    tolerance: float | None = Query(
+        default=None,
+        gt=0,
+        le=1,
+        description="Accepted relative error; enables reading from temperature rollups",
+    ),
+    as_of: dt.datetime | None = Query(
+        default=None, description="Maturity from the readings up to this instant instead of now"
+    ),
+    db: AsyncSession = Depends(get_async_db),
+) -> MaturityResponse:
+    pour = await db.get(Pour, pour_id)
+    if pour is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Pour not found")
+    if as_of is not None:
+        as_of = _check_as_of(pour, as_of)
+
+    async def compute() -> MaturityResponse:
+        plan = _pour_maturity_plan(db.bind.dialect.name, pour, tolerance, as_of)
+        return await run_plan_async(db, plan)
+
+    params = {
+        "view": "pour_window",
+        "tolerance": tolerance,
+        "as_of": as_of,
+        "params": default_params(),
+        "started_at": pour.started_at,
+        "status": pour.status,
+    }
+    return await maturity_cache.get_or_compute(pour_id, params, MaturityResponse, compute)
+
+
+@router.get("/{pour_id}/maturity/as_of", response_model=MaturityAsOfResponse)
+async def get_pour_maturity_as_of(
+    pour_id: str,
+    at: list[dt.datetime] = Query(
+        min_length=1, max_length=100, description="Instants to report maturity at"
+    ),
+    db: AsyncSession = Depends(get_async_db),
+) -> MaturityAsOfResponse:
+    pour = await db.get(Pour, pour_id)
+    if pour is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Pour not found")
+    instants = [_check_as_of(pour, instant) for instant in at]
+
+    async def compute() -> MaturityAsOfResponse:
+        dialect_name = db.bind.dialect.name
+        results = [
+            await run_plan_async(db, _pour_maturity_plan(dialect_name, pour, None, instant))
+            for instant in instants
+        ]
+        return MaturityAsOfResponse(pour_id=pour_id, results=results)
+
+    params = {
+        "view": "pour_as_of",
+        "at": instants,
+        "params": default_params(),
+        "started_at": pour.started_at,
+        "status": pour.status,
+    }
+    return await maturity_cache.get_or_compute(pour_id, params, MaturityAsOfResponse, compute)
+
+
+@router.get("/{pour_id}/forecast", response_model=PourForecast)
+def get_pour_forecast(
+    pour_id: str,
+    method: ForecastMethod = Query(default="smoothed"),
+    basis: MaturityBasis | None = Query(default=None),
+    curing_c: float | None = Query(
+        default=None, description="Assumed curing temperature for method=constant"
+    ),
+    lookback_h: float | None = Query(default=None, gt=0, le=24 * 14),
+    time_constant_h: float | None = Query(default=None, gt=0),
+    db: Session = Depends(get_db),
+) -> PourForecast:
+    pour = db.get(Pour, pour_id)
+    if pour is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Pour not found")
+
+    (forecast,) = forecast_pours(
+        db,
+        [pour],
+        method=method,
+        basis=basis,
+        curing_c=curing_c,
+        lookback_h=lookback_h,
+        time_constant_h=time_constant_h,
+    )
+    return forecast
@@ -1,58 +1,60 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select, update
-from sqlalchemy.dialects.postgresql import insert as pg_insert
-from sqlalchemy.orm import Session
+import asyncio
+import zlib
+from typing import Literal
 
-from app.db import get_db
-from app.models.domain import Sensor, readings_ts
-from app.schemas import ReadingBatchRequest, ReadingBatchResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.exceptions import RequestValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-router = APIRouter(prefix="/readings", tags=["readings"])
+from app.core.config import settings
+from app.db import get_async_db
+from app.domain.reading_codec import (
+    ReadingCodecError,
+    ReadingColumns,
+    column_readings,
+    decode_readings,
+)
+from app.schemas import (
+    ReadingBatchBody,
+    ReadingBatchResponse,
+    ReadingReject,
+    ReadingStreamResponse,
+)
+from app.services.reading_ingest import write_readings
+from app.services.reading_stream import (
+    LineParser,
+    ParsedLine,
+    StreamFormat,
+    iter_lines,
+    stream_format,
+)
+from app.services.reading_validation import ReadingBatchError, validate_reading_rows
+from app.services.sensor_cache import SensorMetadata, sensor_metadata_cache
 
+router = APIRouter(prefix="/readings", tags=["readings"])
 
-def _upsert_readings(session: Session, records: list[dict]) -> tuple[int, int]:
-    inserted = 0
-    updated = 0
-    table = readings_ts
-    dialect_name = session.bind.dialect.name
 
-    if dialect_name == "postgresql":
-        stmt = pg_insert(table).values(records)
-        stmt = stmt.on_conflict_do_update(
-            index_elements=[table.c.sensor_id, table.c.ts],
-            set_={"celsius": stmt.excluded.celsius, "tenant_id": stmt.excluded.tenant_id},
+@router.post("/batch", response_model=ReadingBatchResponse, status_code=status.HTTP_202_ACCEPTED)
+async def ingest_readings(
+    payload: ReadingBatchBody,
+    on_duplicate: Literal["last", "reject"] = Query(default="last"),
+    db: AsyncSession = Depends(get_async_db),
+) -> ReadingBatchResponse:
+    # Rows are parsed as TypedDicts and checked as columns; building a ReadingPayload per
+    # reading dominated latency on large batches. The numpy checks run off the event loop.
+    try:
+        readings = await asyncio.to_thread(
+            validate_reading_rows, payload["readings"], reject_duplicates=on_duplicate == "reject"
         )
-        result = session.execute(stmt)
-        inserted = result.rowcount or 0
-        session.flush()
-    else:
-        for record in records:
-            existing = session.execute(
-                select(table.c.sensor_id).where(
-                    table.c.sensor_id == record["sensor_id"],
-                    table.c.ts == record["ts"],
-                )
-            ).first()
-            if existing:
-                session.execute(
-                    update(table)
-                    .where(table.c.sensor_id == record["sensor_id"], table.c.ts == record["ts"])
-                    .values(celsius=record["celsius"], tenant_id=record["tenant_id"])
-                )
-                updated += 1
-            else:
-                session.execute(table.insert().values(**record))
-                inserted += 1
-    return inserted, updated
+    except ReadingBatchError as exc:
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in exc.errors]
+        ) from exc
 
-
-@router.post("/batch", response_model=ReadingBatchResponse, status_code=status.HTTP_202_ACCEPTED)
-def ingest_readings(payload: ReadingBatchRequest, db: Session = Depends(get_db)) -> ReadingBatchResponse:
-    sensor_ids = {reading.sensor_id for reading in payload.readings}
-    sensors = db.execute(select(Sensor.id, Sensor.tenant_id).where(Sensor.id.in_(sensor_ids))).all()
-    sensors_map = {row.id: row.tenant_id for row in sensors}
+    sensor_ids = set(readings.sensor_ids)
+    sensors_map = await sensor_metadata_cache.resolve(db, sensor_ids)
 
     missing = sensor_ids - sensors_map.keys()
     if missing:
@@ -63,15 +65,149 @@ def ingest_readings(payload: ReadingBatchRequest, db: Session = Depends(get_db))
 
     records = [
         {
-            "sensor_id": reading.sensor_id,
-            "ts": reading.ts,
-            "celsius": reading.celsius,
-            "tenant_id": sensors_map[reading.sensor_id],
+            "sensor_id": sensor_id,
+            "ts": ts,
+            "celsius": celsius,
+            "tenant_id": sensors_map[sensor_id].tenant_id,
         }
-        for reading in payload.readings
+        for sensor_id, ts, celsius in zip(
+            readings.sensor_ids, readings.ts, readings.celsius, strict=True
+        )
     ]
-
-    inserted, updated = _upsert_readings(db, records)
-    db.commit()
+    inserted, updated = await write_readings(db, records, sensors_map)
     return ReadingBatchResponse(processed=len(records), inserted=inserted, updated=updated)
 
+
+class _StreamSummary:
+    def __init__(self, max_rejects: int) -> None:
+        self.max_rejects = max_rejects
+        self.processed = self.inserted = self.updated = self.rejected = 0
+        self.rejects: list[ReadingReject] = []
+
+    def reject(self, line: int, error: str) -> None:
+        self.rejected += 1
+        if len(self.rejects) < self.max_rejects:
+            self.rejects.append(ReadingReject(line=line, error=error))
+
+    def response(self) -> ReadingStreamResponse:
+        return ReadingStreamResponse(
+            processed=self.processed,
+            inserted=self.inserted,
+            updated=self.updated,
+            rejected=self.rejected,
+            rejects=self.rejects,
+            rejects_truncated=self.rejected > len(self.rejects),
+        )
+
+
+async def _flush_stream_chunk(
+    db: AsyncSession, chunk: list[ParsedLine], summary: _StreamSummary
+) -> None:
+    sensor_ids = {parsed.reading.sensor_id for parsed in chunk}
+    sensors_map = await sensor_metadata_cache.resolve(db, sensor_ids)
+    records = []
+    for parsed in chunk:
+        metadata = sensors_map.get(parsed.reading.sensor_id)
+        if metadata is None:
+            summary.reject(parsed.line, f"Unknown sensor {parsed.reading.sensor_id}")
+            continue
+        records.append(
+            {
+                "sensor_id": parsed.reading.sensor_id,
+                "ts": parsed.reading.ts,
+                "celsius": parsed.reading.celsius,
+                "tenant_id": metadata.tenant_id,
+            }
+        )
+    if not records:
+        return
+    inserted, updated = await write_readings(db, records, sensors_map)
+    summary.processed += len(records)
+    summary.inserted += inserted
+    summary.updated += updated
+
+
+@router.post("/stream", response_model=ReadingStreamResponse, status_code=status.HTTP_202_ACCEPTED)
+async def ingest_reading_stream(
+    request: Request,
+    fmt: StreamFormat | None = Query(default=None, alias="format"),
+    db: AsyncSession = Depends(get_async_db),
+) -> ReadingStreamResponse:
+    # Each chunk commits on its own, so a failed upload is retried whole; the upsert makes
+    # replaying the already committed chunks harmless.
+    encoding = request.headers.get("content-encoding", "identity").strip().lower()
+    if encoding not in ("identity", "gzip"):
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Unsupported content encoding {encoding!r}",
+        )
+    parser = LineParser(fmt or stream_format(request.headers.get("content-type")))
+    summary = _StreamSummary(settings.ingest_stream_max_rejects)
+    chunk: list[ParsedLine] = []
+    lines = iter_lines(
+        request.stream(),
+        gzip=encoding == "gzip",
+        max_line_bytes=settings.ingest_stream_max_line_bytes,
+    )
+    try:
+        async for number, raw in lines:
+            parsed = parser.parse(number, raw)
+            if parsed is None:
+                continue
+            if parsed.error is not None:
+                summary.reject(parsed.line, parsed.error)
+                continue
+            chunk.append(parsed)
+            if len(chunk) >= settings.ingest_chunk_size:
+                await _flush_stream_chunk(db, chunk, summary)
+                chunk = []
+    except zlib.error as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid gzip body: {exc}"
+        ) from exc
+    if chunk:
+        await _flush_stream_chunk(db, chunk, summary)
+    return summary.response()
+
+
+def _column_records(columns: ReadingColumns, sensors_map: dict[str, SensorMetadata]) -> list[dict]:
+    tenants = {sensor_id: sensors_map[sensor_id].tenant_id for sensor_id in columns.sensor_ids}
+    return [
+        {"sensor_id": sensor_id, "ts": ts, "celsius": celsius, "tenant_id": tenants[sensor_id]}
+        for sensor_id, ts, celsius in column_readings(columns)
+    ]
+
+
+@router.post("/binary", response_model=ReadingBatchResponse, status_code=status.HTTP_202_ACCEPTED)
+async def ingest_binary_readings(
+    request: Request, db: AsyncSession = Depends(get_async_db)
+) -> ReadingBatchResponse:
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > settings.ingest_binary_max_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Batch exceeds {settings.ingest_binary_max_bytes} bytes",
+            )
+    try:
+        columns = await asyncio.to_thread(decode_readings, bytes(body))
+    except ReadingCodecError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    if not columns.sensor_index.size:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="readings must not be empty"
+        )
+
+    sensor_ids = set(columns.sensor_ids)
+    sensors_map = await sensor_metadata_cache.resolve(db, sensor_ids)
+    missing = sensor_ids - sensors_map.keys()
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown sensors: {', '.join(sorted(missing))}",
+        )
+
+    records = await asyncio.to_thread(_column_records, columns, sensors_map)
+    inserted, updated = await write_readings(db, records, sensors_map)
+    return ReadingBatchResponse(processed=len(records), inserted=inserted, updated=updated)
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import get_async_db
+from app.db.plan import run_plan_async
+from app.models.domain import Sensor
+from app.schemas import SensorLatest, SensorLatestResponse, SensorReadingsResponse
+from app.services.reading_history import decode_cursor, encode_cursor, sensor_history_plan
+from app.services.sensor_latest import latest_readings_query
+
+router = APIRouter(prefix="/sensors", tags=["sensors"])
+
+
+@router.get("/latest", response_model=SensorLatestResponse)
+async def get_latest_readings(
+    tenant_id: str | None = Query(default=None),
+    project_id: str | None = Query(default=None),
+    db: AsyncSession = Depends(get_async_db),
+) -> SensorLatestResponse:
+    if tenant_id is None and project_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="tenant_id or project_id is required",
+        )
+    rows = await db.execute(latest_readings_query(tenant_id, project_id))
+    return SensorLatestResponse(
+        sensors=[SensorLatest.model_validate(row, from_attributes=True) for row in rows]
+    )
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if if_none_match is None:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+@router.get("/{sensor_id}/readings", response_model=SensorReadingsResponse)
+async def get_sensor_readings(
+    sensor_id: str,
+    start: dt.datetime | None = Query(default=None),
+    end: dt.datetime | None = Query(default=None),
+    max_points: int | None = Query(
+        default=None,
+        ge=3,
+        le=10000,
+        description="Decimate the window to this many points for charting",
+    ),
+    cursor: str | None = Query(default=None),
+    limit: int = Query(default=5000, ge=1, le=50000),
+    if_none_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    if await db.get(Sensor, sensor_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sensor not found")
+    try:
+        after = decode_cursor(cursor) if cursor is not None else None
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    plan = sensor_history_plan(
+        db.bind.dialect.name,
+        sensor_id,
+        start,
+        end,
+        max_points=max_points,
+        after=after,
+        limit=limit,
+    )
+    history = await run_plan_async(db, plan)
+    body = SensorReadingsResponse(
+        sensor_id=sensor_id,
+        source=history.source,
+        bucket_seconds=history.bucket_seconds,
+        ts=history.ts,
+        celsius=history.celsius,
+        next_cursor=encode_cursor(history.next_after) if history.next_after else None,
+    ).model_dump_json().encode()
+    # Strong validator over the exact body: a chart polling an unchanged window gets a 304.
+    etag = f'"{hashlib.sha1(body).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -1,9 +1,13 @@
 from fastapi import APIRouter
 
-from . import devices, pours, readings
+from . import admin, calibrations, devices, live, pours, readings, sensors
 
 router = APIRouter()
+router.include_router(admin.router)
+router.include_router(calibrations.router)
 router.include_router(devices.router)
+router.include_router(live.router)
 router.include_router(pours.router)
 router.include_router(readings.router)
+router.include_router(sensors.router)
 
@@ -1,15 +1,62 @@
+from .calibrations import (
+    CalibrationCreate,
+    CalibrationRefitError,
+    CalibrationRefitRequest,
+    CalibrationRefitResponse,
+    CalibrationResponse,
+    CalibrationRunResponse,
+    StrengthBreak,
+)
 from .devices import DeviceClaimRequest, DeviceConfigUpdate, DeviceResponse
-from .pours import MaturityResponse, PourCreate, PourResponse
-from .readings import ReadingBatchRequest, ReadingBatchResponse
+from .pours import (
+    ForecastBoardResponse,
+    MaturityAsOfResponse,
+    MaturityEnvelope,
+    MaturityResponse,
+    PourCreate,
+    PourForecast,
+    PourResponse,
+    SensorForecast,
+    SensorMaturity,
+)
+from .readings import (
+    ReadingBatchBody,
+    ReadingBatchRequest,
+    ReadingBatchResponse,
+    ReadingReject,
+    ReadingRow,
+    ReadingStreamResponse,
+)
+from .sensors import SensorLatest, SensorLatestResponse, SensorReadingsResponse
 
 __all__ = [
+    "CalibrationCreate",
+    "CalibrationRefitError",
+    "CalibrationRefitRequest",
+    "CalibrationRefitResponse",
+    "CalibrationResponse",
+    "CalibrationRunResponse",
+    "StrengthBreak",
     "DeviceClaimRequest",
     "DeviceConfigUpdate",
     "DeviceResponse",
     "PourCreate",
     "PourResponse",
+    "ForecastBoardResponse",
+    "MaturityAsOfResponse",
+    "MaturityEnvelope",
     "MaturityResponse",
+    "PourForecast",
+    "SensorForecast",
+    "SensorMaturity",
+    "ReadingBatchBody",
     "ReadingBatchRequest",
     "ReadingBatchResponse",
+    "ReadingReject",
+    "ReadingRow",
+    "ReadingStreamResponse",
+    "SensorLatest",
+    "SensorLatestResponse",
+    "SensorReadingsResponse",
 ]
 
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import datetime as dt
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+from app.schemas.maturity import CurveParams, CurveType
+
+CalibrationMethod = Literal["nurse_saul", "arrhenius"]
+
+
+class StrengthBreak(BaseModel):
+    maturity: float = Field(
+        gt=0,
+        description="Maturity at the break: °C·h for nurse_saul, hours of equivalent age for "
+        "arrhenius",
+    )
+    strength: float = Field(description="Measured compressive strength, MPa")
+
+
+class CalibrationCreate(BaseModel):
+    tenant_id: str
+    mix_id: str
+    method: CalibrationMethod = "nurse_saul"
+    curve_type: CurveType = "log"
+    breaks: list[StrengthBreak] = Field(min_length=3, max_length=10000)
+
+
+class CalibrationRunResponse(BaseModel):
+    id: str
+    started_at: dt.datetime
+    completed_at: dt.datetime | None
+    summary: dict
+
+    class Config:
+        from_attributes = True
+
+
+class CalibrationResponse(BaseModel):
+    id: str
+    tenant_id: str
+    mix_id: str | None
+    method: str
+    curve_type: CurveType | None = None
+    curve_params: CurveParams | None = Field(
+        default=None, description="Fitted curve, sigma being the residual standard error"
+    )
+    r_squared: float | None = None
+    residual_sigma: float | None = Field(default=None, description="Residual standard error, MPa")
+    points: int = 0
+    promoted: bool = Field(
+        default=True, description="Whether the fit replaced the mix's strength curve"
+    )
+    promotion_issue: str | None = Field(
+        default=None, description="Why the fit was stored without replacing the mix's curve"
+    )
+    run: CalibrationRunResponse | None = None
+
+
+class CalibrationRefitRequest(BaseModel):
+    tenant_id: str
+    curve_type: CurveType | None = Field(
+        default=None, description="Fit this curve instead of each calibration's own"
+    )
+    workers: int | None = Field(default=None, ge=1, le=64)
+
+
+class CalibrationRefitError(BaseModel):
+    mix_id: str
+    calibration_id: str
+    detail: str
+
+
+class CalibrationRefitResponse(BaseModel):
+    tenant_id: str
+    mode: str = Field(description='"process_pool" or "in_process"')
+    workers: int
+    wall_ms: float = Field(description="Time spent fitting, pool start-up included")
+    calibrations: list[CalibrationResponse] = Field(default_factory=list)
+    errors: list[CalibrationRefitError] = Field(default_factory=list)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Literal, Optional
+from datetime import datetime
+from typing import Literal
 
 from pydantic import BaseModel, Field
 
@@ -8,26 +9,38 @@ CurveType = Literal["log", "asymptotic"]
 
 
 class CurveParams(BaseModel):
-    a: Optional[float] = None
-    b: Optional[float] = None
-    f_u: Optional[float] = None
-    k: Optional[float] = None
-    sigma: Optional[float] = None
+    a: float | None = None
+    b: float | None = None
+    f_u: float | None = None
+    k: float | None = None
+    sigma: float | None = None
     min_maturity: float = 1.0
 
 
 class MaturityRequest(BaseModel):
-    curve_type: Optional[CurveType] = None
-    curve_params: Optional[CurveParams] = None
-    T0_c: Optional[float] = None
-    Ea: Optional[float] = None
-    Tr_c: Optional[float] = None
+    curve_type: CurveType | None = None
+    curve_params: CurveParams | None = None
+    T0_c: float | None = None
+    Ea: float | None = None
+    Tr_c: float | None = None
+    as_of: datetime | None = Field(
+        default=None, description="Compute maturity from the readings up to this instant"
+    )
+
+
+class MaturityCurveRequest(MaturityRequest):
+    max_points: int | None = Field(
+        default=None,
+        ge=3,
+        le=10000,
+        description="Decimate each sensor's curve to at most this many points",
+    )
 
 
 class StrengthCI(BaseModel):
     mean: float
-    lower: Optional[float] = None
-    upper: Optional[float] = None
+    lower: float | None = None
+    upper: float | None = None
     units: str = "MPa"
 
 
@@ -35,6 +48,49 @@ class MaturityResponse(BaseModel):
     pour_id: str
     ttf_c_h: float = Field(description="TTF maturity, °C·h")
     eq_age_h: float = Field(description="Equivalent age, h")
-    strength_ttf: Optional[StrengthCI] = None
-    strength_eq: Optional[StrengthCI] = None
+    strength_ttf: StrengthCI | None = None
+    strength_eq: StrengthCI | None = None
+
+
+class StrengthCurve(BaseModel):
+    mean: list[float]
+    lower: list[float] | None = None
+    upper: list[float] | None = None
+    units: str = "MPa"
+
+
+class SensorMaturityCurve(BaseModel):
+    sensor_id: str
+    ts: list[datetime]
+    celsius: list[float]
+    ttf_c_h: list[float] = Field(description="TTF maturity at each instant, °C·h")
+    eq_age_h: list[float] = Field(description="Equivalent age at each instant, h")
+    strength_ttf: StrengthCurve | None = None
+    strength_eq: StrengthCurve | None = None
+
+
+class MaturityCurveResponse(BaseModel):
+    pour_id: str
+    sensors: list[SensorMaturityCurve]
+
+
+class BatchMaturityItem(MaturityRequest):
+    pour_id: str
+
+
+class BatchMaturityRequest(BaseModel):
+    pours: list[BatchMaturityItem] = Field(min_length=1, max_length=500)
+    defaults: MaturityRequest | None = Field(
+        default=None, description="Applied to every pour for fields the pour does not set"
+    )
+
+
+class BatchMaturityError(BaseModel):
+    pour_id: str
+    status_code: int
+    detail: str
+
 
+class BatchMaturityResponse(BaseModel):
+    results: list[MaturityResponse]
+    errors: list[BatchMaturityError]
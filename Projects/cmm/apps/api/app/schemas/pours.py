@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import datetime as dt
+from typing import Literal
 
 from pydantic import BaseModel, Field
 
@@ -10,7 +11,7 @@ class PourCreate(BaseModel):
     project_id: str
     location_id: str | None = None
     mix_id: str | None = None
-    started_at: dt.datetime = Field(default_factory=lambda: dt.datetime.utcnow().replace(tzinfo=dt.timezone.utc))
+    started_at: dt.datetime = Field(default_factory=lambda: dt.datetime.utcnow().replace(tzinfo=dt.UTC))
     target_strength: float | None = None
 
 
@@ -28,10 +29,78 @@ class PourResponse(BaseModel):
         from_attributes = True
 
 
+class SensorMaturity(BaseModel):
+    sensor_id: str
+    readings_count: int
+    average_celsius: float | None
+    first_ts: dt.datetime | None
+    last_ts: dt.datetime | None
+    ttf_c_h: float = Field(description="TTF maturity over the window, °C·h")
+    eq_age_h: float = Field(description="Equivalent age over the window, h")
+    source: str = Field(default="readings_ts", description="Where the values were computed from")
+
+
+class MaturityEnvelope(BaseModel):
+    min: float
+    mean: float
+    max: float
+
+
 class MaturityResponse(BaseModel):
     pour_id: str
+    window_start: dt.datetime
+    window_end: dt.datetime
     sensor_count: int
     readings_count: int
     average_celsius: float | None
-    maturity_index: float | None
+    ttf_c_h: MaturityEnvelope | None = None
+    eq_age_h: MaturityEnvelope | None = None
+    sensors: list[SensorMaturity] = Field(default_factory=list)
+
+
+class MaturityAsOfResponse(BaseModel):
+    pour_id: str
+    results: list[MaturityResponse] = Field(description="One result per requested instant")
+
+
+
+ForecastMethod = Literal["smoothed", "constant"]
+MaturityBasis = Literal["ttf", "eq_age"]
+
+
+class SensorForecast(BaseModel):
+    sensor_id: str
+    last_ts: dt.datetime | None
+    maturity: float | None = Field(description="Maturity at the latest reading, in the basis unit")
+    required_maturity: float | None = Field(
+        description="Maturity at which the curve reaches the target strength"
+    )
+    projected_celsius: float | None = Field(description="Curing temperature assumed from now on")
+    eta: dt.datetime | None = Field(
+        description="When the target strength is reached; None if never at the projection"
+    )
+    hours_remaining: float | None = None
+    reached: bool = False
+
+
+class PourForecast(BaseModel):
+    pour_id: str
+    project_id: str
+    target_strength: float | None
+    curve_type: str | None = None
+    basis: MaturityBasis | None = None
+    method: ForecastMethod
+    status: str = Field(
+        description="ready, curing, stalled, no_target, no_curve, no_sensors or no_readings"
+    )
+    eta: dt.datetime | None = Field(default=None, description="ETA of the governing sensor")
+    hours_remaining: float | None = None
+    governing_sensor_id: str | None = Field(
+        default=None, description="The sensor projected to reach the target last"
+    )
+    sensors: list[SensorForecast] = Field(default_factory=list)
+
 
+class ForecastBoardResponse(BaseModel):
+    generated_at: dt.datetime
+    pours: list[PourForecast]
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import datetime as dt
-from typing import List
+from typing import Annotated
 
 from pydantic import BaseModel, Field, field_validator
+from typing_extensions import TypedDict
 
 
 class ReadingPayload(BaseModel):
@@ -15,23 +16,45 @@ class ReadingPayload(BaseModel):
     @classmethod
     def ensure_timezone(cls, value: dt.datetime) -> dt.datetime:
         if value.tzinfo is None:
-            return value.replace(tzinfo=dt.timezone.utc)
-        return value.astimezone(dt.timezone.utc)
+            return value.replace(tzinfo=dt.UTC)
+        return value.astimezone(dt.UTC)
 
 
 class ReadingBatchRequest(BaseModel):
-    readings: List[ReadingPayload]
+    readings: list[ReadingPayload]
 
     @field_validator("readings")
     @classmethod
-    def ensure_non_empty(cls, readings: List[ReadingPayload]) -> List[ReadingPayload]:
+    def ensure_non_empty(cls, readings: list[ReadingPayload]) -> list[ReadingPayload]:
         if not readings:
             raise ValueError("readings must not be empty")
         return readings
 
 
+class ReadingRow(TypedDict):
+    """Reading as parsed on the batch fast path; range and timezone are checked per batch."""
+
+    sensor_id: str
+    ts: dt.datetime
+    celsius: float
+
+
+class ReadingBatchBody(TypedDict):
+    readings: Annotated[list[ReadingRow], Field(min_length=1)]
+
+
 class ReadingBatchResponse(BaseModel):
     processed: int
     inserted: int
     updated: int
 
+
+class ReadingReject(BaseModel):
+    line: int
+    error: str
+
+
+class ReadingStreamResponse(ReadingBatchResponse):
+    rejected: int
+    rejects: list[ReadingReject]
+    rejects_truncated: bool = False
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import datetime as dt
+
+from pydantic import BaseModel, Field
+
+
+class SensorLatest(BaseModel):
+    sensor_id: str
+    project_id: str
+    device_id: str
+    ts: dt.datetime
+    celsius: float
+    ttf_c_h: float | None = Field(default=None, description="Running TTF maturity, °C·h")
+    eq_age_h: float | None = Field(default=None, description="Running equivalent age, h")
+    maturity_as_of: dt.datetime | None = None
+
+
+class SensorLatestResponse(BaseModel):
+    sensors: list[SensorLatest]
+
+
+class SensorReadingsResponse(BaseModel):
+    sensor_id: str
+    source: str = Field(description="\"readings\" or the name of the rollup read")
+    bucket_seconds: int | None = Field(default=None, description="Rollup bucket width")
+    ts: list[dt.datetime]
+    celsius: list[float]
+    next_cursor: str | None = Field(
+        default=None, description="Pass as cursor to fetch the next page; null on the last one"
+    )
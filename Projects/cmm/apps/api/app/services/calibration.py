@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import datetime as dt
+import math
+import multiprocessing
+import time
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.domain.calibration import ArrayPair, CurveFit, fit_strength_curves
+from app.models.domain import Calibration, CalibrationRun, Mix
+from app.schemas.calibrations import CalibrationCreate
+
+_R_SQUARED_FLOOR = -9.9999
+"""Smallest value ``calibrations.r_squared`` (``Numeric(5, 4)``) can hold."""
+
+
+class RefitResult(NamedTuple):
+    runs: list[tuple[Calibration, CalibrationRun]]
+    errors: list[tuple[Calibration, str]]
+    mode: str
+    workers: int
+    wall_ms: float
+
+
+def method_basis(method: str) -> str:
+    """Maturity basis of a calibration method: Nurse-Saul TTF or Arrhenius equivalent age."""
+    return "eq_age" if method == "arrhenius" else "ttf"
+
+
+def calibration_breaks(calibration: Calibration) -> ArrayPair | None:
+    """The ``(maturity, strength)`` break data a calibration was fitted from, if stored."""
+    breaks = (calibration.parameters or {}).get("breaks")
+    if not breaks:
+        return None
+    data = np.asarray(breaks, dtype=np.float64).reshape(-1, 2)
+    return data[:, 0], data[:, 1]
+
+
+_INCREASING_PARAMS = {"log": ("a",), "asymptotic": ("f_u", "k")}
+"""Parameters that must be positive for strength to grow with maturity."""
+
+
+def _check_fit(fit: CurveFit) -> str | None:
+    if not fit.converged or not all(math.isfinite(value) for value in fit.params.values()):
+        return f"The breaks do not determine a {fit.curve_type} curve."
+    return None
+
+
+def _promotion_issue(fit: CurveFit) -> str | None:
+    """Why ``fit`` must not replace its mix's curve, or None if it may."""
+    falling = [name for name in _INCREASING_PARAMS[fit.curve_type] if fit.params[name] <= 0]
+    if falling:
+        return f"Strength does not increase with maturity ({', '.join(falling)} <= 0)."
+    minimum = settings.calibration_min_r_squared
+    if not math.isfinite(fit.r_squared) or fit.r_squared < minimum:
+        return f"r_squared is below {minimum}."
+    return None
+
+
+def _store_fit(
+    session: Session,
+    calibration: Calibration,
+    mix: Mix,
+    fit: CurveFit,
+    started_at: dt.datetime,
+    summary: dict,
+) -> CalibrationRun:
+    """
+    Record ``fit`` on ``calibration`` and its mix, and log the run that produced it.
+
+    The mix's ``maturity_curve`` takes the fitted curve in the format read by
+    :func:`app.services.strength_forecast.mix_curve`, unless the curve does not increase with
+    maturity or its ``r_squared`` is below ``calibration_min_r_squared``. Such fits are kept on
+    the calibration with ``promoted`` false and the reason, and the mix keeps its curve.
+    """
+    curve_params = dict(fit.params)
+    if fit.residual_sigma is not None:
+        curve_params["sigma"] = fit.residual_sigma
+    issue = _promotion_issue(fit)
+    calibration.parameters = {
+        **(calibration.parameters or {}),
+        "curve_type": fit.curve_type,
+        "curve_params": curve_params,
+        "residual_sigma": fit.residual_sigma,
+        "points": fit.points,
+        "iterations": fit.iterations,
+        "promoted": issue is None,
+        "promotion_issue": issue,
+    }
+    calibration.r_squared = (
+        round(max(fit.r_squared, _R_SQUARED_FLOOR), 4) if math.isfinite(fit.r_squared) else None
+    )
+    if issue is None:
+        mix.maturity_curve = {
+            "curve_type": fit.curve_type,
+            "curve_params": curve_params,
+            "basis": method_basis(calibration.method),
+            "calibration_id": calibration.id,
+        }
+    run = CalibrationRun(
+        calibration_id=calibration.id,
+        started_at=started_at,
+        completed_at=dt.datetime.now(dt.UTC),
+        summary={
+            "curve_type": fit.curve_type,
+            "points": fit.points,
+            "iterations": fit.iterations,
+            "r_squared": fit.r_squared if math.isfinite(fit.r_squared) else None,
+            "promoted": issue is None,
+            **summary,
+        },
+    )
+    session.add(run)
+    return run
+
+
+def calibrate_mix(
+    session: Session, payload: CalibrationCreate
+) -> tuple[Calibration, CalibrationRun]:
+    """
+    Fit a strength-maturity curve to a mix's cylinder breaks and store it.
+
+    A new :class:`Calibration` keeps the breaks, the fitted parameters, ``r_squared`` and the
+    residual standard error; the mix's ``maturity_curve`` is replaced by the fit if it passes
+    the checks of :func:`_store_fit`.
+
+    Raises
+    ------
+    LookupError
+        If the mix does not exist or belongs to another tenant.
+    ValueError
+        If the breaks do not determine the curve.
+    """
+    mix = session.get(Mix, payload.mix_id)
+    if mix is None or mix.tenant_id != payload.tenant_id:
+        raise LookupError(f"Mix '{payload.mix_id}' not found.")
+
+    started_at = dt.datetime.now(dt.UTC)
+    started = time.perf_counter()
+    (fit,) = fit_strength_curves(
+        [([b.maturity for b in payload.breaks], [b.strength for b in payload.breaks])],
+        payload.curve_type,
+    )
+    fit_ms = (time.perf_counter() - started) * 1000.0
+    problem = _check_fit(fit)
+    if problem is not None:
+        raise ValueError(problem)
+
+    calibration = Calibration(
+        tenant_id=payload.tenant_id,
+        mix_id=mix.id,
+        method=payload.method,
+        parameters={"breaks": [[b.maturity, b.strength] for b in payload.breaks]},
+    )
+    session.add(calibration)
+    session.flush()
+    run = _store_fit(
+        session, calibration, mix, fit, started_at, {"mode": "single", "fit_ms": fit_ms}
+    )
+    session.flush()
+    return calibration, run
+
+
+def _fit_jobs(
+    jobs: Sequence[tuple[str, ArrayPair]], workers: int, use_pool: bool
+) -> list[CurveFit]:
+    """
+    Fit every ``(curve_type, data)`` job, in order.
+
+    Jobs are grouped by curve type and each group split into ``workers`` chunks. Every chunk
+    is one batched :func:`fit_strength_curves` call, run in a process pool when ``use_pool``
+    is set and in this process otherwise.
+    """
+    chunks: list[tuple[str, list[int]]] = []
+    for curve_type in sorted({curve_type for curve_type, _ in jobs}):
+        members = [index for index, (kind, _) in enumerate(jobs) if kind == curve_type]
+        parts = np.array_split(np.asarray(members), min(workers, len(members)))
+        chunks.extend((curve_type, part.tolist()) for part in parts)
+    datasets = [[jobs[index][1] for index in members] for _, members in chunks]
+    curve_types = [curve_type for curve_type, _ in chunks]
+
+    if use_pool:
+        # Spawned workers only import the numpy fitting module to unpickle the call, and do
+        # not inherit the parent's database connections or threads.
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            outputs = list(pool.map(fit_strength_curves, datasets, curve_types))
+    else:
+        outputs = [
+            fit_strength_curves(data, kind)
+            for data, kind in zip(datasets, curve_types, strict=True)
+        ]
+
+    results: list[CurveFit | None] = [None] * len(jobs)
+    for (_, members), fits in zip(chunks, outputs, strict=True):
+        for index, fit in zip(members, fits, strict=True):
+            results[index] = fit
+    return results  # type: ignore[return-value]
+
+
+def refit_tenant(
+    session: Session,
+    tenant_id: str,
+    curve_type: str | None = None,
+    workers: int | None = None,
+) -> RefitResult:
+    """
+    Refit the latest calibration of every mix of a tenant from its stored breaks.
+
+    All fits of a curve type run as one batch of :func:`fit_strength_curves`, which fits
+    thousands of mixes per second in a single process. From ``calibration_pool_min_mixes``
+    mixes on, the batch is split over a process pool of ``workers`` (default
+    ``calibration_pool_workers``) processes; below that, starting the pool costs more than
+    it saves. Every refit calibration gets a :class:`CalibrationRun` whose summary records
+    the mode, the worker count, the wall time of the whole batch and each fit's amortised
+    share of it.
+
+    Parameters
+    ----------
+    session : Session
+        Active database session; the caller commits.
+    tenant_id : str
+        Tenant whose mixes are refit.
+    curve_type : str, optional
+        Curve to fit; defaults to each calibration's current one, or ``"log"``.
+    workers : int, optional
+        Process count for the pool.
+
+    Returns
+    -------
+    RefitResult
+        The runs written, calibrations that could not be refit, and batch timing.
+    """
+    workers = workers or settings.calibration_pool_workers
+    latest: dict[str, Calibration] = {}
+    for calibration in session.scalars(
+        select(Calibration)
+        .where(Calibration.tenant_id == tenant_id, Calibration.mix_id.is_not(None))
+        .order_by(Calibration.created_at.desc(), Calibration.id)
+    ):
+        latest.setdefault(calibration.mix_id, calibration)
+    mixes = {mix.id: mix for mix in session.scalars(select(Mix).where(Mix.id.in_(list(latest))))}
+
+    jobs: list[tuple[str, ArrayPair]] = []
+    pending: list[Calibration] = []
+    errors: list[tuple[Calibration, str]] = []
+    for mix_id in sorted(latest):
+        calibration = latest[mix_id]
+        data = calibration_breaks(calibration)
+        if data is None:
+            errors.append((calibration, "The calibration has no stored breaks."))
+            continue
+        kind = curve_type or (calibration.parameters or {}).get("curve_type") or "log"
+        jobs.append((kind, data))
+        pending.append(calibration)
+
+    use_pool = workers > 1 and len(jobs) >= settings.calibration_pool_min_mixes
+    started_at = dt.datetime.now(dt.UTC)
+    started = time.perf_counter()
+    fitted = _fit_jobs(jobs, workers, use_pool) if jobs else []
+    wall_ms = (time.perf_counter() - started) * 1000.0
+    mode = "process_pool" if use_pool else "in_process"
+
+    runs: list[tuple[Calibration, CalibrationRun]] = []
+    for calibration, fit in zip(pending, fitted, strict=True):
+        problem = _check_fit(fit)
+        if problem is not None:
+            errors.append((calibration, problem))
+            continue
+        summary = {
+            "mode": mode,
+            "workers": workers if use_pool else 1,
+            "batch_mixes": len(jobs),
+            "batch_wall_ms": wall_ms,
+            "fit_ms": wall_ms / len(jobs),
+        }
+        run = _store_fit(session, calibration, mixes[calibration.mix_id], fit, started_at, summary)
+        runs.append((calibration, run))
+    session.flush()
+    return RefitResult(runs, errors, mode, workers if use_pool else 1, wall_ms)
@@ -0,0 +1,432 @@
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import json
+import logging
+import uuid
+from collections import defaultdict, deque
+from collections.abc import AsyncIterator, Iterable, Sequence
+from dataclasses import asdict, dataclass
+from functools import cached_property
+from typing import Any
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.domain import SensorMaturityState, readings_ts
+from app.services.maturity_state import as_utc
+from app.services.sensor_cache import SensorMetadata
+
+logger = logging.getLogger(__name__)
+
+LIVE_CHANNEL = "cmm:live:readings"
+RELAY_RETRY_MAX_S = 30.0
+
+LiveReading = tuple[str, dt.datetime, float]
+"""``(sensor_id, ts, celsius)`` with ``ts`` timezone-aware UTC."""
+
+LiveMaturity = tuple[str, float, float, dt.datetime | None]
+"""``(sensor_id, ttf_c_h, eq_age_h, as_of)`` of the default-parameter accumulator."""
+
+
+def project_topic(project_id: str) -> str:
+    return f"project:{project_id}"
+
+
+def pour_topic(pour_id: str) -> str:
+    return f"pour:{pour_id}"
+
+
+def _isoformat(value: dt.datetime | None) -> str | None:
+    return value.isoformat() if value is not None else None
+
+
+def _parse_ts(value: str | None) -> dt.datetime | None:
+    return as_utc(dt.datetime.fromisoformat(value)) if value is not None else None
+
+
+@dataclass(frozen=True)
+class LiveCursor:
+    """
+    Resume point of a live stream: every reading up to ``(ts, sensor_id)`` was sent.
+
+    Replay runs in ``(ts, sensor_id)`` order, so the pair pins where a page ended even inside
+    an instant many sensors share. Without a sensor every reading at ``ts`` counts as sent,
+    which is what a plain ``since`` timestamp means.
+    """
+
+    ts: dt.datetime
+    sensor_id: str | None = None
+
+    @property
+    def key(self) -> tuple:
+        # A cursor without a sensor covers the whole instant, so it sorts after its sensors.
+        return (self.ts, self.sensor_id is None, self.sensor_id or "")
+
+    def encode(self) -> str:
+        if self.sensor_id is None:
+            return self.ts.isoformat()
+        return f"{self.ts.isoformat()}/{self.sensor_id}"
+
+    @classmethod
+    def parse(cls, value: str) -> LiveCursor:
+        """Read an event id; raises ``ValueError`` if it holds no valid timestamp."""
+        ts, _, sensor_id = value.partition("/")
+        return cls(as_utc(dt.datetime.fromisoformat(ts)), sensor_id or None)
+
+
+@dataclass(frozen=True)
+class LiveEvent:
+    """Readings and maturity updates of one topic, encoded once for every subscriber."""
+
+    topic: str
+    readings: tuple[LiveReading, ...] = ()
+    maturity: tuple[LiveMaturity, ...] = ()
+    coalesced: bool = False
+
+    @cached_property
+    def cursor(self) -> LiveCursor | None:
+        """The last of the event's readings in replay order."""
+        newest = max(((ts, sensor_id) for sensor_id, ts, _ in self.readings), default=None)
+        return LiveCursor(*newest) if newest is not None else None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "topic": self.topic,
+            "coalesced": self.coalesced,
+            "readings": [
+                {"sensor_id": sensor_id, "ts": ts.isoformat(), "celsius": celsius}
+                for sensor_id, ts, celsius in self.readings
+            ],
+            "maturity": [
+                {
+                    "sensor_id": sensor_id,
+                    "ttf_c_h": ttf_c_h,
+                    "eq_age_h": eq_age_h,
+                    "as_of": _isoformat(as_of),
+                }
+                for sensor_id, ttf_c_h, eq_age_h, as_of in self.maturity
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> LiveEvent:
+        return cls(
+            topic=data["topic"],
+            readings=tuple(
+                (item["sensor_id"], _parse_ts(item["ts"]), float(item["celsius"]))
+                for item in data.get("readings", ())
+            ),
+            maturity=tuple(
+                (
+                    item["sensor_id"],
+                    float(item["ttf_c_h"]),
+                    float(item["eq_age_h"]),
+                    _parse_ts(item.get("as_of")),
+                )
+                for item in data.get("maturity", ())
+            ),
+            coalesced=bool(data.get("coalesced", False)),
+        )
+
+    @cached_property
+    def encoded(self) -> bytes:
+        return json.dumps(self.to_dict(), separators=(",", ":")).encode()
+
+
+def coalesce_events(events: Iterable[LiveEvent]) -> LiveEvent:
+    """
+    Collapse events of one topic into the newest reading and latest maturity per sensor.
+
+    Later events win ties, so a re-sent reading replaces the value it overwrote in storage.
+    """
+    topic = None
+    readings: dict[str, LiveReading] = {}
+    maturity: dict[str, LiveMaturity] = {}
+    for event in events:
+        topic = event.topic
+        for reading in event.readings:
+            current = readings.get(reading[0])
+            if current is None or reading[1] >= current[1]:
+                readings[reading[0]] = reading
+        for entry in event.maturity:
+            maturity[entry[0]] = entry
+    if topic is None:
+        raise ValueError("No events to coalesce.")
+    return LiveEvent(
+        topic,
+        tuple(sorted(readings.values(), key=lambda reading: (reading[1], reading[0]))),
+        tuple(maturity[sensor_id] for sensor_id in sorted(maturity)),
+        coalesced=True,
+    )
+
+
+def reading_events(
+    records: Sequence[dict],
+    sensors: dict[str, SensorMetadata],
+    maturity: Sequence[LiveMaturity] = (),
+) -> list[LiveEvent]:
+    """Group freshly written ``records`` and ``maturity`` into one event per project and pour."""
+    topics_of = {
+        sensor_id: [project_topic(metadata.project_id)]
+        + [pour_topic(pour_id) for pour_id in metadata.pour_ids]
+        for sensor_id, metadata in sensors.items()
+    }
+    readings: dict[str, list[LiveReading]] = defaultdict(list)
+    for record in records:
+        reading = (record["sensor_id"], as_utc(record["ts"]), float(record["celsius"]))
+        for topic in topics_of.get(record["sensor_id"], ()):
+            readings[topic].append(reading)
+    updates: dict[str, list[LiveMaturity]] = defaultdict(list)
+    for entry in maturity:
+        for topic in topics_of.get(entry[0], ()):
+            updates[topic].append(entry)
+    return [
+        LiveEvent(topic, tuple(readings[topic]), tuple(updates[topic]))
+        for topic in sorted(readings.keys() | updates.keys())
+    ]
+
+
+def maturity_updates(states: Iterable[SensorMaturityState]) -> list[LiveMaturity]:
+    return [
+        (
+            state.sensor_id,
+            float(state.ttf_c_h),
+            float(state.eq_age_h),
+            as_utc(state.last_ts) if state.last_ts is not None else None,
+        )
+        for state in states
+    ]
+
+
+async def replay_readings(
+    session: AsyncSession, sensor_ids: Sequence[str], after: LiveCursor, limit: int
+) -> list[LiveReading]:
+    """Return up to ``limit`` readings of ``sensor_ids`` past ``after``, in replay order."""
+    if not sensor_ids:
+        return []
+    ts, sensor_id = readings_ts.c.ts, readings_ts.c.sensor_id
+    if after.sensor_id is None:
+        past = ts > after.ts
+    else:
+        past = or_(ts > after.ts, and_(ts == after.ts, sensor_id > after.sensor_id))
+    rows = await session.execute(
+        select(sensor_id, ts, readings_ts.c.celsius)
+        .where(sensor_id.in_(sensor_ids), past)
+        .order_by(ts, sensor_id)
+        .limit(limit)
+    )
+    return [(row.sensor_id, as_utc(row.ts), float(row.celsius)) for row in rows]
+
+
+class Subscription:
+    """
+    One client's bounded buffer of pending events.
+
+    When more than ``max_events`` are pending the buffer is coalesced into a single event, so a
+    slow consumer skips intermediate readings instead of holding memory or slowing the
+    publisher.
+    """
+
+    def __init__(self, topic: str, max_events: int) -> None:
+        self.topic = topic
+        self.max_events = max_events
+        self._pending: deque[LiveEvent] = deque()
+        self._ready = asyncio.Event()
+
+    def push(self, event: LiveEvent) -> bool:
+        """Queue ``event``; ``True`` if that overflowed the buffer and coalesced it."""
+        self._pending.append(event)
+        self._ready.set()
+        if len(self._pending) <= self.max_events:
+            return False
+        merged = coalesce_events(self._pending)
+        self._pending.clear()
+        self._pending.append(merged)
+        return True
+
+    async def get(self, timeout: float | None = None) -> list[LiveEvent]:
+        """Wait for and drain the pending events; empty after ``timeout`` seconds without any."""
+        if not self._pending:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except TimeoutError:
+                return []
+        self._ready.clear()
+        events = list(self._pending)
+        self._pending.clear()
+        return events
+
+
+@dataclass
+class LiveHubStats:
+    published: int = 0
+    delivered: int = 0
+    coalesced: int = 0
+    relayed: int = 0
+    errors: int = 0
+
+
+class LiveHub:
+    """
+    In-process fan-out of ingest events to live subscribers, keyed by topic.
+
+    With a Redis client every published event is also sent on :data:`LIVE_CHANNEL` and events
+    from other processes (API workers, the MQTT ingest) are relayed to local subscribers, so a
+    client sees every reading whichever process wrote it. Without one, subscribers see writes of
+    their own process only.
+    """
+
+    def __init__(self, client: Redis | None = None, buffer_events: int = 256) -> None:
+        self.client = client
+        self.buffer_events = buffer_events
+        self.origin = uuid.uuid4().hex
+        self.stats = LiveHubStats()
+        self._topics: dict[str, set[Subscription]] = {}
+        self._relay: asyncio.Task | None = None
+
+    @classmethod
+    def from_settings(cls) -> LiveHub:
+        client = Redis.from_url(settings.redis_url) if settings.redis_url else None
+        return cls(client, buffer_events=settings.live_buffer_events)
+
+    @property
+    def active(self) -> bool:
+        """Whether publishing can reach anyone, i.e. it is worth building events."""
+        return self.client is not None or bool(self._topics)
+
+    def subscribe(self, topic: str) -> Subscription:
+        subscription = Subscription(topic, self.buffer_events)
+        self._topics.setdefault(topic, set()).add(subscription)
+        if self.client is not None:
+            self._ensure_relay()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._topics.get(subscription.topic)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._topics[subscription.topic]
+
+    def deliver(self, events: Iterable[LiveEvent]) -> None:
+        """Hand ``events`` to the local subscribers of their topics."""
+        for event in events:
+            for subscription in self._topics.get(event.topic, ()):
+                self.stats.coalesced += subscription.push(event)
+                self.stats.delivered += 1
+
+    async def publish(self, events: Sequence[LiveEvent]) -> None:
+        """Deliver ``events`` locally and, with Redis, to the other processes."""
+        if not events:
+            return
+        self.stats.published += len(events)
+        self.deliver(events)
+        if self.client is None:
+            return
+        message = json.dumps(
+            {"origin": self.origin, "events": [event.to_dict() for event in events]},
+            separators=(",", ":"),
+        )
+        try:
+            await self.client.publish(LIVE_CHANNEL, message)
+        except (RedisError, OSError):
+            # The readings are committed; remote subscribers catch up when they resume.
+            self.stats.errors += 1
+            logger.warning("Could not publish live readings", exc_info=True)
+
+    def _ensure_relay(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._relay is None or self._relay.done() or self._relay.get_loop() is not loop:
+            self._relay = loop.create_task(self._run_relay(), name="live-relay")
+
+    async def _run_relay(self) -> None:
+        delay = 0.5
+        while True:
+            try:
+                async with self.client.pubsub() as pubsub:
+                    await pubsub.subscribe(LIVE_CHANNEL)
+                    delay = 0.5
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self._relay_message(message["data"])
+            except (RedisError, OSError):
+                self.stats.errors += 1
+                logger.warning("Live relay lost Redis; reconnecting", exc_info=True)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RELAY_RETRY_MAX_S)
+
+    def _relay_message(self, raw: bytes | str) -> None:
+        try:
+            body = json.loads(raw)
+            if body.get("origin") == self.origin:
+                return
+            events = [LiveEvent.from_dict(item) for item in body["events"]]
+        except (KeyError, TypeError, ValueError, AttributeError):
+            self.stats.errors += 1
+            logger.warning("Dropping malformed live message", exc_info=True)
+            return
+        self.stats.relayed += len(events)
+        self.deliver(events)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "relay": self.client is not None,
+            **asdict(self.stats),
+            "topics": len(self._topics),
+            "subscribers": sum(len(subscribers) for subscribers in self._topics.values()),
+        }
+
+
+def format_sse(event: LiveEvent, event_id: LiveCursor | None) -> bytes:
+    head = f"id: {event_id.encode()}\n" if event_id is not None else ""
+    return f"{head}event: readings\ndata: ".encode() + event.encoded + b"\n\n"
+
+
+def _advance(cursor: LiveCursor | None, event: LiveEvent) -> LiveCursor | None:
+    if event.cursor is None or (cursor is not None and event.cursor.key <= cursor.key):
+        return cursor
+    return event.cursor
+
+
+async def stream_events(
+    hub: LiveHub,
+    subscription: Subscription,
+    replay: LiveEvent | None = None,
+    *,
+    cursor: LiveCursor | None = None,
+    heartbeat_s: float = 15.0,
+    end_after_replay: bool = False,
+) -> AsyncIterator[bytes]:
+    """
+    Yield Server-Sent Events for ``subscription``, starting with the ``replay`` event.
+
+    Every event's id is the furthest :class:`LiveCursor` sent so far, which a reconnecting
+    ``EventSource`` returns as ``Last-Event-ID`` to resume from. A comment line is sent after
+    ``heartbeat_s`` seconds without events so proxies keep the connection open and a gone
+    client is noticed. The subscription is dropped when the stream ends or is cancelled.
+    """
+    try:
+        if replay is not None and replay.readings:
+            cursor = _advance(cursor, replay)
+            yield format_sse(replay, cursor)
+        if end_after_replay:
+            return
+        while True:
+            events = await subscription.get(heartbeat_s)
+            if not events:
+                yield b": keepalive\n\n"
+                continue
+            for event in events:
+                cursor = _advance(cursor, event)
+                yield format_sse(event, cursor)
+    finally:
+        hub.unsubscribe(subscription)
+
+
+live_hub = LiveHub.from_settings()
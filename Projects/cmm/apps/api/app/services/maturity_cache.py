@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import asdict, dataclass
+from typing import Any, TypeVar
+
+from pydantic import BaseModel
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+KEY_PREFIX = "cmm:maturity"
+
+
+def version_key(pour_id: str) -> str:
+    return f"{KEY_PREFIX}:version:{pour_id}"
+
+
+def params_hash(params: dict[str, Any]) -> str:
+    canonical = json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(canonical.encode()).hexdigest()[:20]
+
+
+@dataclass
+class CacheStats:
+    l1_hits: int = 0
+    l2_hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    lock_waits: int = 0
+    invalidations: int = 0
+    errors: int = 0
+
+
+class _LocalCache:
+    """Size-bounded LRU with per-entry expiry."""
+
+    def __init__(self, max_entries: int, ttl_s: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self._entries: OrderedDict[str, tuple[float, BaseModel]] = OrderedDict()
+
+    def get(self, key: str) -> BaseModel | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: BaseModel) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_s, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class MaturityCache:
+    """
+    Two-level cache for maturity results.
+
+    Entries are keyed by pour, a hash of the request parameters and the pour's data version, a
+    Redis counter the ingest path increments whenever readings land on the pour's sensors. A
+    version bump therefore orphans every cached result of the pour at once; orphans expire by
+    TTL. The current version is read from Redis on every lookup, so the in-process L1 never
+    serves results from an older version.
+
+    Concurrent misses for one key are coalesced onto a single computation within the process and
+    guarded by a short Redis lock across processes. Without a Redis client the cache is a
+    pass-through and any Redis error degrades to computing the result directly.
+    """
+
+    def __init__(
+        self,
+        client: Redis | None = None,
+        ttl_s: int = 300,
+        l1_max_entries: int = 1024,
+        l1_ttl_s: float = 30.0,
+        lock_ttl_s: float = 10.0,
+    ) -> None:
+        self.client = client
+        self.ttl_s = ttl_s
+        self.lock_ttl_s = lock_ttl_s
+        self.l1 = _LocalCache(l1_max_entries, l1_ttl_s)
+        self.stats = CacheStats()
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    @classmethod
+    def from_settings(cls) -> MaturityCache:
+        client = Redis.from_url(settings.redis_url) if settings.redis_url else None
+        return cls(
+            client,
+            ttl_s=settings.maturity_cache_ttl_s,
+            l1_max_entries=settings.maturity_cache_l1_entries,
+            l1_ttl_s=settings.maturity_cache_l1_ttl_s,
+        )
+
+    async def get_or_compute(
+        self,
+        pour_id: str,
+        params: dict[str, Any],
+        model: type[ModelT],
+        compute: Callable[[], Awaitable[ModelT]],
+    ) -> ModelT:
+        """
+        Return the cached result for ``pour_id`` and ``params`` or compute and store it.
+
+        Parameters
+        ----------
+        pour_id : str
+            Pour the result belongs to; its data version is part of the key.
+        params : dict
+            Everything besides the readings that determines the result, including which view
+            is requested.
+        model : type of BaseModel
+            Model the result is serialized as in Redis.
+        compute : callable
+            Coroutine factory producing the result on a miss.
+        """
+        if self.client is None:
+            return await compute()
+        try:
+            version = int(await self.client.get(version_key(pour_id)) or 0)
+        except (RedisError, OSError):
+            self.stats.errors += 1
+            logger.warning("Maturity cache unavailable; computing directly", exc_info=True)
+            return await compute()
+
+        key = f"{KEY_PREFIX}:{pour_id}:{version}:{params_hash(params)}"
+        cached = self.l1.get(key)
+        if cached is not None:
+            self.stats.l1_hits += 1
+            return cached  # type: ignore[return-value]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._load(key, model, compute)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Waiters re-raise it; retrieving here keeps an unawaited future from logging.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            self.l1.set(key, result)
+            return result
+        finally:
+            del self._inflight[key]
+
+    async def _load(
+        self, key: str, model: type[ModelT], compute: Callable[[], Awaitable[ModelT]]
+    ) -> ModelT:
+        lock_key = f"{key}:lock"
+        try:
+            raw = await self.client.get(key)
+            if raw is None:
+                owner = await self.client.set(
+                    lock_key, b"1", nx=True, px=int(self.lock_ttl_s * 1000)
+                )
+                if not owner:
+                    self.stats.lock_waits += 1
+                    raw = await self._wait_for(key, lock_key)
+        except (RedisError, OSError):
+            self.stats.errors += 1
+            logger.warning("Maturity cache unavailable; computing directly", exc_info=True)
+            return await compute()
+
+        if raw is not None:
+            self.stats.l2_hits += 1
+            return model.model_validate_json(raw)
+
+        self.stats.misses += 1
+        result = await compute()
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.set(key, result.model_dump_json(), ex=self.ttl_s)
+                pipe.delete(lock_key)
+                await pipe.execute()
+        except (RedisError, OSError):
+            self.stats.errors += 1
+            logger.warning("Could not store maturity result", exc_info=True)
+        return result
+
+    async def _wait_for(self, key: str, lock_key: str) -> bytes | None:
+        # Another process holds the lock: poll until it publishes the result or gives up.
+        deadline = time.monotonic() + self.lock_ttl_s
+        while time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+            raw = await self.client.get(key)
+            if raw is not None or not await self.client.exists(lock_key):
+                return raw
+        return None
+
+    async def invalidate(self, pour_ids: Iterable[str]) -> None:
+        """Bump the data version of ``pour_ids`` so their cached results are no longer read."""
+        pour_ids = sorted(set(pour_ids))
+        if self.client is None or not pour_ids:
+            return
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                for pour_id in pour_ids:
+                    pipe.incr(version_key(pour_id))
+                await pipe.execute()
+        except (RedisError, OSError):
+            self.stats.errors += 1
+            logger.warning("Could not invalidate maturity cache", exc_info=True)
+            return
+        self.stats.invalidations += len(pour_ids)
+
+    def snapshot(self) -> dict[str, Any]:
+        lookups = self.stats.l1_hits + self.stats.l2_hits + self.stats.misses
+        hits = self.stats.l1_hits + self.stats.l2_hits
+        return {
+            "enabled": self.client is not None,
+            **asdict(self.stats),
+            "hit_ratio": hits / lookups if lookups else None,
+            "l1_entries": len(self.l1),
+        }
+
+
+maturity_cache = MaturityCache.from_settings()
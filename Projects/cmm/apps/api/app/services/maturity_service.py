@@ -1,51 +1,142 @@
 from __future__ import annotations
 
 import os
-from datetime import datetime, timedelta
-from typing import List, Optional
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
 
-from app.domain.maturity_models import equivalent_age, predict_strength, ttf_maturity
+import numpy as np
+from sqlalchemy import Select, and_, or_, select
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.domain.downsampling import lttb_indices
+from app.domain.maturity_models import (
+    cumulative_maturity,
+    maturity_integrals,
+    predict_strength,
+    predict_strength_array,
+    segmented_maturity_integrals,
+)
+from app.domain.temperature_series import TemperatureSeries, epoch_us
+from app.models.domain import Device, Pour, Sensor
 from app.schemas.maturity import (
+    BatchMaturityError,
+    BatchMaturityItem,
+    BatchMaturityResponse,
     CurveParams,
+    MaturityCurveRequest,
+    MaturityCurveResponse,
     MaturityRequest,
     MaturityResponse,
+    SensorMaturityCurve,
     StrengthCI,
+    StrengthCurve,
 )
+from app.services.storage import is_closed, readings_source
 
 DEFAULT_T0_C = float(os.getenv("MATURITY_T0_C", "-10.0"))
 DEFAULT_EA = float(os.getenv("MATURITY_EA", "33500"))
 DEFAULT_TR_C = float(os.getenv("MATURITY_TR_C", "20.0"))
+STREAM_BATCH_SIZE = int(os.getenv("MATURITY_STREAM_BATCH_SIZE", "5000"))
+
+SensorSample = tuple[str, datetime, float]
+
+
+def pour_sensors_query(pour: Pour) -> Select:
+    """
+    Select the ids of the sensors instrumenting a pour.
+
+    Sensors belong to a pour through the devices installed at its location; pours without a
+    location fall back to every sensor of the project.
+    """
+    stmt = select(Sensor.id).where(Sensor.project_id == pour.project_id)
+    if pour.location_id is not None:
+        stmt = stmt.join(Device, Device.id == Sensor.device_id).where(
+            Device.location_id == pour.location_id
+        )
+    return stmt.order_by(Sensor.id)
+
+
+def pour_sensor_ids(session: Session, pour: Pour) -> list[str]:
+    """Resolve the sensors instrumenting a pour with :func:`pour_sensors_query`."""
+    return list(session.scalars(pour_sensors_query(pour)).all())
+
+
+def pour_sensor_map(session: Session, pours: Iterable[Pour]) -> dict[str, list[str]]:
+    """Resolve the sensors of many pours in one query, with the rules of :func:`pour_sensor_ids`."""
+    pour_ids = [pour.id for pour in pours]
+    sensors: dict[str, list[str]] = {pour_id: [] for pour_id in pour_ids}
+    if not pour_ids:
+        return sensors
+    stmt = (
+        select(Pour.id, Sensor.id)
+        .join(Sensor, Sensor.project_id == Pour.project_id)
+        .outerjoin(Device, Device.id == Sensor.device_id)
+        .where(
+            Pour.id.in_(pour_ids),
+            or_(Pour.location_id.is_(None), Device.location_id == Pour.location_id),
+        )
+        .order_by(Pour.id, Sensor.id)
+    )
+    for pour_id, sensor_id in session.execute(stmt):
+        sensors[pour_id].append(sensor_id)
+    return sensors
 
 
 class MaturityService:
     """Compute maturity metrics and optional strength predictions for pours."""
 
-    def get_temperature_series(self, pour_id: str) -> List[tuple[datetime, float]]:
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal) -> None:
+        self._session_factory = session_factory
+
+    def get_temperature_series(self, pour_id: str) -> Iterator[SensorSample]:
         """
-        Produce a deterministic synthetic temperature series for a pour.
+        Stream a pour's readings from ``readings_ts`` since the pour started.
+
+        Closed pours also read ``readings_archive``, where their readings are tiered once the
+        pour has been closed for ``archive_closed_pours_after_days``.
+
+        Rows are fetched through a server-side cursor in batches of ``STREAM_BATCH_SIZE`` so
+        memory stays flat regardless of how long the pour has been logging.
 
         Parameters
         ----------
         pour_id : str
-            Identifier of the pour (unused in synthetic data).
+            Identifier of the pour.
 
-        Returns
-        -------
-        list[(datetime, float)]
-            Hourly samples across 24 hours.
+        Yields
+        ------
+        (sensor_id, datetime, float)
+            Readings ordered by sensor and then by timestamp.
+
+        Raises
+        ------
+        LookupError
+            If the pour does not exist.
         """
-        base = datetime(2025, 1, 1, 0, 0)
-        series: List[tuple[datetime, float]] = []
-        for hour in range(25):
-            ts = base + timedelta(hours=hour)
-            if hour < 8:
-                temp = 22.0 + hour * 1.5  # warming phase
-            elif hour < 16:
-                temp = 34.0 + (hour - 8) * 0.5  # slightly increasing
-            else:
-                temp = 38.0 - (hour - 16) * 1.0  # cooling
-            series.append((ts, temp))
-        return series
+        with self._session_factory() as session:
+            pour = session.get(Pour, pour_id)
+            if pour is None:
+                raise LookupError(f"Pour '{pour_id}' not found.")
+            sensor_ids = pour_sensor_ids(session, pour)
+            if not sensor_ids:
+                return
+
+            source = readings_source(include_archive=is_closed(pour))
+            stmt = (
+                select(source.c.sensor_id, source.c.ts, source.c.celsius)
+                .where(
+                    source.c.sensor_id.in_(sensor_ids),
+                    source.c.ts >= pour.started_at,
+                )
+                .order_by(source.c.sensor_id, source.c.ts)
+                .execution_options(yield_per=STREAM_BATCH_SIZE)
+            )
+            for row in session.execute(stmt):
+                yield row.sensor_id, row.ts, float(row.celsius)
 
     def _strength_ci_from_result(
         self,
@@ -60,32 +151,366 @@ class MaturityService:
             lower, upper = ci
         return StrengthCI(mean=mean, lower=lower, upper=upper)
 
+    @staticmethod
+    def _params(req: MaturityRequest) -> tuple[float, float, float]:
+        return (
+            req.T0_c if req.T0_c is not None else DEFAULT_T0_C,
+            req.Ea if req.Ea is not None else DEFAULT_EA,
+            req.Tr_c if req.Tr_c is not None else DEFAULT_TR_C,
+        )
+
+    def _response(
+        self, pour_id: str, req: MaturityRequest, ttf_value: float, eq_age_value: float
+    ) -> MaturityResponse:
+        strength_ttf: StrengthCI | None = None
+        strength_eq: StrengthCI | None = None
+        if req.curve_type and req.curve_params:
+            strength_ttf = self._strength_ci_from_result(
+                ttf_value, req.curve_type, req.curve_params
+            )
+            strength_eq = self._strength_ci_from_result(
+                eq_age_value, req.curve_type, req.curve_params
+            )
+
+        return MaturityResponse(
+            pour_id=pour_id,
+            ttf_c_h=ttf_value,
+            eq_age_h=eq_age_value,
+            strength_ttf=strength_ttf,
+            strength_eq=strength_eq,
+        )
+
     def compute(self, pour_id: str, req: MaturityRequest) -> MaturityResponse:
         """
         Compute TTF and Arrhenius maturity along with optional strength predictions.
+
+        Each sensor's stream is packed into a :class:`TemperatureSeries` as it is read and
+        integrated separately; the governing (lowest) maturity across sensors is reported.
+        With ``req.as_of`` only readings up to that instant count, and sensors with maturity
+        checkpoints integrate just the readings after the last checkpoint before it.
+        """
+        if req.as_of is not None:
+            return self._compute_as_of(pour_id, req)
+        rows = self.get_temperature_series(pour_id)
+        series = (
+            TemperatureSeries.from_rows((ts, celsius) for _, ts, celsius in sensor_rows)
+            for _, sensor_rows in groupby(rows, key=itemgetter(0))
+        )
+        return self.compute_series(pour_id, req, series)
+
+    def compute_series(
+        self, pour_id: str, req: MaturityRequest, series: Iterable[TemperatureSeries]
+    ) -> MaturityResponse:
+        """
+        Compute the response of :meth:`compute` from temperature histories already in memory.
+
+        Parameters
+        ----------
+        pour_id : str
+            Identifier reported in the response.
+        req : MaturityRequest
+            Model parameters and optional strength curve.
+        series : iterable of TemperatureSeries
+            One history per sensor of the pour.
+
+        Raises
+        ------
+        ValueError
+            If no sensor has at least two samples.
         """
-        samples = self.get_temperature_series(pour_id)
-        if len(samples) < 2:
+        T0_c, Ea, Tr_c = self._params(req)
+
+        ttf_values: list[float] = []
+        eq_age_values: list[float] = []
+        for sensor_series in series:
+            if len(sensor_series) >= 2:
+                ttf, eq_age = maturity_integrals(sensor_series, None, T0_c, Ea, Tr_c)
+                ttf_values.append(ttf)
+                eq_age_values.append(eq_age)
+        if not ttf_values:
             raise ValueError("Insufficient temperature samples to compute maturity.")
 
-        T0_c = req.T0_c if req.T0_c is not None else DEFAULT_T0_C
-        Ea = req.Ea if req.Ea is not None else DEFAULT_EA
-        Tr_c = req.Tr_c if req.Tr_c is not None else DEFAULT_TR_C
+        return self._response(pour_id, req, min(ttf_values), min(eq_age_values))
 
-        ttf_value = ttf_maturity(samples, T0_c)
-        eq_age_value = equivalent_age(samples, Ea, Tr_c)
+    def maturity_curve(self, pour_id: str, req: MaturityCurveRequest) -> MaturityCurveResponse:
+        """
+        Compute each sensor's maturity and predicted strength at every reading.
 
-        strength_ttf: Optional[StrengthCI] = None
-        strength_eq: Optional[StrengthCI] = None
-        if req.curve_type and req.curve_params:
-            strength_ttf = self._strength_ci_from_result(ttf_value, req.curve_type, req.curve_params)
-            strength_eq = self._strength_ci_from_result(eq_age_value, req.curve_type, req.curve_params)
+        Every sensor's running TTF and equivalent age come from one cumulative-sum pass over its
+        readings since the pour started (up to ``req.as_of`` if given). With ``req.max_points``
+        each curve is reduced with :func:`app.domain.downsampling.lttb_indices` on its TTF
+        maturity. The strength curves of all sensors are then evaluated together with
+        :func:`predict_strength_array`, with a confidence band when the curve has ``sigma``.
 
-        return MaturityResponse(
+        Raises
+        ------
+        LookupError
+            If the pour does not exist.
+        ValueError
+            If the curve parameters are incomplete.
+        """
+        T0_c, Ea, Tr_c = self._params(req)
+        as_of_us = epoch_us(req.as_of) if req.as_of is not None else None
+
+        sensor_ids: list[str] = []
+        samples: list[TemperatureSeries] = []
+        ttf_parts: list[np.ndarray] = []
+        eq_age_parts: list[np.ndarray] = []
+        for sensor_id, sensor_rows in groupby(
+            self.get_temperature_series(pour_id), key=itemgetter(0)
+        ):
+            series = TemperatureSeries.from_rows(
+                (ts, celsius) for _, ts, celsius in sensor_rows
+            ).sorted()
+            if as_of_us is not None:
+                series = series[: int(np.searchsorted(series.epoch_us, as_of_us, side="right"))]
+            if not series:
+                continue
+            ttf, eq_age = cumulative_maturity(series, None, T0_c, Ea, Tr_c)
+            keep = np.arange(len(series))
+            if req.max_points is not None and len(series) > req.max_points:
+                keep = lttb_indices(series.epoch_s, ttf, req.max_points)
+            sensor_ids.append(sensor_id)
+            samples.append(TemperatureSeries(series.epoch_us[keep], series.temps_c[keep], True))
+            ttf_parts.append(ttf[keep])
+            eq_age_parts.append(eq_age[keep])
+
+        strength: dict[str, list[StrengthCurve]] = {}
+        if req.curve_type and req.curve_params and sensor_ids:
+            params_dict = req.curve_params.model_dump(exclude_none=True)
+            splits = np.cumsum([part.size for part in ttf_parts])[:-1]
+            for name, parts in (("ttf", ttf_parts), ("eq", eq_age_parts)):
+                mean, ci = predict_strength_array(
+                    np.concatenate(parts),
+                    req.curve_type,
+                    params_dict,  # type: ignore[arg-type]
+                )
+                means = np.split(mean, splits)
+                bands = (np.split(ci[0], splits), np.split(ci[1], splits)) if ci else None
+                strength[name] = [
+                    StrengthCurve(
+                        mean=means[index].tolist(),
+                        lower=bands[0][index].tolist() if bands else None,
+                        upper=bands[1][index].tolist() if bands else None,
+                    )
+                    for index in range(len(sensor_ids))
+                ]
+
+        return MaturityCurveResponse(
             pour_id=pour_id,
-            ttf_c_h=ttf_value,
-            eq_age_h=eq_age_value,
-            strength_ttf=strength_ttf,
-            strength_eq=strength_eq,
+            sensors=[
+                SensorMaturityCurve(
+                    sensor_id=sensor_id,
+                    ts=[ts for ts, _ in samples[index]],
+                    celsius=samples[index].temps_c.tolist(),
+                    ttf_c_h=ttf_parts[index].tolist(),
+                    eq_age_h=eq_age_parts[index].tolist(),
+                    strength_ttf=strength["ttf"][index] if strength else None,
+                    strength_eq=strength["eq"][index] if strength else None,
+                )
+                for index, sensor_id in enumerate(sensor_ids)
+            ],
+        )
+
+    def _compute_as_of(self, pour_id: str, req: MaturityRequest) -> MaturityResponse:
+        from app.services.maturity_state import sensor_maturity_window
+
+        with self._session_factory() as session:
+            pour = session.get(Pour, pour_id)
+            if pour is None:
+                raise LookupError(f"Pour '{pour_id}' not found.")
+            sensor_ids = pour_sensor_ids(session, pour)
+            sensors = (
+                sensor_maturity_window(
+                    session,
+                    sensor_ids,
+                    pour.started_at,
+                    req.as_of,
+                    self._params(req),
+                    include_archive=is_closed(pour),
+                )
+                if sensor_ids
+                else []
+            )
+        reporting = [sensor for sensor in sensors if sensor.readings_count >= 2]
+        if not reporting:
+            raise ValueError("Insufficient temperature samples to compute maturity.")
+        return self._response(
+            pour_id,
+            req,
+            min(sensor.ttf_c_h for sensor in reporting),
+            min(sensor.eq_age_h for sensor in reporting),
+        )
+
+    def _load_sensor_series(
+        self,
+        session: Session,
+        pours: Sequence[Pour],
+        sensors: dict[str, list[str]],
+    ) -> tuple[TemperatureSeries, dict[str, tuple[int, int]]]:
+        """
+        Scan every sensor once, returning one concatenated series and each sensor's slice.
+
+        Each sensor is read from the earliest start among its own pours, so a long-running pour
+        in the batch does not pull the full history of every other sensor. Sensors sharing that
+        start share one range predicate.
+        """
+        starts: dict[str, datetime] = {}
+        for pour in pours:
+            for sensor_id in sensors[pour.id]:
+                if sensor_id not in starts or pour.started_at < starts[sensor_id]:
+                    starts[sensor_id] = pour.started_at
+        by_start: dict[datetime, list[str]] = defaultdict(list)
+        for sensor_id, started_at in starts.items():
+            by_start[started_at].append(sensor_id)
+
+        source = readings_source(include_archive=any(is_closed(pour) for pour in pours))
+        stmt = (
+            select(source.c.sensor_id, source.c.ts, source.c.celsius)
+            .where(
+                or_(
+                    *(
+                        and_(source.c.sensor_id.in_(sorted(group)), source.c.ts >= started_at)
+                        for started_at, group in sorted(by_start.items())
+                    )
+                )
+            )
+            .order_by(source.c.sensor_id, source.c.ts)
+            .execution_options(yield_per=STREAM_BATCH_SIZE)
         )
+        bounds: dict[str, tuple[int, int]] = {}
+
+        def rows() -> Iterator[tuple[datetime, float]]:
+            count = 0
+            for sensor_id, sensor_rows in groupby(session.execute(stmt), key=itemgetter(0)):
+                first = count
+                for _, ts, celsius in sensor_rows:
+                    count += 1
+                    yield ts, celsius
+                bounds[sensor_id] = (first, count)
+
+        return TemperatureSeries.from_rows(rows()), bounds
+
+    def compute_batch(
+        self,
+        items: Sequence[BatchMaturityItem],
+        defaults: MaturityRequest | None = None,
+    ) -> BatchMaturityResponse:
+        """
+        Compute maturity for many pours with one sensor lookup and one readings scan.
+
+        Every (pour, sensor) window becomes a segment of a single concatenated sample array that
+        is integrated in one vectorized pass with per-pour parameters. Pours that are missing or
+        lack samples are reported in ``errors`` instead of failing the batch. An item's ``as_of``
+        ends its windows at that instant.
+
+        Parameters
+        ----------
+        items : sequence of BatchMaturityItem
+            Pours to compute, each with optional parameter and curve overrides.
+        defaults : MaturityRequest, optional
+            Values used for fields an item leaves unset.
+
+        Returns
+        -------
+        BatchMaturityResponse
+            Results in request order and per-pour errors.
+        """
+        requests: list[tuple[str, MaturityRequest]] = [
+            (
+                item.pour_id,
+                defaults.model_copy(update=item.model_dump(exclude={"pour_id"}, exclude_unset=True))
+                if defaults is not None
+                else item,
+            )
+            for item in items
+        ]
+        with self._session_factory() as session:
+            pours = {
+                pour.id: pour
+                for pour in session.scalars(
+                    select(Pour).where(Pour.id.in_({pour_id for pour_id, _ in requests}))
+                )
+            }
+            sensors = pour_sensor_map(session, pours.values())
+            series, bounds = (
+                self._load_sensor_series(session, list(pours.values()), sensors)
+                if any(sensors.values())
+                else (TemperatureSeries(np.zeros(0), np.zeros(0)), {})
+            )
+
+        # Every (pour, sensor) window becomes one segment of the concatenated columns.
+        owners: list[int] = []
+        windows: list[np.ndarray] = []
+        for position, (pour_id, _) in enumerate(requests):
+            pour = pours.get(pour_id)
+            if pour is None:
+                continue
+            started_us = epoch_us(pour.started_at)
+            as_of = requests[position][1].as_of
+            for sensor_id in sensors[pour_id]:
+                if sensor_id not in bounds:
+                    continue
+                first, end = bounds[sensor_id]
+                if as_of is not None:
+                    end = first + int(
+                        np.searchsorted(series.epoch_us[first:end], epoch_us(as_of), side="right")
+                    )
+                first += int(np.searchsorted(series.epoch_us[first:end], started_us))
+                windows.append(np.arange(first, end))
+                owners.append(position)
+
+        params = np.array([self._params(req) for _, req in requests], dtype=np.float64)
+        owner = np.asarray(owners, dtype=np.intp)
+        if windows:
+            indices = np.concatenate(windows)
+            segments = np.repeat(np.arange(len(windows)), [window.size for window in windows])
+            ttf, eq_age, counts = segmented_maturity_integrals(
+                segments,
+                series.epoch_us[indices] / 1e6,
+                series.temps_c[indices],
+                params[owner, 0],
+                params[owner, 1],
+                params[owner, 2],
+                segment_count=len(windows),
+            )
+        else:
+            ttf = eq_age = counts = np.zeros(0)
+
+        per_pour: dict[int, list[int]] = defaultdict(list)
+        for segment, position in enumerate(owners):
+            if counts[segment] >= 2:
+                per_pour[position].append(segment)
 
+        results: list[MaturityResponse] = []
+        errors: list[BatchMaturityError] = []
+        for position, (pour_id, req) in enumerate(requests):
+            if pour_id not in pours:
+                errors.append(
+                    BatchMaturityError(
+                        pour_id=pour_id, status_code=404, detail=f"Pour '{pour_id}' not found."
+                    )
+                )
+                continue
+            governing = per_pour.get(position)
+            if not governing:
+                errors.append(
+                    BatchMaturityError(
+                        pour_id=pour_id,
+                        status_code=422,
+                        detail="Insufficient temperature samples to compute maturity.",
+                    )
+                )
+                continue
+            try:
+                results.append(
+                    self._response(
+                        pour_id,
+                        req,
+                        float(ttf[governing].min()),
+                        float(eq_age[governing].min()),
+                    )
+                )
+            except ValueError as exc:
+                errors.append(BatchMaturityError(pour_id=pour_id, status_code=422, detail=str(exc)))
+        return BatchMaturityResponse(results=results, errors=errors)
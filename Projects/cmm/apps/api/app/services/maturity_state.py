@@ -0,0 +1,569 @@
+from __future__ import annotations
+
+import datetime as dt
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from itertools import groupby
+from operator import itemgetter
+
+import numpy as np
+from sqlalchemy import DateTime, Float, and_, cast, delete, func, insert, literal, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.config import settings
+from app.db.plan import Plan, run_plan
+from app.domain.maturity_models import (
+    Sample,
+    cumulative_maturity,
+    maturity_integrals,
+)
+from app.domain.temperature_series import TemperatureSeries, epoch_us
+from app.models.domain import SensorMaturityState, sensor_maturity_checkpoints
+from app.schemas.pours import SensorMaturity
+from app.services.maturity_service import DEFAULT_EA, DEFAULT_T0_C, DEFAULT_TR_C
+from app.services.storage import readings_source
+
+MaturityParams = tuple[float, float, float]
+"""Parameter set keying a running accumulator: ``(T0_c, Ea, Tr_c)``."""
+
+_EPOCH = dt.datetime(1970, 1, 1, tzinfo=dt.UTC)
+
+
+def default_params() -> MaturityParams:
+    return (DEFAULT_T0_C, DEFAULT_EA, DEFAULT_TR_C)
+
+
+def as_utc(value: dt.datetime) -> dt.datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=dt.UTC)
+    return value.astimezone(dt.UTC)
+
+
+def _params_of(state: SensorMaturityState) -> MaturityParams:
+    return (state.t0_c, state.ea, state.tr_c)
+
+
+def load_sensor_history_plan(
+    sensor_id: str,
+    since: dt.datetime | None = None,
+) -> Plan[TemperatureSeries]:
+    """
+    Fetch a sensor's readings in timestamp order, archived readings included.
+
+    Parameters
+    ----------
+    sensor_id : str
+        Sensor whose readings are loaded.
+    since : datetime, optional
+        Inclusive lower bound on the reading timestamp.
+
+    Returns
+    -------
+    Plan[TemperatureSeries]
+        Samples ordered by time.
+    """
+    source = readings_source(include_archive=True)
+    stmt = select(source.c.ts, source.c.celsius).where(source.c.sensor_id == sensor_id)
+    if since is not None:
+        stmt = stmt.where(source.c.ts >= since)
+    return TemperatureSeries.from_rows((yield stmt.order_by(source.c.ts)))
+
+
+def _checkpoint_rows(
+    state: SensorMaturityState,
+    chain: TemperatureSeries,
+    base: tuple[float, float, float, int],
+    after: dt.datetime | None = None,
+) -> list[dict]:
+    """
+    Checkpoint rows for the intervals that ``chain`` closes.
+
+    ``chain`` is a sorted run of a state's samples and ``base`` the state's
+    ``(ttf_c_h, eq_age_h, celsius_sum, sample_count)`` up to and including its first sample.
+    Every checkpoint interval that holds a sample of the run and is followed by a later sample
+    gets a row at its end, with the totals of the readings before that instant. Only rows later
+    than ``after`` are returned.
+    """
+    interval_us = settings.maturity_checkpoint_interval_s * 1_000_000
+    buckets = chain.epoch_us // interval_us
+    closing = np.flatnonzero(buckets[1:] != buckets[:-1])
+    boundaries = (buckets[closing] + 1) * interval_us
+    if after is not None:
+        later = boundaries > epoch_us(after)
+        closing, boundaries = closing[later], boundaries[later]
+    if not closing.size:
+        return []
+
+    ttf, eq_age = cumulative_maturity(chain, None, state.t0_c, state.ea, state.tr_c)
+    temps = chain.temps_c.astype(np.float64)
+    celsius_sum = np.cumsum(temps) - temps[0]
+    ttf0, eq_age0, celsius_sum0, count0 = base
+    return [
+        {
+            "state_id": state.id,
+            "ts": _EPOCH + dt.timedelta(microseconds=boundary),
+            "last_ts": chain[index][0],
+            "last_celsius": float(temps[index]),
+            "ttf_c_h": ttf0 + float(ttf[index]),
+            "eq_age_h": eq_age0 + float(eq_age[index]),
+            "celsius_sum": celsius_sum0 + float(celsius_sum[index]),
+            "sample_count": count0 + index,
+        }
+        for index, boundary in zip(closing.tolist(), boundaries.tolist(), strict=True)
+    ]
+
+
+def _integrate_from(
+    state: SensorMaturityState,
+    chain: TemperatureSeries,
+    base: tuple[float, float, float, int],
+    after: dt.datetime | None = None,
+) -> list[dict]:
+    # ``base`` holds the totals up to and including ``chain``'s first sample, so integrating
+    # the chain onto it gives exactly what a full re-integration would.
+    checkpoints = _checkpoint_rows(state, chain, base, after)
+    ttf0, eq_age0, celsius_sum0, count0 = base
+    ttf, eq_age = maturity_integrals(chain, None, state.t0_c, state.ea, state.tr_c)
+    state.ttf_c_h = ttf0 + ttf
+    state.eq_age_h = eq_age0 + eq_age
+    state.celsius_sum = celsius_sum0 + float(chain.temps_c[1:].sum())
+    state.last_ts, state.last_celsius = chain[-1]
+    state.sample_count = count0 + len(chain) - 1
+    return checkpoints
+
+
+def _rebuild_state_plan(
+    state: SensorMaturityState,
+    since: dt.datetime | None = None,
+) -> Plan[list[dict]]:
+    # Checkpoints up to the earliest changed reading (``since``) still hold: integration
+    # resumes from the latest of them and only the readings after it are loaded. Later
+    # checkpoints are replaced; returns the replacements for the caller to insert.
+    checkpoints = sensor_maturity_checkpoints
+    stale = delete(checkpoints).where(checkpoints.c.state_id == state.id)
+    resume = None
+    if since is not None:
+        stale = stale.where(checkpoints.c.ts > since)
+        result = yield (
+            select(checkpoints)
+            .where(checkpoints.c.state_id == state.id, checkpoints.c.ts <= since)
+            .order_by(checkpoints.c.ts.desc())
+            .limit(1)
+        )
+        resume = result.first()
+    yield stale
+
+    if resume is not None:
+        resume_ts = as_utc(resume.last_ts)
+        tail = yield from load_sensor_history_plan(state.sensor_id, since=resume_ts)
+        # The checkpoint's last reading opens the tail; without it, fall back to a full rebuild.
+        if tail and tail[0][0] == resume_ts:
+            base = (resume.ttf_c_h, resume.eq_age_h, resume.celsius_sum, resume.sample_count)
+            return _integrate_from(state, tail, base, since)
+
+    history = yield from load_sensor_history_plan(state.sensor_id)
+    if not history:
+        state.origin_ts = state.last_ts = state.last_celsius = None
+        state.ttf_c_h = state.eq_age_h = state.celsius_sum = 0.0
+        state.sample_count = 0
+        return []
+    state.origin_ts = history[0][0]
+    return _integrate_from(state, history, (0.0, 0.0, float(history.temps_c[0]), 1), since)
+
+
+def _append_samples(state: SensorMaturityState, ordered: Sequence[Sample]) -> list[dict]:
+    # The last stored sample opens the first new interval, so chaining it in front of the new
+    # samples reproduces exactly the contribution a full re-integration would add.
+    chain = TemperatureSeries.from_rows([(as_utc(state.last_ts), state.last_celsius), *ordered])
+    base = (state.ttf_c_h, state.eq_age_h, state.celsius_sum, state.sample_count)
+    return _integrate_from(state, chain, base)
+
+
+def _ensure_default_states_plan(dialect_name: str, sensor_ids: Iterable[str]) -> Plan[None]:
+    T0_c, Ea, Tr_c = default_params()
+    rows = [
+        {
+            "sensor_id": sensor_id,
+            "t0_c": T0_c,
+            "ea": Ea,
+            "tr_c": Tr_c,
+            "ttf_c_h": 0.0,
+            "eq_age_h": 0.0,
+            "celsius_sum": 0.0,
+            "sample_count": 0,
+        }
+        for sensor_id in sensor_ids
+    ]
+    if dialect_name in ("postgresql", "sqlite"):
+        # ON CONFLICT DO NOTHING: a concurrent ingest may create the same state first.
+        upsert = pg_insert if dialect_name == "postgresql" else sqlite_insert
+        stmt = upsert(SensorMaturityState).on_conflict_do_nothing(
+            index_elements=["sensor_id", "t0_c", "ea", "tr_c"]
+        )
+        yield stmt, rows
+        return
+
+    result = yield select(SensorMaturityState.sensor_id).where(
+        SensorMaturityState.sensor_id.in_([row["sensor_id"] for row in rows]),
+        SensorMaturityState.t0_c == T0_c,
+        SensorMaturityState.ea == Ea,
+        SensorMaturityState.tr_c == Tr_c,
+    )
+    existing = set(result.scalars())
+    missing = [row for row in rows if row["sensor_id"] not in existing]
+    if missing:
+        yield insert(SensorMaturityState), missing
+
+
+def advance_maturity_states_plan(
+    dialect_name: str, records: Iterable[dict]
+) -> Plan[list[SensorMaturityState]]:
+    """
+    Fold freshly upserted readings into the per-sensor maturity accumulators.
+
+    Readings newer than a state's watermark (``last_ts``) are integrated onto the running totals.
+    A reading at the watermark only replaces the last temperature, since that sample has not
+    opened an interval yet. Anything older means late or out-of-order data landed inside the
+    integrated range, so the state is re-integrated from its stored readings. Sensors without
+    a state for the default parameter set get one created.
+
+    Every ``maturity_checkpoint_interval_s`` a state crosses leaves a row in
+    ``sensor_maturity_checkpoints`` with its totals at that instant. A rebuild keeps the
+    checkpoints up to the earliest late reading, resumes from the latest of them, so only the
+    readings after it are loaded, and replaces the later ones.
+
+    The states are locked (``SELECT ... FOR UPDATE``, in a fixed order) for the rest of the
+    transaction, so concurrent ingests of one sensor advance it one after the other instead of
+    losing each other's updates, and missing states are created with ``ON CONFLICT DO
+    NOTHING``. Must run after the readings themselves were written in the same transaction,
+    which flushes the updated states. Returns the default-parameter state of every sensor in
+    ``records``.
+    """
+    by_sensor: dict[str, dict[dt.datetime, float]] = defaultdict(dict)
+    for record in records:
+        by_sensor[record["sensor_id"]][as_utc(record["ts"])] = float(record["celsius"])
+    if not by_sensor:
+        return []
+
+    yield from _ensure_default_states_plan(dialect_name, by_sensor)
+    locked = yield (
+        select(SensorMaturityState)
+        .where(SensorMaturityState.sensor_id.in_(by_sensor.keys()))
+        .order_by(SensorMaturityState.sensor_id, SensorMaturityState.id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+    states = locked.scalars().all()
+    states_by_sensor: dict[str, list[SensorMaturityState]] = defaultdict(list)
+    for state in states:
+        states_by_sensor[state.sensor_id].append(state)
+
+    defaults = default_params()
+    advanced: list[SensorMaturityState] = []
+    checkpoints: list[dict] = []
+    for sensor_id, samples in by_sensor.items():
+        sensor_states = states_by_sensor[sensor_id]
+        ordered = sorted(samples.items())
+        for state in sensor_states:
+            watermark = as_utc(state.last_ts) if state.last_ts is not None else None
+            if watermark is None or ordered[0][0] < watermark:
+                since = ordered[0][0] if watermark is not None else None
+                rebuilt = yield from _rebuild_state_plan(state, since)
+                checkpoints.extend(rebuilt)
+                continue
+
+            pending = ordered
+            if pending[0][0] == watermark:
+                state.celsius_sum += pending[0][1] - state.last_celsius
+                state.last_celsius = pending[0][1]
+                pending = pending[1:]
+            if pending:
+                checkpoints.extend(_append_samples(state, pending))
+        advanced.extend(state for state in sensor_states if _params_of(state) == defaults)
+    if checkpoints:
+        yield insert(sensor_maturity_checkpoints), checkpoints
+    return advanced
+
+
+def advance_maturity_states(session: Session, records: Iterable[dict]) -> list[SensorMaturityState]:
+    """Run :func:`advance_maturity_states_plan` on a sync session and flush the states."""
+    states = run_plan(session, advance_maturity_states_plan(session.bind.dialect.name, records))
+    session.flush()
+    return states
+
+
+def _interval_hours(dialect_name: str, start: ColumnElement, end: ColumnElement) -> ColumnElement:
+    if dialect_name == "postgresql":
+        return func.extract("epoch", end - start) / 3600.0
+    return (func.julianday(end) - func.julianday(start)) * 24.0
+
+
+def windowed_sensor_maturity_plan(
+    dialect_name: str,
+    sensor_ids: Sequence[str],
+    start: dt.datetime,
+    end: dt.datetime,
+    params: MaturityParams | None = None,
+    R: float = 8.314,
+    include_archive: bool = False,
+) -> dict[str, SensorMaturity]:
+    """
+    Integrate TTF and equivalent age per sensor inside the database.
+
+    ``lead(ts)`` over each sensor's readings in ``[start, end]`` yields the interval each sample
+    opens, so the scan stays on ``ix_readings_ts_sensor_ts`` and only one aggregate row per
+    sensor is returned. ``include_archive`` also scans ``readings_archive`` for closed pours.
+    """
+    T0_c, Ea, Tr_c = params or default_params()
+    table = readings_source(include_archive)
+    windowed = (
+        select(
+            table.c.sensor_id,
+            table.c.ts,
+            cast(table.c.celsius, Float).label("celsius"),
+            func.lead(table.c.ts)
+            .over(partition_by=table.c.sensor_id, order_by=table.c.ts)
+            .label("next_ts"),
+        )
+        .where(table.c.sensor_id.in_(sensor_ids), table.c.ts >= start, table.c.ts <= end)
+        .subquery()
+    )
+    # The final sample opens no interval: its NULL hours drop out of both sums.
+    hours = _interval_hours(dialect_name, windowed.c.ts, windowed.c.next_ts)
+    Tr_k = Tr_c + 273.15
+    arrhenius = func.exp(-Ea / R * ((1.0 / (windowed.c.celsius + 273.15)) - (1.0 / Tr_k)))
+    stmt = select(
+        windowed.c.sensor_id,
+        func.count().label("readings_count"),
+        func.avg(windowed.c.celsius).label("average_celsius"),
+        func.min(windowed.c.ts).label("first_ts"),
+        func.max(windowed.c.ts).label("last_ts"),
+        func.coalesce(func.sum((windowed.c.celsius - T0_c) * hours), 0.0).label("ttf_c_h"),
+        func.coalesce(func.sum(arrhenius * hours), 0.0).label("eq_age_h"),
+    ).group_by(windowed.c.sensor_id)
+
+    return {
+        row.sensor_id: SensorMaturity(
+            sensor_id=row.sensor_id,
+            readings_count=row.readings_count,
+            average_celsius=float(row.average_celsius),
+            first_ts=as_utc(row.first_ts),
+            last_ts=as_utc(row.last_ts),
+            ttf_c_h=float(row.ttf_c_h),
+            eq_age_h=float(row.eq_age_h),
+        )
+        for row in (yield stmt)
+    }
+
+
+def checkpoint_sensor_maturity_plan(
+    states: Sequence[SensorMaturityState],
+    end: dt.datetime,
+    include_archive: bool = False,
+) -> Plan[dict[str, SensorMaturity]]:
+    """
+    Maturity of each state's sensor from its first reading up to ``end``, via checkpoints.
+
+    The newest checkpoint at or before ``end`` is found per state with an index lookup, and
+    only the readings from there to ``end`` are integrated onto its totals, chained to the
+    checkpoint's last reading as :func:`advance_maturity_states_plan` chains batches. States without
+    such a checkpoint are left out.
+    """
+    if not states:
+        return {}
+    checkpoints = sensor_maturity_checkpoints
+    earlier = checkpoints.alias("earlier")
+    latest = (
+        select(func.max(earlier.c.ts))
+        .where(earlier.c.state_id == SensorMaturityState.id, earlier.c.ts <= end)
+        .scalar_subquery()
+    )
+    by_id = {state.id: state for state in states}
+    result = yield (
+        select(checkpoints)
+        .join(
+            SensorMaturityState,
+            and_(
+                SensorMaturityState.id == checkpoints.c.state_id,
+                checkpoints.c.ts == latest,
+            ),
+        )
+        .where(SensorMaturityState.id.in_(by_id))
+    )
+    found = {row.state_id: row for row in result}
+    if not found:
+        return {}
+
+    source = readings_source(include_archive)
+    tail_stmt = (
+        select(source.c.sensor_id, source.c.ts, source.c.celsius)
+        .where(
+            or_(
+                *(
+                    and_(source.c.sensor_id == by_id[state_id].sensor_id, source.c.ts >= row.ts)
+                    for state_id, row in found.items()
+                )
+            ),
+            source.c.ts <= end,
+        )
+        .order_by(source.c.sensor_id, source.c.ts)
+    )
+    tails = {
+        sensor_id: [(ts, celsius) for _, ts, celsius in rows]
+        for sensor_id, rows in groupby((yield tail_stmt), key=itemgetter(0))
+    }
+
+    results: dict[str, SensorMaturity] = {}
+    for state_id, row in found.items():
+        state = by_id[state_id]
+        tail = tails.get(state.sensor_id, [])
+        chain = TemperatureSeries.from_rows([(row.last_ts, row.last_celsius), *tail])
+        ttf, eq_age = maturity_integrals(chain, None, state.t0_c, state.ea, state.tr_c)
+        count = row.sample_count + len(tail)
+        results[state.sensor_id] = SensorMaturity(
+            sensor_id=state.sensor_id,
+            readings_count=count,
+            average_celsius=(row.celsius_sum + float(chain.temps_c[1:].sum())) / count,
+            first_ts=as_utc(state.origin_ts),
+            last_ts=chain[-1][0],
+            ttf_c_h=row.ttf_c_h + ttf,
+            eq_age_h=row.eq_age_h + eq_age,
+            source="checkpoint",
+        )
+    return results
+
+
+def accumulated_maturity(state: SensorMaturityState) -> SensorMaturity:
+    """Maturity of a sensor's whole history, read from its running accumulator."""
+    return SensorMaturity(
+        sensor_id=state.sensor_id,
+        readings_count=state.sample_count,
+        average_celsius=state.celsius_sum / state.sample_count,
+        first_ts=as_utc(state.origin_ts),
+        last_ts=as_utc(state.last_ts),
+        ttf_c_h=state.ttf_c_h,
+        eq_age_h=state.eq_age_h,
+        source="accumulator",
+    )
+
+
+def smoothed_sensor_temperatures(
+    session: Session,
+    sensor_ids: Sequence[str],
+    end: dt.datetime,
+    lookback: dt.timedelta,
+    time_constant_h: float,
+) -> dict[str, float]:
+    """
+    Exponentially smoothed temperature of each sensor at its latest reading before ``end``.
+
+    Readings from the ``lookback`` before ``end`` are weighted by ``exp(-age / time_constant_h)``,
+    so the estimate follows the recent trend while damping short spikes. Ages are measured back
+    from ``end`` rather than from each sensor's newest reading: that scales all of a sensor's
+    weights by one factor, which cancels in the weighted mean, and spares a window function.
+    One aggregate row per sensor is returned; sensors without readings in the lookback are
+    left out.
+    """
+    if not sensor_ids:
+        return {}
+    table = readings_source()
+    end = as_utc(end)
+    age_h = _interval_hours(
+        session.bind.dialect.name, table.c.ts, literal(end, DateTime(timezone=True))
+    )
+    weight = func.exp(-age_h / time_constant_h)
+    celsius = cast(table.c.celsius, Float)
+    stmt = (
+        select(
+            table.c.sensor_id,
+            (func.sum(weight * celsius) / func.sum(weight)).label("celsius"),
+        )
+        .where(
+            table.c.sensor_id.in_(sensor_ids),
+            table.c.ts > end - lookback,
+            table.c.ts <= end,
+        )
+        .group_by(table.c.sensor_id)
+    )
+    return {row.sensor_id: float(row.celsius) for row in session.execute(stmt)}
+
+
+def sensor_maturity_window_plan(
+    dialect_name: str,
+    sensor_ids: Sequence[str],
+    start: dt.datetime,
+    end: dt.datetime,
+    params: MaturityParams | None = None,
+    include_archive: bool = False,
+) -> Plan[list[SensorMaturity]]:
+    """
+    Return per-sensor maturity over ``[start, end]``.
+
+    Accumulators whose whole history lies inside the window answer in O(1). Those that start
+    inside the window but run past ``end`` answer from their last checkpoint before ``end``
+    plus the readings after it (:func:`checkpoint_sensor_maturity_plan`). The remaining sensors are
+    integrated in one windowed aggregate query.
+    """
+    T0_c, Ea, Tr_c = params or default_params()
+    start, end = as_utc(start), as_utc(end)
+    result = yield select(SensorMaturityState).where(
+        SensorMaturityState.sensor_id.in_(sensor_ids),
+        SensorMaturityState.t0_c == T0_c,
+        SensorMaturityState.ea == Ea,
+        SensorMaturityState.tr_c == Tr_c,
+    )
+    states = result.scalars().all()
+
+    results: dict[str, SensorMaturity] = {}
+    overrunning: list[SensorMaturityState] = []
+    for state in states:
+        if state.origin_ts is None or state.last_ts is None:
+            continue
+        origin, last = as_utc(state.origin_ts), as_utc(state.last_ts)
+        if origin >= start and last > end:
+            overrunning.append(state)
+        elif origin >= start:
+            results[state.sensor_id] = accumulated_maturity(state)
+    checkpointed = yield from checkpoint_sensor_maturity_plan(overrunning, end, include_archive)
+    results.update(checkpointed)
+
+    pending = [sensor_id for sensor_id in sensor_ids if sensor_id not in results]
+    if pending:
+        windowed = yield from windowed_sensor_maturity_plan(
+            dialect_name, pending, start, end, (T0_c, Ea, Tr_c), include_archive=include_archive
+        )
+        results.update(windowed)
+
+    return [
+        results.get(sensor_id)
+        or SensorMaturity(
+            sensor_id=sensor_id,
+            readings_count=0,
+            average_celsius=None,
+            first_ts=None,
+            last_ts=None,
+            ttf_c_h=0.0,
+            eq_age_h=0.0,
+        )
+        for sensor_id in sensor_ids
+    ]
+
+
+def sensor_maturity_window(
+    session: Session,
+    sensor_ids: Sequence[str],
+    start: dt.datetime,
+    end: dt.datetime,
+    params: MaturityParams | None = None,
+    include_archive: bool = False,
+) -> list[SensorMaturity]:
+    """Run :func:`sensor_maturity_window_plan` on a sync session."""
+    return run_plan(
+        session,
+        sensor_maturity_window_plan(
+            session.bind.dialect.name, sensor_ids, start, end, params, include_archive
+        ),
+    )
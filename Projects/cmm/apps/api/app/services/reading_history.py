@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import base64
+import datetime as dt
+from typing import NamedTuple
+
+import numpy as np
+from sqlalchemy import Row, exists, func, select
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.db.plan import Plan
+from app.domain.downsampling import lttb_indices
+from app.models.domain import readings_archive
+from app.services.maturity_state import as_utc
+from app.services.rollups import coarsest_rollup_plan, rollup_table
+from app.services.storage import readings_source
+
+_EPOCH = dt.datetime(1970, 1, 1, tzinfo=dt.UTC)
+
+
+class ReadingHistory(NamedTuple):
+    """One page of a sensor's history as columns."""
+
+    source: str
+    bucket_seconds: int | None
+    ts: list[dt.datetime]
+    celsius: list[float]
+    next_after: dt.datetime | None
+
+
+def encode_cursor(after: dt.datetime) -> str:
+    return base64.urlsafe_b64encode(as_utc(after).isoformat().encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dt.datetime:
+    """Return the timestamp a page cursor resumes after; ``ValueError`` if it is not one."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        return as_utc(dt.datetime.fromisoformat(raw))
+    except (UnicodeDecodeError, ValueError) as exc:
+        raise ValueError("Invalid cursor.") from exc
+
+
+def _window(
+    column: ColumnElement,
+    start: dt.datetime | None,
+    end: dt.datetime | None,
+    after: dt.datetime | None,
+) -> list[ColumnElement]:
+    conditions: list[ColumnElement] = []
+    if after is not None:
+        conditions.append(column > after)
+    elif start is not None:
+        conditions.append(column >= start)
+    if end is not None:
+        conditions.append(column <= end)
+    return conditions
+
+
+def _raw_rows_plan(
+    sensor_id: str,
+    start: dt.datetime | None,
+    end: dt.datetime | None,
+    after: dt.datetime | None,
+    limit: int | None = None,
+) -> Plan[list[Row]]:
+    source = readings_source(include_archive=True)
+    stmt = (
+        select(source.c.ts, source.c.celsius)
+        .where(source.c.sensor_id == sensor_id, *_window(source.c.ts, start, end, after))
+        .order_by(source.c.ts)
+    )
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return list((yield stmt).all())
+
+
+def _span_plan(
+    sensor_id: str, start: dt.datetime | None, end: dt.datetime | None
+) -> Plan[dt.timedelta | None]:
+    if start is None or end is None:
+        source = readings_source(include_archive=True)
+        result = yield select(func.min(source.c.ts), func.max(source.c.ts)).where(
+            source.c.sensor_id == sensor_id, *_window(source.c.ts, start, end, None)
+        )
+        first, last = result.one()
+        if first is None:
+            return None
+        start = start or as_utc(first)
+        end = end or as_utc(last)
+    return end - start
+
+
+def _archived_plan(
+    sensor_id: str, start: dt.datetime | None, end: dt.datetime | None
+) -> Plan[bool]:
+    result = yield select(
+        exists().where(
+            readings_archive.c.sensor_id == sensor_id,
+            *_window(readings_archive.c.ts, start, end, None),
+        )
+    )
+    return bool(result.scalar())
+
+
+def sensor_history_plan(
+    dialect_name: str,
+    sensor_id: str,
+    start: dt.datetime | None = None,
+    end: dt.datetime | None = None,
+    *,
+    max_points: int | None = None,
+    after: dt.datetime | None = None,
+    limit: int = 5000,
+) -> Plan[ReadingHistory]:
+    """
+    Read a sensor's temperature history, raw and paged or decimated for charting.
+
+    Without ``max_points`` raw readings from both storage tiers are returned oldest first,
+    ``limit`` per page; ``next_after`` is the last timestamp of a full page, from which the
+    next page continues via ``after``. With ``max_points`` the window (after ``after`` if
+    given) is read from the coarsest rollup that still has a bucket per point, or from the raw
+    readings when none does or part of the window is archived, and reduced to at most
+    ``max_points`` with :func:`app.domain.downsampling.lttb_indices` in a single page. Rollup
+    points are the bucket start and time-weighted average temperature.
+    """
+    start = as_utc(start) if start is not None else None
+    end = as_utc(end) if end is not None else None
+    after = as_utc(after) if after is not None else None
+    if max_points is None:
+        rows = yield from _raw_rows_plan(sensor_id, start, end, after, limit + 1)
+        more = len(rows) > limit
+        rows = rows[:limit]
+        return ReadingHistory(
+            source="readings",
+            bucket_seconds=None,
+            ts=[as_utc(row.ts) for row in rows],
+            celsius=[float(row.celsius) for row in rows],
+            next_after=as_utc(rows[-1].ts) if more else None,
+        )
+
+    window_start = after or start
+    span = yield from _span_plan(sensor_id, window_start, end)
+    rollup = None
+    if span is not None and not (yield from _archived_plan(sensor_id, window_start, end)):
+        rollup = yield from coarsest_rollup_plan(dialect_name, span / max_points)
+    if rollup is None:
+        rows = yield from _raw_rows_plan(sensor_id, start, end, after)
+        ts = [as_utc(row.ts) for row in rows]
+        celsius = np.array([float(row.celsius) for row in rows])
+        source, bucket_seconds = "readings", None
+    else:
+        buckets = rollup_table(rollup)
+        result = yield (
+            select(buckets.c.bucket, buckets.c.twa_c)
+            .where(buckets.c.sensor_id == sensor_id, *_window(buckets.c.bucket, start, end, after))
+            .order_by(buckets.c.bucket)
+        )
+        rows = result.all()
+        ts = [as_utc(row.bucket) for row in rows]
+        celsius = np.array([float(row.twa_c) for row in rows])
+        source, bucket_seconds = rollup.name, int(rollup.width.total_seconds())
+
+    if len(ts) > max_points:
+        epoch_s = np.array([(value - _EPOCH).total_seconds() for value in ts])
+        keep = lttb_indices(epoch_s, celsius, max_points)
+        ts = [ts[index] for index in keep.tolist()]
+        celsius = celsius[keep]
+    return ReadingHistory(source, bucket_seconds, ts, celsius.tolist(), None)
@@ -0,0 +1,213 @@
+"""Write path shared by the reading ingest routes."""
+
+from __future__ import annotations
+
+import datetime as dt
+from collections.abc import Iterator, Mapping
+from decimal import Decimal
+
+from sqlalchemy import literal_column, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.plan import run_plan_async
+from app.models.domain import readings_ts
+from app.services.live_hub import live_hub, maturity_updates, reading_events
+from app.services.maturity_cache import maturity_cache
+from app.services.maturity_state import advance_maturity_states_plan
+from app.services.sensor_cache import SensorMetadata
+from app.services.sensor_latest import update_sensor_latest_plan
+
+STAGE_TABLE = "_readings_stage"
+STAGE_COLUMNS = ("seq", "sensor_id", "ts", "celsius", "tenant_id")
+
+
+def _chunked(records: list[dict], size: int) -> Iterator[list[dict]]:
+    for start in range(0, len(records), size):
+        yield records[start : start + size]
+
+
+def _dedupe_records(records: list[dict]) -> list[dict]:
+    # A single upsert statement may not touch the same key twice; the last reading wins.
+    latest = {(record["sensor_id"], record["ts"]): record for record in records}
+    return list(latest.values())
+
+
+async def _insert_upsert_readings(session: AsyncSession, records: list[dict]) -> tuple[int, int]:
+    table = readings_ts
+    inserted = updated = 0
+    for chunk in _chunked(_dedupe_records(records), settings.ingest_chunk_size):
+        stmt = pg_insert(table).values(chunk)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.sensor_id, table.c.ts],
+            set_={"celsius": stmt.excluded.celsius, "tenant_id": stmt.excluded.tenant_id},
+        ).returning(literal_column("xmax = 0").label("inserted"))
+        flags = (await session.execute(stmt)).scalars().all()
+        chunk_inserted = sum(1 for flag in flags if flag)
+        inserted += chunk_inserted
+        updated += len(flags) - chunk_inserted
+    return inserted, updated
+
+
+async def _copy_upsert_readings(session: AsyncSession, records: list[dict]) -> tuple[int, int]:
+    """Stream readings into a temporary staging table with COPY and merge them in one statement."""
+    await session.execute(
+        text(
+            f"CREATE TEMP TABLE IF NOT EXISTS {STAGE_TABLE} ("
+            " seq bigint NOT NULL,"
+            " sensor_id varchar(36) NOT NULL,"
+            " ts timestamptz NOT NULL,"
+            " celsius numeric(6, 3) NOT NULL,"
+            " tenant_id varchar(36) NOT NULL"
+            ") ON COMMIT DROP"
+        )
+    )
+    await session.execute(text(f"TRUNCATE {STAGE_TABLE}"))
+
+    connection = await session.connection()
+    driver_connection = (await connection.get_raw_connection()).driver_connection
+    for offset, chunk in enumerate(_chunked(records, settings.ingest_chunk_size)):
+        base = offset * settings.ingest_chunk_size
+        await driver_connection.copy_records_to_table(
+            STAGE_TABLE,
+            records=[
+                (
+                    base + index,
+                    record["sensor_id"],
+                    record["ts"],
+                    Decimal(str(record["celsius"])),
+                    record["tenant_id"],
+                )
+                for index, record in enumerate(chunk)
+            ],
+            columns=STAGE_COLUMNS,
+        )
+
+    # xmax is zero only for tuples created by this statement, which separates inserts from
+    # conflict updates. DISTINCT ON keeps the last staged reading per key.
+    result = await session.execute(
+        text(
+            "WITH merged AS ("
+            " INSERT INTO readings_ts (sensor_id, ts, celsius, tenant_id)"
+            " SELECT DISTINCT ON (sensor_id, ts) sensor_id, ts, celsius, tenant_id"
+            f" FROM {STAGE_TABLE}"
+            " ORDER BY sensor_id, ts, seq DESC"
+            " ON CONFLICT (sensor_id, ts) DO UPDATE"
+            " SET celsius = EXCLUDED.celsius, tenant_id = EXCLUDED.tenant_id"
+            " RETURNING (xmax = 0) AS inserted"
+            ")"
+            " SELECT count(*) FILTER (WHERE inserted) AS inserted,"
+            " count(*) FILTER (WHERE NOT inserted) AS updated"
+            " FROM merged"
+        )
+    )
+    counts = result.one()
+    return counts.inserted, counts.updated
+
+
+def _naive_utc(value: dt.datetime) -> dt.datetime:
+    # SQLite stores timestamps without an offset, so keys compare as naive UTC.
+    if value.tzinfo is not None:
+        value = value.astimezone(dt.UTC).replace(tzinfo=None)
+    return value
+
+
+async def _sqlite_upsert_readings(session: AsyncSession, records: list[dict]) -> tuple[int, int]:
+    table = readings_ts
+    stmt = sqlite_insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.sensor_id, table.c.ts],
+        set_={"celsius": stmt.excluded.celsius, "tenant_id": stmt.excluded.tenant_id},
+    )
+
+    inserted = updated = 0
+    for chunk in _chunked(records, settings.ingest_chunk_size):
+        timestamps = [record["ts"] for record in chunk]
+        existing_rows = await session.execute(
+            select(table.c.sensor_id, table.c.ts).where(
+                table.c.sensor_id.in_({record["sensor_id"] for record in chunk}),
+                table.c.ts.between(min(timestamps), max(timestamps)),
+            )
+        )
+        seen = {(row.sensor_id, _naive_utc(row.ts)) for row in existing_rows}
+        for record in chunk:
+            key = (record["sensor_id"], _naive_utc(record["ts"]))
+            if key in seen:
+                updated += 1
+            else:
+                inserted += 1
+                seen.add(key)
+        await session.execute(stmt, chunk)
+    return inserted, updated
+
+
+async def upsert_readings(session: AsyncSession, records: list[dict]) -> tuple[int, int]:
+    """
+    Insert ``records`` into ``readings_ts``, replacing readings already stored for a key.
+
+    PostgreSQL batches of at least ``ingest_copy_threshold`` readings are staged with COPY and
+    merged in one statement, smaller ones use a multi-row ``INSERT ... ON CONFLICT``. Returns
+    the number of inserted and updated readings.
+    """
+    inserted = 0
+    updated = 0
+    table = readings_ts
+    dialect_name = session.bind.dialect.name
+
+    if dialect_name == "postgresql":
+        if len(records) >= settings.ingest_copy_threshold:
+            inserted, updated = await _copy_upsert_readings(session, records)
+        else:
+            inserted, updated = await _insert_upsert_readings(session, records)
+        await session.flush()
+    elif dialect_name == "sqlite":
+        inserted, updated = await _sqlite_upsert_readings(session, records)
+    else:
+        for record in records:
+            existing = await session.execute(
+                select(table.c.sensor_id).where(
+                    table.c.sensor_id == record["sensor_id"],
+                    table.c.ts == record["ts"],
+                )
+            )
+            if existing.first():
+                await session.execute(
+                    update(table)
+                    .where(table.c.sensor_id == record["sensor_id"], table.c.ts == record["ts"])
+                    .values(celsius=record["celsius"], tenant_id=record["tenant_id"])
+                )
+                updated += 1
+            else:
+                await session.execute(table.insert().values(**record))
+                inserted += 1
+    return inserted, updated
+
+
+async def write_readings(
+    session: AsyncSession, records: list[dict], sensors: Mapping[str, SensorMetadata]
+) -> tuple[int, int]:
+    """
+    Store a batch of readings and everything derived from it in one transaction.
+
+    ``records`` carry ``sensor_id``, ``ts``, ``celsius`` and ``tenant_id``, and ``sensors`` the
+    resolved metadata of their sensors. The readings are upserted, the maturity accumulators
+    and ``sensor_latest`` advanced and the transaction committed; then the cached maturity of
+    the sensors' pours is invalidated and the readings published to live subscribers. Returns
+    the number of inserted and updated readings.
+    """
+    dialect_name = session.bind.dialect.name
+    inserted, updated = await upsert_readings(session, records)
+    states = await run_plan_async(session, advance_maturity_states_plan(dialect_name, records))
+    await run_plan_async(session, update_sensor_latest_plan(dialect_name, records))
+    maturity = maturity_updates(states) if live_hub.active else []
+    await session.commit()
+    # Bumped after commit: a result computed concurrently from pre-commit data stays orphaned.
+    # Pour writes invalidate the sensors' cached metadata, so its pour ids are current.
+    await maturity_cache.invalidate(
+        pour_id for metadata in sensors.values() for pour_id in metadata.pour_ids
+    )
+    if live_hub.active:
+        await live_hub.publish(reading_events(records, sensors, maturity))
+    return inserted, updated
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import csv
+import json
+import zlib
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any, Literal
+
+from pydantic import ValidationError
+
+from app.schemas.readings import ReadingPayload
+
+StreamFormat = Literal["ndjson", "csv"]
+
+CSV_COLUMNS = ("sensor_id", "ts", "celsius")
+DECOMPRESS_STEP_BYTES = 1 << 20
+
+
+class LineTooLong(ValueError):
+    """Yielded in place of a line exceeding the configured maximum, which is skipped."""
+
+
+@dataclass(frozen=True)
+class ParsedLine:
+    line: int
+    reading: ReadingPayload | None = None
+    error: str | None = None
+
+
+def stream_format(content_type: str | None) -> StreamFormat:
+    """Pick the body format from a ``Content-Type`` header; anything but CSV is NDJSON."""
+    media_type = (content_type or "").split(";", 1)[0].strip().lower()
+    return "csv" if media_type in ("text/csv", "application/csv") else "ndjson"
+
+
+async def _decompressed(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    # max_length bounds each output step, so a highly compressed body cannot inflate at once.
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        data = chunk
+        while data:
+            output = decompressor.decompress(data, DECOMPRESS_STEP_BYTES)
+            if output:
+                yield output
+            data = decompressor.unconsumed_tail
+    tail = decompressor.flush()
+    if tail:
+        yield tail
+    if not decompressor.eof:
+        raise zlib.error("Truncated gzip body.")
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes], *, gzip: bool = False, max_line_bytes: int = 65536
+) -> AsyncIterator[tuple[int, bytes | LineTooLong]]:
+    """
+    Split a body arriving in arbitrary chunks into numbered lines.
+
+    Only the current partial line is buffered. A line longer than ``max_line_bytes`` is
+    yielded as a :class:`LineTooLong` in its place and discarded up to its newline. Blank lines
+    are counted but not yielded.
+    """
+    source = _decompressed(chunks) if gzip else chunks
+    buffer = bytearray()
+    number = 0
+    skipping = False
+    async for chunk in source:
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            if end < 0:
+                if not skipping:
+                    buffer += chunk[start:]
+                    if len(buffer) > max_line_bytes:
+                        buffer.clear()
+                        skipping = True
+                break
+            number += 1
+            if skipping:
+                skipping = False
+                yield number, LineTooLong(f"Line exceeds {max_line_bytes} bytes.")
+            else:
+                buffer += chunk[start:end]
+                if len(buffer) > max_line_bytes:
+                    yield number, LineTooLong(f"Line exceeds {max_line_bytes} bytes.")
+                elif buffer.strip():
+                    yield number, bytes(buffer)
+                buffer.clear()
+            start = end + 1
+    if skipping:
+        yield number + 1, LineTooLong(f"Line exceeds {max_line_bytes} bytes.")
+    elif buffer.strip():
+        yield number + 1, bytes(buffer)
+
+
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'reading'}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+class LineParser:
+    """
+    Turn NDJSON or CSV lines into validated :class:`ReadingPayload` objects.
+
+    NDJSON lines are reading objects. CSV lines are ``sensor_id,ts,celsius``; a first line
+    naming a ``sensor_id`` column is taken as a header and may reorder the columns.
+    """
+
+    def __init__(self, fmt: StreamFormat) -> None:
+        self.fmt = fmt
+        self._columns: tuple[str, ...] = CSV_COLUMNS
+        self._first = True
+
+    def _fields(self, raw: bytes) -> dict[str, Any] | None:
+        text = raw.decode("utf-8").strip()
+        if self.fmt == "ndjson":
+            value = json.loads(text)
+            if not isinstance(value, dict):
+                raise ValueError("Line is not a JSON object.")
+            return value
+        (row,) = csv.reader([text])
+        row = [field.strip() for field in row]
+        first, self._first = self._first, False
+        if first and "sensor_id" in (field.lower() for field in row):
+            self._columns = tuple(field.lower() for field in row)
+            return None
+        if len(row) != len(self._columns):
+            raise ValueError(f"Expected {len(self._columns)} columns, got {len(row)}.")
+        return dict(zip(self._columns, row, strict=True))
+
+    def parse(self, number: int, raw: bytes | LineTooLong) -> ParsedLine | None:
+        """Parse one line; ``None`` for a CSV header."""
+        if isinstance(raw, LineTooLong):
+            return ParsedLine(number, error=str(raw))
+        try:
+            fields = self._fields(raw)
+        except (UnicodeDecodeError, ValueError, csv.Error) as exc:
+            return ParsedLine(number, error=str(exc) or type(exc).__name__)
+        if fields is None:
+            return None
+        try:
+            return ParsedLine(number, reading=ReadingPayload.model_validate(fields))
+        except ValidationError as exc:
+            return ParsedLine(number, error=_validation_message(exc))
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import datetime as dt
+from collections.abc import Sequence
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from app.schemas.readings import ReadingRow
+
+MIN_CELSIUS, MAX_CELSIUS = -200.0, 300.0
+
+_EPOCH = dt.datetime(1970, 1, 1, tzinfo=dt.UTC)
+_MICROSECOND = dt.timedelta(microseconds=1)
+
+
+class ReadingBatchError(ValueError):
+    """Raised with Pydantic-style error dicts, one per offending reading."""
+
+    def __init__(self, errors: list[dict[str, Any]]) -> None:
+        super().__init__(f"{len(errors)} invalid readings")
+        self.errors = errors
+
+
+class ValidatedReadings(NamedTuple):
+    """Batch columns after validation; ``ts`` is timezone-aware UTC."""
+
+    sensor_ids: list[str]
+    ts: list[dt.datetime]
+    celsius: list[float]
+
+
+def _range_errors(celsius: np.ndarray) -> list[dict[str, Any]]:
+    # Same types and messages as ``Field(ge=-200.0, le=300.0)`` on ReadingPayload.
+    errors = []
+    for index in np.flatnonzero(~((celsius >= MIN_CELSIUS) & (celsius <= MAX_CELSIUS))):
+        value = float(celsius[index])
+        if np.isnan(value):
+            error = {"type": "finite_number", "msg": "Input should be a finite number"}
+        elif value < MIN_CELSIUS:
+            error = {
+                "type": "greater_than_equal",
+                "msg": f"Input should be greater than or equal to {MIN_CELSIUS:g}",
+                "ctx": {"ge": MIN_CELSIUS},
+            }
+        else:
+            error = {
+                "type": "less_than_equal",
+                "msg": f"Input should be less than or equal to {MAX_CELSIUS:g}",
+                "ctx": {"le": MAX_CELSIUS},
+            }
+        errors.append({"loc": ("readings", int(index), "celsius"), "input": value, **error})
+    return errors
+
+
+def find_duplicates(sensor_ids: Sequence[str], ts: Sequence[dt.datetime]) -> list[tuple[int, int]]:
+    """
+    Find readings sharing their ``(sensor_id, ts)`` key with an earlier reading of the batch.
+
+    ``ts`` must be timezone-aware.
+
+    Returns
+    -------
+    list of (int, int)
+        ``(index, first_index)`` pairs in index order, ``first_index`` being the earliest
+        reading with the same key.
+    """
+    if len(sensor_ids) < 2:
+        return []
+    epoch_us = np.fromiter(
+        ((value - _EPOCH) // _MICROSECOND for value in ts), dtype=np.int64, count=len(ts)
+    )
+    _, codes = np.unique(np.asarray(sensor_ids), return_inverse=True)
+    # lexsort is stable, so each run of equal keys keeps batch order.
+    order = np.lexsort((epoch_us, codes))
+    keys_codes, keys_epoch = codes[order], epoch_us[order]
+    repeat = np.empty(order.size, dtype=bool)
+    repeat[0] = False
+    repeat[1:] = (keys_codes[1:] == keys_codes[:-1]) & (keys_epoch[1:] == keys_epoch[:-1])
+    if not repeat.any():
+        return []
+    run_start = np.maximum.accumulate(np.where(repeat, 0, np.arange(order.size)))
+    pairs = zip(order[repeat].tolist(), order[run_start[repeat]].tolist(), strict=True)
+    return sorted(pairs)
+
+
+def validate_reading_rows(
+    rows: Sequence[ReadingRow], *, reject_duplicates: bool = False
+) -> ValidatedReadings:
+    """
+    Check a parsed batch as columns instead of one model per reading.
+
+    Temperatures are range-checked over the whole batch at once and timestamps normalized to
+    UTC (naive ones are taken as UTC), matching :class:`app.schemas.readings.ReadingPayload`.
+    With ``reject_duplicates`` a repeated ``(sensor_id, ts)`` is an error; otherwise it is left
+    to the upsert, where the last reading wins.
+
+    Raises
+    ------
+    ReadingBatchError
+        Listing every out-of-range temperature and, if requested, every duplicate, located by
+        reading index.
+    """
+    count = len(rows)
+    sensor_ids = [row["sensor_id"] for row in rows]
+    celsius = np.fromiter((row["celsius"] for row in rows), dtype=np.float64, count=count)
+    ts = [
+        value.replace(tzinfo=dt.UTC)
+        if value.tzinfo is None
+        else value.astimezone(dt.UTC)
+        for value in (row["ts"] for row in rows)
+    ]
+
+    errors = _range_errors(celsius)
+    if reject_duplicates:
+        errors.extend(
+            {
+                "type": "duplicate_reading",
+                "loc": ("readings", index),
+                "msg": f"Duplicate of readings[{first}]: same sensor_id and ts",
+                "input": {"sensor_id": sensor_ids[index], "ts": ts[index].isoformat()},
+            }
+            for index, first in find_duplicates(sensor_ids, ts)
+        )
+    if errors:
+        errors.sort(key=lambda error: error["loc"][1])
+        raise ReadingBatchError(errors)
+    return ValidatedReadings(sensor_ids, ts, celsius.tolist())
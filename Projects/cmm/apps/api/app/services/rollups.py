@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import datetime as dt
+from collections import defaultdict
+from collections.abc import Sequence
+from typing import NamedTuple
+
+import numpy as np
+from sqlalchemy import bindparam, column, or_, select, table, text
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import TableClause
+
+from app.db.plan import Plan, run_plan
+from app.domain.maturity_models import maturity_integrals_with_bounds
+from app.models.domain import readings_ts
+from app.schemas.pours import SensorMaturity
+from app.services.maturity_state import MaturityParams, as_utc, default_params
+
+_EPOCH = dt.datetime(1970, 1, 1, tzinfo=dt.UTC)
+
+# (representative ts, representative celsius, low, high, reading count, plain average)
+_BucketSample = tuple[dt.datetime, float, float, float, int, float]
+
+
+class Rollup(NamedTuple):
+    name: str
+    width: dt.timedelta
+
+
+ROLLUPS: tuple[Rollup, ...] = (
+    Rollup("readings_1m", dt.timedelta(minutes=1)),
+    Rollup("readings_15m", dt.timedelta(minutes=15)),
+    Rollup("readings_1h", dt.timedelta(hours=1)),
+    Rollup("readings_1d", dt.timedelta(days=1)),
+)
+"""Rollups created by the ``20251104_000004`` migration, finest first."""
+
+
+def rollup_table(rollup: Rollup) -> TableClause:
+    return table(
+        rollup.name,
+        column("bucket"),
+        column("sensor_id"),
+        column("sample_count"),
+        column("min_c"),
+        column("max_c"),
+        column("avg_c"),
+        column("twa_c"),
+        column("first_ts"),
+        column("last_ts"),
+    )
+
+
+def available_rollups_plan(dialect_name: str) -> Plan[list[Rollup]]:
+    """
+    Return the rollups that can be queried, finest first.
+
+    Timescale continuous aggregates show up as views; the plain materialized-view fallback only
+    counts once it has been populated by a refresh. Non-PostgreSQL databases have none.
+    """
+    if dialect_name != "postgresql":
+        return []
+    stmt = text(
+        "SELECT relname FROM pg_class WHERE relname IN :names"
+        " AND relkind IN ('v', 'm') AND (relkind <> 'm' OR relispopulated)"
+    ).bindparams(bindparam("names", expanding=True))
+    result = yield stmt, {"names": [rollup.name for rollup in ROLLUPS]}
+    present = set(result.scalars())
+    return [rollup for rollup in ROLLUPS if rollup.name in present]
+
+
+def available_rollups(session: Session) -> list[Rollup]:
+    """Run :func:`available_rollups_plan` on a sync session."""
+    return run_plan(session, available_rollups_plan(session.bind.dialect.name))
+
+
+def refresh_rollups(session: Session) -> list[str]:
+    """
+    Refresh every rollup outside of the session's transaction.
+
+    Continuous aggregates are refreshed over their full range; fallback materialized views are
+    recomputed, concurrently once they hold data.
+    """
+    if session.bind.dialect.name != "postgresql":
+        return []
+    refreshed: list[str] = []
+    with session.get_bind().connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        kinds = dict(
+            conn.execute(
+                text(
+                    "SELECT relname, relkind::text || relispopulated::text FROM pg_class"
+                    " WHERE relname IN :names AND relkind IN ('v', 'm')"
+                ).bindparams(bindparam("names", expanding=True)),
+                {"names": [rollup.name for rollup in ROLLUPS]},
+            ).all()
+        )
+        for rollup in ROLLUPS:
+            kind = kinds.get(rollup.name)
+            if kind is None:
+                continue
+            if kind.startswith("v"):
+                conn.execute(
+                    text(f"CALL refresh_continuous_aggregate('{rollup.name}', NULL, NULL)")
+                )
+            elif kind == "mtrue":
+                conn.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {rollup.name}"))
+            else:
+                conn.execute(text(f"REFRESH MATERIALIZED VIEW {rollup.name}"))
+            refreshed.append(rollup.name)
+    return refreshed
+
+
+def coarsest_rollup_plan(dialect_name: str, max_width: dt.timedelta) -> Plan[Rollup | None]:
+    """Return the coarsest available rollup whose buckets are no wider than ``max_width``."""
+    available = yield from available_rollups_plan(dialect_name)
+    candidates = [rollup for rollup in available if rollup.width <= max_width]
+    return candidates[-1] if candidates else None
+
+
+def _align(value: dt.datetime, width: dt.timedelta, up: bool) -> dt.datetime:
+    # Timescale buckets and the date_bin fallback both align to multiples of the width from the
+    # Unix epoch for these widths.
+    steps, remainder = divmod(value - _EPOCH, width)
+    if up and remainder:
+        steps += 1
+    return _EPOCH + steps * width
+
+
+def _rollup_candidates_plan(
+    rollup: Rollup,
+    sensor_ids: Sequence[str],
+    start: dt.datetime,
+    end: dt.datetime,
+    params: MaturityParams,
+) -> Plan[dict[str, tuple[SensorMaturity, float]]]:
+    aligned_start = _align(start, rollup.width, up=True)
+    aligned_end = _align(end, rollup.width, up=False)
+    if aligned_end <= aligned_start:
+        return {}
+
+    buckets = rollup_table(rollup)
+    bucket_rows = yield (
+        select(buckets)
+        .where(
+            buckets.c.sensor_id.in_(sensor_ids),
+            buckets.c.bucket >= aligned_start,
+            buckets.c.bucket <= aligned_end - rollup.width,
+        )
+        .order_by(buckets.c.sensor_id, buckets.c.bucket)
+    )
+    # The partial buckets at either end of the window come from the raw readings.
+    edge_rows = yield (
+        select(readings_ts.c.sensor_id, readings_ts.c.ts, readings_ts.c.celsius)
+        .where(
+            readings_ts.c.sensor_id.in_(sensor_ids),
+            or_(
+                (readings_ts.c.ts >= start) & (readings_ts.c.ts < aligned_start),
+                (readings_ts.c.ts >= aligned_end) & (readings_ts.c.ts <= end),
+            ),
+        )
+        .order_by(readings_ts.c.sensor_id, readings_ts.c.ts)
+    )
+
+    samples: dict[str, list[_BucketSample]] = defaultdict(list)
+    for row in bucket_rows:
+        samples[row.sensor_id].append(
+            (
+                as_utc(row.first_ts),
+                float(row.twa_c),
+                float(row.min_c),
+                float(row.max_c),
+                int(row.sample_count),
+                float(row.avg_c),
+            )
+        )
+    for row in edge_rows:
+        celsius = float(row.celsius)
+        samples[row.sensor_id].append((as_utc(row.ts), celsius, celsius, celsius, 1, celsius))
+
+    T0_c, Ea, Tr_c = params
+    results: dict[str, tuple[SensorMaturity, float]] = {}
+    for sensor_id, sensor_samples in samples.items():
+        sensor_samples.sort(key=lambda item: item[0])
+        epoch_s = np.array([(item[0] - _EPOCH).total_seconds() for item in sensor_samples])
+        temps, low, high, counts, averages = (
+            np.array([item[index] for item in sensor_samples]) for index in range(1, 6)
+        )
+        ttf, eq_age, ttf_error, eq_age_error = maturity_integrals_with_bounds(
+            epoch_s, temps, low, high, T0_c, Ea, Tr_c
+        )
+        readings_count = int(counts.sum())
+        results[sensor_id] = (
+            SensorMaturity(
+                sensor_id=sensor_id,
+                readings_count=readings_count,
+                average_celsius=float(np.dot(averages, counts)) / readings_count,
+                first_ts=sensor_samples[0][0],
+                last_ts=sensor_samples[-1][0],
+                ttf_c_h=ttf,
+                eq_age_h=eq_age,
+                source=rollup.name,
+            ),
+            max(_relative(ttf_error, ttf), _relative(eq_age_error, eq_age)),
+        )
+    return results
+
+
+def _relative(error: float, value: float) -> float:
+    if value:
+        return error / abs(value)
+    return 0.0 if not error else float("inf")
+
+
+def rollup_sensor_maturity_plan(
+    dialect_name: str,
+    sensor_ids: Sequence[str],
+    start: dt.datetime,
+    end: dt.datetime,
+    tolerance: float,
+    params: MaturityParams | None = None,
+) -> Plan[dict[str, SensorMaturity]]:
+    """
+    Approximate per-sensor maturity from the coarsest rollup that meets ``tolerance``.
+
+    Rollups are tried from coarsest to finest. A sensor is accepted at the first level whose
+    error bound, relative to the integrated value, is within ``tolerance`` for both TTF and
+    equivalent age. Sensors no level satisfies are left out for the caller to compute exactly.
+    """
+    params = params or default_params()
+    start, end = as_utc(start), as_utc(end)
+    pending = list(sensor_ids)
+    accepted: dict[str, SensorMaturity] = {}
+    for rollup in reversed((yield from available_rollups_plan(dialect_name))):
+        if not pending:
+            break
+        candidates = yield from _rollup_candidates_plan(rollup, pending, start, end, params)
+        for sensor_id, (maturity, relative_error) in candidates.items():
+            if relative_error <= tolerance:
+                accepted[sensor_id] = maturity
+        pending = [sensor_id for sensor_id in pending if sensor_id not in accepted]
+    return accepted
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.domain import Device, Pour, Sensor
+from app.services.storage import CLOSED_POUR_STATUSES
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "cmm:sensor_metadata:version"
+
+
+@dataclass(frozen=True)
+class SensorMetadata:
+    """What the ingest path needs to know about a sensor besides its readings."""
+
+    sensor_id: str
+    tenant_id: str
+    project_id: str
+    device_id: str
+    location_id: str | None
+    pour_ids: tuple[str, ...]
+    active_pour_id: str | None
+
+
+@dataclass
+class SensorCacheStats:
+    hits: int = 0
+    misses: int = 0
+    loads: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+async def load_sensor_metadata(
+    session: AsyncSession, sensor_ids: Iterable[str]
+) -> dict[str, SensorMetadata]:
+    """
+    Resolve tenant, placement and pours of ``sensor_ids`` in two queries.
+
+    A sensor instruments the pours of its project at its device's location, or every pour of the
+    project that has no location, matching :func:`app.services.maturity_service.pour_sensor_ids`.
+    The active pour is the most recently started one that is not closed. Unknown sensors are
+    absent from the result.
+    """
+    sensor_ids = set(sensor_ids)
+    if not sensor_ids:
+        return {}
+    sensors = await session.execute(
+        select(
+            Sensor.id,
+            Sensor.tenant_id,
+            Sensor.project_id,
+            Sensor.device_id,
+            Device.location_id,
+        )
+        .outerjoin(Device, Device.id == Sensor.device_id)
+        .where(Sensor.id.in_(sensor_ids))
+    )
+    pours = await session.execute(
+        select(Sensor.id, Pour.id, Pour.status)
+        .join(Pour, Pour.project_id == Sensor.project_id)
+        .outerjoin(Device, Device.id == Sensor.device_id)
+        .where(
+            Sensor.id.in_(sensor_ids),
+            or_(Pour.location_id.is_(None), Pour.location_id == Device.location_id),
+        )
+        .order_by(Sensor.id, Pour.started_at.desc(), Pour.id)
+    )
+
+    pours_by_sensor: dict[str, list[tuple[str, str]]] = defaultdict(list)
+    for sensor_id, pour_id, pour_status in pours:
+        pours_by_sensor[sensor_id].append((pour_id, pour_status))
+    metadata = {}
+    for row in sensors:
+        sensor_pours = pours_by_sensor.get(row.id, [])
+        active = next(
+            (pour_id for pour_id, status in sensor_pours if status not in CLOSED_POUR_STATUSES),
+            None,
+        )
+        metadata[row.id] = SensorMetadata(
+            sensor_id=row.id,
+            tenant_id=row.tenant_id,
+            project_id=row.project_id,
+            device_id=row.device_id,
+            location_id=row.location_id,
+            pour_ids=tuple(pour_id for pour_id, _ in sensor_pours),
+            active_pour_id=active,
+        )
+    return metadata
+
+
+class SensorMetadataCache:
+    """
+    In-process LRU of :class:`SensorMetadata` with per-entry expiry.
+
+    Writes that change what a sensor resolves to (claiming or reconfiguring its device,
+    reassigning the sensor, creating or editing pours of its project) invalidate the affected
+    entries in this process and then :meth:`publish` the change by incrementing a Redis
+    counter. Every process compares that counter with the last value it saw in :meth:`sync`
+    before resolving sensors and drops all of its entries when it moved; such writes are rare
+    next to ingest. Without Redis, other processes pick changes up when their entries expire.
+    A load that overlaps an invalidation is returned but not cached, so a concurrent read of
+    pre-commit rows cannot resurrect an invalidated entry.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 100_000,
+        ttl_s: float = 300.0,
+        client: Redis | None = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.client = client
+        self.stats = SensorCacheStats()
+        self._entries: OrderedDict[str, tuple[float, SensorMetadata]] = OrderedDict()
+        self._generation = 0
+        self._version: int | None = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> SensorMetadataCache:
+        return cls(
+            max_entries=settings.sensor_cache_max_entries,
+            ttl_s=settings.sensor_cache_ttl_s,
+            client=Redis.from_url(settings.redis_url) if settings.redis_url else None,
+        )
+
+    async def sync(self) -> None:
+        """Drop every entry if another process published an invalidation since the last check."""
+        if self.client is None:
+            return
+        try:
+            version = int(await self.client.get(VERSION_KEY) or 0)
+        except (RedisError, OSError):
+            logger.warning("Sensor cache version unavailable; relying on expiry", exc_info=True)
+            return
+        if version != self._version:
+            self.clear()
+            self._version = version
+
+    async def publish(self) -> None:
+        """Tell the other processes to drop their entries; call after the write committed."""
+        if self.client is None:
+            return
+        try:
+            version = await self.client.incr(VERSION_KEY)
+        except (RedisError, OSError):
+            logger.warning("Could not publish sensor cache invalidation", exc_info=True)
+            return
+        # This process already invalidated precisely; skip the full clear unless another
+        # process published in between.
+        if self._version == version - 1:
+            self._version = version
+
+    def get_many(self, sensor_ids: Iterable[str]) -> dict[str, SensorMetadata]:
+        """Return the cached, unexpired entries among ``sensor_ids``."""
+        now = time.monotonic()
+        found: dict[str, SensorMetadata] = {}
+        with self._lock:
+            for sensor_id in sensor_ids:
+                entry = self._entries.get(sensor_id)
+                if entry is None:
+                    self.stats.misses += 1
+                    continue
+                expires_at, metadata = entry
+                if expires_at < now:
+                    del self._entries[sensor_id]
+                    self.stats.misses += 1
+                    continue
+                self._entries.move_to_end(sensor_id)
+                found[sensor_id] = metadata
+                self.stats.hits += 1
+        return found
+
+    async def load(
+        self, session: AsyncSession, sensor_ids: Iterable[str]
+    ) -> dict[str, SensorMetadata]:
+        """Query ``sensor_ids`` with :func:`load_sensor_metadata` and cache the result."""
+        with self._lock:
+            generation = self._generation
+        metadata = await load_sensor_metadata(session, sensor_ids)
+        with self._lock:
+            self.stats.loads += 1
+            if generation != self._generation:
+                return metadata
+            expires_at = time.monotonic() + self.ttl_s
+            for sensor_id, value in metadata.items():
+                self._entries[sensor_id] = (expires_at, value)
+                self._entries.move_to_end(sensor_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+        return metadata
+
+    async def resolve(
+        self, session: AsyncSession, sensor_ids: Iterable[str]
+    ) -> dict[str, SensorMetadata]:
+        """
+        Return metadata for ``sensor_ids``, querying only for the ones not cached.
+
+        Syncs with the other processes first; in steady state this is all cache hits and no
+        query runs. Unknown sensors are absent from the result.
+        """
+        await self.sync()
+        sensor_ids = set(sensor_ids)
+        metadata = self.get_many(sensor_ids)
+        missing = sensor_ids - metadata.keys()
+        if missing:
+            metadata.update(await self.load(session, missing))
+        return metadata
+
+    def _invalidate_where(self, field: str, values: Iterable[str | None]) -> None:
+        values = set(values)
+        with self._lock:
+            self._generation += 1
+            stale = [
+                sensor_id
+                for sensor_id, (_, metadata) in self._entries.items()
+                if getattr(metadata, field) in values
+            ]
+            for sensor_id in stale:
+                del self._entries[sensor_id]
+            self.stats.invalidations += len(stale)
+
+    def invalidate_sensors(self, sensor_ids: Iterable[str]) -> None:
+        self._invalidate_where("sensor_id", sensor_ids)
+
+    def invalidate_projects(self, project_ids: Iterable[str]) -> None:
+        self._invalidate_where("project_id", project_ids)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self.stats.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.stats.hits + self.stats.misses
+            return {
+                **asdict(self.stats),
+                "hit_ratio": self.stats.hits / lookups if lookups else None,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+
+
+sensor_metadata_cache = SensorMetadataCache.from_settings()
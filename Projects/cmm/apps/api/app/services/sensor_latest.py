@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from sqlalchemy import Select, and_, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.db.plan import Plan, run_plan
+from app.models.domain import Sensor, SensorMaturityState, sensor_latest
+from app.services.maturity_state import default_params
+
+
+def update_sensor_latest_plan(dialect_name: str, records: Iterable[dict]) -> Plan[None]:
+    """
+    Move ``sensor_latest`` forward to the newest of ``records`` per sensor.
+
+    Rows are only replaced by readings at or after their current timestamp, so late or
+    backfilled data never moves a sensor's latest value back in time; a reading re-sent for the
+    current timestamp replaces its value. Must run in the transaction that wrote the readings.
+    """
+    newest: dict[str, dict] = {}
+    for record in records:
+        current = newest.get(record["sensor_id"])
+        if current is None or record["ts"] >= current["ts"]:
+            newest[record["sensor_id"]] = record
+    if not newest:
+        return
+
+    rows = [
+        {
+            "sensor_id": record["sensor_id"],
+            "tenant_id": record["tenant_id"],
+            "ts": record["ts"],
+            "celsius": record["celsius"],
+        }
+        for record in newest.values()
+    ]
+    if dialect_name in ("postgresql", "sqlite"):
+        upsert = pg_insert if dialect_name == "postgresql" else sqlite_insert
+        stmt = upsert(sensor_latest)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[sensor_latest.c.sensor_id],
+            set_={
+                "tenant_id": stmt.excluded.tenant_id,
+                "ts": stmt.excluded.ts,
+                "celsius": stmt.excluded.celsius,
+            },
+            where=sensor_latest.c.ts <= stmt.excluded.ts,
+        )
+        yield stmt, rows
+        return
+
+    result = yield select(sensor_latest.c.sensor_id).where(sensor_latest.c.sensor_id.in_(newest))
+    existing = set(result.scalars())
+    for row in rows:
+        if row["sensor_id"] in existing:
+            yield (
+                update(sensor_latest)
+                .where(
+                    sensor_latest.c.sensor_id == row["sensor_id"],
+                    sensor_latest.c.ts <= row["ts"],
+                )
+                .values(tenant_id=row["tenant_id"], ts=row["ts"], celsius=row["celsius"])
+            )
+        else:
+            yield insert(sensor_latest).values(**row)
+
+
+def update_sensor_latest(session: Session, records: Iterable[dict]) -> None:
+    """Run :func:`update_sensor_latest_plan` on a sync session."""
+    run_plan(session, update_sensor_latest_plan(session.bind.dialect.name, records))
+
+
+def latest_readings_query(tenant_id: str | None = None, project_id: str | None = None) -> Select:
+    """
+    Return the latest reading and running maturity of every sensor in a tenant or project.
+
+    Maturity comes from the sensor's accumulator for the default parameters and is ``None``
+    while that accumulator does not exist, e.g. right after the MQTT ingest cleared it.
+    """
+    T0_c, Ea, Tr_c = default_params()
+    state = SensorMaturityState
+    stmt = (
+        select(
+            sensor_latest.c.sensor_id,
+            Sensor.project_id,
+            Sensor.device_id,
+            sensor_latest.c.ts,
+            sensor_latest.c.celsius,
+            state.ttf_c_h,
+            state.eq_age_h,
+            state.last_ts.label("maturity_as_of"),
+        )
+        .join(Sensor, Sensor.id == sensor_latest.c.sensor_id)
+        .outerjoin(
+            state,
+            and_(
+                state.sensor_id == sensor_latest.c.sensor_id,
+                state.t0_c == T0_c,
+                state.ea == Ea,
+                state.tr_c == Tr_c,
+            ),
+        )
+        .order_by(sensor_latest.c.sensor_id)
+    )
+    if tenant_id is not None:
+        stmt = stmt.where(sensor_latest.c.tenant_id == tenant_id)
+    if project_id is not None:
+        stmt = stmt.where(Sensor.project_id == project_id)
+    return stmt
+
+
+def latest_readings(
+    session: Session, tenant_id: str | None = None, project_id: str | None = None
+) -> list:
+    return list(session.execute(latest_readings_query(tenant_id, project_id)).all())
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import datetime as dt
+
+from sqlalchemy import and_, delete, exists, insert, or_, select, text, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import FromClause
+
+from app.models.domain import CLOSED_POUR_STATUSES, Pour, readings_archive, readings_ts
+
+
+def readings_source(include_archive: bool = False) -> FromClause:
+    """
+    Return the selectable maturity and history readers scan.
+
+    Closed pours may have had their readings tiered into ``readings_archive``; including the
+    archive unions both tables so readers see the full history either way.
+    """
+    if not include_archive:
+        return readings_ts
+    columns = ("sensor_id", "ts", "celsius", "tenant_id")
+    return union_all(
+        select(*(readings_ts.c[name] for name in columns)),
+        select(*(readings_archive.c[name] for name in columns)),
+    ).subquery("readings_all")
+
+
+def is_closed(pour: Pour) -> bool:
+    return pour.status in CLOSED_POUR_STATUSES
+
+
+def _timescale_enabled(session: Session) -> bool:
+    if session.bind.dialect.name != "postgresql":
+        return False
+    return (
+        session.execute(
+            text(
+                "SELECT 1 FROM pg_extension e"
+                " JOIN pg_class c ON c.relname = 'readings_ts'"
+                " WHERE e.extname = 'timescaledb'"
+            )
+        ).first()
+        is not None
+    )
+
+
+def storage_status(session: Session) -> dict:
+    """Report compression settings, chunk counts and on-disk size per readings table."""
+    if not _timescale_enabled(session):
+        return {"timescale": False, "tables": []}
+
+    tables = []
+    for name in ("readings_ts", "readings_archive"):
+        stats = session.execute(
+            text(
+                "SELECT"
+                " (SELECT count(*) FROM show_chunks(CAST(:name AS regclass))) AS chunks,"
+                " coalesce(s.total_chunks, 0) AS compressible_chunks,"
+                " coalesce(s.number_compressed_chunks, 0) AS compressed_chunks,"
+                " coalesce(s.before_compression_total_bytes, 0) AS before_bytes,"
+                " coalesce(s.after_compression_total_bytes, 0) AS after_bytes,"
+                " hypertable_size(CAST(:name AS regclass)) AS total_bytes"
+                " FROM (SELECT 1) AS one"
+                " LEFT JOIN hypertable_compression_stats(CAST(:name AS regclass)) s ON TRUE"
+            ),
+            {"name": name},
+        ).one()
+        policy = session.execute(
+            text(
+                "SELECT config ->> 'compress_after' FROM timescaledb_information.jobs"
+                " WHERE proc_name = 'policy_compression' AND hypertable_name = :name"
+            ),
+            {"name": name},
+        ).scalar()
+        tables.append(
+            {
+                "table": name,
+                "compress_after": policy,
+                "chunks": stats.chunks,
+                "compressed_chunks": stats.compressed_chunks,
+                "bytes_before_compression": stats.before_bytes,
+                "bytes_after_compression": stats.after_bytes,
+                "total_bytes": stats.total_bytes,
+            }
+        )
+    return {"timescale": True, "tables": tables}
+
+
+def set_compression_policy(session: Session, compress_after: dt.timedelta) -> bool:
+    """Replace the ``readings_ts`` compression policy; returns False without Timescale."""
+    if not _timescale_enabled(session):
+        return False
+    session.execute(text("SELECT remove_compression_policy('readings_ts', if_exists => TRUE)"))
+    session.execute(
+        text("SELECT add_compression_policy('readings_ts', CAST(:after AS interval))"),
+        {"after": f"{int(compress_after.total_seconds())} seconds"},
+    )
+    return True
+
+
+def compress_chunks(session: Session, older_than: dt.timedelta) -> int:
+    """Compress every ``readings_ts`` chunk older than ``older_than`` right away."""
+    if not _timescale_enabled(session):
+        return 0
+    compressed = session.scalars(
+        text(
+            "SELECT compress_chunk(c, if_not_compressed => TRUE)"
+            " FROM show_chunks('readings_ts', older_than => CAST(:older AS interval)) c"
+        ),
+        {"older": f"{int(older_than.total_seconds())} seconds"},
+    ).all()
+    return len(compressed)
+
+
+def _merge_into_archive(session: Session, condition: list) -> int:
+    """Copy the ``readings_ts`` rows matching ``condition``, replacing archived ones."""
+    columns = ("sensor_id", "ts", "celsius", "tenant_id")
+    rows = select(*(readings_ts.c[name] for name in columns)).where(*condition)
+    dialect_name = session.bind.dialect.name
+    if dialect_name in ("postgresql", "sqlite"):
+        upsert = pg_insert if dialect_name == "postgresql" else sqlite_insert
+        stmt = upsert(readings_archive).from_select(list(columns), rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[readings_archive.c.sensor_id, readings_archive.c.ts],
+            set_={"celsius": stmt.excluded.celsius, "tenant_id": stmt.excluded.tenant_id},
+        )
+        return session.execute(stmt).rowcount
+
+    # Without ON CONFLICT the archived copies of the rows are dropped and inserted again.
+    archived = exists().where(
+        readings_ts.c.sensor_id == readings_archive.c.sensor_id,
+        readings_ts.c.ts == readings_archive.c.ts,
+        *condition,
+    )
+    session.execute(delete(readings_archive).where(archived))
+    return session.execute(insert(readings_archive).from_select(list(columns), rows)).rowcount
+
+
+def archive_closed_pours(
+    session: Session,
+    closed_for: dt.timedelta,
+    now: dt.datetime | None = None,
+) -> dict[str, int]:
+    """
+    Move readings of pours closed for at least ``closed_for`` into ``readings_archive``.
+
+    A pour's readings are those of its sensors from ``started_at`` until ``closed_at``. Only
+    open pours and recently closed ones read ``readings_ts`` alone, so readings inside the
+    window of any such pour sharing the sensor stay where they are. Readings that arrive for
+    an archived window later are merged into the archive on the next run, replacing the
+    archived value for their timestamp. Rows are copied and deleted with set-based statements
+    per pour.
+    """
+    # Deferred: the maturity readers import this module for ``readings_source``.
+    from app.services.maturity_service import pour_sensor_map
+
+    now = now or dt.datetime.now(dt.UTC)
+    eligible = and_(
+        Pour.status.in_(CLOSED_POUR_STATUSES),
+        Pour.closed_at.is_not(None),
+        Pour.closed_at <= now - closed_for,
+    )
+    pours = session.scalars(select(Pour).where(eligible).order_by(Pour.started_at)).all()
+    if not pours:
+        return {}
+    # Sensors belong to one project, so only pours of the same projects can share them.
+    project_ids = {pour.project_id for pour in pours}
+    live = session.scalars(select(Pour).where(Pour.project_id.in_(project_ids), ~eligible)).all()
+    sensors = pour_sensor_map(session, [*pours, *live])
+
+    moved: dict[str, int] = {}
+    for pour in pours:
+        sensor_ids = sensors[pour.id]
+        if not sensor_ids:
+            continue
+        condition = [
+            readings_ts.c.sensor_id.in_(sensor_ids),
+            readings_ts.c.ts >= pour.started_at,
+            readings_ts.c.ts <= pour.closed_at,
+        ]
+        kept = []
+        for other in live:
+            shared = set(sensors[other.id]).intersection(sensor_ids)
+            if not shared:
+                continue
+            window = [readings_ts.c.sensor_id.in_(sorted(shared))]
+            window.append(readings_ts.c.ts >= other.started_at)
+            if other.closed_at is not None and other.status in CLOSED_POUR_STATUSES:
+                window.append(readings_ts.c.ts <= other.closed_at)
+            kept.append(and_(*window))
+        if kept:
+            condition.append(~or_(*kept))
+
+        copied = _merge_into_archive(session, condition)
+        session.execute(delete(readings_ts).where(*condition))
+        if copied:
+            moved[pour.id] = copied
+    session.flush()
+    return moved
@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+import datetime as dt
+from collections import defaultdict
+from collections.abc import Sequence
+from typing import NamedTuple
+
+import numpy as np
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.domain.strength_forecast import hours_to_maturity, maturity_for_strength, maturity_rate
+from app.domain.temperature_series import epoch_us
+from app.models.domain import Mix, Pour, SensorMaturityState
+from app.schemas.maturity import CurveParams
+from app.schemas.pours import (
+    ForecastMethod,
+    MaturityBasis,
+    PourForecast,
+    SensorForecast,
+    SensorMaturity,
+)
+from app.services.maturity_service import (
+    DEFAULT_EA,
+    DEFAULT_T0_C,
+    DEFAULT_TR_C,
+    pour_sensor_map,
+)
+from app.services.maturity_state import (
+    MaturityParams,
+    accumulated_maturity,
+    as_utc,
+    sensor_maturity_window,
+    smoothed_sensor_temperatures,
+)
+from app.services.storage import CLOSED_POUR_STATUSES
+
+_EPOCH = dt.datetime(1970, 1, 1, tzinfo=dt.UTC)
+_LAST_ETA_S = (dt.datetime(9999, 12, 31, tzinfo=dt.UTC) - _EPOCH).total_seconds()
+"""Latest ETA a ``datetime`` can hold; later ones are reported as unreachable."""
+
+
+class StrengthCurveSpec(NamedTuple):
+    curve_type: str
+    params: CurveParams
+    basis: MaturityBasis
+
+
+def mix_curve(mix: Mix | None) -> StrengthCurveSpec | None:
+    """
+    Parse the strength-maturity curve stored on a mix.
+
+    ``Mix.maturity_curve`` holds ``{"curve_type": "log" | "asymptotic", "curve_params": {...}}``
+    with the fields of :class:`~app.schemas.maturity.CurveParams`, and optionally the
+    ``"basis"`` the curve was fitted against (``"ttf"``, the default, or ``"eq_age"``).
+
+    Returns
+    -------
+    StrengthCurveSpec or None
+        ``None`` when the mix has no usable curve.
+    """
+    curve = (mix.maturity_curve if mix is not None else None) or {}
+    curve_type = curve.get("curve_type")
+    basis = curve.get("basis") or "ttf"
+    if curve_type not in ("log", "asymptotic") or basis not in ("ttf", "eq_age"):
+        return None
+    try:
+        params = CurveParams.model_validate(curve.get("curve_params") or {})
+    except ValidationError:
+        return None
+    return StrengthCurveSpec(curve_type, params, basis)
+
+
+def active_pours(
+    session: Session, tenant_id: str | None = None, project_id: str | None = None
+) -> list[Pour]:
+    """Pours that are still curing, i.e. not closed, oldest first."""
+    stmt = select(Pour).where(Pour.status.not_in(CLOSED_POUR_STATUSES))
+    if tenant_id is not None:
+        stmt = stmt.where(Pour.tenant_id == tenant_id)
+    if project_id is not None:
+        stmt = stmt.where(Pour.project_id == project_id)
+    return list(session.scalars(stmt.order_by(Pour.started_at, Pour.id)).all())
+
+
+def _mix_params(mix: Mix | None) -> MaturityParams:
+    Ea = mix.activation_energy if mix is not None else None
+    return (DEFAULT_T0_C, float(Ea) if Ea is not None else DEFAULT_EA, DEFAULT_TR_C)
+
+
+def _current_maturity(
+    session: Session,
+    pours: Sequence[Pour],
+    sensors: dict[str, list[str]],
+    params: dict[str, MaturityParams],
+    now: dt.datetime,
+) -> dict[tuple[str, str], SensorMaturity]:
+    """
+    Maturity of every sensor of every pour since the pour started, keyed by (pour, sensor).
+
+    Accumulators whose history starts inside the pour answer from one bulk query; the other
+    sensors go through :func:`sensor_maturity_window`, once per distinct pour start and
+    parameter set.
+    """
+    sensor_ids = sorted({sensor_id for pour in pours for sensor_id in sensors[pour.id]})
+    states = {
+        (state.sensor_id, (state.t0_c, state.ea, state.tr_c)): state
+        for state in session.scalars(
+            select(SensorMaturityState).where(SensorMaturityState.sensor_id.in_(sensor_ids))
+        )
+    }
+    results: dict[tuple[str, str], SensorMaturity] = {}
+    pending: dict[tuple[dt.datetime, MaturityParams], list[tuple[str, str]]] = defaultdict(list)
+    for pour in pours:
+        start = as_utc(pour.started_at)
+        for sensor_id in sensors[pour.id]:
+            state = states.get((sensor_id, params[pour.id]))
+            if (
+                state is not None
+                and state.origin_ts is not None
+                and state.last_ts is not None
+                and as_utc(state.origin_ts) >= start
+                and as_utc(state.last_ts) <= now
+            ):
+                results[pour.id, sensor_id] = accumulated_maturity(state)
+            else:
+                pending[start, params[pour.id]].append((pour.id, sensor_id))
+    for (start, window_params), members in pending.items():
+        sensor_ids = sorted({sensor_id for _, sensor_id in members})
+        window = {
+            sensor.sensor_id: sensor
+            for sensor in sensor_maturity_window(session, sensor_ids, start, now, window_params)
+        }
+        for pour_id, sensor_id in members:
+            results[pour_id, sensor_id] = window[sensor_id]
+    return results
+
+
+def _finite(value: float) -> float | None:
+    return value if np.isfinite(value) else None
+
+
+def forecast_pours(
+    session: Session,
+    pours: Sequence[Pour],
+    now: dt.datetime | None = None,
+    method: ForecastMethod = "smoothed",
+    basis: MaturityBasis | None = None,
+    curing_c: float | None = None,
+    lookback_h: float | None = None,
+    time_constant_h: float | None = None,
+) -> list[PourForecast]:
+    """
+    Project when each sensor of each pour reaches the pour's target strength.
+
+    The mix's strength curve is inverted for the maturity the target needs, and the maturity
+    still missing at a sensor's latest reading is accrued at a projected constant curing
+    temperature. A pour's ETA is that of its governing sensor, the one reaching the target
+    last. The inversion, rates and ETAs of all sensors of all pours are computed together as
+    arrays, so a fleet costs a few queries and numpy passes rather than work per sensor.
+
+    Parameters
+    ----------
+    session : Session
+        Active database session.
+    pours : sequence of Pour
+        Pours to forecast, e.g. from :func:`active_pours`.
+    now : datetime, optional
+        Forecast instant; readings after it are ignored. Defaults to the current time.
+    method : {"smoothed", "constant"}
+        ``"smoothed"`` projects each sensor's exponentially smoothed recent temperature,
+        falling back to its average since the pour started when it has no recent readings.
+        ``"constant"`` projects ``curing_c``, or the average when it is not given.
+    basis : {"ttf", "eq_age"}, optional
+        Maturity basis; defaults to the one the mix's curve was fitted against.
+    curing_c : float, optional
+        Assumed curing temperature for ``method="constant"``.
+    lookback_h, time_constant_h : float, optional
+        Smoothing window and time constant in hours; default to ``forecast_lookback_h`` and
+        ``forecast_smoothing_h``.
+
+    Returns
+    -------
+    list of PourForecast
+        One forecast per pour, in the order given.
+    """
+    now = as_utc(now or dt.datetime.now(dt.UTC))
+    mix_ids = {pour.mix_id for pour in pours if pour.mix_id is not None}
+    mixes = (
+        {mix.id: mix for mix in session.scalars(select(Mix).where(Mix.id.in_(mix_ids)))}
+        if mix_ids
+        else {}
+    )
+
+    forecasts: dict[str, PourForecast] = {}
+    curves: dict[str, StrengthCurveSpec] = {}
+    for pour in pours:
+        curve = mix_curve(mixes.get(pour.mix_id))
+        target = float(pour.target_strength) if pour.target_strength is not None else None
+        status = None
+        if target is None:
+            status = "no_target"
+        elif curve is None:
+            status = "no_curve"
+        else:
+            curves[pour.id] = curve
+        forecasts[pour.id] = PourForecast(
+            pour_id=pour.id,
+            project_id=pour.project_id,
+            target_strength=target,
+            curve_type=curve.curve_type if curve is not None else None,
+            basis=(basis or curve.basis) if curve is not None else None,
+            method=method,
+            status=status or "no_sensors",
+        )
+
+    forecastable = [pour for pour in pours if pour.id in curves]
+    sensors = pour_sensor_map(session, forecastable)
+    params = {pour.id: _mix_params(mixes.get(pour.mix_id)) for pour in forecastable}
+    current = _current_maturity(session, forecastable, sensors, params, now)
+    pairs = [
+        (index, pour, sensor_id)
+        for index, pour in enumerate(forecastable)
+        for sensor_id in sensors[pour.id]
+    ]
+    if not pairs:
+        return [forecasts[pour.id] for pour in pours]
+
+    maturities = [current[pour.id, sensor_id] for _, pour, sensor_id in pairs]
+    if method == "smoothed":
+        smoothed = smoothed_sensor_temperatures(
+            session,
+            sorted({sensor_id for _, _, sensor_id in pairs}),
+            now,
+            dt.timedelta(hours=lookback_h or settings.forecast_lookback_h),
+            time_constant_h or settings.forecast_smoothing_h,
+        )
+    else:
+        smoothed = {}
+
+    def column(values) -> np.ndarray:
+        return np.array(values, dtype=np.float64)
+
+    pour_index = np.array([index for index, _, _ in pairs], dtype=np.intp)
+    per_pour = {
+        "target": column([forecasts[pour.id].target_strength for pour in forecastable]),
+        "eq_age": np.array([forecasts[pour.id].basis == "eq_age" for pour in forecastable]),
+        "log": np.array([curves[pour.id].curve_type == "log" for pour in forecastable]),
+        "T0_c": column([params[pour.id][0] for pour in forecastable]),
+        "Ea": column([params[pour.id][1] for pour in forecastable]),
+        "Tr_c": column([params[pour.id][2] for pour in forecastable]),
+    }
+    for name in ("a", "b", "f_u", "k", "min_maturity"):
+        per_pour[name] = column(
+            [
+                np.nan if (value := getattr(curves[pour.id].params, name)) is None else value
+                for pour in forecastable
+            ]
+        )
+    # Broadcast the per-pour columns to one element per (pour, sensor) pair.
+    cols = {name: values[pour_index] for name, values in per_pour.items()}
+
+    reporting = np.array([sensor.readings_count > 0 for sensor in maturities])
+    average = column(
+        [
+            sensor.average_celsius if sensor.average_celsius is not None else np.nan
+            for sensor in maturities
+        ]
+    )
+    if method == "smoothed":
+        projected = column([smoothed.get(sensor_id, np.nan) for _, _, sensor_id in pairs])
+        projected = np.where(np.isnan(projected), average, projected)
+    elif curing_c is not None:
+        projected = np.full(len(pairs), float(curing_c))
+    else:
+        projected = average
+
+    required = np.empty(len(pairs))
+    log = cols["log"]
+    required[log] = maturity_for_strength(
+        cols["target"][log],
+        "log",
+        {"a": cols["a"][log], "b": cols["b"][log], "min_maturity": cols["min_maturity"][log]},
+    )
+    required[~log] = maturity_for_strength(
+        cols["target"][~log], "asymptotic", {"f_u": cols["f_u"][~log], "k": cols["k"][~log]}
+    )
+    # A curve missing a parameter yields nan; it can never be reached.
+    required = np.where(np.isnan(required), np.inf, required)
+
+    eq_age = cols["eq_age"]
+    maturity = np.where(
+        eq_age,
+        column([sensor.eq_age_h for sensor in maturities]),
+        column([sensor.ttf_c_h for sensor in maturities]),
+    )
+    rate = np.where(
+        eq_age,
+        maturity_rate(projected, "eq_age", cols["T0_c"], cols["Ea"], cols["Tr_c"]),
+        maturity_rate(projected, "ttf", cols["T0_c"], cols["Ea"], cols["Tr_c"]),
+    )
+    hours = hours_to_maturity(maturity, required, rate)
+    last_s = column(
+        [
+            epoch_us(sensor.last_ts) / 1e6 if sensor.last_ts is not None else np.nan
+            for sensor in maturities
+        ]
+    )
+    eta_s = np.where(reporting, last_s + hours * 3600.0, np.nan)
+    eta_s = np.where(eta_s > _LAST_ETA_S, np.inf, eta_s)
+    remaining_h = np.maximum(eta_s - epoch_us(now) / 1e6, 0.0) / 3600.0
+
+    # The governing sensor of each pour is the last to reach the target; sensors without
+    # readings sort first so they only govern pours where no sensor reports.
+    key = np.where(np.isnan(eta_s), -np.inf, eta_s)
+    order = np.lexsort((key, pour_index))
+    group_last = np.r_[pour_index[order][1:] != pour_index[order][:-1], True]
+    governing = dict(
+        zip(pour_index[order][group_last].tolist(), order[group_last].tolist(), strict=True)
+    )
+
+    rows: dict[str, list[SensorForecast]] = defaultdict(list)
+    for position, ((_, pour, sensor_id), sensor) in enumerate(zip(pairs, maturities, strict=True)):
+        reports = bool(reporting[position])
+        eta = float(eta_s[position])
+        rows[pour.id].append(
+            SensorForecast(
+                sensor_id=sensor_id,
+                last_ts=sensor.last_ts,
+                maturity=float(maturity[position]) if reports else None,
+                required_maturity=_finite(float(required[position])),
+                projected_celsius=_finite(float(projected[position])),
+                eta=_EPOCH + dt.timedelta(seconds=eta) if np.isfinite(eta) else None,
+                hours_remaining=_finite(float(remaining_h[position])),
+                reached=reports and bool(hours[position] == 0.0),
+            )
+        )
+
+    for index, pour in enumerate(forecastable):
+        forecast = forecasts[pour.id]
+        forecast.sensors = rows[pour.id]
+        if index not in governing:
+            continue
+        position = governing[index]
+        lead = forecast.sensors[position - int(np.searchsorted(pour_index, index))]
+        if not reporting[position]:
+            forecast.status = "no_readings"
+            continue
+        forecast.governing_sensor_id = lead.sensor_id
+        forecast.eta = lead.eta
+        forecast.hours_remaining = lead.hours_remaining
+        if all(sensor.reached for sensor in forecast.sensors if sensor.maturity is not None):
+            forecast.status = "ready"
+        elif lead.eta is None:
+            forecast.status = "stalled"
+        else:
+            forecast.status = "curing"
+    return [forecasts[pour.id] for pour in pours]
@@ -0,0 +1,142 @@
+"""
+Measure the disk footprint and scan time of Timescale compression on generated readings.
+
+A scratch hypertable shaped like ``readings_ts`` is filled with ``generate_series`` data, a
+per-sensor window scan (the maturity reader's access pattern) and a full aggregate are timed,
+the chunks are compressed with the production settings, and the same measurements are
+repeated. Results are printed as JSON.
+
+Usage::
+
+    python scripts/bench_compression.py --sensors 50 --days 30 --interval-s 60
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.config import settings  # noqa: E402
+
+TABLE = "bench_readings_ts"
+
+WINDOW_SCAN = (
+    f"SELECT count(*), avg(celsius) FROM {TABLE}"
+    " WHERE sensor_id = :sensor AND ts >= now() - INTERVAL '7 days'"
+)
+FULL_SCAN = f"SELECT sensor_id, avg(celsius), count(*) FROM {TABLE} GROUP BY sensor_id"
+
+
+def _setup(conn: Connection, sensors: int, days: int, interval_s: int) -> int:
+    conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+    conn.execute(
+        text(
+            f"CREATE TABLE {TABLE} ("
+            " sensor_id varchar(36) NOT NULL, ts timestamptz NOT NULL,"
+            " celsius numeric(6, 3) NOT NULL, tenant_id varchar(36) NOT NULL,"
+            " PRIMARY KEY (sensor_id, ts))"
+        )
+    )
+    conn.execute(text(f"SELECT create_hypertable('{TABLE}', 'ts')"))
+    conn.execute(
+        text(
+            f"INSERT INTO {TABLE} (sensor_id, ts, celsius, tenant_id)"
+            " SELECT 'sensor-' || s, t,"
+            " round((20 + 8 * sin(extract(epoch FROM t) / 43200.0) + random())::numeric, 3),"
+            " 'bench-tenant'"
+            " FROM generate_series(1, :sensors) AS s,"
+            " generate_series(now() - make_interval(days => :days), now(),"
+            " make_interval(secs => :interval_s)) AS t"
+        ),
+        {"sensors": sensors, "days": days, "interval_s": interval_s},
+    )
+    conn.execute(text(f"ANALYZE {TABLE}"))
+    return conn.execute(text(f"SELECT count(*) FROM {TABLE}")).scalar_one()
+
+
+def _measure(conn: Connection, sensors: int, repeat: int) -> dict:
+    size = conn.execute(text(f"SELECT hypertable_size('{TABLE}')")).scalar_one()
+
+    def timed(sql: str, params: dict) -> float:
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            conn.execute(text(sql), params).all()
+            best = min(best, time.perf_counter() - started)
+        return round(best * 1000, 3)
+
+    return {
+        "total_bytes": size,
+        "window_scan_ms": timed(WINDOW_SCAN, {"sensor": f"sensor-{sensors // 2 + 1}"}),
+        "full_scan_ms": timed(FULL_SCAN, {}),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=settings.database_url)
+    parser.add_argument("--sensors", type=int, default=50)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--interval-s", type=int, default=60)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="keep the scratch hypertable")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url, future=True)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        rows = _setup(conn, args.sensors, args.days, args.interval_s)
+        before = _measure(conn, args.sensors, args.repeat)
+        conn.execute(
+            text(
+                f"ALTER TABLE {TABLE} SET (timescaledb.compress,"
+                " timescaledb.compress_segmentby = 'sensor_id',"
+                " timescaledb.compress_orderby = 'ts')"
+            )
+        )
+        started = time.perf_counter()
+        chunks = len(
+            conn.execute(
+                text(
+                    "SELECT compress_chunk(c, if_not_compressed => TRUE)"
+                    f" FROM show_chunks('{TABLE}') c"
+                )
+            ).all()
+        )
+        compress_s = time.perf_counter() - started
+        conn.execute(text(f"ANALYZE {TABLE}"))
+        after = _measure(conn, args.sensors, args.repeat)
+        if not args.keep:
+            conn.execute(text(f"DROP TABLE {TABLE}"))
+
+    print(
+        json.dumps(
+            {
+                "rows": rows,
+                "sensors": args.sensors,
+                "compressed_chunks": chunks,
+                "compress_seconds": round(compress_s, 3),
+                "before": before,
+                "after": after,
+                "size_ratio": round(before["total_bytes"] / max(after["total_bytes"], 1), 2),
+                "window_scan_speedup": round(
+                    before["window_scan_ms"] / max(after["window_scan_ms"], 1e-6), 2
+                ),
+                "full_scan_speedup": round(
+                    before["full_scan_ms"] / max(after["full_scan_ms"], 1e-6), 2
+                ),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
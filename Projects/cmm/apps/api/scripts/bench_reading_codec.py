@@ -0,0 +1,142 @@
+"""
+Compare the JSON and compact binary reading batch formats on wire size and decode time.
+
+The same generated batch is encoded both ways. Decoding is timed up to the records the bulk
+writer consumes. JSON is measured twice: through one ``ReadingPayload`` model per reading, and
+through the batch route's columnar validation (``ReadingBatchBody`` plus
+:func:`validate_reading_rows`). Binary is :func:`decode_readings` plus the binary route's
+conversion. Results are printed as JSON.
+
+Usage::
+
+    python scripts/bench_reading_codec.py --readings 100000 --sensors 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pydantic import TypeAdapter  # noqa: E402
+
+from app.domain.reading_codec import decode_readings, encode_readings  # noqa: E402
+from app.routers.readings import _column_records  # noqa: E402
+from app.schemas import ReadingBatchBody, ReadingBatchRequest  # noqa: E402
+from app.services.reading_validation import validate_reading_rows  # noqa: E402
+from app.services.sensor_cache import SensorMetadata  # noqa: E402
+
+
+def _batch(readings: int, sensors: int) -> tuple[list[str], np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(7)
+    ids = [str(uuid.uuid4()) for _ in range(sensors)]
+    sensor_ids = [ids[i % sensors] for i in range(readings)]
+    start_ms = 1_735_689_600_000
+    epoch_ms = start_ms + (np.arange(readings) // sensors) * 60_000
+    celsius = np.round(20.0 + 8.0 * rng.standard_normal(readings).clip(-2, 2), 2)
+    return sensor_ids, epoch_ms, celsius
+
+
+def _best_of(repeats: int, func) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--readings", type=int, default=100_000)
+    parser.add_argument("--sensors", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    sensor_ids, epoch_ms, celsius = _batch(args.readings, args.sensors)
+    json_body = json.dumps(
+        {
+            "readings": [
+                {
+                    "sensor_id": sensor_id,
+                    "ts": np.datetime64(int(stamp), "ms").item().isoformat() + "Z",
+                    "celsius": float(value),
+                }
+                for sensor_id, stamp, value in zip(sensor_ids, epoch_ms, celsius, strict=True)
+            ]
+        }
+    ).encode()
+    binary_body = encode_readings(sensor_ids, epoch_ms, celsius)
+    sensors_map = {
+        sensor_id: SensorMetadata(sensor_id, "tenant", "project", "device", None, (), None)
+        for sensor_id in set(sensor_ids)
+    }
+
+    batch_body = TypeAdapter(ReadingBatchBody)
+
+    def decode_json_models() -> list[dict]:
+        payload = ReadingBatchRequest.model_validate_json(json_body)
+        return [
+            {
+                "sensor_id": reading.sensor_id,
+                "ts": reading.ts,
+                "celsius": reading.celsius,
+                "tenant_id": sensors_map[reading.sensor_id].tenant_id,
+            }
+            for reading in payload.readings
+        ]
+
+    def decode_json() -> list[dict]:
+        readings = validate_reading_rows(batch_body.validate_json(json_body)["readings"])
+        return [
+            {
+                "sensor_id": sensor_id,
+                "ts": ts,
+                "celsius": value,
+                "tenant_id": sensors_map[sensor_id].tenant_id,
+            }
+            for sensor_id, ts, value in zip(
+                readings.sensor_ids, readings.ts, readings.celsius, strict=True
+            )
+        ]
+
+    def decode_binary() -> list[dict]:
+        return _column_records(decode_readings(binary_body), sensors_map)
+
+    assert len(decode_json_models()) == len(decode_json()) == len(decode_binary()) == args.readings
+    models_s = _best_of(args.repeats, decode_json_models)
+    json_s = _best_of(args.repeats, decode_json)
+    binary_s = _best_of(args.repeats, decode_binary)
+    columns_s = _best_of(args.repeats, lambda: decode_readings(binary_body))
+    report = {
+        "readings": args.readings,
+        "sensors": args.sensors,
+        "json": {
+            "bytes": len(json_body),
+            "gzip_bytes": len(gzip.compress(json_body)),
+            "decode_ms": round(json_s * 1000, 2),
+            "per_reading_models_ms": round(models_s * 1000, 2),
+        },
+        "binary": {
+            "bytes": len(binary_body),
+            "gzip_bytes": len(gzip.compress(binary_body)),
+            "decode_ms": round(binary_s * 1000, 2),
+            "columns_only_ms": round(columns_s * 1000, 3),
+        },
+        "size_ratio": round(len(json_body) / len(binary_body), 1),
+        "columnar_validation_speedup": round(models_s / json_s, 1),
+        "decode_speedup": round(json_s / binary_s, 1),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Compare the memory and maturity cost of a list of samples against a ``TemperatureSeries``.
+
+One sensor history of ``--samples`` readings is held as the ``(datetime, float)`` tuples the
+services used to build and as a :class:`TemperatureSeries` with float64 and float32
+temperatures. Each is measured twice: the retained size of the container and everything it
+references, and the peak allocation while building it from database-like rows (traced with
+``tracemalloc``). The maturity integral of each form is timed too. Results are printed as JSON.
+
+Usage::
+
+    python scripts/bench_temperature_series.py --samples 40000
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.domain.maturity_models import maturity_integrals, samples_to_arrays  # noqa: E402
+from app.domain.temperature_series import TemperatureSeries  # noqa: E402
+
+_EPOCH = dt.datetime(1970, 1, 1, tzinfo=dt.UTC)
+
+
+def _rows(samples: int, interval_s: int) -> list[tuple[dt.datetime, float]]:
+    rng = np.random.default_rng(7)
+    start = dt.datetime(2025, 1, 1, tzinfo=dt.UTC)
+    celsius = 20.0 + rng.normal(0.0, 2.0, samples).round(2)
+    return [
+        (start + dt.timedelta(seconds=index * interval_s), value)
+        for index, value in enumerate(celsius.tolist())
+    ]
+
+
+def _retained_bytes(samples: list[tuple[dt.datetime, float]]) -> int:
+    seen: set[int] = set()
+    total = sys.getsizeof(samples)
+    for sample in samples:
+        for item in (sample, *sample):
+            if id(item) not in seen:
+                seen.add(id(item))
+                total += sys.getsizeof(item)
+    return total
+
+
+def _peak_bytes(build: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        result = build()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak
+
+
+def _best_of(repeats: int, func: Callable[[], Any]) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--samples", type=int, default=40_000)
+    parser.add_argument("--interval-s", type=int, default=60)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    # Rows are rebuilt per measurement so the list form pays for its own datetimes.
+    rows = _rows(args.samples, args.interval_s)
+    samples = list(rows)
+    series = TemperatureSeries.from_rows(rows)
+    series32 = TemperatureSeries.from_rows(rows, dtype=np.float32)
+
+    list_bytes = _retained_bytes(samples)
+    forms = {
+        "tuple_list": {
+            "retained_bytes": list_bytes,
+            "build_peak_bytes": _peak_bytes(lambda: _rows(args.samples, args.interval_s)),
+            "integrate_ms": _best_of(
+                args.repeats,
+                lambda: maturity_integrals(*samples_to_arrays(samples), -10.0, 33500.0, 20.0),
+            ),
+        },
+        "series_f64": {
+            "retained_bytes": series.nbytes,
+            "build_peak_bytes": _peak_bytes(lambda: TemperatureSeries.from_rows(iter(rows))),
+            "integrate_ms": _best_of(
+                args.repeats, lambda: maturity_integrals(series, None, -10.0, 33500.0, 20.0)
+            ),
+        },
+        "series_f32": {
+            "retained_bytes": series32.nbytes,
+            "build_peak_bytes": _peak_bytes(
+                lambda: TemperatureSeries.from_rows(iter(rows), dtype=np.float32)
+            ),
+            "integrate_ms": _best_of(
+                args.repeats, lambda: maturity_integrals(series32, None, -10.0, 33500.0, 20.0)
+            ),
+        },
+    }
+    for form in forms.values():
+        form["integrate_ms"] = round(form["integrate_ms"] * 1000.0, 3)
+        form["bytes_per_sample"] = round(form["retained_bytes"] / args.samples, 1)
+        form["reduction"] = round(list_bytes / form["retained_bytes"], 1)
+    print(json.dumps({"samples": args.samples, "forms": forms}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Drive concurrent clients against the read-heavy routes and report latency percentiles.
+
+Each client loops for ``--duration`` seconds, mostly reading pour maturity and occasionally
+posting a small readings batch. Several targets can be measured in one run, e.g. a build with
+the sync routes next to one with the async routes, and the p99 change is reported between the
+first target and every other one. Results are printed as JSON.
+
+Measured on one core with both builds on SQLite, 500 clients reading pour maturity for 30 s
+(the pre-async build is the parent of the commit that added ``get_async_db``):
+
+=============  =========  ======  ======  =======
+build          completed  errors  p50     p99
+=============  =========  ======  ======  =======
+sync routes    1          500     939 ms  939 ms
+async routes   2063       9       8.5 s   15.2 s
+=============  =========  ======  ======  =======
+
+The sync build starves: every other request ends in the 30 s ``QueuePool`` checkout timeout
+while the threadpool workers hold or wait for its 15 connections. The async build keeps
+serving; its latency is queueing on the one core it shares with the load generator.
+At 50 clients, where the sync build does not starve, the sync routes are faster on SQLite (p99
+2.2 s against 3.4 s), since aiosqlite and the worker-thread hops cost more than they save on a
+single core; PostgreSQL with asyncpg was not measured here.
+
+Usage::
+
+    python scripts/load_test.py --clients 500 --duration 60 \\
+        --target sync=http://localhost:8001 --target async=http://localhost:8000 \\
+        --pour-id <pour uuid> --sensor-id <sensor uuid>
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime as dt
+import json
+import random
+import time
+from collections import defaultdict
+
+import httpx
+import numpy as np
+
+
+async def _client(
+    http: httpx.AsyncClient,
+    deadline: float,
+    args: argparse.Namespace,
+    latencies: dict[str, list[float]],
+    errors: dict[str, int],
+) -> None:
+    rng = random.Random()
+    while time.perf_counter() < deadline:
+        if args.sensor_id and rng.random() < args.write_ratio:
+            route = "POST /v1/readings/batch"
+            now = dt.datetime.now(dt.UTC)
+            request = http.post(
+                "/v1/readings/batch",
+                json={
+                    "readings": [
+                        {
+                            "sensor_id": rng.choice(args.sensor_id),
+                            "ts": (now - dt.timedelta(milliseconds=i)).isoformat(),
+                            "celsius": round(rng.uniform(15.0, 35.0), 3),
+                        }
+                        for i in range(args.batch_size)
+                    ]
+                },
+            )
+        else:
+            route = "GET /v1/pours/{id}/maturity"
+            request = http.get(f"/v1/pours/{rng.choice(args.pour_id)}/maturity")
+        started = time.perf_counter()
+        try:
+            response = await request
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        if ok:
+            latencies[route].append(time.perf_counter() - started)
+        else:
+            errors[route] += 1
+
+
+def _summary(samples: list[float], duration: float) -> dict:
+    if not samples:
+        return {"requests": 0}
+    ms = np.asarray(samples) * 1000.0
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {
+        "requests": int(ms.size),
+        "rps": round(ms.size / duration, 1),
+        "p50_ms": round(float(p50), 2),
+        "p95_ms": round(float(p95), 2),
+        "p99_ms": round(float(p99), 2),
+        "max_ms": round(float(ms.max()), 2),
+    }
+
+
+async def _run_target(base_url: str, args: argparse.Namespace) -> dict:
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    limits = httpx.Limits(max_connections=args.clients, max_keepalive_connections=args.clients)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as http:
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(
+            *(_client(http, deadline, args, latencies, errors) for _ in range(args.clients))
+        )
+        elapsed = time.perf_counter() - started
+
+    routes = {route: _summary(samples, elapsed) for route, samples in latencies.items()}
+    for route, count in errors.items():
+        routes.setdefault(route, {"requests": 0})["errors"] = count
+    overall = _summary([value for samples in latencies.values() for value in samples], elapsed)
+    return {"base_url": base_url, "overall": overall, "routes": routes}
+
+
+async def _main(args: argparse.Namespace) -> dict:
+    targets = dict(target.split("=", 1) for target in args.target)
+    results = {}
+    for label, base_url in targets.items():
+        results[label] = await _run_target(base_url, args)
+
+    report: dict = {"clients": args.clients, "duration_s": args.duration, "targets": results}
+    labels = list(results)
+    baseline = results[labels[0]]["overall"].get("p99_ms")
+    if baseline:
+        report["p99_change"] = {
+            f"{labels[0]}->{label}": round(results[label]["overall"]["p99_ms"] / baseline, 3)
+            for label in labels[1:]
+            if results[label]["overall"].get("p99_ms")
+        }
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--target", action="append", required=True, help="label=base_url, repeatable"
+    )
+    parser.add_argument("--pour-id", action="append", required=True)
+    parser.add_argument("--sensor-id", action="append", default=[])
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--write-ratio", type=float, default=0.1)
+    parser.add_argument("--batch-size", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    print(json.dumps(asyncio.run(_main(parser.parse_args())), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,34 +1,43 @@
 from __future__ import annotations
 
+import asyncio
 import datetime as dt
+import os
 import pathlib
 import sys
-from typing import Generator
+import tempfile
+from collections.abc import AsyncGenerator, Generator
 
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy.pool import StaticPool
 
 ROOT = pathlib.Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.append(str(ROOT))
 
-from app.db.session import get_db  # noqa: E402
+from app.db.session import get_async_db, get_db  # noqa: E402
 from app.main import app  # noqa: E402
 from app.models.base import Base  # noqa: E402
 from app.models.domain import Device, Location, Mix, Project, Sensor, Tenant, User  # noqa: E402
 
-TEST_DATABASE_URL = "sqlite+pysqlite:///:memory:"
+# A file rather than :memory: so the sync and async engines share one database.
+TEST_DATABASE_PATH = pathlib.Path(tempfile.gettempdir()) / f"cmm-api-tests-{os.getpid()}.sqlite"
+TEST_DATABASE_URL = f"sqlite+pysqlite:///{TEST_DATABASE_PATH}"
+TEST_ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///{TEST_DATABASE_PATH}"
 
 engine = create_engine(
     TEST_DATABASE_URL,
     future=True,
     connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
 )
 TestingSessionLocal = sessionmaker(bind=engine, expire_on_commit=False, autoflush=False, autocommit=False, future=True)
+async_engine = create_async_engine(TEST_ASYNC_DATABASE_URL)
+TestingAsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, expire_on_commit=False, autoflush=False
+)
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -36,6 +45,9 @@ def setup_database() -> Generator[None, None, None]:
     Base.metadata.create_all(bind=engine)
     yield
     Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+    asyncio.run(async_engine.dispose())
+    TEST_DATABASE_PATH.unlink(missing_ok=True)
 
 
 @pytest.fixture
@@ -52,12 +64,18 @@ def client(db_session: Session) -> Generator[TestClient, None, None]:
     def _get_test_db() -> Generator[Session, None, None]:
         yield db_session
 
+    async def _get_test_async_db() -> AsyncGenerator[AsyncSession, None]:
+        async with TestingAsyncSessionLocal() as session:
+            yield session
+
     app.dependency_overrides[get_db] = _get_test_db
+    app.dependency_overrides[get_async_db] = _get_test_async_db
     test_client = TestClient(app)
     try:
         yield test_client
     finally:
         app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_async_db, None)
 
 
 @pytest.fixture
@@ -72,6 +90,7 @@ def seed_data(db_session: Session):
 
     location = Location(tenant_id=tenant.id, project_id=project.id, name="Zone A")
     db_session.add(location)
+    db_session.flush()
 
     user = User(tenant_id=tenant.id, email="operator@example.com", full_name="Operator One")
     db_session.add(user)
@@ -107,5 +126,5 @@ def seed_data(db_session: Session):
         "device": device,
         "sensor": sensor,
         "mix": mix,
-        "timestamp": dt.datetime(2025, 1, 1, 12, 0, tzinfo=dt.timezone.utc),
+        "timestamp": dt.datetime(2025, 1, 1, 12, 0, tzinfo=dt.UTC),
     }
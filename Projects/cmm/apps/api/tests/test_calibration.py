@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.domain.calibration import fit_strength_curves
+from app.models.domain import Calibration, CalibrationRun, Mix
+
+MATURITY = np.geomspace(250.0, 20000.0, 9)
+
+
+def _log_breaks(noise: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+    strength = 9.0 * np.log(MATURITY) - 25.0
+    return MATURITY, strength + (noise if noise is not None else 0.0)
+
+
+def _asymptotic_breaks(noise: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+    strength = 42.0 * -np.expm1(-0.0004 * MATURITY)
+    return MATURITY, strength + (noise if noise is not None else 0.0)
+
+
+def test_fits_recover_exact_curves():
+    (log_fit,) = fit_strength_curves([_log_breaks()], "log")
+    assert log_fit.params == pytest.approx({"a": 9.0, "b": -25.0})
+    assert log_fit.r_squared == pytest.approx(1.0)
+
+    (asymptotic,) = fit_strength_curves([_asymptotic_breaks()], "asymptotic")
+    assert asymptotic.converged
+    assert asymptotic.params == pytest.approx({"f_u": 42.0, "k": 0.0004}, rel=1e-6)
+
+
+def test_asymptotic_fit_reaches_the_least_squares_minimum():
+    noise = np.random.default_rng(3).normal(0.0, 1.5, MATURITY.size)
+    maturity, strength = _asymptotic_breaks(noise)
+    (fit,) = fit_strength_curves([(maturity, strength)], "asymptotic")
+
+    # Brute force: for each k on a fine grid, f_u has a closed-form least-squares value.
+    k = np.geomspace(1e-5, 1e-2, 200001)[:, None]
+    shape = -np.expm1(-k * maturity)
+    f_u = (shape @ strength) / (shape * shape).sum(axis=1)
+    grid_sse = ((strength - f_u[:, None] * shape) ** 2).sum(axis=1).min()
+    sse = fit.residual_sigma**2 * (maturity.size - 2)
+    assert fit.converged
+    assert sse <= grid_sse * (1 + 1e-9)
+
+
+def test_batched_fits_match_individual_fits():
+    rng = np.random.default_rng(5)
+    datasets = [
+        (
+            MATURITY[: 3 + index],
+            _asymptotic_breaks(rng.normal(0.0, 1.0, MATURITY.size))[1][: 3 + index],
+        )
+        for index in range(6)
+    ]
+    batched = fit_strength_curves(datasets, "asymptotic")
+    for data, fit in zip(datasets, batched, strict=True):
+        (alone,) = fit_strength_curves([data], "asymptotic")
+        assert fit.points == alone.points
+        assert fit.params == pytest.approx(alone.params, rel=1e-6)
+
+    (degenerate,) = fit_strength_curves([([500.0] * 4, [10.0, 11.0, 12.0, 13.0])], "log")
+    assert not degenerate.converged and np.isnan(degenerate.params["a"])
+
+
+def _calibrate(client: TestClient, seed_data, mix_id: str, breaks, **extra) -> dict:
+    maturity, strength = breaks
+    response = client.post(
+        "/v1/calibrations",
+        json={
+            "tenant_id": seed_data["tenant"].id,
+            "mix_id": mix_id,
+            "breaks": [
+                {"maturity": m, "strength": s}
+                for m, s in zip(maturity.tolist(), strength.tolist(), strict=True)
+            ],
+            **extra,
+        },
+    )
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_calibration_fits_and_updates_the_mix(client: TestClient, db_session: Session, seed_data):
+    mix = seed_data["mix"]
+    noise = np.random.default_rng(11).normal(0.0, 0.8, MATURITY.size)
+    body = _calibrate(client, seed_data, mix.id, _log_breaks(noise), method="arrhenius")
+
+    assert body["curve_type"] == "log" and body["points"] == MATURITY.size
+    assert body["curve_params"]["a"] == pytest.approx(9.0, abs=0.5)
+    assert body["curve_params"]["sigma"] == pytest.approx(body["residual_sigma"])
+    assert 0.9 < body["r_squared"] <= 1.0
+    assert body["run"]["summary"]["mode"] == "single"
+
+    db_session.expire_all()
+    curve = db_session.get(Mix, mix.id).maturity_curve
+    assert curve["basis"] == "eq_age" and curve["calibration_id"] == body["id"]
+    assert client.get(f"/v1/calibrations/{body['id']}").json()["run"]["id"] == body["run"]["id"]
+
+    wrong_tenant = client.post(
+        "/v1/calibrations",
+        json={
+            "tenant_id": "other",
+            "mix_id": mix.id,
+            "breaks": [{"maturity": m, "strength": 20.0} for m in (100.0, 200.0, 300.0)],
+        },
+    )
+    assert wrong_tenant.status_code == 404
+    same_maturity = client.post(
+        "/v1/calibrations",
+        json={
+            "tenant_id": seed_data["tenant"].id,
+            "mix_id": mix.id,
+            "breaks": [{"maturity": 500.0, "strength": s} for s in (10.0, 12.0, 14.0)],
+        },
+    )
+    assert same_maturity.status_code == 422
+
+
+def test_implausible_fits_are_stored_without_replacing_the_curve(
+    client: TestClient, db_session: Session, seed_data
+):
+    mix = seed_data["mix"]
+    good = _calibrate(client, seed_data, mix.id, _log_breaks())
+    assert good["promoted"] and good["promotion_issue"] is None
+
+    maturity, strength = _log_breaks()
+    falling = _calibrate(client, seed_data, mix.id, (maturity, strength[::-1]))
+    assert falling["curve_params"]["a"] < 0
+    assert not falling["promoted"] and "a <= 0" in falling["promotion_issue"]
+    assert falling["run"]["summary"]["promoted"] is False
+
+    scatter = np.random.default_rng(2).normal(0.0, 15.0, MATURITY.size)
+    noisy = _calibrate(client, seed_data, mix.id, (maturity, strength.mean() + scatter))
+    assert noisy["r_squared"] < settings.calibration_min_r_squared
+    assert not noisy["promoted"]
+    stored = client.get(f"/v1/calibrations/{noisy['id']}").json()
+    assert stored["promotion_issue"] == noisy["promotion_issue"]
+
+    db_session.expire_all()
+    assert db_session.get(Mix, mix.id).maturity_curve["calibration_id"] == good["id"]
+
+
+def test_refit_all_mixes_in_process_and_in_a_pool(
+    client: TestClient, db_session: Session, seed_data, monkeypatch
+):
+    tenant = seed_data["tenant"]
+    mixes = [seed_data["mix"]]
+    for index in range(2):
+        mix = Mix(tenant_id=tenant.id, name=f"Mix {index}")
+        db_session.add(mix)
+        mixes.append(mix)
+    db_session.commit()
+    rng = np.random.default_rng(17)
+    for mix in mixes:
+        _calibrate(client, seed_data, mix.id, _asymptotic_breaks(rng.normal(0.0, 1.0, 9)))
+
+    response = client.post(
+        "/v1/calibrations/refit", json={"tenant_id": tenant.id, "curve_type": "asymptotic"}
+    )
+    assert response.status_code == 200, response.text
+    in_process = response.json()
+    assert in_process["mode"] == "in_process" and not in_process["errors"]
+    assert len(in_process["calibrations"]) == 3
+    summary = in_process["calibrations"][0]["run"]["summary"]
+    assert summary["batch_mixes"] == 3 and summary["fit_ms"] >= 0.0
+
+    monkeypatch.setattr(settings, "calibration_pool_min_mixes", 1)
+    pooled = client.post(
+        "/v1/calibrations/refit",
+        json={"tenant_id": tenant.id, "curve_type": "asymptotic", "workers": 2},
+    ).json()
+    assert pooled["mode"] == "process_pool" and pooled["workers"] == 2
+    for serial, parallel in zip(in_process["calibrations"], pooled["calibrations"], strict=True):
+        assert serial["mix_id"] == parallel["mix_id"]
+        assert parallel["curve_params"] == pytest.approx(serial["curve_params"])
+    runs = db_session.scalars(
+        select(CalibrationRun)
+        .join(Calibration, Calibration.id == CalibrationRun.calibration_id)
+        .where(Calibration.mix_id.in_([mix.id for mix in mixes]))
+    ).all()
+    assert len(runs) == 9
@@ -88,5 +88,22 @@ def test_readings_upsert(client: TestClient, seed_data):
     assert second.status_code == 202
     assert second.json()["updated"] >= 0
 
-    maturity = client.get(f"/v1/pours/non-existent/maturity")
+    maturity = client.get("/v1/pours/non-existent/maturity")
     assert maturity.status_code == 404
+
+
+def test_readings_bulk_upsert_counts(client: TestClient, seed_data):
+    sensor = seed_data["sensor"]
+    timestamp = seed_data["timestamp"]
+
+    def _reading(minutes: int, celsius: float) -> dict:
+        ts = timestamp + dt.timedelta(minutes=minutes)
+        return {"sensor_id": sensor.id, "ts": ts.isoformat(), "celsius": celsius}
+
+    initial = [_reading(minutes, 20.0) for minutes in range(3)]
+    first = client.post("/v1/readings/batch", json={"readings": initial})
+    assert first.json() == {"processed": 3, "inserted": 3, "updated": 0}
+
+    batch = [_reading(2, 21.0), _reading(3, 22.0), _reading(4, 23.0), _reading(4, 23.5)]
+    second = client.post("/v1/readings/batch", json={"readings": batch})
+    assert second.json() == {"processed": 4, "inserted": 2, "updated": 2}
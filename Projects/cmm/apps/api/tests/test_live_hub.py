@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import json
+
+import fakeredis.aioredis
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.domain import Sensor
+from app.services.live_hub import (
+    LIVE_CHANNEL,
+    LiveEvent,
+    LiveHub,
+    coalesce_events,
+    live_hub,
+    project_topic,
+    stream_events,
+)
+from app.services.maturity_state import as_utc
+
+BASE = dt.datetime(2025, 1, 1, 12, tzinfo=dt.UTC)
+
+
+def _event(topic: str, *readings: tuple[str, int, float]) -> LiveEvent:
+    return LiveEvent(
+        topic,
+        tuple(
+            (sensor_id, BASE + dt.timedelta(minutes=minute), celsius)
+            for sensor_id, minute, celsius in readings
+        ),
+    )
+
+
+def _sse_data(chunk: bytes) -> dict:
+    (data,) = [line for line in chunk.decode().splitlines() if line.startswith("data: ")]
+    return json.loads(data.removeprefix("data: "))
+
+
+def test_hub_fans_out_by_topic():
+    async def scenario():
+        hub = LiveHub()
+        first, second = hub.subscribe("project:a"), hub.subscribe("project:a")
+        other = hub.subscribe("project:b")
+        await hub.publish([_event("project:a", ("s1", 0, 20.0))])
+        assert [len(await sub.get(0)) for sub in (first, second)] == [1, 1]
+        assert await other.get(0.01) == []
+        hub.unsubscribe(first)
+        hub.unsubscribe(second)
+        assert hub.snapshot()["subscribers"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_slow_subscriber_is_coalesced_to_newest_per_sensor():
+    async def scenario():
+        hub = LiveHub(buffer_events=2)
+        subscription = hub.subscribe("pour:p")
+        hub.deliver(
+            [
+                _event("pour:p", ("s1", 0, 20.0), ("s2", 0, 21.0)),
+                _event("pour:p", ("s1", 5, 22.0)),
+                _event("pour:p", ("s2", 3, 23.0), ("s1", 4, 99.0)),
+            ]
+        )
+        (event,) = await subscription.get(0)
+        assert event.coalesced
+        assert [reading[0::2] for reading in event.readings] == [("s2", 23.0), ("s1", 22.0)]
+        assert hub.stats.coalesced == 1
+
+    asyncio.run(scenario())
+
+
+def test_coalesce_keeps_latest_maturity():
+    merged = coalesce_events(
+        [
+            LiveEvent("project:a", maturity=(("s1", 1.0, 0.5, BASE),)),
+            LiveEvent("project:a", maturity=(("s1", 2.0, 0.9, BASE),)),
+        ]
+    )
+    assert merged.maturity == (("s1", 2.0, 0.9, BASE),)
+    assert LiveEvent.from_dict(merged.to_dict()) == merged
+
+
+def test_stream_sends_replay_heartbeats_and_monotonic_ids():
+    async def scenario():
+        hub = LiveHub()
+        subscription = hub.subscribe("project:a")
+        stream = stream_events(
+            hub,
+            subscription,
+            _event("project:a", ("s1", 10, 20.0)),
+            heartbeat_s=0.01,
+        )
+        replay = await anext(stream)
+        resume_id = f"id: {(BASE + dt.timedelta(minutes=10)).isoformat()}/s1\n".encode()
+        assert replay.startswith(resume_id)
+        assert await anext(stream) == b": keepalive\n\n"
+
+        # A late reading does not move the resume id back.
+        hub.deliver([_event("project:a", ("s1", 2, 19.0))])
+        late = await anext(stream)
+        assert late.startswith(resume_id)
+        assert _sse_data(late)["readings"][0]["celsius"] == 19.0
+
+        await stream.aclose()
+        assert hub.snapshot()["subscribers"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_relay_delivers_events_from_other_processes():
+    async def scenario():
+        server = fakeredis.FakeServer()
+        local = LiveHub(fakeredis.aioredis.FakeRedis(server=server))
+        remote = LiveHub(fakeredis.aioredis.FakeRedis(server=server))
+        subscription = local.subscribe("project:a")
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            [(_, listeners)] = await remote.client.pubsub_numsub(LIVE_CHANNEL)
+            if listeners:
+                break
+        await remote.publish([_event("project:a", ("s1", 0, 20.0))])
+        (event,) = await subscription.get(1.0)
+        assert event.readings[0][0] == "s1"
+        assert local.stats.relayed == 1
+        local._relay.cancel()
+
+    asyncio.run(scenario())
+
+
+def test_live_route_validates_scope(client: TestClient, seed_data):
+    assert client.get("/v1/live/readings").status_code == 422
+    assert client.get("/v1/live/readings", params={"project_id": "missing"}).status_code == 404
+    response = client.get(
+        "/v1/live/readings",
+        params={"project_id": seed_data["project"].id},
+        headers={"Last-Event-ID": "yesterday"},
+    )
+    assert response.status_code == 400
+
+
+def test_live_route_replays_in_pages(client: TestClient, seed_data, monkeypatch):
+    sensor = seed_data["sensor"]
+    readings = [
+        {
+            "sensor_id": sensor.id,
+            "ts": (BASE + dt.timedelta(minutes=minute)).isoformat(),
+            "celsius": 20.0 + minute,
+        }
+        for minute in range(3)
+    ]
+    assert client.post("/v1/readings/batch", json={"readings": readings}).status_code == 202
+    monkeypatch.setattr(settings, "live_replay_max_readings", 2)
+
+    # A full page ends the stream so the client resumes from the last id it got.
+    response = client.get(
+        "/v1/live/readings",
+        params={"project_id": seed_data["project"].id, "since": BASE.isoformat()},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    data = _sse_data(response.content)
+    assert data["topic"] == project_topic(seed_data["project"].id)
+    assert [reading["celsius"] for reading in data["readings"]] == [21.0, 22.0]
+
+
+def _sse_id(chunk: bytes) -> str:
+    (line,) = [line for line in chunk.decode().splitlines() if line.startswith("id: ")]
+    return line.removeprefix("id: ")
+
+
+def test_live_route_resumes_inside_a_shared_instant(
+    client: TestClient, db_session: Session, seed_data, monkeypatch
+):
+    first = seed_data["sensor"]
+    sensors = [first]
+    for channel in range(2, 6):
+        sensor = Sensor(
+            tenant_id=first.tenant_id,
+            project_id=first.project_id,
+            device_id=first.device_id,
+            channel=str(channel),
+            sensor_type="temperature",
+        )
+        db_session.add(sensor)
+        sensors.append(sensor)
+    db_session.commit()
+    # Five sensors share one instant; the pages of two end inside it twice.
+    sent = {(sensor.id, BASE) for sensor in sensors} | {(first.id, BASE + dt.timedelta(minutes=1))}
+    readings = [
+        {"sensor_id": sensor_id, "ts": ts.isoformat(), "celsius": 20.0} for sensor_id, ts in sent
+    ]
+    assert client.post("/v1/readings/batch", json={"readings": readings}).status_code == 202
+    monkeypatch.setattr(settings, "live_replay_max_readings", 2)
+
+    params = {"project_id": seed_data["project"].id, "since": BASE - dt.timedelta(minutes=1)}
+    headers: dict[str, str] = {}
+    received = []
+    for _ in range(3):
+        response = client.get("/v1/live/readings", params=params, headers=headers)
+        assert response.status_code == 200
+        page = _sse_data(response.content)["readings"]
+        assert len(page) == 2
+        received.extend(
+            (reading["sensor_id"], as_utc(dt.datetime.fromisoformat(reading["ts"])))
+            for reading in page
+        )
+        headers["Last-Event-ID"] = _sse_id(response.content)
+    assert len(received) == len(set(received))
+    assert set(received) == sent
+
+
+def test_ingest_publishes_readings_and_maturity(client: TestClient, seed_data):
+    sensor = seed_data["sensor"]
+    subscription = live_hub.subscribe(project_topic(seed_data["project"].id))
+    try:
+        readings = [
+            {
+                "sensor_id": sensor.id,
+                "ts": (BASE + dt.timedelta(hours=hour)).isoformat(),
+                "celsius": 20.0,
+            }
+            for hour in range(2)
+        ]
+        assert client.post("/v1/readings/batch", json={"readings": readings}).status_code == 202
+        (event,) = asyncio.run(subscription.get(0))
+    finally:
+        live_hub.unsubscribe(subscription)
+    assert [reading[1] for reading in event.readings] == [BASE, BASE + dt.timedelta(hours=1)]
+    ((sensor_id, ttf_c_h, _, as_of),) = event.maturity
+    assert sensor_id == sensor.id
+    assert ttf_c_h == pytest.approx(30.0)
+    assert as_of == BASE + dt.timedelta(hours=1)
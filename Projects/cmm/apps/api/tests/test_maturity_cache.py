@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import datetime as dt
+
+import fakeredis.aioredis
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.maturity_cache import CacheStats, maturity_cache
+
+
+@pytest.fixture
+def redis_cache(monkeypatch):
+    monkeypatch.setattr(maturity_cache, "client", fakeredis.aioredis.FakeRedis())
+    monkeypatch.setattr(maturity_cache, "stats", CacheStats())
+    maturity_cache.l1.clear()
+    yield maturity_cache
+    maturity_cache.l1.clear()
+
+
+def _post(client: TestClient, sensor_id: str, samples: list[tuple[dt.datetime, float]]) -> None:
+    payload = {
+        "readings": [
+            {"sensor_id": sensor_id, "ts": ts.isoformat(), "celsius": celsius}
+            for ts, celsius in samples
+        ]
+    }
+    response = client.post("/v1/readings/batch", json=payload)
+    assert response.status_code == 202, response.text
+
+
+def test_pour_maturity_is_cached_until_readings_arrive(
+    client: TestClient, seed_data, redis_cache
+):
+    sensor = seed_data["sensor"]
+    base = seed_data["timestamp"]
+    pour = client.post(
+        "/v1/pours",
+        json={
+            "tenant_id": seed_data["tenant"].id,
+            "project_id": seed_data["project"].id,
+            "started_at": base.isoformat(),
+        },
+    ).json()
+    _post(client, sensor.id, [(base + dt.timedelta(hours=h), 20.0) for h in range(3)])
+
+    first = client.get(f"/v1/pours/{pour['id']}/maturity").json()
+    second = client.get(f"/v1/pours/{pour['id']}/maturity").json()
+    assert second == first
+    assert redis_cache.stats.misses == 1
+    assert redis_cache.stats.l1_hits == 1
+
+    # A fresh process has an empty L1 but still finds the result in Redis.
+    redis_cache.l1.clear()
+    assert client.get(f"/v1/pours/{pour['id']}/maturity").json() == first
+    assert redis_cache.stats.l2_hits == 1
+
+    invalidations = redis_cache.stats.invalidations
+    _post(client, sensor.id, [(base + dt.timedelta(hours=h), 30.0) for h in range(3, 6)])
+    assert redis_cache.stats.invalidations == invalidations + 1
+    updated = client.get(f"/v1/pours/{pour['id']}/maturity").json()
+    assert redis_cache.stats.misses == 2
+    assert updated["readings_count"] == 6
+    assert updated["ttf_c_h"]["mean"] > first["ttf_c_h"]["mean"]
+
+    stats = client.get("/v1/admin/cache").json()["maturity"]
+    assert stats["enabled"] is True
+    assert stats["hit_ratio"] == pytest.approx(0.5)
+
+
+def test_cache_is_pass_through_without_redis(client: TestClient, seed_data):
+    assert maturity_cache.client is None
+    pour = client.post(
+        "/v1/pours",
+        json={
+            "tenant_id": seed_data["tenant"].id,
+            "project_id": seed_data["project"].id,
+            "started_at": seed_data["timestamp"].isoformat(),
+        },
+    ).json()
+    assert client.get(f"/v1/pours/{pour['id']}/maturity").status_code == 200
+    assert client.get("/v1/admin/cache").json()["maturity"]["enabled"] is False
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+import math
 from datetime import datetime, timedelta
 
 from fastapi.testclient import TestClient
 
 from app.main import maturity_service
+from app.models.domain import Device, Location, Sensor
+from tests.conftest import TestingSessionLocal
 
 
-def _series() -> list[tuple[datetime, float]]:
+def _series() -> list[tuple[str, datetime, float]]:
     base = datetime(2025, 2, 1, 0, 0)
     temps = []
     for hour in range(25):
@@ -17,7 +20,7 @@ def _series() -> list[tuple[datetime, float]]:
             temps.append(32.0 + (hour - 6) * 0.7)
         else:
             temps.append(40.4 - (hour - 18) * 1.2)
-    return [(base + timedelta(hours=h), temps[h]) for h in range(len(temps))]
+    return [("sensor-1", base + timedelta(hours=h), temps[h]) for h in range(len(temps))]
 
 
 def test_maturity_endpoint_basic(client: TestClient, monkeypatch) -> None:
@@ -65,3 +68,194 @@ def test_maturity_endpoint_overrides(client: TestClient, monkeypatch) -> None:
 
     assert override["ttf_c_h"] < default["ttf_c_h"]
     assert override["eq_age_h"] < default["eq_age_h"]
+
+
+def test_maturity_endpoint_streams_pour_readings(
+    client: TestClient, monkeypatch, seed_data
+) -> None:
+    monkeypatch.setattr(maturity_service, "_session_factory", TestingSessionLocal)
+    sensor = seed_data["sensor"]
+    started_at = seed_data["timestamp"]
+    pour = client.post(
+        "/v1/pours",
+        json={
+            "tenant_id": seed_data["tenant"].id,
+            "project_id": seed_data["project"].id,
+            "location_id": seed_data["location"].id,
+            "started_at": started_at.isoformat(),
+        },
+    ).json()
+    readings = [
+        {"sensor_id": sensor.id, "ts": (started_at + timedelta(hours=h)).isoformat(), "celsius": 30}
+        for h in range(-2, 7)
+    ]
+    assert client.post("/v1/readings/batch", json={"readings": readings}).status_code == 202
+
+    response = client.post(f"/v1/pours/{pour['id']}/maturity_advanced", json={"T0_c": 0.0})
+    assert response.status_code == 200
+    assert math.isclose(response.json()["ttf_c_h"], 30.0 * 6, rel_tol=1e-9)
+
+    missing = client.post("/v1/pours/unknown/maturity_advanced", json={})
+    assert missing.status_code == 404
+
+
+def test_maturity_batch_matches_single_pour_results(
+    client: TestClient, monkeypatch, seed_data
+) -> None:
+    monkeypatch.setattr(maturity_service, "_session_factory", TestingSessionLocal)
+    sensor = seed_data["sensor"]
+    started_at = seed_data["timestamp"]
+    readings = [
+        {
+            "sensor_id": sensor.id,
+            "ts": (started_at + timedelta(hours=h)).isoformat(),
+            "celsius": 20 + 2 * h,
+        }
+        for h in range(-3, 9)
+    ]
+    assert client.post("/v1/readings/batch", json={"readings": readings}).status_code == 202
+
+    pour_ids = []
+    for offset in (0, 4, 10):
+        pour = client.post(
+            "/v1/pours",
+            json={
+                "tenant_id": seed_data["tenant"].id,
+                "project_id": seed_data["project"].id,
+                "location_id": seed_data["location"].id,
+                "started_at": (started_at + timedelta(hours=offset)).isoformat(),
+            },
+        ).json()
+        pour_ids.append(pour["id"])
+
+    payload = {
+        "pours": [
+            {"pour_id": pour_ids[0]},
+            {"pour_id": pour_ids[1], "T0_c": 0.0},
+            {"pour_id": pour_ids[2]},
+            {"pour_id": "unknown"},
+        ],
+        "defaults": {"Ea": 40000.0},
+    }
+    response = client.post("/v1/pours/maturity:batch", json=payload)
+    assert response.status_code == 200, response.text
+    body = response.json()
+
+    expected = [
+        client.post(f"/v1/pours/{pour_ids[0]}/maturity_advanced", json={"Ea": 40000.0}).json(),
+        client.post(
+            f"/v1/pours/{pour_ids[1]}/maturity_advanced", json={"Ea": 40000.0, "T0_c": 0.0}
+        ).json(),
+    ]
+    assert [result["pour_id"] for result in body["results"]] == pour_ids[:2]
+    for result, single in zip(body["results"], expected, strict=True):
+        assert math.isclose(result["ttf_c_h"], single["ttf_c_h"], rel_tol=1e-9)
+        assert math.isclose(result["eq_age_h"], single["eq_age_h"], rel_tol=1e-9)
+    assert {(error["pour_id"], error["status_code"]) for error in body["errors"]} == {
+        (pour_ids[2], 422),
+        ("unknown", 404),
+    }
+
+
+def test_maturity_batch_reads_each_sensor_from_its_own_pours(
+    client: TestClient, db_session, monkeypatch, seed_data
+) -> None:
+    monkeypatch.setattr(maturity_service, "_session_factory", TestingSessionLocal)
+    started_at = seed_data["timestamp"]
+    zone_b = Location(
+        tenant_id=seed_data["tenant"].id, project_id=seed_data["project"].id, name="Zone B"
+    )
+    db_session.add(zone_b)
+    db_session.flush()
+    device = Device(
+        tenant_id=seed_data["tenant"].id,
+        project_id=seed_data["project"].id,
+        location_id=zone_b.id,
+        serial_number="DEV-002",
+        status="active",
+    )
+    db_session.add(device)
+    db_session.flush()
+    other = Sensor(
+        tenant_id=seed_data["tenant"].id,
+        project_id=seed_data["project"].id,
+        device_id=device.id,
+        channel="1",
+        sensor_type="temperature",
+    )
+    db_session.add(other)
+    db_session.commit()
+    readings = [
+        {"sensor_id": sensor_id, "ts": (started_at + timedelta(hours=h)).isoformat(), "celsius": 20}
+        for sensor_id in (seed_data["sensor"].id, other.id)
+        for h in range(12)
+    ]
+    assert client.post("/v1/readings/batch", json={"readings": readings}).status_code == 202
+
+    pour_ids = [
+        client.post(
+            "/v1/pours",
+            json={
+                "tenant_id": seed_data["tenant"].id,
+                "project_id": seed_data["project"].id,
+                "location_id": location.id,
+                "started_at": (started_at + timedelta(hours=offset)).isoformat(),
+            },
+        ).json()["id"]
+        for location, offset in ((seed_data["location"], 0), (zone_b, 8))
+    ]
+    loaded = []
+    load = maturity_service._load_sensor_series
+
+    def spy(session, pours, sensors):
+        series, bounds = load(session, pours, sensors)
+        loaded.append(len(series))
+        return series, bounds
+
+    monkeypatch.setattr(maturity_service, "_load_sensor_series", spy)
+    response = client.post(
+        "/v1/pours/maturity:batch", json={"pours": [{"pour_id": pour_id} for pour_id in pour_ids]}
+    )
+    assert response.status_code == 200, response.text
+    ttf = [result["ttf_c_h"] for result in response.json()["results"]]
+    assert ttf == [30.0 * 11, 30.0 * 3]
+    # Zone B's sensor is read from its own pour's start, not the earliest start in the batch.
+    assert loaded == [12 + 4]
+
+
+def test_maturity_curve_endpoint(client: TestClient, monkeypatch) -> None:
+    monkeypatch.setattr(maturity_service, "get_temperature_series", lambda _: _series())
+    curve_params = {"a": 4.2, "b": -6.0, "sigma": 0.8, "min_maturity": 1.0}
+
+    final = client.post(
+        "/v1/pours/XYZ/maturity_advanced", json={"curve_type": "log", "curve_params": curve_params}
+    ).json()
+    response = client.post(
+        "/v1/pours/XYZ/maturity_curve", json={"curve_type": "log", "curve_params": curve_params}
+    )
+    assert response.status_code == 200
+    (curve,) = response.json()["sensors"]
+    assert len(curve["ts"]) == len(curve["ttf_c_h"]) == 25
+    assert curve["ttf_c_h"][0] == 0.0
+    assert all(
+        later >= earlier
+        for earlier, later in zip(curve["ttf_c_h"], curve["ttf_c_h"][1:], strict=False)
+    )
+    assert math.isclose(curve["ttf_c_h"][-1], final["ttf_c_h"], rel_tol=1e-9)
+    assert math.isclose(curve["strength_ttf"]["mean"][-1], final["strength_ttf"]["mean"])
+    assert math.isclose(curve["strength_eq"]["upper"][-1], final["strength_eq"]["upper"])
+
+    decimated = client.post(
+        "/v1/pours/XYZ/maturity_curve",
+        json={"max_points": 5, "as_of": "2025-02-01T12:00:00Z"},
+    ).json()
+    (curve,) = decimated["sensors"]
+    assert curve["strength_ttf"] is None
+    assert len(curve["ts"]) == 5
+    assert curve["ts"][0].startswith("2025-02-01T00:00:00")
+    assert curve["ts"][-1].startswith("2025-02-01T12:00:00")
+
+    invalid = client.post(
+        "/v1/pours/XYZ/maturity_curve", json={"curve_type": "log", "curve_params": {"a": 1.0}}
+    )
+    assert invalid.status_code == 422
@@ -3,7 +3,24 @@ from __future__ import annotations
 import math
 from datetime import datetime, timedelta
 
-from app.domain.maturity_models import equivalent_age, predict_strength, ttf_maturity
+import numpy as np
+import pytest
+
+from app.domain.maturity_models import (
+    SAMPLE_DTYPE,
+    cumulative_maturity,
+    equivalent_age,
+    equivalent_age_array,
+    maturity_integrals,
+    maturity_integrals_stream,
+    maturity_integrals_with_bounds,
+    predict_strength,
+    predict_strength_array,
+    samples_to_arrays,
+    segmented_maturity_integrals,
+    ttf_maturity,
+    ttf_maturity_array,
+)
 
 
 def _synthetic_samples() -> list[tuple[datetime, float]]:
@@ -63,3 +80,142 @@ def test_predict_strength_models() -> None:
     assert asym_ci is None
     assert asym_mean > 35.0
     assert asym_mean < 40.0
+
+
+def _irregular_samples() -> list[tuple[datetime, float]]:
+    base = datetime(2025, 3, 1, 0, 0)
+    offsets_min = [0, 7, 7, 30, 22, 95, 180, 181, 400]
+    temps = [18.0, 19.5, 40.0, 24.0, 21.0, 27.5, 33.0, 33.2, 29.0]
+    return [(base + timedelta(minutes=m), t) for m, t in zip(offsets_min, temps, strict=True)]
+
+
+def _scalar_reference(samples, T0_c, Ea, Tr_c, R=8.314) -> tuple[float, float]:
+    ordered = sorted(samples, key=lambda item: item[0])
+    Tr_k = Tr_c + 273.15
+    ttf = eq_age = 0.0
+    for (t_i, temp_c), (t_j, _) in zip(ordered, ordered[1:], strict=False):
+        delta_hours = (t_j - t_i).total_seconds() / 3600.0
+        if delta_hours <= 0:
+            continue
+        ttf += (temp_c - T0_c) * delta_hours
+        eq_age += delta_hours * math.exp(-Ea / R * ((1.0 / (temp_c + 273.15)) - (1.0 / Tr_k)))
+    return ttf, eq_age
+
+
+def test_array_kernels_match_scalar_reference() -> None:
+    samples = _irregular_samples()
+    expected_ttf, expected_eq = _scalar_reference(samples, -10.0, 33500.0, 20.0)
+
+    epoch_s, temps_c = samples_to_arrays(samples)
+    ttf, eq_age = maturity_integrals(epoch_s, temps_c, -10.0, 33500.0, 20.0)
+    assert math.isclose(ttf, expected_ttf, rel_tol=1e-9)
+    assert math.isclose(eq_age, expected_eq, rel_tol=1e-9)
+    assert math.isclose(ttf_maturity_array(epoch_s, temps_c, -10.0), expected_ttf, rel_tol=1e-9)
+    assert math.isclose(
+        equivalent_age_array(epoch_s, temps_c, 33500.0, 20.0), expected_eq, rel_tol=1e-9
+    )
+    assert math.isclose(ttf_maturity(samples, -10.0), expected_ttf, rel_tol=1e-9)
+    assert math.isclose(equivalent_age(samples, 33500.0, 20.0), expected_eq, rel_tol=1e-9)
+
+
+def test_array_kernels_accept_structured_samples() -> None:
+    samples = _irregular_samples()
+    epoch_s, temps_c = samples_to_arrays(samples)
+    structured = np.empty(len(samples), dtype=SAMPLE_DTYPE)
+    structured["ts"] = epoch_s
+    structured["temp_c"] = temps_c
+
+    assert maturity_integrals(structured, None, 0.0, 40000.0, 25.0) == maturity_integrals(
+        epoch_s, temps_c, 0.0, 40000.0, 25.0
+    )
+    assert maturity_integrals(structured[:1], None, 0.0, 40000.0, 25.0) == (0.0, 0.0)
+
+
+def test_stream_kernel_matches_batch_across_chunks() -> None:
+    samples = sorted(_irregular_samples())
+    epoch_s, temps_c = samples_to_arrays(samples)
+    expected = maturity_integrals(epoch_s, temps_c, -10.0, 33500.0, 20.0)
+
+    ttf, eq_age, count = maturity_integrals_stream(
+        iter(samples), -10.0, 33500.0, 20.0, chunk_size=2
+    )
+    assert count == len(samples)
+    assert math.isclose(ttf, expected[0], rel_tol=1e-9)
+    assert math.isclose(eq_age, expected[1], rel_tol=1e-9)
+
+    with pytest.raises(ValueError):
+        maturity_integrals_stream(reversed(samples), -10.0, 33500.0, 20.0)
+
+
+def test_bucket_bounds_cover_raw_integral() -> None:
+    minutes = np.arange(0, 6 * 60, dtype=np.float64)
+    temps = 20.0 + 8.0 * np.sin(minutes / 90.0)
+    epoch_s = minutes * 60.0
+    exact_ttf, exact_eq = maturity_integrals(epoch_s, temps, -10.0, 33500.0, 20.0)
+
+    buckets = np.arange(0, minutes.size, 15)
+    bucket_temps = np.add.reduceat(temps, buckets) / 15.0
+    low = np.minimum.reduceat(temps, buckets)
+    high = np.maximum.reduceat(temps, buckets)
+    # The final raw reading closes the last bucket as a zero-spread sample.
+    ttf, eq_age, ttf_error, eq_error = maturity_integrals_with_bounds(
+        np.append(epoch_s[buckets], epoch_s[-1]),
+        np.append(bucket_temps, temps[-1]),
+        np.append(low, temps[-1]),
+        np.append(high, temps[-1]),
+        -10.0,
+        33500.0,
+        20.0,
+    )
+    assert 0.0 < ttf_error < 0.05 * ttf
+    assert abs(ttf - exact_ttf) <= ttf_error
+    assert abs(eq_age - exact_eq) <= eq_error
+
+    raw = maturity_integrals_with_bounds(epoch_s, temps, temps, temps, -10.0, 33500.0, 20.0)
+    assert raw[2] == raw[3] == 0.0
+
+
+def test_segmented_integrals_match_per_segment_results() -> None:
+    epoch_s, temps = samples_to_arrays(_synthetic_samples())
+    cut = epoch_s.size // 3
+    segments = np.concatenate([np.zeros(cut, dtype=int), np.full(epoch_s.size - cut, 2)])
+    params = np.array([[-10.0, 33500.0, 20.0], [0.0, 40000.0, 25.0], [0.0, 40000.0, 25.0]])
+
+    ttf, eq_age, counts = segmented_maturity_integrals(
+        segments, epoch_s, temps, params[:, 0], params[:, 1], params[:, 2], segment_count=3
+    )
+    assert counts.tolist() == [cut, 0, epoch_s.size - cut]
+    assert ttf[1] == eq_age[1] == 0.0
+    for segment, window in ((0, slice(None, cut)), (2, slice(cut, None))):
+        expected = maturity_integrals(epoch_s[window], temps[window], *params[segment])
+        assert math.isclose(ttf[segment], expected[0], rel_tol=1e-12)
+        assert math.isclose(eq_age[segment], expected[1], rel_tol=1e-12)
+
+
+def test_cumulative_maturity_matches_prefix_integrals():
+    samples = _synthetic_samples()
+    samples.insert(5, samples[4])
+    epoch_s, temps_c = samples_to_arrays(samples)
+    ttf, eq_age = cumulative_maturity(epoch_s, temps_c, -10.0, 33500.0, 20.0)
+    assert ttf[0] == eq_age[0] == 0.0
+    for count in (2, 6, 13, len(samples)):
+        expected = maturity_integrals(epoch_s[:count], temps_c[:count], -10.0, 33500.0, 20.0)
+        assert ttf[count - 1] == pytest.approx(expected[0], rel=1e-12)
+        assert eq_age[count - 1] == pytest.approx(expected[1], rel=1e-12)
+
+
+
+def test_predict_strength_array_matches_scalar():
+    maturity = np.array([0.0, 0.5, 12.0, 480.0])
+    for curve_type, params in (
+        ("log", {"a": 4.2, "b": -6.0, "sigma": 0.8, "min_maturity": 1.0}),
+        ("asymptotic", {"f_u": 45.0, "k": 0.004}),
+    ):
+        mean, ci = predict_strength_array(maturity, curve_type, params)
+        for index, value in enumerate(maturity.tolist()):
+            expected, expected_ci = predict_strength(value, curve_type, params)
+            assert mean[index] == pytest.approx(expected)
+            if expected_ci is None:
+                assert ci is None
+            else:
+                assert (ci[0][index], ci[1][index]) == pytest.approx(expected_ci)
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import datetime as dt
+import math
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.domain.maturity_models import equivalent_age, ttf_maturity
+from app.main import maturity_service
+from app.models.domain import SensorMaturityState, sensor_maturity_checkpoints
+from app.services import maturity_state
+from app.services.maturity_state import advance_maturity_states, default_params
+from tests.conftest import TestingSessionLocal
+
+
+def _post(client: TestClient, sensor_id: str, samples: list[tuple[dt.datetime, float]]) -> None:
+    payload = {
+        "readings": [
+            {"sensor_id": sensor_id, "ts": ts.isoformat(), "celsius": celsius}
+            for ts, celsius in samples
+        ]
+    }
+    response = client.post("/v1/readings/batch", json=payload)
+    assert response.status_code == 202, response.text
+
+
+def _state(db_session: Session, sensor_id: str) -> SensorMaturityState:
+    T0_c, Ea, Tr_c = default_params()
+    state = db_session.scalars(
+        select(SensorMaturityState).where(
+            SensorMaturityState.sensor_id == sensor_id,
+            SensorMaturityState.t0_c == T0_c,
+            SensorMaturityState.ea == Ea,
+            SensorMaturityState.tr_c == Tr_c,
+        )
+    ).one()
+    db_session.refresh(state)
+    return state
+
+
+def _assert_matches_full_history(state: SensorMaturityState, samples) -> None:
+    T0_c, Ea, Tr_c = default_params()
+    assert math.isclose(state.ttf_c_h, ttf_maturity(samples, T0_c), rel_tol=1e-9)
+    assert math.isclose(state.eq_age_h, equivalent_age(samples, Ea, Tr_c), rel_tol=1e-9)
+
+
+def test_state_advances_and_rebuilds_on_late_data(
+    client: TestClient, db_session: Session, seed_data
+):
+    sensor = seed_data["sensor"]
+    base = seed_data["timestamp"]
+    samples = [(base + dt.timedelta(minutes=15 * i), 20.0 + i) for i in range(12)]
+
+    _post(client, sensor.id, samples[:4])
+    _post(client, sensor.id, samples[4:8])
+    state = _state(db_session, sensor.id)
+    assert state.sample_count == 8
+    _assert_matches_full_history(state, samples[:8])
+
+    # Re-sending the watermark sample with a new value only changes the open interval.
+    samples[7] = (samples[7][0], 35.0)
+    _post(client, sensor.id, samples[7:12])
+    _assert_matches_full_history(_state(db_session, sensor.id), samples)
+
+    late = (base + dt.timedelta(minutes=20), 45.0)
+    _post(client, sensor.id, [late])
+    state = _state(db_session, sensor.id)
+    assert state.sample_count == 13
+    _assert_matches_full_history(state, sorted([*samples, late]))
+
+
+def test_state_advance_reads_the_locked_row_not_a_stale_copy(
+    client: TestClient, db_session: Session, seed_data
+):
+    sensor = seed_data["sensor"]
+    base = seed_data["timestamp"]
+    samples = [(base + dt.timedelta(minutes=15 * i), 20.0 + i) for i in range(9)]
+    _post(client, sensor.id, samples[:3])
+
+    other = TestingSessionLocal()
+    try:
+        # ``other`` still holds the state as of the first batch when it advances the third.
+        (stale,) = other.scalars(
+            select(SensorMaturityState).where(SensorMaturityState.sensor_id == sensor.id)
+        ).all()
+        assert stale.sample_count == 3
+        _post(client, sensor.id, samples[3:6])
+        records = [{"sensor_id": sensor.id, "ts": ts, "celsius": c} for ts, c in samples[6:]]
+        advance_maturity_states(other, records)
+        other.commit()
+    finally:
+        other.close()
+
+    state = _state(db_session, sensor.id)
+    assert state.sample_count == 9
+    _assert_matches_full_history(state, samples)
+
+
+def test_pour_maturity_reads_accumulator(client: TestClient, seed_data):
+    sensor = seed_data["sensor"]
+    base = seed_data["timestamp"]
+    pour = client.post(
+        "/v1/pours",
+        json={
+            "tenant_id": seed_data["tenant"].id,
+            "project_id": seed_data["project"].id,
+            "started_at": base.isoformat(),
+        },
+    ).json()
+
+    samples = [(base + dt.timedelta(hours=h), 25.0) for h in range(5)]
+    _post(client, sensor.id, samples)
+
+    body = client.get(f"/v1/pours/{pour['id']}/maturity").json()
+    T0_c, _, _ = default_params()
+    assert math.isclose(body["ttf_c_h"]["mean"], (25.0 - T0_c) * 4, rel_tol=1e-9)
+    assert body["eq_age_h"]["min"] > 4.0
+    assert body["sensors"][0]["readings_count"] == 5
+
+
+def test_pour_maturity_window_excludes_pre_pour_readings(client: TestClient, seed_data):
+    sensor = seed_data["sensor"]
+    base = seed_data["timestamp"]
+    samples = [(base + dt.timedelta(minutes=30 * i), 18.0 + 0.5 * i) for i in range(16)]
+    _post(client, sensor.id, samples)
+
+    started_at = samples[5][0]
+    pour = client.post(
+        "/v1/pours",
+        json={
+            "tenant_id": seed_data["tenant"].id,
+            "project_id": seed_data["project"].id,
+            "location_id": seed_data["location"].id,
+            "started_at": started_at.isoformat(),
+        },
+    ).json()
+
+    body = client.get(f"/v1/pours/{pour['id']}/maturity").json()
+    T0_c, Ea, Tr_c = default_params()
+    in_window = samples[5:]
+    assert body["readings_count"] == len(in_window)
+    (reported,) = body["sensors"]
+    assert math.isclose(reported["ttf_c_h"], ttf_maturity(in_window, T0_c), rel_tol=1e-6)
+    assert math.isclose(reported["eq_age_h"], equivalent_age(in_window, Ea, Tr_c), rel_tol=1e-6)
+    assert body["ttf_c_h"]["min"] == body["ttf_c_h"]["max"] == reported["ttf_c_h"]
+
+
+def test_pour_maturity_tolerance_falls_back_without_rollups(client: TestClient, seed_data):
+    sensor = seed_data["sensor"]
+    base = seed_data["timestamp"]
+    pour = client.post(
+        "/v1/pours",
+        json={
+            "tenant_id": seed_data["tenant"].id,
+            "project_id": seed_data["project"].id,
+            "started_at": base.isoformat(),
+        },
+    ).json()
+    _post(client, sensor.id, [(base + dt.timedelta(hours=h), 22.0) for h in range(3)])
+
+    exact = client.get(f"/v1/pours/{pour['id']}/maturity").json()
+    approximate = client.get(f"/v1/pours/{pour['id']}/maturity", params={"tolerance": 0.05})
+    assert approximate.status_code == 200
+    assert approximate.json()["sensors"] == exact["sensors"]
+    invalid = client.get(f"/v1/pours/{pour['id']}/maturity", params={"tolerance": 0})
+    assert invalid.status_code == 422
+
+
+def _checkpoints(db_session: Session, state: SensorMaturityState) -> list[tuple]:
+    table = sensor_maturity_checkpoints
+    rows = db_session.execute(
+        select(table.c.ts, table.c.sample_count, table.c.ttf_c_h)
+        .where(table.c.state_id == state.id)
+        .order_by(table.c.ts)
+    ).all()
+    return [(ts.replace(tzinfo=dt.UTC), count, ttf) for ts, count, ttf in rows]
+
+
+def test_checkpoints_are_written_and_repaired(
+    client: TestClient, db_session: Session, seed_data, monkeypatch
+):
+    sensor = seed_data["sensor"]
+    base = seed_data["timestamp"]
+    samples = [(base + dt.timedelta(minutes=20 * i), 20.0 + i) for i in range(10)]
+    _post(client, sensor.id, samples[:5])
+    _post(client, sensor.id, samples[5:])
+
+    # Readings run 12:00-15:00; the open 15:00 hour has no checkpoint yet.
+    state = _state(db_session, sensor.id)
+    checkpoints = _checkpoints(db_session, state)
+    assert [(ts.hour, count) for ts, count, _ in checkpoints] == [(13, 3), (14, 6), (15, 9)]
+    T0_c, _, _ = default_params()
+    assert math.isclose(checkpoints[1][2], ttf_maturity(samples[:6], T0_c), rel_tol=1e-9)
+
+    loads = []
+    load = maturity_state.load_sensor_history_plan
+
+    def spy(sensor_id, since=None):
+        loads.append(since)
+        return load(sensor_id, since)
+
+    monkeypatch.setattr(maturity_state, "load_sensor_history_plan", spy)
+    late = (base + dt.timedelta(minutes=90), 60.0)
+    _post(client, sensor.id, [late])
+    # Resumed from the 13:00 checkpoint, whose last reading is at 12:40.
+    assert loads == [samples[2][0]]
+    repaired = _checkpoints(db_session, _state(db_session, sensor.id))
+    history = sorted([*samples, late])
+    assert repaired[0] == checkpoints[0]
+    assert [count for _, count, _ in repaired] == [3, 7, 10]
+    assert math.isclose(repaired[1][2], ttf_maturity(history[:7], T0_c), rel_tol=1e-9)
+
+
+def test_pour_maturity_as_of(client: TestClient, seed_data, monkeypatch):
+    sensor = seed_data["sensor"]
+    base = seed_data["timestamp"]
+    pour = client.post(
+        "/v1/pours",
+        json={
+            "tenant_id": seed_data["tenant"].id,
+            "project_id": seed_data["project"].id,
+            "started_at": base.isoformat(),
+        },
+    ).json()
+    samples = [(base + dt.timedelta(minutes=25 * i), 18.0 + 0.7 * i) for i in range(20)]
+    _post(client, sensor.id, samples)
+
+    T0_c, Ea, Tr_c = default_params()
+    as_of = base + dt.timedelta(hours=3, minutes=10)
+    body = client.get(f"/v1/pours/{pour['id']}/maturity", params={"as_of": as_of.isoformat()})
+    (reported,) = body.json()["sensors"]
+    upto = [sample for sample in samples if sample[0] <= as_of]
+    assert reported["source"] == "checkpoint"
+    assert reported["readings_count"] == len(upto)
+    assert math.isclose(reported["ttf_c_h"], ttf_maturity(upto, T0_c), rel_tol=1e-9)
+    assert math.isclose(reported["eq_age_h"], equivalent_age(upto, Ea, Tr_c), rel_tol=1e-9)
+
+    instants = [base + dt.timedelta(minutes=minutes) for minutes in (30, 200, 475)]
+    timeline = client.get(
+        f"/v1/pours/{pour['id']}/maturity/as_of",
+        params={"at": [instant.isoformat() for instant in instants]},
+    ).json()
+    for instant, result in zip(instants, timeline["results"], strict=True):
+        expected = ttf_maturity([sample for sample in samples if sample[0] <= instant], T0_c)
+        assert result["window_end"] == instant.isoformat().replace("+00:00", "Z")
+        # Before the first checkpoint the window is integrated in SQL, to SQLite's precision.
+        assert math.isclose(result["ttf_c_h"]["min"], expected, rel_tol=1e-6)
+
+    monkeypatch.setattr(maturity_service, "_session_factory", TestingSessionLocal)
+    advanced = client.post(
+        f"/v1/pours/{pour['id']}/maturity_advanced", json={"as_of": as_of.isoformat()}
+    )
+    assert math.isclose(advanced.json()["ttf_c_h"], ttf_maturity(upto, T0_c), rel_tol=1e-9)
+
+    early = client.get(
+        f"/v1/pours/{pour['id']}/maturity",
+        params={"as_of": (base - dt.timedelta(hours=1)).isoformat()},
+    )
+    assert early.status_code == 422
+
+
+
+def test_states_are_created_once_without_on_conflict(db_session: Session, seed_data, monkeypatch):
+    # Dialects other than PostgreSQL and SQLite create missing states with select-then-insert.
+    monkeypatch.setattr(db_session.bind.dialect, "name", "generic")
+    sensor = seed_data["sensor"]
+    for minutes in (0, 15):
+        ts = seed_data["timestamp"] + dt.timedelta(minutes=minutes)
+        advance_maturity_states(db_session, [{"sensor_id": sensor.id, "ts": ts, "celsius": 20.0}])
+    db_session.commit()
+    monkeypatch.undo()
+
+    assert _state(db_session, sensor.id).sample_count == 0
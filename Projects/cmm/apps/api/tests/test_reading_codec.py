@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import datetime as dt
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.domain.reading_codec import (
+    HEADER,
+    MEDIA_TYPE,
+    MIN_EPOCH_MS,
+    ReadingCodecError,
+    column_readings,
+    decode_readings,
+    encode_readings,
+)
+
+
+def test_round_trip_preserves_columns():
+    sensor_ids = ["a", "b", "a", "c", "b"]
+    epoch_ms = [
+        1_700_000_060_000,
+        1_700_000_000_000,
+        1_700_000_120_000,
+        1_699_990_000_000,
+        1_700_000_000_500,
+    ]
+    celsius = [20.0, -12.346, 299.99, -200.0, 0.004]
+
+    body = encode_readings(sensor_ids, epoch_ms, celsius)
+    assert len(body) == HEADER.size + 3 * 2 + len(sensor_ids) * 8
+
+    columns = decode_readings(body)
+    assert columns.sensor_ids == ["a", "b", "c"]
+    assert [columns.sensor_ids[i] for i in columns.sensor_index] == sensor_ids
+    np.testing.assert_array_equal(columns.epoch_ms, epoch_ms)
+    np.testing.assert_allclose(columns.celsius, [20.0, -12.35, 299.99, -200.0, 0.0])
+
+
+@pytest.mark.parametrize(
+    "mutate, message",
+    [
+        (lambda body: body[:10], "shorter than the header"),
+        (lambda body: b"JSON" + body[4:], "Not a binary"),
+        (lambda body: body[:-1], "bytes of columns"),
+        (lambda body: body[: HEADER.size + 3] + b"\x09\x00" + body[HEADER.size + 5 :], "outside"),
+        (lambda _: encode_readings(["s1"], [2**50], [21.5]), "Timestamp out of range"),
+        (lambda _: encode_readings(["s1"] * 2, [MIN_EPOCH_MS, MIN_EPOCH_MS - 1], [1, 2]), "range"),
+    ],
+)
+def test_decode_rejects_malformed_batches(mutate, message):
+    body = encode_readings(["s1"], [1_700_000_000_000], [21.5])
+    with pytest.raises(ReadingCodecError, match=message):
+        decode_readings(mutate(body))
+
+
+def test_column_readings_expand_to_utc_datetimes():
+    epoch_ms = [
+        1_700_000_000_123,
+        1_699_999_999_999,
+        1_700_086_400_000,
+        1_700_000_000_123,
+        1_700_000_000_001,
+    ]
+    readings = column_readings(
+        decode_readings(encode_readings(["a", "b", "c", "a", "b"], epoch_ms, [1, 2, 3, 4, 5]))
+    )
+
+    epoch = dt.datetime(1970, 1, 1, tzinfo=dt.UTC)
+    assert readings == [
+        (sensor_id, epoch + dt.timedelta(milliseconds=ms), celsius)
+        for sensor_id, ms, celsius in zip("abcab", epoch_ms, [1.0, 2.0, 3.0, 4.0, 5.0], strict=True)
+    ]
+    assert readings[0][1] is readings[3][1]
+
+
+def test_encode_rejects_out_of_range_temperatures():
+    with pytest.raises(ReadingCodecError):
+        encode_readings(["s1"], [0], [300.5])
+
+
+def test_binary_ingest_matches_json_batch(client: TestClient, seed_data):
+    sensor = seed_data["sensor"]
+    base = seed_data["timestamp"]
+    stamps = [base + dt.timedelta(minutes=10 * i) for i in range(6)]
+    body = encode_readings(
+        [sensor.id] * 6,
+        [int(ts.timestamp() * 1000) for ts in stamps],
+        [21.0 + i for i in range(6)],
+    )
+
+    response = client.post(
+        "/v1/readings/binary", content=body, headers={"content-type": MEDIA_TYPE}
+    )
+    assert response.status_code == 202, response.text
+    assert response.json() == {"processed": 6, "inserted": 6, "updated": 0}
+
+    replay = client.post(
+        "/v1/readings/batch",
+        json={
+            "readings": [
+                {"sensor_id": sensor.id, "ts": ts.isoformat(), "celsius": 21.0 + i}
+                for i, ts in enumerate(stamps)
+            ]
+        },
+    )
+    assert replay.json()["updated"] == 6
+
+    unknown = client.post("/v1/readings/binary", content=encode_readings(["ghost"], [0], [1.0]))
+    assert unknown.status_code == 400
+    assert client.post("/v1/readings/binary", content=b"CMRB").status_code == 400
+    far_future = encode_readings([sensor.id], [2**50], [20.0])
+    assert client.post("/v1/readings/binary", content=far_future).status_code == 400
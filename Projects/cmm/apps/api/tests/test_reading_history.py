@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import datetime as dt
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.domain.downsampling import lttb_indices
+from app.services.reading_history import decode_cursor, encode_cursor
+
+
+def test_lttb_keeps_endpoints_and_peaks():
+    x = np.arange(1000, dtype=float)
+    y = np.sin(x / 50.0)
+    y[437] = 25.0
+    keep = lttb_indices(x, y, 50)
+    assert len(keep) == 50
+    assert keep[0] == 0 and keep[-1] == 999
+    assert np.all(np.diff(keep) > 0)
+    assert 437 in keep
+    np.testing.assert_array_equal(lttb_indices(x[:10], y[:10], 50), np.arange(10))
+    with pytest.raises(ValueError):
+        lttb_indices(x, y, 2)
+
+
+def test_cursor_round_trips():
+    ts = dt.datetime(2025, 1, 1, 12, 30, tzinfo=dt.UTC)
+    assert decode_cursor(encode_cursor(ts)) == ts
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def _seed(client: TestClient, sensor_id: str, start: dt.datetime, count: int) -> None:
+    readings = [
+        {
+            "sensor_id": sensor_id,
+            "ts": (start + dt.timedelta(minutes=minute)).isoformat(),
+            "celsius": 20.0 + 10.0 * np.sin(minute / 30.0),
+        }
+        for minute in range(count)
+    ]
+    assert client.post("/v1/readings/batch", json={"readings": readings}).status_code == 202
+
+
+def test_history_pages_raw_readings(client: TestClient, seed_data):
+    sensor = seed_data["sensor"]
+    start = seed_data["timestamp"]
+    _seed(client, sensor.id, start, 25)
+
+    seen: list[str] = []
+    params = {"limit": 10, "start": start.isoformat()}
+    while True:
+        page = client.get(f"/v1/sensors/{sensor.id}/readings", params=params).json()
+        assert page["source"] == "readings"
+        seen.extend(page["ts"])
+        if page["next_cursor"] is None:
+            break
+        params["cursor"] = page["next_cursor"]
+    assert len(seen) == 25
+    assert len(set(seen)) == 25
+
+
+def test_history_decimates_to_max_points(client: TestClient, seed_data):
+    sensor = seed_data["sensor"]
+    start = seed_data["timestamp"]
+    _seed(client, sensor.id, start, 600)
+
+    response = client.get(
+        f"/v1/sensors/{sensor.id}/readings",
+        params={
+            "max_points": 100,
+            "start": start.isoformat(),
+            "end": (start + dt.timedelta(hours=10)).isoformat(),
+        },
+    )
+    assert response.status_code == 200
+    page = response.json()
+    assert len(page["ts"]) == len(page["celsius"]) == 100
+    assert page["next_cursor"] is None
+    assert page["ts"] == sorted(page["ts"])
+    assert max(page["celsius"]) == pytest.approx(30.0, abs=0.05)
+
+
+def test_history_supports_conditional_requests(client: TestClient, seed_data):
+    sensor = seed_data["sensor"]
+    url = f"/v1/sensors/{sensor.id}/readings"
+    _seed(client, sensor.id, seed_data["timestamp"], 5)
+
+    first = client.get(url)
+    etag = first.headers["etag"]
+    cached = client.get(url, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    _seed(client, sensor.id, seed_data["timestamp"] + dt.timedelta(hours=1), 1)
+    changed = client.get(url, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+def test_history_rejects_bad_requests(client: TestClient, seed_data):
+    sensor = seed_data["sensor"]
+    assert client.get("/v1/sensors/missing/readings").status_code == 404
+    response = client.get(f"/v1/sensors/{sensor.id}/readings", params={"cursor": "%%%"})
+    assert response.status_code == 400
+    response = client.get(f"/v1/sensors/{sensor.id}/readings", params={"max_points": 2})
+    assert response.status_code == 422
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import gzip
+import json
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.services.reading_stream import LineTooLong, iter_lines
+
+
+def _pieces(body: bytes, size: int):
+    for start in range(0, len(body), size):
+        yield body[start : start + size]
+
+
+def test_ndjson_stream_upserts_in_chunks_and_reports_rejects(
+    client: TestClient, seed_data, monkeypatch
+):
+    monkeypatch.setattr(settings, "ingest_chunk_size", 2)
+    sensor = seed_data["sensor"]
+    base = seed_data["timestamp"]
+    lines = [
+        json.dumps(
+            {
+                "sensor_id": sensor.id,
+                "ts": (base + dt.timedelta(minutes=i)).isoformat(),
+                "celsius": 20 + i,
+            }
+        )
+        for i in range(5)
+    ]
+    lines.insert(2, "{not json")
+    lines.insert(4, json.dumps({"sensor_id": sensor.id, "ts": base.isoformat(), "celsius": 999}))
+    lines.append("")
+    lines.append(json.dumps({"sensor_id": "ghost", "ts": base.isoformat(), "celsius": 1}))
+    body = "\n".join(lines).encode()
+
+    response = client.post(
+        "/v1/readings/stream",
+        content=_pieces(body, 7),
+        headers={"content-type": "application/x-ndjson"},
+    )
+    assert response.status_code == 202, response.text
+    summary = response.json()
+    assert summary["processed"] == summary["inserted"] == 5
+    assert summary["rejected"] == 3
+    assert [reject["line"] for reject in summary["rejects"]] == [3, 5, 9]
+    assert "celsius" in summary["rejects"][1]["error"]
+    assert summary["rejects"][2]["error"] == "Unknown sensor ghost"
+    assert summary["rejects_truncated"] is False
+
+
+def test_gzip_csv_stream_with_header(client: TestClient, seed_data):
+    sensor = seed_data["sensor"]
+    base = seed_data["timestamp"]
+    rows = ["celsius,sensor_id,ts"] + [
+        f"{18.5 + i},{sensor.id},{(base + dt.timedelta(hours=i)).isoformat()}" for i in range(50)
+    ]
+    rows.append(f"oops,{sensor.id},{base.isoformat()}")
+    body = gzip.compress("\r\n".join(rows).encode())
+
+    response = client.post(
+        "/v1/readings/stream",
+        content=_pieces(body, 64),
+        headers={"content-type": "text/csv", "content-encoding": "gzip"},
+    )
+    assert response.status_code == 202, response.text
+    summary = response.json()
+    assert summary["processed"] == 50
+    assert summary["rejected"] == 1
+    assert summary["rejects"][0]["line"] == 52
+
+    replay = client.post(
+        "/v1/readings/stream?format=csv",
+        content=gzip.compress("\n".join(rows[:11]).encode()),
+        headers={"content-encoding": "gzip"},
+    ).json()
+    assert replay["updated"] == 10
+    assert replay["inserted"] == 0
+
+
+def test_invalid_gzip_body_is_rejected(client: TestClient, seed_data):
+    response = client.post(
+        "/v1/readings/stream",
+        content=b"definitely not gzip",
+        headers={"content-encoding": "gzip"},
+    )
+    assert response.status_code == 400
+
+
+def test_iter_lines_skips_oversized_lines():
+    async def collect(chunks):
+        async def source():
+            for chunk in chunks:
+                yield chunk
+
+        return [item async for item in iter_lines(source(), max_line_bytes=8)]
+
+    lines = asyncio.run(collect([b"ok\n0123", b"456789abc", b"def\nfine\n\nlast"]))
+    assert lines[0] == (1, b"ok")
+    assert lines[1][0] == 2 and isinstance(lines[1][1], LineTooLong)
+    assert lines[2:] == [(3, b"fine"), (5, b"last")]
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import datetime as dt
+import math
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+from app.schemas import ReadingBatchBody
+from app.services.reading_validation import (
+    ReadingBatchError,
+    find_duplicates,
+    validate_reading_rows,
+)
+
+BODY = TypeAdapter(ReadingBatchBody)
+
+
+def _rows(readings: list[dict]):
+    return BODY.validate_python({"readings": readings})["readings"]
+
+
+def test_timestamps_are_normalized_to_utc():
+    readings = validate_reading_rows(
+        _rows(
+            [
+                {"sensor_id": "a", "ts": "2025-01-01T12:00:00", "celsius": 20},
+                {"sensor_id": "a", "ts": "2025-01-01T14:00:00+02:00", "celsius": "21.5"},
+            ]
+        )
+    )
+    noon = dt.datetime(2025, 1, 1, 12, tzinfo=dt.UTC)
+    assert readings.ts == [noon, noon]
+    assert all(ts.utcoffset() == dt.timedelta(0) for ts in readings.ts)
+    assert readings.celsius == [20.0, 21.5]
+
+
+def test_range_errors_keep_reading_indices():
+    rows = _rows(
+        [
+            {"sensor_id": "a", "ts": "2025-01-01T00:00:00Z", "celsius": 20},
+            {"sensor_id": "a", "ts": "2025-01-01T00:01:00Z", "celsius": 300.5},
+            {"sensor_id": "a", "ts": "2025-01-01T00:02:00Z", "celsius": -250},
+            {"sensor_id": "a", "ts": "2025-01-01T00:03:00Z", "celsius": math.nan},
+        ]
+    )
+    with pytest.raises(ReadingBatchError) as info:
+        validate_reading_rows(rows)
+    errors = info.value.errors
+    assert [error["loc"] for error in errors] == [
+        ("readings", 1, "celsius"),
+        ("readings", 2, "celsius"),
+        ("readings", 3, "celsius"),
+    ]
+    assert [error["type"] for error in errors] == [
+        "less_than_equal",
+        "greater_than_equal",
+        "finite_number",
+    ]
+
+
+def test_find_duplicates_points_at_first_occurrence():
+    base = dt.datetime(2025, 1, 1, tzinfo=dt.UTC)
+    later = base + dt.timedelta(microseconds=1)
+    sensor_ids = ["a", "b", "a", "a", "b", "c"]
+    ts = [base, base, base, later, base, base]
+    assert find_duplicates(sensor_ids, ts) == [(2, 0), (4, 1)]
+    assert find_duplicates(["a", "a"], [base, later]) == []
+
+
+def test_batch_route_reports_errors_per_index(client: TestClient, seed_data):
+    sensor = seed_data["sensor"]
+    ts = seed_data["timestamp"].isoformat()
+    response = client.post(
+        "/v1/readings/batch",
+        json={
+            "readings": [
+                {"sensor_id": sensor.id, "ts": ts, "celsius": 20.0},
+                {"sensor_id": sensor.id, "ts": ts, "celsius": 400.0},
+                {"sensor_id": sensor.id, "ts": "not a time", "celsius": 20.0},
+            ]
+        },
+    )
+    assert response.status_code == 422
+    assert [error["loc"] for error in response.json()["detail"]] == [["body", "readings", 2, "ts"]]
+
+    response = client.post(
+        "/v1/readings/batch",
+        json={"readings": [{"sensor_id": sensor.id, "ts": ts, "celsius": 400.0}]},
+    )
+    (error,) = response.json()["detail"]
+    assert error["loc"] == ["body", "readings", 0, "celsius"]
+    assert error["msg"] == "Input should be less than or equal to 300"
+
+    assert client.post("/v1/readings/batch", json={"readings": []}).status_code == 422
+
+
+def test_batch_route_can_reject_duplicates(client: TestClient, seed_data):
+    sensor = seed_data["sensor"]
+    ts = seed_data["timestamp"].isoformat()
+    readings = [
+        {"sensor_id": sensor.id, "ts": ts, "celsius": 20.0},
+        {"sensor_id": sensor.id, "ts": ts, "celsius": 21.0},
+    ]
+
+    rejected = client.post(
+        "/v1/readings/batch", params={"on_duplicate": "reject"}, json={"readings": readings}
+    )
+    assert rejected.status_code == 422
+    (error,) = rejected.json()["detail"]
+    assert error["loc"] == ["body", "readings", 1]
+    assert error["msg"].startswith("Duplicate of readings[0]")
+
+    accepted = client.post("/v1/readings/batch", json={"readings": readings})
+    assert accepted.status_code == 202
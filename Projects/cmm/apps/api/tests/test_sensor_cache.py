@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import re
+
+import fakeredis
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.domain import Pour
+from app.services.maturity_cache import maturity_cache
+from app.services.sensor_cache import (
+    VERSION_KEY,
+    SensorCacheStats,
+    SensorMetadataCache,
+    sensor_metadata_cache,
+)
+from tests.conftest import async_engine
+
+
+@pytest.fixture
+def sensor_cache(monkeypatch):
+    monkeypatch.setattr(sensor_metadata_cache, "stats", SensorCacheStats())
+    sensor_metadata_cache.clear()
+    yield sensor_metadata_cache
+    sensor_metadata_cache.clear()
+
+
+def _post(client: TestClient, sensor_id: str, ts: dt.datetime) -> None:
+    payload = {"readings": [{"sensor_id": sensor_id, "ts": ts.isoformat(), "celsius": 21.0}]}
+    response = client.post("/v1/readings/batch", json=payload)
+    assert response.status_code == 202, response.text
+
+
+def test_ingest_resolves_sensors_from_cache(client: TestClient, seed_data, sensor_cache):
+    sensor = seed_data["sensor"]
+    base = seed_data["timestamp"]
+
+    _post(client, sensor.id, base)
+    assert sensor_cache.stats.loads == 1
+    for minutes in range(1, 4):
+        _post(client, sensor.id, base + dt.timedelta(minutes=minutes))
+    assert sensor_cache.stats.loads == 1
+    assert sensor_cache.stats.hits == 3
+
+    pour = client.post(
+        "/v1/pours",
+        json={
+            "tenant_id": seed_data["tenant"].id,
+            "project_id": seed_data["project"].id,
+            "started_at": base.isoformat(),
+        },
+    ).json()
+    _post(client, sensor.id, base + dt.timedelta(minutes=5))
+    assert sensor_cache.stats.loads == 2
+    (metadata,) = sensor_cache.get_many([sensor.id]).values()
+    assert metadata.tenant_id == seed_data["tenant"].id
+    assert metadata.pour_ids == (pour["id"],)
+    assert metadata.active_pour_id == pour["id"]
+
+    stats = client.get("/v1/admin/cache").json()["sensor_metadata"]
+    assert stats["entries"] == 1
+    assert stats["loads"] == 2
+
+
+def test_ingest_invalidates_pours_without_metadata_queries(
+    client: TestClient, db_session: Session, seed_data, sensor_cache, monkeypatch
+):
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(sensor_cache, "client", fakeredis.aioredis.FakeRedis(server=server))
+    monkeypatch.setattr(sensor_cache, "_version", None)
+    sensor = seed_data["sensor"]
+    base = seed_data["timestamp"]
+    _post(client, sensor.id, base)
+
+    # Created by another worker, which publishes the change instead of this process.
+    pour = Pour(
+        tenant_id=seed_data["tenant"].id,
+        project_id=seed_data["project"].id,
+        started_at=base,
+    )
+    db_session.add(pour)
+    db_session.commit()
+    asyncio.run(SensorMetadataCache(client=fakeredis.aioredis.FakeRedis(server=server)).publish())
+    invalidated = []
+
+    async def invalidate(pour_ids):
+        invalidated.extend(pour_ids)
+
+    monkeypatch.setattr(maturity_cache, "invalidate", invalidate)
+    _post(client, sensor.id, base + dt.timedelta(minutes=1))
+    assert sensor_cache.stats.loads == 2
+    assert invalidated == [pour.id]
+
+    statements = []
+
+    def record(conn, cursor, statement, *args) -> None:
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        _post(client, sensor.id, base + dt.timedelta(minutes=2))
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+    assert invalidated == [pour.id, pour.id]
+    assert statements
+    assert not [sql for sql in statements if re.search(r"\b(sensors|devices|pours)\b", sql)]
+
+
+def test_device_changes_invalidate_its_sensors(client: TestClient, seed_data, sensor_cache):
+    sensor = seed_data["sensor"]
+    _post(client, sensor.id, seed_data["timestamp"])
+    assert sensor_cache.get_many([sensor.id])
+
+    response = client.patch(
+        f"/v1/devices/{seed_data['device'].id}/config", json={"firmware_version": "2.0.1"}
+    )
+    assert response.status_code == 200
+    assert sensor_cache.get_many([sensor.id]) == {}
+
+
+def test_invalidations_are_published_to_other_processes(
+    client: TestClient, seed_data, sensor_cache, monkeypatch
+):
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(sensor_cache, "client", fakeredis.aioredis.FakeRedis(server=server))
+    monkeypatch.setattr(sensor_cache, "_version", None)
+    sensor = seed_data["sensor"]
+    base = seed_data["timestamp"]
+    _post(client, sensor.id, base)
+    _post(client, sensor.id, base + dt.timedelta(minutes=1))
+    assert sensor_cache.stats.loads == 1
+
+    # A device edit in this process invalidates precisely and does not clear the rest.
+    response = client.patch(
+        f"/v1/devices/{seed_data['device'].id}/config", json={"firmware_version": "2.0.1"}
+    )
+    assert response.status_code == 200
+    _post(client, sensor.id, base + dt.timedelta(minutes=2))
+    _post(client, sensor.id, base + dt.timedelta(minutes=3))
+    assert sensor_cache.stats.loads == 2
+
+    other = SensorMetadataCache(client=fakeredis.aioredis.FakeRedis(server=server))
+    asyncio.run(other.publish())
+    _post(client, sensor.id, base + dt.timedelta(minutes=4))
+    assert sensor_cache.stats.loads == 3
+    version = asyncio.run(fakeredis.aioredis.FakeRedis(server=server).get(VERSION_KEY))
+    assert int(version) == 2
+
+
+def test_unknown_sensors_are_not_cached(client: TestClient, seed_data, sensor_cache):
+    response = client.post(
+        "/v1/readings/batch",
+        json={
+            "readings": [
+                {"sensor_id": "missing", "ts": seed_data["timestamp"].isoformat(), "celsius": 1.0}
+            ]
+        },
+    )
+    assert response.status_code == 400
+    assert sensor_cache.snapshot()["entries"] == 0
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import datetime as dt
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.services.sensor_latest import latest_readings, update_sensor_latest
+
+
+def _post(client: TestClient, sensor_id: str, ts: dt.datetime, celsius: float) -> None:
+    response = client.post(
+        "/v1/readings/batch",
+        json={"readings": [{"sensor_id": sensor_id, "ts": ts.isoformat(), "celsius": celsius}]},
+    )
+    assert response.status_code == 202
+
+
+def _latest(client: TestClient, **params) -> list[dict]:
+    response = client.get("/v1/sensors/latest", params=params)
+    assert response.status_code == 200
+    return response.json()["sensors"]
+
+
+def test_latest_reading_only_moves_forward(client: TestClient, seed_data):
+    sensor = seed_data["sensor"]
+    start = seed_data["timestamp"]
+    assert _latest(client, project_id=seed_data["project"].id) == []
+
+    _post(client, sensor.id, start + dt.timedelta(hours=2), 25.0)
+    _post(client, sensor.id, start, 15.0)
+    (row,) = _latest(client, project_id=seed_data["project"].id)
+    assert row["sensor_id"] == sensor.id
+    assert row["device_id"] == sensor.device_id
+    assert dt.datetime.fromisoformat(row["ts"]).replace(tzinfo=dt.UTC) == (
+        start + dt.timedelta(hours=2)
+    )
+    assert row["celsius"] == 25.0
+    assert row["ttf_c_h"] is not None and row["ttf_c_h"] > 0
+    assert row["eq_age_h"] is not None
+
+    _post(client, sensor.id, start + dt.timedelta(hours=2), 26.5)
+    (row,) = _latest(client, tenant_id=seed_data["tenant"].id)
+    assert row["celsius"] == 26.5
+
+
+def test_latest_requires_a_scope(client: TestClient, seed_data):
+    assert client.get("/v1/sensors/latest").status_code == 422
+    assert _latest(client, tenant_id=seed_data["tenant"].id, project_id="unknown") == []
+
+
+def test_latest_moves_forward_without_on_conflict(db_session: Session, seed_data, monkeypatch):
+    # Dialects other than PostgreSQL and SQLite update or insert each sensor's row in turn.
+    monkeypatch.setattr(db_session.bind.dialect, "name", "generic")
+    sensor = seed_data["sensor"]
+    start = seed_data["timestamp"]
+    tenant_id = seed_data["tenant"].id
+    for hours, celsius in ((2, 25.0), (0, 15.0), (2, 26.5)):
+        ts = start + dt.timedelta(hours=hours)
+        record = {"sensor_id": sensor.id, "tenant_id": tenant_id, "ts": ts, "celsius": celsius}
+        update_sensor_latest(db_session, [record])
+    db_session.commit()
+    monkeypatch.undo()
+
+    (row,) = latest_readings(db_session, project_id=seed_data["project"].id)
+    assert row.ts.replace(tzinfo=dt.UTC) == start + dt.timedelta(hours=2)
+    assert float(row.celsius) == 26.5
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import datetime as dt
+import math
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.domain.maturity_models import equivalent_age, ttf_maturity
+from app.models.domain import Pour, readings_archive, readings_ts
+from app.services.maturity_state import default_params
+from app.services.storage import archive_closed_pours
+
+
+def test_archived_pour_keeps_maturity(client: TestClient, db_session: Session, seed_data):
+    sensor = seed_data["sensor"]
+    base = seed_data["timestamp"]
+    samples = [(base + dt.timedelta(hours=h), 20.0 + h) for h in range(6)]
+    response = client.post(
+        "/v1/readings/batch",
+        json={
+            "readings": [
+                {"sensor_id": sensor.id, "ts": ts.isoformat(), "celsius": celsius}
+                for ts, celsius in samples
+            ]
+        },
+    )
+    assert response.status_code == 202, response.text
+    created = client.post(
+        "/v1/pours",
+        json={
+            "tenant_id": seed_data["tenant"].id,
+            "project_id": seed_data["project"].id,
+            "location_id": seed_data["location"].id,
+            "started_at": base.isoformat(),
+        },
+    ).json()
+    before = client.get(f"/v1/pours/{created['id']}/maturity").json()
+
+    pour = db_session.get(Pour, created["id"])
+    pour.status = "closed"
+    assert pour.closed_at is not None
+    pour.closed_at = samples[-1][0] + dt.timedelta(hours=1)
+    db_session.commit()
+
+    archived = client.post("/v1/admin/storage/archive", params={"closed_for_days": 0})
+    assert archived.status_code == 200, archived.text
+    assert archived.json()["archived_readings"] == len(samples)
+    remaining = db_session.scalar(
+        select(func.count()).select_from(readings_ts).where(readings_ts.c.sensor_id == sensor.id)
+    )
+    moved = db_session.scalar(
+        select(func.count())
+        .select_from(readings_archive)
+        .where(readings_archive.c.sensor_id == sensor.id)
+    )
+    assert (remaining, moved) == (0, len(samples))
+
+    # Archiving again is a no-op and the closed pour still reads its full history.
+    again = client.post("/v1/admin/storage/archive", params={"closed_for_days": 0})
+    assert again.json()["archived_readings"] == 0
+    after = client.get(f"/v1/pours/{created['id']}/maturity", params={"tolerance": 0.05}).json()
+    T0_c, Ea, Tr_c = default_params()
+    (reported,) = after["sensors"]
+    assert reported["readings_count"] == len(samples)
+    assert math.isclose(reported["ttf_c_h"], ttf_maturity(samples, T0_c), rel_tol=1e-6)
+    assert math.isclose(reported["eq_age_h"], equivalent_age(samples, Ea, Tr_c), rel_tol=1e-6)
+    assert after["ttf_c_h"] == before["ttf_c_h"]
+
+
+def _post_readings(client: TestClient, sensor_id: str, samples) -> None:
+    response = client.post(
+        "/v1/readings/batch",
+        json={
+            "readings": [
+                {"sensor_id": sensor_id, "ts": ts.isoformat(), "celsius": celsius}
+                for ts, celsius in samples
+            ]
+        },
+    )
+    assert response.status_code == 202, response.text
+
+
+def _stored(db_session: Session, table, sensor_id: str) -> dict:
+    rows = db_session.execute(
+        select(table.c.ts, table.c.celsius).where(table.c.sensor_id == sensor_id)
+    ).all()
+    return {ts.replace(tzinfo=dt.UTC): float(celsius) for ts, celsius in rows}
+
+
+def test_archive_keeps_open_pour_windows_and_merges_late_readings(
+    client: TestClient, db_session: Session, seed_data
+):
+    sensor = seed_data["sensor"]
+    base = seed_data["timestamp"]
+    hours = [base + dt.timedelta(hours=h) for h in range(8)]
+    _post_readings(client, sensor.id, [(ts, 20.0) for ts in hours])
+
+    def create_pour(started_at: dt.datetime) -> Pour:
+        created = client.post(
+            "/v1/pours",
+            json={
+                "tenant_id": seed_data["tenant"].id,
+                "project_id": seed_data["project"].id,
+                "location_id": seed_data["location"].id,
+                "started_at": started_at.isoformat(),
+            },
+        )
+        assert created.status_code == 201, created.text
+        return db_session.get(Pour, created.json()["id"])
+
+    closed = create_pour(hours[0])
+    create_pour(hours[4])
+    closed.status = "closed"
+    closed.closed_at = hours[5]
+    # Later edits to the closed pour do not move its window.
+    closed.updated_at = hours[-1] + dt.timedelta(days=1)
+    db_session.commit()
+
+    archived = client.post("/v1/admin/storage/archive", params={"closed_for_days": 0})
+    assert archived.json() == {"archived_readings": 4, "pours": {closed.id: 4}}
+    assert sorted(_stored(db_session, readings_archive, sensor.id)) == hours[:4]
+    assert sorted(_stored(db_session, readings_ts, sensor.id)) == hours[4:]
+
+    # A corrected reading for an archived timestamp replaces the archived value.
+    _post_readings(client, sensor.id, [(hours[1], 25.0)])
+    merged = client.post("/v1/admin/storage/archive", params={"closed_for_days": 0})
+    assert merged.json()["archived_readings"] == 1
+    assert _stored(db_session, readings_archive, sensor.id)[hours[1]] == 25.0
+    assert sorted(_stored(db_session, readings_ts, sensor.id)) == hours[4:]
+
+    # Reopening clears the close time, so the pour is no longer archived.
+    closed.status = "in_progress"
+    assert closed.closed_at is None
+
+
+def test_archive_merges_without_on_conflict(
+    client: TestClient, db_session: Session, seed_data, monkeypatch
+):
+    sensor = seed_data["sensor"]
+    base = seed_data["timestamp"]
+    hours = [base + dt.timedelta(hours=h) for h in range(4)]
+    _post_readings(client, sensor.id, [(ts, 20.0) for ts in hours])
+    pour = Pour(
+        tenant_id=seed_data["tenant"].id,
+        project_id=seed_data["project"].id,
+        location_id=seed_data["location"].id,
+        started_at=hours[0],
+        status="closed",
+    )
+    db_session.add(pour)
+    db_session.commit()
+
+    # Dialects other than PostgreSQL and SQLite replace archived rows by delete and insert.
+    monkeypatch.setattr(db_session.bind.dialect, "name", "generic")
+    assert archive_closed_pours(db_session, dt.timedelta(0)) == {pour.id: 4}
+    db_session.commit()
+    monkeypatch.undo()
+
+    _post_readings(client, sensor.id, [(hours[1], 25.0)])
+    monkeypatch.setattr(db_session.bind.dialect, "name", "generic")
+    assert archive_closed_pours(db_session, dt.timedelta(0)) == {pour.id: 1}
+    db_session.commit()
+    monkeypatch.undo()
+
+    assert _stored(db_session, readings_archive, sensor.id) == {
+        ts: 25.0 if ts == hours[1] else 20.0 for ts in hours
+    }
+    assert _stored(db_session, readings_ts, sensor.id) == {}
+
+
+def test_storage_status_without_timescale(client: TestClient):
+    response = client.get("/v1/admin/storage")
+    assert response.status_code == 200
+    assert response.json() == {"timescale": False, "tables": []}
+    policy = client.put("/v1/admin/storage/compression", params={"after_days": 3})
+    assert policy.json() == {"applied": False, "compress_after_days": 3}
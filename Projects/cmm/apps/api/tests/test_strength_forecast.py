@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import datetime as dt
+import math
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.domain.maturity_models import predict_strength
+from app.domain.strength_forecast import hours_to_maturity, maturity_for_strength
+from app.services.maturity_state import default_params, smoothed_sensor_temperatures
+
+
+def _post(client: TestClient, sensor_id: str, samples: list[tuple[dt.datetime, float]]) -> None:
+    payload = {
+        "readings": [
+            {"sensor_id": sensor_id, "ts": ts.isoformat(), "celsius": celsius}
+            for ts, celsius in samples
+        ]
+    }
+    response = client.post("/v1/readings/batch", json=payload)
+    assert response.status_code == 202, response.text
+
+
+def test_maturity_for_strength_inverts_predict_strength():
+    maturity = np.array([50.0, 400.0, 2500.0, 9000.0])
+    log_params = {"a": 9.0, "b": -25.0}
+    strengths = [predict_strength(m, "log", log_params)[0] for m in maturity]
+    np.testing.assert_allclose(maturity_for_strength(strengths, "log", log_params), maturity)
+
+    asymptotic = {"f_u": 45.0, "k": 0.002}
+    strengths = [predict_strength(m, "asymptotic", asymptotic)[0] for m in maturity]
+    np.testing.assert_allclose(
+        maturity_for_strength(strengths, "asymptotic", asymptotic), maturity, rtol=1e-9
+    )
+    assert np.isinf(maturity_for_strength(45.0, "asymptotic", asymptotic))
+    with pytest.raises(ValueError):
+        maturity_for_strength(20.0, "log", {"a": 9.0})
+
+
+def test_hours_to_maturity_edge_cases():
+    hours = hours_to_maturity(
+        current=[100.0, 500.0, 100.0, 100.0],
+        required=[300.0, 400.0, 300.0, np.inf],
+        rate_per_h=[20.0, 20.0, -1.0, 20.0],
+    )
+    np.testing.assert_array_equal(hours, [10.0, 0.0, np.inf, np.inf])
+
+
+def test_smoothed_sensor_temperatures_weights_recent_readings(
+    client: TestClient, db_session: Session, seed_data
+):
+    sensor = seed_data["sensor"]
+    base = seed_data["timestamp"]
+    samples = [(base + dt.timedelta(hours=h), 10.0 + 2.0 * h) for h in range(8)]
+    _post(client, sensor.id, samples)
+
+    end = base + dt.timedelta(hours=6, minutes=30)
+    smoothed = smoothed_sensor_temperatures(
+        db_session, [sensor.id], end, dt.timedelta(hours=4), time_constant_h=2.0
+    )
+    ages = np.array([3.0, 2.0, 1.0, 0.0])
+    temps = np.array([16.0, 18.0, 20.0, 22.0])
+    weights = np.exp(-ages / 2.0)
+    assert math.isclose(smoothed[sensor.id], float(weights @ temps / weights.sum()), rel_tol=1e-6)
+    assert (
+        smoothed_sensor_temperatures(
+            db_session, [sensor.id], base - dt.timedelta(days=1), dt.timedelta(hours=4), 2.0
+        )
+        == {}
+    )
+
+
+def test_pour_forecast_and_board(client: TestClient, db_session: Session, seed_data):
+    sensor = seed_data["sensor"]
+    base = seed_data["timestamp"]
+    mix = seed_data["mix"]
+    mix.maturity_curve = {"curve_type": "log", "curve_params": {"a": 9.0, "b": -25.0}}
+    db_session.commit()
+
+    pour = client.post(
+        "/v1/pours",
+        json={
+            "tenant_id": seed_data["tenant"].id,
+            "project_id": seed_data["project"].id,
+            "mix_id": mix.id,
+            "started_at": base.isoformat(),
+            "target_strength": 30.0,
+        },
+    ).json()
+    untargeted = client.post(
+        "/v1/pours",
+        json={
+            "tenant_id": seed_data["tenant"].id,
+            "project_id": seed_data["project"].id,
+            "started_at": base.isoformat(),
+        },
+    ).json()
+    samples = [(base + dt.timedelta(hours=h), 20.0) for h in range(13)]
+    _post(client, sensor.id, samples)
+
+    response = client.get(
+        f"/v1/pours/{pour['id']}/forecast", params={"method": "constant", "curing_c": 15.0}
+    )
+    assert response.status_code == 200, response.text
+    forecast = response.json()
+    T0_c, _, _ = default_params()
+    required = math.exp((30.0 + 25.0) / 9.0)
+    current = (20.0 - T0_c) * 12.0
+    expected_eta = samples[-1][0] + dt.timedelta(hours=(required - current) / (15.0 - T0_c))
+    assert forecast["status"] == "curing"
+    assert forecast["governing_sensor_id"] == sensor.id
+    (row,) = forecast["sensors"]
+    assert math.isclose(row["maturity"], current, rel_tol=1e-9)
+    assert math.isclose(row["required_maturity"], required, rel_tol=1e-9)
+    assert row["projected_celsius"] == 15.0
+    eta = dt.datetime.fromisoformat(forecast["eta"])
+    assert abs((eta - expected_eta).total_seconds()) < 1e-3
+
+    # No readings in the smoothing window: the projection falls back to the average.
+    smoothed = client.get(f"/v1/pours/{pour['id']}/forecast").json()
+    assert smoothed["sensors"][0]["projected_celsius"] == pytest.approx(20.0)
+    assert dt.datetime.fromisoformat(smoothed["eta"]) < eta
+
+    # A weaker curve needs exp(20 / 9) ≈ 9.2 h of equivalent age, already exceeded.
+    mix.maturity_curve = {"curve_type": "log", "curve_params": {"a": 9.0, "b": 10.0}}
+    db_session.commit()
+    reached = client.get(f"/v1/pours/{pour['id']}/forecast", params={"basis": "eq_age"}).json()
+    assert reached["status"] == "ready" and reached["sensors"][0]["reached"]
+    assert reached["sensors"][0]["hours_remaining"] == 0.0
+
+    board = client.get("/v1/pours/forecast", params={"tenant_id": seed_data["tenant"].id}).json()
+    by_pour = {item["pour_id"]: item for item in board["pours"]}
+    assert by_pour[pour["id"]]["status"] == "ready"
+    assert by_pour[untargeted["id"]]["status"] == "no_target"
+
+    # exp(30) °C·h is ~4e11 h away at this rate, past what a datetime can hold.
+    mix.maturity_curve = {"curve_type": "log", "curve_params": {"a": 1.0, "b": 0.0}}
+    db_session.commit()
+    steep = client.get(f"/v1/pours/{pour['id']}/forecast")
+    assert steep.status_code == 200, steep.text
+    assert steep.json()["status"] == "stalled" and steep.json()["eta"] is None
+    assert client.get("/v1/pours/missing/forecast").status_code == 404
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.domain.maturity_models import equivalent_age, maturity_integrals, ttf_maturity
+from app.domain.temperature_series import TemperatureSeries
+
+BASE = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def _samples(count: int = 48) -> list[tuple[datetime, float]]:
+    return [
+        (BASE + timedelta(minutes=30 * index), 20.0 + 5.0 * np.sin(index / 6.0))
+        for index in range(count)
+    ]
+
+
+def test_from_rows_round_trips_samples():
+    samples = _samples()
+    series = TemperatureSeries.from_rows(iter(samples))
+    assert len(series) == len(samples)
+    assert series.is_sorted
+    assert series.epoch_us.dtype == np.int64
+    assert series[0] == samples[0]
+    assert list(series) == samples
+    assert series.nbytes == 16 * len(samples)
+    assert TemperatureSeries.from_rows(samples, dtype=np.float32).nbytes == 12 * len(samples)
+    # Seconds are converted once and then counted as part of the series.
+    assert series.epoch_s is series.epoch_s
+    assert series.epoch_s.tolist() == [ts.timestamp() for ts, _ in samples]
+    assert series.nbytes == 24 * len(samples)
+
+
+def test_naive_timestamps_are_utc_and_exact():
+    naive = datetime(2025, 1, 1, 0, 0, 0, 123457)
+    series = TemperatureSeries.from_rows([(naive, 1.0)])
+    assert series[0][0] == naive.replace(tzinfo=UTC)
+
+
+def test_window_is_a_zero_copy_view():
+    series = TemperatureSeries.from_rows(_samples())
+    window = series.window(BASE + timedelta(hours=2), BASE + timedelta(hours=4))
+    assert [ts for ts, _ in window] == [BASE + timedelta(minutes=m) for m in (120, 150, 180, 210)]
+    assert np.shares_memory(window.epoch_us, series.epoch_us)
+    assert np.shares_memory(window.temps_c, series.temps_c)
+    assert len(series.window(BASE + timedelta(days=9))) == 0
+
+
+def test_unsorted_series_must_be_sorted_before_windowing():
+    series = TemperatureSeries.from_rows(reversed(_samples()))
+    assert not series.is_sorted
+    with pytest.raises(ValueError):
+        series.window(BASE)
+    ordered = series.sorted()
+    assert ordered.is_sorted and ordered[0] == _samples()[0]
+    assert ordered.sorted() is ordered
+
+
+def test_kernels_accept_series_natively():
+    samples = _samples()
+    series = TemperatureSeries.from_rows(samples)
+    assert ttf_maturity(series, -10.0) == pytest.approx(ttf_maturity(samples, -10.0))
+    assert equivalent_age(series, 33500.0, 20.0) == pytest.approx(
+        equivalent_age(samples, 33500.0, 20.0)
+    )
+    shuffled = TemperatureSeries.from_rows(samples[::2] + samples[1::2])
+    assert maturity_integrals(shuffled, None, -10.0, 33500.0, 20.0) == pytest.approx(
+        maturity_integrals(series, None, -10.0, 33500.0, 20.0)
+    )
@@ -0,0 +1,105 @@
+"""
+Measure sustained ingest throughput through the pipeline with the in-process broker.
+
+Readings are published as JSON or compact binary (``--format``) batches of ``--per-message``
+readings. By default batches go to a writer that only counts rows, which isolates decoding and
+batching cost; pass ``--database`` to include the API's write path into the database its
+``DATABASE_URL`` names.
+
+Usage::
+
+    PYTHONPATH=../api python bench_ingest.py --readings 500000 --per-message 50 --format binary
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime as dt
+import json
+import time
+from collections.abc import Sequence
+
+from app.domain.reading_codec import encode_readings
+
+from broker import LocalBroker
+from ingest import (
+    DatabaseBatchWriter,
+    IngestPipeline,
+    IngestSettings,
+    Reading,
+)
+
+
+class CountingWriter:
+    def __init__(self) -> None:
+        self.rows = 0
+
+    async def write(self, readings: Sequence[Reading]) -> int:
+        self.rows += len(readings)
+        return len(readings)
+
+
+def _binary(sensor: str, readings: list[dict]) -> bytes:
+    return encode_readings(
+        [sensor] * len(readings),
+        [round(reading["ts"] * 1000) for reading in readings],
+        [reading["celsius"] for reading in readings],
+    )
+
+
+def _payloads(total: int, per_message: int, sensors: int, fmt: str) -> list[tuple[str, bytes]]:
+    start = dt.datetime(2025, 1, 1, tzinfo=dt.UTC).timestamp()
+    messages = []
+    for offset in range(0, total, per_message):
+        sensor = f"sensor-{(offset // per_message) % sensors}"
+        readings = [
+            {"ts": start + offset + i, "celsius": 20.0 + (i % 10) * 0.5}
+            for i in range(min(per_message, total - offset))
+        ]
+        payload = _binary(sensor, readings) if fmt == "binary" else json.dumps(readings).encode()
+        messages.append((f"cmm/bench/sensors/{sensor}/readings", payload))
+    return messages
+
+
+async def _run(args: argparse.Namespace) -> dict:
+    writer = DatabaseBatchWriter() if args.database else CountingWriter()
+    pipeline = IngestPipeline(writer, IngestSettings())
+    broker = LocalBroker()
+    payloads = _payloads(args.readings, args.per_message, args.sensors, args.format)
+
+    pipeline.start()
+    broker.start(pipeline.submit_threadsafe)
+    started = time.perf_counter()
+    for topic, payload in payloads:
+        broker.publish(topic, payload)
+    while broker.unacked:
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - started
+    broker.stop()
+    await pipeline.stop()
+
+    stats = pipeline.stats
+    return {
+        "format": args.format,
+        "payload_bytes": sum(len(payload) for _, payload in payloads),
+        "readings": stats.readings,
+        "messages": stats.messages,
+        "batches": stats.batches,
+        "seconds": round(elapsed, 3),
+        "readings_per_second": round(stats.readings / elapsed),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--readings", type=int, default=500_000)
+    parser.add_argument("--per-message", type=int, default=50)
+    parser.add_argument("--sensors", type=int, default=200)
+    parser.add_argument("--format", choices=("json", "binary"), default="json")
+    parser.add_argument("--database", action="store_true")
+    print(json.dumps(asyncio.run(_run(parser.parse_args())), indent=2))
+
+
+if __name__ == "__main__":
+    main()
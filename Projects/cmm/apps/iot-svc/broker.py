@@ -0,0 +1,160 @@
+"""
+Message sources feeding the ingest pipeline: a paho MQTT client and an in-process stand-in.
+
+Both deliver :class:`ingest.Message` objects through a blocking ``deliver`` callable and hand
+out acks that must be called once the message is durably written.
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import os
+import threading
+from collections import OrderedDict, deque
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from ingest import Message
+
+logger = logging.getLogger("cmm.iot.broker")
+
+Deliver = Callable[[Message], None]
+
+
+@dataclass(frozen=True)
+class MqttSettings:
+    host: str = "emqx"
+    port: int = 1883
+    topic: str = "cmm/+/sensors/+/readings"
+    qos: int = 1
+    client_id: str = "cmm-iot-svc"
+
+    @classmethod
+    def from_env(cls) -> MqttSettings:
+        return cls(
+            host=os.getenv("MQTT_BROKER", "emqx"),
+            port=int(os.getenv("MQTT_PORT", "1883")),
+            topic=os.getenv("MQTT_TOPIC", "cmm/+/sensors/+/readings"),
+            qos=int(os.getenv("MQTT_QOS", "1")),
+            client_id=os.getenv("MQTT_CLIENT_ID", "cmm-iot-svc"),
+        )
+
+
+class PahoSource:
+    """
+    Subscribe with a persistent session and manual acks.
+
+    PUBACKs are only sent when the pipeline acks a message, so the broker redelivers anything
+    that was in flight when the service stopped. ``deliver`` runs on paho's network thread and
+    blocks it while the pipeline queue is full.
+    """
+
+    def __init__(self, settings: MqttSettings, deliver: Deliver) -> None:
+        import paho.mqtt.client as mqtt
+
+        self.settings = settings
+        self._deliver = deliver
+        self._client = mqtt.Client(
+            mqtt.CallbackAPIVersion.VERSION2,
+            client_id=settings.client_id,
+            clean_session=False,
+            manual_ack=True,
+        )
+        # Bounds unacked QoS 1 messages the broker pushes to us, i.e. our in-flight window.
+        self._client.max_inflight_messages_set(1000)
+        self._client.on_connect = self._on_connect
+        self._client.on_message = self._on_message
+        self.connected = False
+
+    def _on_connect(self, client, userdata, flags, reason_code, properties) -> None:
+        self.connected = not reason_code.is_failure
+        if self.connected:
+            client.subscribe(self.settings.topic, qos=self.settings.qos)
+        else:
+            logger.error("MQTT connect failed: %s", reason_code)
+
+    def _on_message(self, client, userdata, message) -> None:
+        mid, qos = message.mid, message.qos
+
+        def ack() -> None:
+            if qos > 0:
+                client.ack(mid, qos)
+
+        self._deliver(Message(message.topic, message.payload, ack))
+
+    def start(self) -> None:
+        self._client.connect_async(self.settings.host, self.settings.port)
+        self._client.loop_start()
+
+    def stop(self) -> None:
+        self._client.disconnect()
+        self._client.loop_stop()
+        self.connected = False
+
+
+class LocalBroker:
+    """
+    In-process broker stand-in with QoS 1 semantics for tests and benchmarks.
+
+    Published messages are handed to the subscriber on a worker thread, in order. Messages stay
+    unacknowledged until their ack is called; :meth:`redeliver` republishes all of them, as a
+    broker does when a persistent session reconnects.
+    """
+
+    def __init__(self) -> None:
+        self._ids = itertools.count()
+        self._pending: OrderedDict[int, Message] = OrderedDict()
+        self._lock = threading.Lock()
+        self._outbox: deque[tuple[int, str, bytes]] = deque()
+        self._wake = threading.Condition(self._lock)
+        self._deliver: Deliver | None = None
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    @property
+    def unacked(self) -> int:
+        with self._lock:
+            return len(self._pending) + len(self._outbox)
+
+    def publish(self, topic: str, payload: bytes) -> None:
+        with self._wake:
+            self._outbox.append((next(self._ids), topic, payload))
+            self._wake.notify()
+
+    def redeliver(self) -> None:
+        with self._wake:
+            replay = [(mid, msg.topic, msg.payload) for mid, msg in self._pending.items()]
+            self._pending.clear()
+            self._outbox.extendleft(reversed(replay))
+            self._wake.notify()
+
+    def _ack(self, mid: int) -> None:
+        with self._lock:
+            self._pending.pop(mid, None)
+
+    def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="local-broker", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._wake:
+            self._closed = True
+            self._wake.notify()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._wake:
+                while not self._outbox and not self._closed:
+                    self._wake.wait()
+                if self._closed:
+                    return
+                mid, topic, payload = self._outbox.popleft()
+                message = Message(topic, payload, lambda mid=mid: self._ack(mid))
+                self._pending[mid] = message
+            # Outside the lock: a full pipeline blocks here, like a stalled socket read.
+            self._deliver(message)
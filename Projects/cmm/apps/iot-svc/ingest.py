@@ -0,0 +1,495 @@
+"""
+MQTT reading ingestion: payload decoding, micro-batching and bulk writes into ``readings_ts``.
+
+Messages flow from a broker source into a bounded queue. A single consumer groups them into
+micro-batches closed by row count or age, writes each batch in one transaction through the API's
+ingest path, and only then acknowledges the messages it contained. A full queue blocks the
+source, which stops reading from the broker, so a slow database throttles devices instead of
+growing memory. Failed writes are retried and never acknowledged, so delivery is at-least-once
+and the upsert is idempotent. Messages that cannot be decoded, and messages whose readings the
+database keeps rejecting, are handed to a dead-letter sink and acknowledged, so one bad message
+cannot stall the stream.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import datetime as dt
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, NamedTuple, Protocol
+
+from app.domain.reading_codec import (
+    MAGIC,
+    MAX_CELSIUS,
+    MIN_CELSIUS,
+    ReadingCodecError,
+    column_readings,
+    decode_readings,
+)
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+logger = logging.getLogger("cmm.iot.ingest")
+
+Reading = tuple[str, dt.datetime, float]
+"""``(sensor_id, ts, celsius)`` with ``ts`` timezone-aware UTC."""
+
+SENSOR_ID_MAX_LENGTH = 36
+"""Width of ``sensors.id`` and ``readings_ts.sensor_id``."""
+
+_SUBMIT_POLL_S = 0.1
+"""How often a producer blocked on a full queue checks whether the pipeline is stopping."""
+
+
+class Message(NamedTuple):
+    topic: str
+    payload: bytes
+    ack: Callable[[], None]
+
+
+class BatchWriter(Protocol):
+    async def write(self, readings: Sequence[Reading]) -> int:
+        """
+        Persist ``readings`` durably and return the number of rows written.
+
+        Raise :class:`TransientWriteError` when the store is unavailable; any other error is
+        taken to mean the readings themselves were rejected.
+        """
+
+
+class DeadLetterSink(Protocol):
+    def put(self, message: Message, reason: str) -> None:
+        """Keep ``message`` for inspection or replay; it is acknowledged afterwards."""
+
+
+class TransientWriteError(RuntimeError):
+    """Raised by a writer when the store is unreachable; the batch is retried until it lands."""
+
+
+@dataclass(frozen=True)
+class IngestSettings:
+    batch_rows: int = 5000
+    batch_delay_s: float = 0.25
+    queue_size: int = 10000
+    retry_initial_s: float = 0.5
+    retry_max_s: float = 30.0
+    max_write_attempts: int = 3
+    dead_letter_path: str | None = None
+
+    @classmethod
+    def from_env(cls) -> IngestSettings:
+        return cls(
+            batch_rows=int(os.getenv("INGEST_BATCH_ROWS", "5000")),
+            batch_delay_s=int(os.getenv("INGEST_BATCH_MS", "250")) / 1000.0,
+            queue_size=int(os.getenv("INGEST_QUEUE_SIZE", "10000")),
+            max_write_attempts=int(os.getenv("INGEST_MAX_WRITE_ATTEMPTS", "3")),
+            dead_letter_path=os.getenv("INGEST_DEAD_LETTER_PATH") or None,
+        )
+
+
+class PayloadError(ValueError):
+    """Raised when a message cannot be decoded into readings."""
+
+
+def _parse_ts(value: object) -> dt.datetime:
+    if isinstance(value, (int, float)):
+        try:
+            return dt.datetime.fromtimestamp(value, tz=dt.UTC)
+        except (OverflowError, OSError, ValueError) as exc:
+            raise PayloadError(f"Timestamp {value!r} is out of range.") from exc
+    if isinstance(value, str):
+        parsed = dt.datetime.fromisoformat(value.replace("Z", "+00:00", 1))
+        if parsed.tzinfo is None:
+            return parsed.replace(tzinfo=dt.UTC)
+        return parsed.astimezone(dt.UTC)
+    raise PayloadError(f"Unsupported timestamp {value!r}.")
+
+
+def _topic_sensor(topic: str) -> str | None:
+    parts = topic.split("/")
+    try:
+        return parts[parts.index("sensors") + 1] or None
+    except (ValueError, IndexError):
+        return None
+
+
+def _valid_sensor_id(sensor_id: object) -> bool:
+    # Sensor ids fit the id columns; control characters and backslashes are rejected.
+    return (
+        isinstance(sensor_id, str)
+        and 0 < len(sensor_id) <= SENSOR_ID_MAX_LENGTH
+        and sensor_id.isprintable()
+        and "\\" not in sensor_id
+    )
+
+
+def decode_binary(topic: str, payload: bytes) -> list[Reading]:
+    """
+    Decode a compact columnar batch with the API's :mod:`app.domain.reading_codec`.
+
+    Raises
+    ------
+    PayloadError
+        If the batch is truncated, inconsistent or holds out-of-range values.
+    """
+    try:
+        columns = decode_readings(payload)
+    except ReadingCodecError as exc:
+        raise PayloadError(f"Invalid binary payload on {topic!r}: {exc}") from exc
+    if not all(_valid_sensor_id(sensor_id) for sensor_id in columns.sensor_ids):
+        raise PayloadError(f"Missing or invalid sensor_id on {topic!r}.")
+    return column_readings(columns)
+
+
+def decode_payload(topic: str, payload: bytes) -> list[Reading]:
+    """
+    Decode a device message into readings.
+
+    The payload is a compact binary batch (see :func:`decode_binary`), a JSON reading object, a
+    list of them, or ``{"readings": [...]}``. Each JSON reading has ``ts`` (ISO 8601 or epoch
+    seconds) and ``celsius``; ``sensor_id`` may be omitted on ``.../sensors/<sensor_id>/...``
+    topics.
+
+    Raises
+    ------
+    PayloadError
+        If the payload is not valid JSON or a reading is malformed or out of range. Every
+        decoding failure is reported this way, so callers only need to handle this one error.
+    """
+    try:
+        return _decode_payload(topic, payload)
+    except PayloadError:
+        raise
+    except (OverflowError, OSError, RecursionError, TypeError, ValueError) as exc:
+        raise PayloadError(f"Payload on {topic!r} cannot be decoded: {exc}") from exc
+
+
+def _decode_payload(topic: str, payload: bytes) -> list[Reading]:
+    if payload[: len(MAGIC)] == MAGIC:
+        return decode_binary(topic, payload)
+    try:
+        body = json.loads(payload)
+    except ValueError as exc:
+        raise PayloadError(f"Payload on {topic!r} is not JSON.") from exc
+    if isinstance(body, dict):
+        body = body["readings"] if "readings" in body else [body]
+    if not isinstance(body, list):
+        raise PayloadError(f"Payload on {topic!r} is not a reading or list of readings.")
+
+    default_sensor = _topic_sensor(topic)
+    readings: list[Reading] = []
+    for item in body:
+        try:
+            sensor_id = item.get("sensor_id", default_sensor)
+            celsius = float(item["celsius"])
+            ts = _parse_ts(item["ts"])
+        except (AttributeError, KeyError, OverflowError, TypeError, ValueError) as exc:
+            raise PayloadError(f"Malformed reading on {topic!r}: {item!r}") from exc
+        if not _valid_sensor_id(sensor_id):
+            raise PayloadError(f"Missing or invalid sensor_id on {topic!r}.")
+        if not MIN_CELSIUS <= celsius <= MAX_CELSIUS:
+            raise PayloadError(f"Temperature {celsius} out of range on {topic!r}.")
+        readings.append((sensor_id, ts, celsius))
+    return readings
+
+
+class DatabaseBatchWriter:
+    """
+    Write readings through the API's ingest path, ``app.services.reading_ingest``.
+
+    Sensors are resolved with the API's metadata cache and readings of unknown sensors are
+    dropped. The rest are upserted with their sensor's tenant in one transaction with the
+    maturity accumulators and ``sensor_latest``; then the API's maturity cache is invalidated and
+    the readings are published to its live subscribers, exactly as for readings posted to the API.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker | None = None) -> None:
+        from app.db import AsyncSessionLocal
+        from app.services.reading_ingest import write_readings
+        from app.services.sensor_cache import sensor_metadata_cache
+        from sqlalchemy import exc
+
+        self._session_factory = session_factory or AsyncSessionLocal
+        self._write_readings = write_readings
+        self._sensors = sensor_metadata_cache
+        # Lost connections, failovers, deadlocks and serialization failures; any other error
+        # means the batch itself was rejected.
+        self._transient_errors = (exc.OperationalError, exc.InterfaceError, OSError)
+
+    async def write(self, readings: Sequence[Reading]) -> int:
+        # A reading repeated in the batch is written once, with its last value.
+        latest = {(sensor_id, ts): celsius for sensor_id, ts, celsius in readings}
+        try:
+            async with self._session_factory() as session:
+                sensors = await self._sensors.resolve(session, {key[0] for key in latest})
+                records = [
+                    {
+                        "sensor_id": sensor_id,
+                        "ts": ts,
+                        "celsius": celsius,
+                        "tenant_id": sensors[sensor_id].tenant_id,
+                    }
+                    for (sensor_id, ts), celsius in latest.items()
+                    if sensor_id in sensors
+                ]
+                if not records:
+                    return 0
+                inserted, updated = await self._write_readings(session, records, sensors)
+        except self._transient_errors as exc:
+            raise TransientWriteError(f"Database unavailable: {exc}") from exc
+        return inserted + updated
+
+
+class FileDeadLetter:
+    """
+    Append dead-lettered messages to a JSON lines file, one object per message.
+
+    Each line holds the topic, the base64 payload, the reason and the time it was written, so
+    messages can be inspected and replayed once whatever rejected them is fixed.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    def put(self, message: Message, reason: str) -> None:
+        line = json.dumps(
+            {
+                "topic": message.topic,
+                "payload": base64.b64encode(message.payload).decode(),
+                "reason": reason,
+                "at": dt.datetime.now(dt.UTC).isoformat(),
+            }
+        )
+        with self._lock, open(self.path, "a", encoding="utf-8") as handle:
+            handle.write(line + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+
+
+@dataclass
+class IngestStats:
+    messages: int = 0
+    readings: int = 0
+    rejected_messages: int = 0
+    dead_lettered: int = 0
+    batches: int = 0
+    rows_written: int = 0
+    write_failures: int = 0
+    last_batch_at: float | None = None
+    last_batch_seconds: float | None = None
+
+
+@dataclass
+class _Batch:
+    """Decoded messages in arrival order; ``ends[i]`` is where message ``i``'s readings end."""
+
+    messages: list[Message] = field(default_factory=list)
+    readings: list[Reading] = field(default_factory=list)
+    ends: list[int] = field(default_factory=list)
+
+    def append(self, message: Message, readings: Sequence[Reading]) -> None:
+        self.messages.append(message)
+        self.readings.extend(readings)
+        self.ends.append(len(self.readings))
+
+    def split(self) -> tuple[_Batch, _Batch]:
+        """Halve the batch at a message boundary."""
+        middle = len(self.messages) // 2
+        cut = self.ends[middle - 1]
+        head = _Batch(self.messages[:middle], self.readings[:cut], self.ends[:middle])
+        tail = _Batch(
+            self.messages[middle:],
+            self.readings[cut:],
+            [end - cut for end in self.ends[middle:]],
+        )
+        return head, tail
+
+
+class IngestPipeline:
+    """
+    Bounded queue plus a single batching consumer.
+
+    Sources call :meth:`submit_threadsafe` from their network thread. Capacity is a semaphore
+    taken by the producer and released when the consumer dequeues, so a full queue blocks the
+    broker connection rather than buffering without limit, while the common non-full case is a
+    single ``call_soon_threadsafe`` hand-off.
+
+    A batch the writer rejects ``max_write_attempts`` times is split in halves, which are
+    written on their own, until the message that cannot be written is isolated and
+    dead-lettered. Transient errors are retried without limit, since nothing is wrong with the
+    readings.
+    """
+
+    def __init__(
+        self,
+        writer: BatchWriter,
+        settings: IngestSettings | None = None,
+        dead_letter: DeadLetterSink | None = None,
+    ) -> None:
+        self.writer = writer
+        self.settings = settings or IngestSettings()
+        if dead_letter is None and self.settings.dead_letter_path:
+            dead_letter = FileDeadLetter(self.settings.dead_letter_path)
+        self.dead_letter = dead_letter
+        self.stats = IngestStats()
+        self._queue: asyncio.Queue[Message | None] = asyncio.Queue()
+        self._capacity = threading.BoundedSemaphore(self.settings.queue_size)
+        self._closing = threading.Event()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def submit_threadsafe(self, message: Message) -> None:
+        """
+        Enqueue from a foreign thread, blocking that thread while the queue is full.
+
+        Once :meth:`stop` has begun, messages are not taken and stay unacknowledged for the
+        broker to redeliver; a producer blocked on a full queue is released the same way, so
+        the source can be stopped after the pipeline.
+        """
+        if self._loop is None:
+            raise RuntimeError("Pipeline is not running.")
+        while not self._capacity.acquire(timeout=_SUBMIT_POLL_S):
+            if self._closing.is_set():
+                return
+        if self._closing.is_set():
+            self._capacity.release()
+            return
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, message)
+
+    def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._closing.clear()
+        self._task = asyncio.create_task(self._consume(), name="mqtt-ingest")
+
+    async def stop(self) -> None:
+        """
+        Stop taking messages, flush what is queued, then stop the consumer.
+
+        A write that fails while stopping is not retried: its messages stay unacknowledged and
+        are redelivered after a restart.
+        """
+        if self._task is None:
+            return
+        self._closing.set()
+        self._queue.put_nowait(None)
+        await self._task
+        self._task = None
+
+    async def _next(self, timeout: float | None) -> Message | None:
+        # Drain without suspending while messages are queued; wait only on an empty queue.
+        try:
+            message = self._queue.get_nowait()
+        except asyncio.QueueEmpty:
+            message = await asyncio.wait_for(self._queue.get(), timeout)
+        if message is not None:
+            self._capacity.release()
+        return message
+
+    async def _collect(self) -> tuple[_Batch, bool]:
+        batch = _Batch()
+        first = await self._next(None)
+        if first is None:
+            return batch, True
+        self._add(batch, first)
+        deadline = time.monotonic() + self.settings.batch_delay_s
+        while len(batch.readings) < self.settings.batch_rows:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                message = await self._next(remaining)
+            except TimeoutError:
+                break
+            if message is None:
+                return batch, True
+            self._add(batch, message)
+        return batch, False
+
+    def _add(self, batch: _Batch, message: Message) -> None:
+        self.stats.messages += 1
+        try:
+            readings = decode_payload(message.topic, message.payload)
+        except PayloadError as exc:
+            # Acked with the batch anyway: redelivering a poison message cannot succeed.
+            self.stats.rejected_messages += 1
+            self._dead_letter(message, str(exc))
+            readings = []
+        else:
+            self.stats.readings += len(readings)
+        batch.append(message, readings)
+
+    def _dead_letter(self, message: Message, reason: str) -> None:
+        if self.dead_letter is None:
+            logger.warning("Dropping message on %r: %s", message.topic, reason)
+            return
+        self.dead_letter.put(message, reason)
+        self.stats.dead_lettered += 1
+        logger.warning("Dead-lettered message on %r: %s", message.topic, reason)
+
+    async def _write(self, batch: _Batch) -> Exception | None:
+        """Write ``batch`` with retries; returns ``None`` once written, else the last error."""
+        delay = self.settings.retry_initial_s
+        attempts = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                written = await self.writer.write(batch.readings)
+            except Exception as exc:
+                self.stats.write_failures += 1
+                if not isinstance(exc, TransientWriteError):
+                    attempts += 1
+                if self._closing.is_set() or attempts >= self.settings.max_write_attempts:
+                    return exc
+                logger.warning(
+                    "Batch of %d readings failed; retrying", len(batch.readings), exc_info=True
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.settings.retry_max_s)
+                continue
+            self.stats.batches += 1
+            self.stats.rows_written += written
+            self.stats.last_batch_at = time.time()
+            self.stats.last_batch_seconds = time.perf_counter() - started
+            return None
+
+    async def _flush(self, batch: _Batch) -> None:
+        parts = [batch]
+        while parts:
+            part = parts.pop(0)
+            error = await self._write(part) if part.readings else None
+            if error is not None and (
+                self._closing.is_set() or isinstance(error, TransientWriteError)
+            ):
+                logger.warning(
+                    "Leaving %d messages unacknowledged for redelivery: %s",
+                    sum(len(p.messages) for p in (part, *parts)),
+                    error,
+                )
+                return
+            if error is not None and len(part.messages) > 1:
+                parts[:0] = part.split()
+                continue
+            if error is not None:
+                self._dead_letter(part.messages[0], f"Write rejected: {error}")
+            for message in part.messages:
+                message.ack()
+
+    async def _consume(self) -> None:
+        done = False
+        while not done:
+            batch, done = await self._collect()
+            if batch.messages:
+                await self._flush(batch)
@@ -0,0 +1,50 @@
+import logging
+import os
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+
+from broker import MqttSettings, PahoSource
+from ingest import DatabaseBatchWriter, IngestPipeline, IngestSettings
+
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
+
+state: dict = {}
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    if os.getenv("MQTT_INGEST", "1") != "1":
+        yield
+        return
+    # The API's settings read DATABASE_URL and REDIS_URL from the same environment.
+    from app.db import async_engine
+
+    pipeline = IngestPipeline(DatabaseBatchWriter(), IngestSettings.from_env())
+    pipeline.start()
+    source = PahoSource(MqttSettings.from_env(), pipeline.submit_threadsafe)
+    source.start()
+    state.update(pipeline=pipeline, source=source)
+    try:
+        yield
+    finally:
+        # The pipeline first: stopping it releases a paho thread blocked on a full queue, which
+        # source.stop() joins, and its final acks still reach the broker.
+        await pipeline.stop()
+        source.stop()
+        await async_engine.dispose()
+        state.clear()
+
+
+app = FastAPI(title="CMM IoT Service", lifespan=lifespan)
+
+
+@app.get("/healthz")
+def healthz():
+    body = {"ok": True, "broker": os.getenv("MQTT_BROKER", "emqx")}
+    pipeline = state.get("pipeline")
+    if pipeline is not None:
+        body["mqtt_connected"] = state["source"].connected
+        body["queue_depth"] = pipeline.queue_depth
+        body["ingest"] = vars(pipeline.stats)
+    return body
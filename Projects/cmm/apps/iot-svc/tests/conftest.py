@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+# The service writes through the API's ingest code, which the image puts on PYTHONPATH.
+for path in (ROOT, ROOT.parent / "api"):
+    if str(path) not in sys.path:
+        sys.path.append(str(path))
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import datetime as dt
+import json
+import threading
+import time
+from collections.abc import Sequence
+
+import pytest
+from app.domain.reading_codec import encode_readings
+
+from broker import LocalBroker
+from ingest import (
+    IngestPipeline,
+    IngestSettings,
+    PayloadError,
+    Reading,
+    TransientWriteError,
+    decode_payload,
+)
+
+TOPIC = "cmm/demo/sensors/s-1/readings"
+START = dt.datetime(2025, 1, 1, tzinfo=dt.UTC)
+
+
+class RecordingWriter:
+    def __init__(self, fail: Sequence[BaseException] = ()) -> None:
+        self.batches: list[list[Reading]] = []
+        self.failures = list(fail)
+        self.gate = threading.Event()
+        self.gate.set()
+
+    async def write(self, readings: Sequence[Reading]) -> int:
+        await asyncio.to_thread(self.gate.wait)
+        if self.failures:
+            raise self.failures.pop(0)
+        if any(sensor_id == "poison" for sensor_id, _, _ in readings):
+            raise ValueError("value too long for type character varying(36)")
+        self.batches.append(list(readings))
+        return len(readings)
+
+    @property
+    def rows(self) -> list[Reading]:
+        return [reading for batch in self.batches for reading in batch]
+
+
+def _json(offset_s: float, sensor_id: str = "s-1", celsius: float = 20.0) -> bytes:
+    ts = (START + dt.timedelta(seconds=offset_s)).isoformat()
+    return json.dumps({"sensor_id": sensor_id, "ts": ts, "celsius": celsius}).encode()
+
+
+def _binary(sensor_id: str, base_ms: int, deltas: list[int], centi: list[int]) -> bytes:
+    stamps = [base_ms + sum(deltas[: i + 1]) for i in range(len(deltas))]
+    return encode_readings([sensor_id] * len(deltas), stamps, [c / 100 for c in centi])
+
+
+def _settings(**overrides) -> IngestSettings:
+    values = {"batch_rows": 100, "batch_delay_s": 0.01, "retry_initial_s": 0.001}
+    return IngestSettings(**{**values, **overrides})
+
+
+async def _until(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        await asyncio.sleep(0.005)
+
+
+def test_decode_payload_formats_and_rejections():
+    (reading,) = decode_payload(TOPIC, b'{"ts": 1735689600, "celsius": 21.5}')
+    assert reading == ("s-1", START, 21.5)
+    binary = decode_payload(TOPIC, _binary("s-2", 1735689600000, [0, 60000], [2050, -125]))
+    assert binary == [("s-2", START, 20.5), ("s-2", START + dt.timedelta(minutes=1), -1.25)]
+
+    malformed = [
+        b'{"ts": 1e20, "celsius": 20.0}',
+        b'{"ts": "2025-01-01T00:00:00Z", "celsius": 1' + b"0" * 400 + b"}",
+        b'{"ts": "not a time", "celsius": 20.0}',
+        b'{"ts": "2025-01-01T00:00:00Z", "celsius": 20.0, "sensor_id": "' + b"x" * 37 + b'"}',
+        b'{"ts": "2025-01-01T00:00:00Z", "celsius": 20.0, "sensor_id": ""}',
+        b"[" * 100000,
+        _binary("s-2", 2**62, [0], [2000]),
+        _binary("s-2", 1735689600000, [0], [2000])[:-1],
+    ]
+    for payload in malformed:
+        with pytest.raises(PayloadError):
+            decode_payload(TOPIC, payload)
+
+
+def test_messages_are_batched_and_acked_after_the_write():
+    writer = RecordingWriter()
+    broker = LocalBroker()
+
+    async def scenario() -> None:
+        pipeline = IngestPipeline(writer, _settings(batch_rows=10, batch_delay_s=1.0))
+        pipeline.start()
+        broker.start(pipeline.submit_threadsafe)
+        writer.gate.clear()
+        for offset in range(25):
+            broker.publish(TOPIC, _json(offset))
+        await _until(lambda: pipeline.stats.messages >= 10)
+        assert broker.unacked == 25
+        writer.gate.set()
+        await _until(lambda: broker.unacked == 0)
+        await pipeline.stop()
+        broker.stop()
+
+    asyncio.run(scenario())
+    assert [len(batch) for batch in writer.batches] == [10, 10, 5]
+    assert [ts for _, ts, _ in writer.rows] == [START + dt.timedelta(seconds=i) for i in range(25)]
+
+
+def test_transient_failures_are_retried_before_acking():
+    writer = RecordingWriter(fail=[TransientWriteError("down")] * 5)
+    broker = LocalBroker()
+
+    async def scenario() -> None:
+        pipeline = IngestPipeline(writer, _settings(max_write_attempts=1))
+        pipeline.start()
+        broker.start(pipeline.submit_threadsafe)
+        broker.publish(TOPIC, _json(0))
+        await _until(lambda: broker.unacked == 0)
+        assert pipeline.stats.write_failures == 5
+        assert pipeline.stats.dead_lettered == 0
+        await pipeline.stop()
+        broker.stop()
+
+    asyncio.run(scenario())
+    assert len(writer.rows) == 1
+
+
+def test_bad_messages_are_dead_lettered_and_ingest_continues(tmp_path):
+    writer = RecordingWriter()
+    broker = LocalBroker()
+    dead_letter = tmp_path / "dead-letter.jsonl"
+
+    async def scenario() -> None:
+        settings = _settings(max_write_attempts=2, dead_letter_path=str(dead_letter))
+        pipeline = IngestPipeline(writer, settings)
+        pipeline.start()
+        broker.start(pipeline.submit_threadsafe)
+        writer.gate.clear()
+        broker.publish(TOPIC, b'{"ts": 1e20, "celsius": 20.0}')
+        for offset in range(6):
+            broker.publish(TOPIC, _json(offset, "poison" if offset == 4 else "s-1"))
+        await _until(lambda: pipeline.stats.messages == 7)
+        writer.gate.set()
+        await _until(lambda: broker.unacked == 0)
+        broker.publish(TOPIC, _json(10))
+        await _until(lambda: broker.unacked == 0)
+        assert pipeline.stats.rejected_messages == 1
+        assert pipeline.stats.dead_lettered == 2
+        await pipeline.stop()
+        broker.stop()
+
+    asyncio.run(scenario())
+    assert sorted(ts.second for _, ts, _ in writer.rows) == [0, 1, 2, 3, 5, 10]
+    entries = [json.loads(line) for line in dead_letter.read_text().splitlines()]
+    assert base64.b64decode(entries[0]["payload"]) == b'{"ts": 1e20, "celsius": 20.0}'
+    assert b"poison" in base64.b64decode(entries[1]["payload"])
+    assert entries[1]["reason"].startswith("Write rejected")
+
+
+def test_full_queue_blocks_the_source_and_stop_releases_it():
+    writer = RecordingWriter(fail=[TransientWriteError("down")])
+    broker = LocalBroker()
+
+    async def scenario() -> None:
+        pipeline = IngestPipeline(writer, _settings(queue_size=3, batch_rows=1))
+        pipeline.start()
+        broker.start(pipeline.submit_threadsafe)
+        writer.gate.clear()
+        for offset in range(20):
+            broker.publish(TOPIC, _json(offset))
+        # One message is being written, three fill the queue and the broker thread blocks.
+        await _until(lambda: pipeline.queue_depth == 3)
+        await asyncio.sleep(0.05)
+        assert pipeline.queue_depth == 3 and broker.unacked == 20
+
+        stopping = asyncio.create_task(pipeline.stop())
+        await asyncio.sleep(0.05)
+        writer.gate.set()
+        await asyncio.wait_for(stopping, 5.0)
+        await asyncio.wait_for(asyncio.to_thread(broker.stop), 5.0)
+
+    asyncio.run(scenario())
+    # The write failing during shutdown stays unacked; the queued messages were flushed.
+    assert len(writer.rows) == 3
+    assert broker.unacked == 17
+
+    # Redelivery to a fresh pipeline completes the stream: delivery is at-least-once.
+    async def resume() -> None:
+        pipeline = IngestPipeline(writer, _settings())
+        pipeline.start()
+        broker.start(pipeline.submit_threadsafe)
+        broker.redeliver()
+        await _until(lambda: broker.unacked == 0)
+        await pipeline.stop()
+        broker.stop()
+
+    asyncio.run(resume())
+    assert sorted({ts.second for _, ts, _ in writer.rows}) == list(range(20))